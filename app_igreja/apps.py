@@ -1,6 +1,18 @@
+import logging
+
 from django.apps import AppConfig
+from django.core import checks
 
 
 class AppIgrejaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_igreja'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .utils_chatbot import verificar_cache_compartilhado
+
+        checks.register(verificar_cache_compartilhado, checks.Tags.caches)
+        # O gunicorn não roda as verificações do Django: o aviso vai também para o log
+        for aviso in verificar_cache_compartilhado():
+            logging.getLogger(__name__).warning('%s %s', aviso.msg, aviso.hint)
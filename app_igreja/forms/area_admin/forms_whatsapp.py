@@ -233,6 +233,21 @@ class MensagemWhatsAppForm(forms.Form):
         max_length=1000
     )
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Os selects de destinatário específico não listam a tabela inteira: as opções são
+        # carregadas sob demanda pela busca (whatsapp_buscar_destinatarios). Aqui só fica o
+        # registro enviado no POST, para validar e re-renderizar o formulário.
+        for campo, model, pk_field in (
+            ('dizimista_especifico', TBDIZIMISTAS, 'id'),
+            ('colaborador_especifico', TBCOLABORADORES, 'COL_id'),
+        ):
+            valor = self.data.get(self.add_prefix(campo)) if self.is_bound else None
+            if valor and str(valor).isdigit():
+                self.fields[campo].queryset = model.objects.filter(**{pk_field: valor})
+            else:
+                self.fields[campo].queryset = model.objects.none()
+    
     def clean(self):
         cleaned_data = super().clean()
         tipo_midia = cleaned_data.get('tipo_midia')
@@ -2,6 +2,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from datetime import date
 from app_igreja.models.area_admin.models_celebracoes import TBCELEBRACOES
+from app_igreja.utils_celebracoes import HorarioIndisponivel, verificar_horario
 
 
 class CelebracaoAgendadaPubForm(forms.ModelForm):
@@ -131,6 +132,18 @@ class CelebracaoAgendadaPubForm(forms.ModelForm):
         
         return participantes
 
+    def clean(self):
+        """Horário precisa existir na grade de celebrações do dia e ter vaga"""
+        cleaned_data = super().clean()
+        data_celebracao = cleaned_data.get('CEL_data_celebracao')
+        horario = cleaned_data.get('CEL_horario')
+        if data_celebracao and horario:
+            try:
+                verificar_horario(data_celebracao, horario, ignorar_pk=self.instance.pk)
+            except HorarioIndisponivel as e:
+                self.add_error('CEL_horario', str(e))
+        return cleaned_data
+
     def save(self, commit=True):
         """Override save para sempre definir status como pendente"""
         instance = super().save(commit=False)
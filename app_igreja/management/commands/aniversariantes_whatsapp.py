@@ -0,0 +1,107 @@
+"""
+Enfileira as felicitações de aniversário do dia (dizimistas e colaboradores ativos).
+
+Uso (cron, uma vez por dia, de manhã):
+    python manage.py aniversariantes_whatsapp
+    python manage.py aniversariantes_whatsapp --enviar
+    python manage.py aniversariantes_whatsapp --data 2026-12-25 --simular
+
+Os aniversariantes vêm de utils_segmentos.Segmento com a janela de um dia: comparação
+na coluna DIS_dia_ano / COL_dia_ano (mês * 100 + dia, indexada), só nome e telefone.
+Quem é dizimista e colaborador ao mesmo tempo (mesmo telefone normalizado) recebe uma
+mensagem só. Quem nasceu em 29/02 é felicitado em 28/02 nos anos não bissextos.
+
+A foto da capa (VIS_FOTO_CAPA) vai pelo media id do cache de mídias da Whapi
+(utils_midia_whatsapp): sobe uma vez e todas as mensagens levam o mesmo id, em vez de a
+Whapi baixar a imagem do nosso servidor para cada aniversariante. A chave
+aniversario:<ano>:<telefone> evita felicitar a mesma pessoa duas vezes no ano, mesmo
+rodando o comando de novo.
+"""
+import calendar
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app_igreja.models.area_admin.models_visual import TBVISUAL
+from app_igreja.models.area_admin.models_whatsapp import TBFILAWHATSAPP
+from app_igreja.utils_busca import chave_telefone
+from app_igreja.utils_chatbot import nome_paroquia
+from app_igreja.utils_fila_whatsapp import enfileirar, processar_fila
+from app_igreja.utils_midia_whatsapp import media_id_arquivo
+from app_igreja.utils_segmentos import Segmento
+
+ORIGEM = 'ANIVERSARIO'
+
+MODELO = (
+    '🎉 Feliz aniversário, {nome}! 🎂\n\n'
+    'A Paróquia {paroquia} agradece a Deus pela sua vida e reza por você neste dia. '
+    'Que o Senhor te abençoe e te guarde!'
+)
+
+
+def felicitacoes(dia, paroquia):
+    """
+    [(chave, telefone, texto)] dos aniversariantes do dia, sem telefone repetido.
+    Em 28/02 de ano não bissexto entram também os nascidos em 29/02.
+    """
+    fim = dia
+    if (dia.month, dia.day) == (2, 28) and not calendar.isleap(dia.year):
+        fim = date(2000, 2, 29)  # só mês e dia contam: janela 228 a 229
+    segmento = Segmento(
+        'TODOS', status_dizimista='ATIVO', status_colaborador='ATIVO',
+        aniversario_inicio=dia, aniversario_fim=fim,
+    )
+    return [
+        (
+            f'aniversario:{dia.year}:{chave_telefone(pessoa["telefone"])}',
+            pessoa['telefone'],
+            MODELO.format(nome=(pessoa['nome'] or '').split(' ')[0], paroquia=paroquia),
+        )
+        for pessoa in segmento.destinatarios()
+    ]
+
+
+def subir_foto_capa():
+    """Media id da foto da capa na Whapi ('' se não houver capa ou o upload falhar)."""
+    visual = TBVISUAL.objects.only('VIS_ID', 'VIS_FOTO_CAPA').first()
+    return (visual and media_id_arquivo(visual.VIS_FOTO_CAPA)) or ''
+
+
+class Command(BaseCommand):
+    help = 'Enfileira as felicitações de aniversário do dia para envio pelo WhatsApp'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', help='Dia dos aniversários, AAAA-MM-DD (padrão: hoje)')
+        parser.add_argument('--sem-imagem', action='store_true', help='Envia só o texto, sem a foto da capa')
+        parser.add_argument('--enviar', action='store_true', help='Processa a fila de envio ao final')
+        parser.add_argument('--simular', action='store_true', help='Só lista os aniversariantes')
+
+    def handle(self, *args, **options):
+        try:
+            dia = date.fromisoformat(options['data']) if options['data'] else timezone.localdate()
+        except ValueError:
+            raise CommandError('Use --data no formato AAAA-MM-DD.')
+
+        mensagens = felicitacoes(dia, nome_paroquia())
+        if options['simular']:
+            for chave, telefone, _ in mensagens:
+                self.stdout.write(f'{chave}  {telefone}')
+            self.stdout.write(f'{len(mensagens)} aniversariante(s) em {dia:%d/%m}.')
+            return
+
+        # Sobe a capa só se houver felicitação nova (reexecuções não repetem o upload)
+        ja_na_fila = TBFILAWHATSAPP.objects.filter(FIL_chave__in=[chave for chave, _, _ in mensagens]).count()
+        midia = ''
+        if len(mensagens) > ja_na_fila and not options['sem_imagem']:
+            midia = subir_foto_capa()
+            if not midia:
+                self.stdout.write(self.style.WARNING('Foto da capa indisponível: felicitações só com texto.'))
+
+        novas = enfileirar(mensagens, ORIGEM, midia=midia)
+        self.stdout.write(self.style.SUCCESS(
+            f'{novas} felicitação(ões) nova(s) na fila ({len(mensagens)} aniversariante(s) em {dia:%d/%m}).'
+        ))
+        if options['enviar']:
+            totais = processar_fila()
+            self.stdout.write(', '.join(f'{chave}={n}' for chave, n in sorted(totais.items())) or 'Nada a enviar.')
@@ -0,0 +1,118 @@
+"""
+Mede o tempo de renderização da home com N banners para cada estratégia de URL de mídia.
+
+Uso:
+    python manage.py benchmark_home
+    python manage.py benchmark_home --banners 20 --repeticoes 50
+
+Não acessa a rede: URLs S3 são assinadas localmente, com credenciais fictícias.
+Os registros de teste (visual, banners, murais) são criados numa transação desfeita
+ao final; os nomes de arquivo são únicos por execução, então o cache de URLs do
+servidor não interfere na medição.
+"""
+import re
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from storages.backends.s3 import S3Storage
+
+from app_igreja.models.area_admin.models_banners import TBBANNERS
+from app_igreja.models.area_admin.models_mural import TBMURAL
+from app_igreja.models.area_admin.models_visual import TBVISUAL
+from app_igreja.storage import ArmazenamentoMidia
+
+BUCKET = 'benchmark-oncristo'
+
+
+class Command(BaseCommand):
+    help = 'Tempo de renderização da home com N banners por estratégia de URL de mídia'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--banners', type=int, default=20, help='Banners ativos na home (padrão: 20)')
+        parser.add_argument('--repeticoes', type=int, default=30, help='Renderizações medidas por estratégia (padrão: 30)')
+
+    def handle(self, *args, **options):
+        opcoes_s3 = {
+            'bucket_name': BUCKET,
+            'access_key': 'benchmark',
+            'secret_key': 'benchmark',
+            'endpoint_url': settings.AWS_S3_ENDPOINT_URL,
+            'region_name': settings.AWS_S3_REGION_NAME,
+            'signature_version': 's3v4',
+            'querystring_auth': True,
+        }
+        estrategias = [
+            ('S3Storage (assina a cada .url)', lambda: S3Storage(**opcoes_s3), False),
+            ('ArmazenamentoMidia assinada', lambda: ArmazenamentoMidia(**opcoes_s3), False),
+            ('ArmazenamentoMidia sem assinatura', lambda: ArmazenamentoMidia(**opcoes_s3), True),
+        ]
+
+        self.stdout.write(f"{'Estratégia':<36} {'1ª (ms)':>9} {'mediana (ms)':>13} {'p95 (ms)':>9}  URLs estáveis")
+        armazenamento_original = default_storage._wrapped
+        try:
+            for nome, criar_storage, sem_assinatura in estrategias:
+                with transaction.atomic():
+                    self._criar_dados(options['banners'])
+                    default_storage._wrapped = criar_storage()
+                    with override_settings(MIDIA_PUBLICA_SEM_ASSINATURA=sem_assinatura):
+                        primeira, tempos, estaveis = self._medir(options['repeticoes'])
+                    transaction.set_rollback(True)
+                tempos.sort()
+                p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+                self.stdout.write(
+                    f'{nome:<36} {primeira:>9.1f} {statistics.median(tempos):>13.1f} {p95:>9.1f}  '
+                    f"{'sim' if estaveis else 'não'}"
+                )
+        finally:
+            default_storage._wrapped = armazenamento_original
+
+    @staticmethod
+    def _criar_dados(quantidade_banners):
+        # bulk_create: sem save() (que abriria as imagens no storage) e sem sinais
+        execucao = uuid.uuid4().hex[:8]
+        TBVISUAL.objects.bulk_create([TBVISUAL(
+            VIS_FOTO_PRINCIPAL=f'visual/principal/{execucao}.jpg',
+            VIS_FOTO_CAPA=f'visual/capa/{execucao}.jpg',
+            VIS_FOTO_BRASAO=f'visual/brasao/{execucao}.jpg',
+            VIS_FOTO_PADROEIRO=f'visual/padroeiro/{execucao}.jpg',
+        )])
+        TBBANNERS.objects.bulk_create([
+            TBBANNERS(BAN_NOME_PATROCINADOR=f'Patrocinador {i}', BAN_IMAGE=f'banners/{execucao}_{i}.jpg', BAN_ORDEM=i + 1)
+            for i in range(quantidade_banners)
+        ])
+        TBMURAL.objects.bulk_create([
+            TBMURAL(
+                MUR_titulo_mural=f'Mural {i}',
+                **{f'MUR_foto{n}_mural': f'mural/{execucao}_{i}_{n}.jpg' for n in range(1, 6)},
+            )
+            for i in range(3)
+        ])
+
+    @staticmethod
+    def _medir(repeticoes):
+        client = Client(HTTP_HOST='localhost')
+        padrao_url = re.compile(rf'https?://[^"\s]*{BUCKET}[^"\s]*')
+
+        def renderizar():
+            inicio = time.perf_counter()
+            response = client.get('/')
+            return (time.perf_counter() - inicio) * 1000, response.content.decode()
+
+        primeira, html = renderizar()
+        urls_primeira = set(padrao_url.findall(html))
+        tempos = []
+        for _ in range(repeticoes):
+            tempo, _ = renderizar()
+            tempos.append(tempo)
+        # A assinatura S3v4 tem resolução de 1s: espera para que uma URL reassinada mude
+        time.sleep(1.1)
+        _, html = renderizar()
+        estaveis = bool(urls_primeira) and urls_primeira == set(padrao_url.findall(html))
+        return primeira, tempos, estaveis
@@ -0,0 +1,29 @@
+"""
+Envia as mensagens pendentes da fila do WhatsApp (TBFILAWHATSAPP) no ritmo permitido.
+
+Uso (cron a cada 2 minutos, instalado por scripts/servidor_configurar_cron.sh):
+    python manage.py enviar_fila_whatsapp
+    python manage.py enviar_fila_whatsapp --por-minuto 20 --maximo 200
+
+As mensagens entram na fila pelas campanhas (lembretes_dizimo etc.); ver
+utils_fila_whatsapp para a reserva de cada mensagem e as novas tentativas.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app_igreja.utils_fila_whatsapp import processar_fila
+
+
+class Command(BaseCommand):
+    help = 'Envia as mensagens pendentes da fila do WhatsApp respeitando o limite por minuto'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--por-minuto', type=int, default=settings.WHATSAPP_FILA_POR_MINUTO,
+                            help=f'Mensagens por minuto (padrão: WHATSAPP_FILA_POR_MINUTO = {settings.WHATSAPP_FILA_POR_MINUTO})')
+        parser.add_argument('--maximo', type=int, help='Para depois de N mensagens (padrão: todas as pendentes)')
+
+    def handle(self, *args, **options):
+        totais = processar_fila(por_minuto=options['por_minuto'], maximo=options['maximo'])
+        self.stdout.write(', '.join(f'{chave}={n}' for chave, n in sorted(totais.items())) or 'Nada a enviar.')
+        if totais['limite']:
+            self.stdout.write(self.style.WARNING('A Whapi respondeu 429: o restante fica para a próxima execução.'))
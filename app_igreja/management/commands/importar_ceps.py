@@ -0,0 +1,112 @@
+"""
+Importa uma base de CEPs (CSV) para a tabela TBCEP.
+
+Uso:
+    python manage.py importar_ceps caminho/ceps.csv
+    python manage.py importar_ceps caminho/ceps.csv --lote 5000 --encoding latin-1
+
+O CSV precisa de cabeçalho; separador (vírgula, ponto e vírgula ou tab) é detectado
+automaticamente. Colunas aceitas: cep, logradouro|endereco, bairro,
+cidade|localidade, estado|uf, complemento.
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from app_igreja.models.area_admin.models_cep import TBCEP
+from app_igreja.utils_cep import limpar_cep, limpar_cache_cep
+
+COLUNAS = {
+    'cep': ('cep',),
+    'logradouro': ('logradouro', 'endereco', 'endereço'),
+    'bairro': ('bairro',),
+    'cidade': ('cidade', 'localidade', 'municipio', 'município'),
+    'estado': ('estado', 'uf'),
+    'complemento': ('complemento',),
+}
+
+CAMPOS_ATUALIZADOS = [
+    'CEP_logradouro', 'CEP_bairro', 'CEP_cidade', 'CEP_estado',
+    'CEP_complemento', 'CEP_valido', 'CEP_fonte', 'CEP_data_consulta',
+]
+
+
+class Command(BaseCommand):
+    help = 'Importa uma base de CEPs (CSV) para o cache local TBCEP'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Arquivo CSV com cabeçalho')
+        parser.add_argument('--lote', type=int, default=2000, help='Registros por bulk_create (padrão: 2000)')
+        parser.add_argument('--encoding', default='utf-8', help='Codificação do arquivo (padrão: utf-8)')
+
+    def handle(self, *args, **options):
+        try:
+            arquivo = open(options['arquivo'], newline='', encoding=options['encoding'])
+        except OSError as e:
+            raise CommandError(f'Não foi possível abrir o arquivo: {e}')
+
+        with arquivo:
+            amostra = arquivo.read(4096)
+            arquivo.seek(0)
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+            except csv.Error:
+                dialeto = csv.excel
+            leitor = csv.DictReader(arquivo, dialect=dialeto)
+            mapa = self._mapear_colunas(leitor.fieldnames or [])
+
+            agora = timezone.now()
+            lote = []
+            importados = ignorados = 0
+            for linha in leitor:
+                cep = limpar_cep(linha.get(mapa['cep']))
+                if not cep:
+                    ignorados += 1
+                    continue
+                lote.append(TBCEP(
+                    CEP_cep=cep,
+                    CEP_logradouro=self._valor(linha, mapa, 'logradouro', 200),
+                    CEP_bairro=self._valor(linha, mapa, 'bairro', 100),
+                    CEP_cidade=self._valor(linha, mapa, 'cidade', 100),
+                    CEP_estado=self._valor(linha, mapa, 'estado', 2).upper(),
+                    CEP_complemento=self._valor(linha, mapa, 'complemento', 100),
+                    CEP_valido=True,
+                    CEP_fonte='IMPORTACAO',
+                    CEP_data_consulta=agora,
+                ))
+                if len(lote) >= options['lote']:
+                    importados += self._gravar(lote)
+                    lote = []
+            if lote:
+                importados += self._gravar(lote)
+
+        limpar_cache_cep()
+        self.stdout.write(self.style.SUCCESS(
+            f'{importados} CEP(s) importado(s), {ignorados} linha(s) ignorada(s).'
+        ))
+
+    def _mapear_colunas(self, cabecalho):
+        normalizado = {c.strip().lower(): c for c in cabecalho if c}
+        mapa = {}
+        for campo, nomes in COLUNAS.items():
+            mapa[campo] = next((normalizado[n] for n in nomes if n in normalizado), None)
+        if not mapa['cep']:
+            raise CommandError(f'Coluna "cep" não encontrada no cabeçalho: {cabecalho}')
+        return mapa
+
+    @staticmethod
+    def _valor(linha, mapa, campo, tamanho):
+        coluna = mapa.get(campo)
+        return (linha.get(coluna) or '').strip()[:tamanho] if coluna else ''
+
+    @staticmethod
+    def _gravar(lote):
+        # Remove CEPs repetidos dentro do mesmo lote (o último vence)
+        por_cep = {registro.CEP_cep: registro for registro in lote}
+        kwargs = {'update_conflicts': True, 'update_fields': CAMPOS_ATUALIZADOS}
+        if connection.features.supports_update_conflicts_with_target:
+            kwargs['unique_fields'] = ['CEP_cep']
+        TBCEP.objects.bulk_create(por_cep.values(), **kwargs)
+        return len(por_cep)
@@ -0,0 +1,105 @@
+"""
+Enfileira lembretes de dízimo pelo WhatsApp a partir dos vencimentos de TBGERDIZIMO.
+
+Uso (cron, uma vez por dia):
+    python manage.py lembretes_dizimo
+    python manage.py lembretes_dizimo --dias 3 --atraso-dias 30 --enviar
+    python manage.py lembretes_dizimo --simular
+
+Seleciona os dízimos em aberto (sem pagamento ou pagos em parte) de dizimistas ativos
+com vencimento entre hoje - --atraso-dias e hoje + --dias: um intervalo em
+GER_dtvencimento (indexado), com nome e telefone do dizimista no mesmo SELECT.
+
+Cada dízimo recebe no máximo um lembrete "a vencer" e um "em atraso": a chave de
+idempotência (dizimo:<GER_id>:<fase>) impede que uma segunda execução no mesmo dia - ou
+nos dias seguintes, enquanto o vencimento estiver na janela - enfileire de novo.
+O envio fica com enviar_fila_whatsapp (ou --enviar, ao final desta execução).
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.utils import timezone
+
+from app_igreja.models.area_admin.models_dizimistas import TBGERDIZIMO
+from app_igreja.templatetags.format_utils import formatar_moeda
+from app_igreja.utils_chatbot import nome_paroquia
+from app_igreja.utils_fila_whatsapp import enfileirar, processar_fila
+
+ORIGEM = 'LEMBRETE_DIZIMO'
+
+MODELO_A_VENCER = (
+    'Olá, {nome}! 🙏\n\n'
+    'Lembramos que o seu dízimo de {mes} ({valor}) vence em {vencimento}.\n\n'
+    'Obrigado por sustentar a missão da Paróquia {paroquia}!'
+)
+MODELO_ATRASADO = (
+    'Olá, {nome}! 🙏\n\n'
+    'O seu dízimo de {mes} ({valor}), com vencimento em {vencimento}, ainda não consta como pago.\n'
+    'Se já contribuiu, por favor desconsidere esta mensagem.\n\n'
+    'Paróquia {paroquia}'
+)
+
+
+def dizimos_em_aberto(inicio, fim):
+    """(GER_id, mês/ano, vencimento, valor, nome, telefone) dos dízimos em aberto no intervalo."""
+    return (
+        TBGERDIZIMO.objects
+        .filter(GER_dtvencimento__range=(inicio, fim), GER_dizimista__DIS_status=True)
+        .filter(Q(GER_vlr_pago__isnull=True) | Q(GER_vlr_pago__lt=F('GER_vlr_dizimo')))
+        .exclude(GER_dizimista__DIS_telefone='')
+        .order_by('GER_dtvencimento', 'GER_id')
+        .values_list(
+            'GER_id', 'GER_mesano', 'GER_dtvencimento', 'GER_vlr_dizimo',
+            'GER_dizimista__DIS_nome', 'GER_dizimista__DIS_telefone',
+        )
+    )
+
+
+def montar_lembretes(linhas, hoje, paroquia):
+    """Gera (chave, telefone, texto) para enfileirar."""
+    for ger_id, mesano, vencimento, valor, nome, telefone in linhas:
+        fase, modelo = ('atrasado', MODELO_ATRASADO) if vencimento < hoje else ('a_vencer', MODELO_A_VENCER)
+        texto = modelo.format(
+            nome=(nome or '').split(' ')[0] or 'irmão(ã)',
+            mes=mesano.strftime('%m/%Y'),
+            valor=formatar_moeda(valor),
+            vencimento=vencimento.strftime('%d/%m/%Y'),
+            paroquia=paroquia,
+        )
+        yield f'dizimo:{ger_id}:{fase}', telefone, texto
+
+
+class Command(BaseCommand):
+    help = 'Enfileira lembretes de dízimo (a vencer e em atraso) para envio pelo WhatsApp'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=3, help='Lembrar vencimentos dos próximos N dias (padrão: 3)')
+        parser.add_argument('--atraso-dias', type=int, default=30,
+                            help='Incluir vencidos há até N dias (padrão: 30; 0 = nenhum atrasado)')
+        parser.add_argument('--enviar', action='store_true', help='Processa a fila de envio ao final')
+        parser.add_argument('--simular', action='store_true', help='Só mostra quantos lembretes seriam gerados')
+
+    def handle(self, *args, **options):
+        hoje = timezone.localdate()
+        inicio = hoje - timedelta(days=options['atraso_dias'])
+        fim = hoje + timedelta(days=options['dias'])
+        linhas = dizimos_em_aberto(inicio, fim).iterator(chunk_size=500)
+        lembretes = montar_lembretes(linhas, hoje, nome_paroquia())
+
+        if options['simular']:
+            total = 0
+            for chave, telefone, texto in lembretes:
+                if not total:
+                    self.stdout.write(f'Exemplo ({chave}):\n{texto}\n')
+                total += 1
+            self.stdout.write(f'{total} lembrete(s) com vencimento de {inicio:%d/%m/%Y} a {fim:%d/%m/%Y}.')
+            return
+
+        novos = enfileirar(lembretes, ORIGEM)
+        self.stdout.write(self.style.SUCCESS(
+            f'{novos} lembrete(s) novo(s) na fila (vencimentos de {inicio:%d/%m/%Y} a {fim:%d/%m/%Y}).'
+        ))
+        if options['enviar']:
+            totais = processar_fila()
+            self.stdout.write(', '.join(f'{chave}={n}' for chave, n in sorted(totais.items())) or 'Nada a enviar.')
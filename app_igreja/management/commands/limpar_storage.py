@@ -0,0 +1,135 @@
+"""
+Remove do bucket (Wasabi/S3) os arquivos que nenhum registro referencia.
+
+Uso:
+    python manage.py limpar_storage                  # só lista os órfãos (simulação)
+    python manage.py limpar_storage --executar       # apaga os órfãos
+    python manage.py limpar_storage --reconstruir    # recria o manifesto antes de comparar
+    python manage.py limpar_storage --endpoint-url http://localhost:5000 --bucket teste
+
+Os arquivos referenciados vêm do manifesto TBMIDIA (mantido por sinais), não de uma
+varredura das tabelas. O bucket é listado em paralelo, um prefixo de primeiro nível
+("bispos/", "mural/", ...) por thread, e os órfãos são apagados em lotes de até 1000
+chaves por chamada delete_objects.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app_igreja.utils_image import limpar_rendicoes_orfas
+from app_igreja.utils_midia import arquivos_referenciados, cliente_s3, reconstruir_manifesto
+
+# Limite da API S3 para delete_objects
+MAX_CHAVES_POR_EXCLUSAO = 1000
+
+
+class Command(BaseCommand):
+    help = 'Lista (ou apaga, com --executar) arquivos do bucket que não estão no manifesto de mídia'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--executar', action='store_true', help='Apaga de fato os órfãos (padrão: apenas lista)')
+        parser.add_argument('--reconstruir', action='store_true', help='Reconstrói o manifesto a partir das tabelas antes de comparar')
+        parser.add_argument('--workers', type=int, default=8, help='Prefixos listados em paralelo (padrão: 8)')
+        parser.add_argument('--prefixo', action='append', default=[], help='Limita a varredura ao prefixo (pode repetir)')
+        parser.add_argument('--idade-minima', type=int, default=24,
+                            help='Ignora objetos modificados há menos de N horas (uploads em andamento). Padrão: 24')
+        parser.add_argument('--bucket', default=None, help='Bucket (padrão: AWS_STORAGE_BUCKET_NAME)')
+        parser.add_argument('--endpoint-url', default=None, help='Endpoint S3 (padrão: AWS_S3_ENDPOINT_URL; use para S3 local)')
+
+    def handle(self, *args, **options):
+        bucket = options['bucket'] or settings.AWS_STORAGE_BUCKET_NAME
+        if not bucket:
+            raise CommandError('Bucket não configurado (AWS_STORAGE_BUCKET_NAME ou --bucket).')
+        workers = max(1, options['workers'])
+
+        if options['reconstruir']:
+            total = reconstruir_manifesto()
+            self.stdout.write(f'Manifesto reconstruído: {total} arquivo(s).')
+
+        referenciados = arquivos_referenciados()
+        if options['executar']:
+            # Rendições de originais apagados deixam de ser referenciadas e viram órfãs
+            if limpar_rendicoes_orfas(referenciados):
+                referenciados = arquivos_referenciados()
+        self.stdout.write(f'Arquivos no manifesto: {len(referenciados)}')
+        if not referenciados and options['executar']:
+            # Manifesto vazio apagaria o bucket inteiro
+            raise CommandError('Manifesto de mídia vazio. Rode com --reconstruir antes de usar --executar.')
+
+        s3 = cliente_s3(options['endpoint_url'], max_conexoes=workers + 2)
+        limite = timezone.now() - timedelta(hours=options['idade_minima'])
+
+        try:
+            prefixos, orfaos = self._prefixos(s3, bucket, options['prefixo'], referenciados, limite)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for orfaos_prefixo in executor.map(
+                    lambda prefixo: self._orfaos_no_prefixo(s3, bucket, prefixo, referenciados, limite),
+                    prefixos,
+                ):
+                    orfaos.extend(orfaos_prefixo)
+        except (BotoCoreError, ClientError) as e:
+            raise CommandError(f'Erro ao listar o bucket: {e}')
+
+        for chave in orfaos:
+            self.stdout.write(f'Órfão: {chave}')
+
+        if not orfaos:
+            self.stdout.write(self.style.SUCCESS('Nenhum arquivo órfão encontrado.'))
+            return
+        if not options['executar']:
+            self.stdout.write(self.style.WARNING(
+                f'{len(orfaos)} arquivo(s) órfão(s). Nada foi apagado; use --executar para remover.'
+            ))
+            return
+
+        apagados, erros = self._apagar(s3, bucket, orfaos)
+        for erro in erros:
+            self.stderr.write(f"Falha ao apagar {erro.get('Key')}: {erro.get('Code')} {erro.get('Message')}")
+        self.stdout.write(self.style.SUCCESS(f'{apagados} arquivo(s) órfão(s) apagado(s).'))
+
+    @staticmethod
+    def _eh_orfao(obj, referenciados, limite):
+        chave = obj['Key']
+        return not chave.endswith('/') and chave not in referenciados and obj['LastModified'] < limite
+
+    def _prefixos(self, s3, bucket, prefixos_informados, referenciados, limite):
+        """
+        Prefixos a varrer em paralelo e os órfãos já encontrados na raiz do bucket.
+
+        Sem --prefixo, uma listagem com Delimiter='/' devolve os prefixos de primeiro
+        nível e os objetos soltos na raiz.
+        """
+        if prefixos_informados:
+            return prefixos_informados, []
+
+        prefixos, orfaos = [], []
+        paginator = s3.get_paginator('list_objects_v2')
+        for pagina in paginator.paginate(Bucket=bucket, Delimiter='/'):
+            prefixos.extend(p['Prefix'] for p in pagina.get('CommonPrefixes', []))
+            orfaos.extend(o['Key'] for o in pagina.get('Contents', []) if self._eh_orfao(o, referenciados, limite))
+        return prefixos, orfaos
+
+    def _orfaos_no_prefixo(self, s3, bucket, prefixo, referenciados, limite):
+        paginator = s3.get_paginator('list_objects_v2')
+        orfaos = []
+        for pagina in paginator.paginate(Bucket=bucket, Prefix=prefixo, PaginationConfig={'PageSize': 1000}):
+            orfaos.extend(o['Key'] for o in pagina.get('Contents', []) if self._eh_orfao(o, referenciados, limite))
+        return orfaos
+
+    @staticmethod
+    def _apagar(s3, bucket, chaves):
+        apagados, erros = 0, []
+        for inicio in range(0, len(chaves), MAX_CHAVES_POR_EXCLUSAO):
+            lote = chaves[inicio:inicio + MAX_CHAVES_POR_EXCLUSAO]
+            resposta = s3.delete_objects(
+                Bucket=bucket,
+                Delete={'Objects': [{'Key': chave} for chave in lote], 'Quiet': True},
+            )
+            falhas = resposta.get('Errors', [])
+            erros.extend(falhas)
+            apagados += len(lote) - len(falhas)
+        return apagados, erros
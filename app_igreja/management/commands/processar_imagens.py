@@ -0,0 +1,70 @@
+"""
+Gera as rendições (thumb/medio/grande) das imagens que ainda não as têm.
+
+Uso:
+    python manage.py processar_imagens              # originais sem rendição
+    python manage.py processar_imagens --workers 4
+    python manage.py processar_imagens --limpar     # também remove rendições de originais apagados
+
+Normalmente as rendições são geradas em segundo plano logo após o upload; este comando
+cobre imagens antigas (anteriores ao pipeline) e uploads cujo worker não terminou
+(reinício do servidor, erro de rede com o storage).
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from app_igreja.models.area_admin.models_midia import TBMIDIA, TBRENDICAO
+from app_igreja.utils_image import formatos_rendicao, gerar_rendicoes, limpar_rendicoes_orfas, RENDICOES
+from app_igreja.utils_midia import campos_de_imagem, models_com_arquivo
+
+
+class Command(BaseCommand):
+    help = 'Gera as rendições das imagens que ainda não as têm'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Imagens processadas em paralelo (padrão: 2)')
+        parser.add_argument('--limpar', action='store_true', help='Remove rendições cujo original não é mais referenciado')
+
+    def handle(self, *args, **options):
+        tabelas = {m._meta.label: set(campos_de_imagem(m)) for m in models_com_arquivo() if campos_de_imagem(m)}
+        originais = {
+            arquivo
+            for tabela, campo, arquivo in TBMIDIA.objects.filter(
+                MID_tabela__in=tabelas
+            ).values_list('MID_tabela', 'MID_campo', 'MID_arquivo').iterator(chunk_size=2000)
+            if campo in tabelas[tabela]
+        }
+
+        if options['limpar']:
+            removidas = limpar_rendicoes_orfas(originais)
+            self.stdout.write(f'{removidas} rendição(ões) órfã(s) removida(s).')
+
+        esperadas = len(RENDICOES) * len(formatos_rendicao())
+        completos = set()
+        contagem = {}
+        for original in TBRENDICAO.objects.values_list('REN_original', flat=True).iterator(chunk_size=2000):
+            contagem[original] = contagem.get(original, 0) + 1
+            if contagem[original] >= esperadas:
+                completos.add(original)
+        pendentes = sorted(originais - completos)
+        self.stdout.write(f'{len(pendentes)} imagem(ns) sem rendições completas.')
+
+        erros = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            for nome, erro in executor.map(self._processar, pendentes):
+                if erro:
+                    erros += 1
+                    self.stderr.write(f'Erro em {nome}: {erro}')
+        self.stdout.write(self.style.SUCCESS(f'{len(pendentes) - erros} imagem(ns) processada(s), {erros} erro(s).'))
+
+    @staticmethod
+    def _processar(nome):
+        try:
+            gerar_rendicoes(nome)
+            return nome, None
+        except Exception as e:
+            return nome, e
+        finally:
+            close_old_connections()
@@ -0,0 +1,76 @@
+"""
+Refaz os termos de busca (TBTERMOBUSCA) e as colunas DIS_busca / COL_busca a partir dos
+cadastros de dizimistas e colaboradores.
+
+Uso:
+    python manage.py reindexar_busca
+    python manage.py reindexar_busca --tabela DIS
+    python manage.py reindexar_busca --simular
+
+Os sinais de post_save/post_delete mantêm o índice em dia a cada save() e delete(). O
+que passa por fora deles - QuerySet.update(), bulk_create(), bulk_update(), SQL direto,
+importações no banco - deixa TBTERMOBUSCA desatualizado: rode este comando depois.
+Cada tabela é refeita numa transação (apaga os termos e grava de novo em lotes).
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_igreja.models.area_admin.models_busca import TBTERMOBUSCA
+from app_igreja.models.area_admin.models_colaboradores import TBCOLABORADORES
+from app_igreja.models.area_admin.models_dizimistas import TBDIZIMISTAS
+
+TAMANHO_LOTE = 2000
+
+# TER_tabela -> (model, coluna de texto de busca)
+TABELAS = {
+    'DIS': (TBDIZIMISTAS, 'DIS_busca'),
+    'COL': (TBCOLABORADORES, 'COL_busca'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Refaz o índice de busca de dizimistas e colaboradores (TBTERMOBUSCA)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tabela', choices=sorted(TABELAS), help='Só uma tabela (padrão: as duas)')
+        parser.add_argument('--simular', action='store_true', help='Só conta, sem gravar')
+
+    def handle(self, *args, **options):
+        for tabela in [options['tabela']] if options['tabela'] else TABELAS:
+            registros, termos, colunas = self._reindexar(tabela, options['simular'])
+            self.stdout.write(
+                f'{tabela}: {registros} registro(s), {termos} termo(s), {colunas} coluna(s) de busca corrigida(s).'
+            )
+        if options['simular']:
+            self.stdout.write(self.style.WARNING('Simulação: nada foi gravado.'))
+
+    @transaction.atomic
+    def _reindexar(self, tabela, simular):
+        model, coluna = TABELAS[tabela]
+        if not simular:
+            TBTERMOBUSCA.objects.filter(TER_tabela=tabela).delete()
+        registros = total_termos = 0
+        termos, alterados = [], []
+        for registro in model.objects.order_by('pk').iterator(chunk_size=500):
+            registros += 1
+            termos.extend(
+                TBTERMOBUSCA(TER_tabela=tabela, TER_registro=registro.pk, TER_campo=campo, TER_termo=termo)
+                for campo, termo in registro.termos_busca()
+            )
+            anterior = getattr(registro, coluna)
+            registro.atualizar_busca()
+            if getattr(registro, coluna) != anterior:
+                alterados.append(registro)
+            if len(termos) >= TAMANHO_LOTE:
+                total_termos += self._gravar(termos, simular)
+                termos = []
+        total_termos += self._gravar(termos, simular)
+        if not simular:
+            model.objects.bulk_update(alterados, [coluna], batch_size=500)
+        return registros, total_termos, len(alterados)
+
+    @staticmethod
+    def _gravar(termos, simular):
+        if not simular:
+            TBTERMOBUSCA.objects.bulk_create(termos, batch_size=TAMANHO_LOTE)
+        return len(termos)
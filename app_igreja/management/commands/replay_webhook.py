@@ -0,0 +1,193 @@
+"""
+Dispara tráfego gravado (ou sintético) contra o webhook do WhatsApp e mede a vazão.
+
+Uso:
+    python manage.py replay_webhook --arquivo webhook.jsonl --concorrencia 16
+    python manage.py replay_webhook --total 2000 --concorrencia 32 --url http://127.0.0.1:8000/app_igreja/api/whatsapp/webhook/
+
+O arquivo é o JSONL gravado com WHATSAPP_GRAVAR_WEBHOOK (utils_webhook); sem
+--arquivo o tráfego é sintético: primeiros contatos, cliques nos itens do menu
+principal e nos botões "Não" (utils_chatbot). Os ids das mensagens ganham um sufixo
+por execução para não caírem na deduplicação do webhook (--manter-ids testa justamente
+a deduplicação).
+
+Suba antes o servidor com WHATSAPP_BASE_URL apontando para o whapi_stub, senão cada
+mensagem sai para a Whapi de verdade.
+
+Relata vazão, latências p50/p95/p99 e a ocupação dos workers do gunicorn
+(gunicorn_config.py): pela lei de Little, vazão x latência média = requisições em
+atendimento ao mesmo tempo; perto do número de workers (sync) as requisições passam
+a esperar na fila do socket e a latência sobe sem a vazão acompanhar.
+"""
+import copy
+import json
+import runpy
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app_igreja.utils_chatbot import MENU_PRINCIPAL, SUBMENUS
+
+URL_PADRAO = 'http://127.0.0.1:8000/app_igreja/api/whatsapp/webhook/'
+
+
+def percentil(valores_ordenados, fracao):
+    if not valores_ordenados:
+        return 0.0
+    return valores_ordenados[min(len(valores_ordenados) - 1, int(len(valores_ordenados) * fracao))]
+
+
+def trafego_sintetico(remetentes=50):
+    """Entregas no formato "messages" da Whapi: texto, item da lista e botão."""
+    entregas = []
+    for n in range(remetentes):
+        numero = f'5500{n:09d}'
+        mensagens = [{'type': 'text', 'text': {'body': 'oi'}}]
+        item_id = MENU_PRINCIPAL[n % len(MENU_PRINCIPAL)][0]
+        mensagens.append({'type': 'list', 'list': {'id': f'ListV3:{item_id}', 'title': ''}})
+        chave = list(SUBMENUS)[n % len(SUBMENUS)]
+        mensagens.append({
+            'type': 'reply',
+            'reply': {'type': 'button_reply', 'button_reply': {'id': f'{chave}_nao'}},
+        })
+        for i, mensagem in enumerate(mensagens):
+            entregas.append({
+                'event': {'type': 'messages', 'event': 'post'},
+                'messages': [{'id': f'sint-{n}-{i}', 'from_me': False, 'from': numero, **mensagem}],
+            })
+    return entregas
+
+
+def renomear_ids(entrega, sufixo):
+    """Cópia da entrega com os ids de mensagem únicos para esta execução."""
+    entrega = copy.deepcopy(entrega)
+    for mensagem in entrega.get('messages') or []:
+        if mensagem.get('id'):
+            mensagem['id'] = f"{mensagem['id']}-{sufixo}"
+    for atualizacao in entrega.get('chats_updates') or []:
+        ultima = (atualizacao.get('after_update') or {}).get('last_message') or {}
+        if ultima.get('id'):
+            ultima['id'] = f"{ultima['id']}-{sufixo}"
+    return entrega
+
+
+class Command(BaseCommand):
+    help = 'Replay/teste de carga do webhook do WhatsApp (vazão, p50/p95/p99, ocupação dos workers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--arquivo', help='JSONL gravado com WHATSAPP_GRAVAR_WEBHOOK (padrão: tráfego sintético)')
+        parser.add_argument('--url', default=URL_PADRAO, help=f'URL do webhook (padrão: {URL_PADRAO})')
+        parser.add_argument('--concorrencia', type=int, default=8, help='Requisições simultâneas (padrão: 8)')
+        parser.add_argument('--total', type=int, help='Entregas a disparar (padrão: todas do arquivo, uma vez)')
+        parser.add_argument('--manter-ids', action='store_true', help='Não renomeia os ids (testa a deduplicação)')
+        parser.add_argument('--timeout', type=float, default=60, help='Timeout de cada requisição em segundos')
+        parser.add_argument(
+            '--gunicorn-config', default=str(Path(settings.BASE_DIR) / 'gunicorn_config.py'),
+            help='Configuração do gunicorn para comparar a ocupação (padrão: gunicorn_config.py)',
+        )
+        parser.add_argument('--workers', type=int, help='Workers do gunicorn (padrão: lido da configuração)')
+
+    def handle(self, *args, **options):
+        entregas = self._carregar(options['arquivo'])
+        if not entregas:
+            raise CommandError('Nenhuma entrega para disparar.')
+        total = options['total'] or len(entregas)
+        execucao = uuid.uuid4().hex[:8]
+        corpos = []
+        for n in range(total):
+            entrega = entregas[n % len(entregas)]
+            if not options['manter_ids']:
+                entrega = renomear_ids(entrega, f'{execucao}-{n}')
+            corpos.append(json.dumps(entrega, ensure_ascii=False).encode('utf-8'))
+
+        self.stdout.write(f"Disparando {total} entregas em {options['url']} com concorrência {options['concorrencia']}...")
+        latencias, status, duracao = self._disparar(corpos, options)
+        self._relatar(latencias, status, duracao, options)
+
+    @staticmethod
+    def _carregar(arquivo):
+        if not arquivo:
+            return trafego_sintetico()
+        try:
+            with open(arquivo, encoding='utf-8') as linhas:
+                return [json.loads(linha) for linha in linhas if linha.strip()]
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Não foi possível ler {arquivo}: {e}')
+
+    @staticmethod
+    def _disparar(corpos, options):
+        local = threading.local()
+        trava = threading.Lock()
+        latencias = []
+        status = Counter()
+
+        def enviar(corpo):
+            sessao = getattr(local, 'sessao', None)
+            if sessao is None:
+                sessao = local.sessao = requests.Session()
+            inicio = time.perf_counter()
+            try:
+                resposta = sessao.post(
+                    options['url'], data=corpo, timeout=options['timeout'],
+                    headers={'Content-Type': 'application/json'},
+                )
+                codigo = resposta.status_code
+            except requests.RequestException as e:
+                codigo = type(e).__name__
+            ms = (time.perf_counter() - inicio) * 1000
+            with trava:
+                latencias.append(ms)
+                status[codigo] += 1
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concorrencia']) as executor:
+            list(executor.map(enviar, corpos))
+        return sorted(latencias), status, time.perf_counter() - inicio
+
+    def _relatar(self, latencias, status, duracao, options):
+        vazao = len(latencias) / duracao if duracao else 0
+        media = statistics.mean(latencias) if latencias else 0
+        self.stdout.write('')
+        self.stdout.write(f"Respostas: {', '.join(f'{codigo}={n}' for codigo, n in sorted(status.items(), key=str))}")
+        self.stdout.write(f'Duração: {duracao:.1f} s   Vazão: {vazao:.1f} entregas/s')
+        self.stdout.write(
+            f'Latência (ms): média {media:.1f}  p50 {percentil(latencias, 0.50):.1f}  '
+            f'p95 {percentil(latencias, 0.95):.1f}  p99 {percentil(latencias, 0.99):.1f}  '
+            f'máx {latencias[-1] if latencias else 0:.1f}'
+        )
+
+        workers, timeout = options['workers'], None
+        try:
+            config = runpy.run_path(options['gunicorn_config'])
+            workers = workers or config.get('workers')
+            timeout = config.get('timeout')
+        except (OSError, SyntaxError) as e:
+            self.stdout.write(self.style.WARNING(f"Configuração do gunicorn não lida ({e})."))
+        if not workers:
+            return
+
+        # Lei de Little: requisições em atendimento ao mesmo tempo = vazão x tempo médio
+        ocupacao = vazao * media / 1000
+        self.stdout.write(
+            f'Workers do gunicorn: {workers}   Em atendimento (média): {ocupacao:.1f} '
+            f'({ocupacao / workers:.0%} dos workers)'
+        )
+        if options['concorrencia'] > workers:
+            self.stdout.write(self.style.WARNING(
+                f"Concorrência ({options['concorrencia']}) acima dos workers ({workers}): "
+                'o excedente espera na fila e entra na latência medida.'
+            ))
+        if timeout:
+            estouros = sum(1 for ms in latencias if ms >= timeout * 1000)
+            if estouros:
+                self.stdout.write(self.style.ERROR(
+                    f'{estouros} entrega(s) passaram do timeout do gunicorn ({timeout} s): o worker seria reiniciado.'
+                ))
@@ -0,0 +1,101 @@
+"""
+Servidor local que faz o papel da Whapi Cloud para testes de carga do webhook.
+
+Uso:
+    python manage.py whapi_stub
+    python manage.py whapi_stub --porta 8765 --latencia-ms 250 --jitter-ms 100 --taxa-erro 0.02
+
+Depois suba o Django (ou o gunicorn) apontando para ele:
+    WHATSAPP_BASE_URL=http://127.0.0.1:8765 gunicorn -c gunicorn_config.py pro_igreja.wsgi:application
+
+Responde como a Whapi aos envios (POST /messages/<tipo> -> {"sent": true, ...}) e ao
+upload de mídia (POST /media), com latência configurável e uma fração de respostas de
+erro (500) ou de limite (429). Nada sai para a internet. Ao encerrar (Ctrl+C) mostra as
+chamadas recebidas por rota.
+"""
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Servidor local que imita a API da Whapi Cloud (latência e erros configuráveis)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--porta', type=int, default=8765)
+        parser.add_argument('--latencia-ms', type=float, default=200, help='Latência média por chamada (padrão: 200)')
+        parser.add_argument('--jitter-ms', type=float, default=50, help='Variação da latência, ± (padrão: 50)')
+        parser.add_argument('--taxa-erro', type=float, default=0.0, help='Fração de respostas 500 (0 a 1)')
+        parser.add_argument('--taxa-limite', type=float, default=0.0, help='Fração de respostas 429 (0 a 1)')
+
+    def handle(self, *args, **options):
+        chamadas = Counter()
+        trava = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def _responder(self, status, corpo):
+                dados = json.dumps(corpo).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def do_POST(self):
+                tamanho = int(self.headers.get('Content-Length') or 0)
+                corpo = self.rfile.read(tamanho) if tamanho else b''
+                atraso = options['latencia_ms'] + random.uniform(-options['jitter_ms'], options['jitter_ms'])
+                time.sleep(max(atraso, 0) / 1000)
+
+                rota = self.path.split('?')[0].rstrip('/')
+                sorteio = random.random()
+                if sorteio < options['taxa_erro']:
+                    status, resposta = 500, {'error': {'code': 500, 'message': 'erro simulado'}}
+                elif sorteio < options['taxa_erro'] + options['taxa_limite']:
+                    status, resposta = 429, {'error': {'code': 429, 'message': 'limite simulado'}}
+                elif rota == '/media':
+                    status, resposta = 200, {'media': [{'id': f'stub-media-{uuid.uuid4().hex}'}]}
+                elif rota.startswith('/messages/'):
+                    try:
+                        para = json.loads(corpo or b'{}').get('to')
+                    except ValueError:
+                        para = None
+                    status, resposta = 200, {
+                        'sent': True,
+                        'message': {'id': f'stub-{uuid.uuid4().hex}', 'to': para, 'status': 'pending'},
+                    }
+                else:
+                    status, resposta = 404, {'error': {'code': 404, 'message': 'rota não simulada'}}
+                with trava:
+                    chamadas[(rota, status)] += 1
+                self._responder(status, resposta)
+
+            def do_GET(self):
+                self._responder(200, {'status': 'stub', 'version': 'whapi-stub'})
+
+            def log_message(self, formato, *args):
+                pass  # uma linha por chamada pesaria no próprio teste de carga
+
+        servidor = ThreadingHTTPServer((options['host'], options['porta']), Handler)
+        servidor.daemon_threads = True
+        self.stdout.write(
+            f"Whapi simulada em http://{options['host']}:{options['porta']} "
+            f"(latência {options['latencia_ms']:.0f}±{options['jitter_ms']:.0f} ms, "
+            f"erro {options['taxa_erro']:.0%}, limite {options['taxa_limite']:.0%}). Ctrl+C para encerrar."
+        )
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
+        self.stdout.write(f"\n{'Rota':<30} {'Status':>6} {'Chamadas':>9}")
+        for (rota, status), total in sorted(chamadas.items()):
+            self.stdout.write(f'{rota:<30} {status:>6} {total:>9}')
@@ -0,0 +1,65 @@
+"""
+Middlewares do app_igreja
+"""
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .utils_desempenho import (
+    amostrar, conexoes_instrumentadas, detectar_n_mais_um, encerrar_medicao, iniciar_medicao,
+    instrumentar, logger, registrar_medicao,
+)
+
+
+class MedicaoDesempenhoMiddleware:
+    """
+    Mede as requisições sorteadas (DESEMPENHO_AMOSTRAGEM): tempo total, consultas e tempo
+    de banco, chamadas HTTP de saída e acertos do cache (utils_desempenho).
+
+    O resultado vai numa linha de log JSON (logger app_igreja.desempenho), no ranking de
+    endpoints da área administrativa e, só para usuários da equipe (is_staff), no
+    cabeçalho Server-Timing: os tempos de banco e de APIs externas não são para o público.
+    Deve ser o primeiro da lista MIDDLEWARE para que o tempo inclua os demais.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrumentar()
+
+    def __call__(self, request):
+        if not amostrar():
+            return self.get_response(request)
+
+        medicao, token = iniciar_medicao()
+        try:
+            with conexoes_instrumentadas(medicao.medir_consulta):
+                response = self.get_response(request)
+        finally:
+            encerrar_medicao(token)
+        medicao.finalizar()
+
+        usuario = getattr(request, 'user', None)
+        if usuario is not None and usuario.is_staff:
+            response['Server-Timing'] = medicao.server_timing()
+        resolver_match = getattr(request, 'resolver_match', None)
+        endpoint = resolver_match.view_name if resolver_match else 'não resolvida'
+        registrar_medicao(endpoint, request.method, response.status_code, medicao)
+        return response
+
+
+class DetectorNMaisUmMiddleware:
+    """
+    Só em DEBUG: avisa no log (app_igreja.desempenho) quando a mesma consulta roda
+    N_MAIS_UM_LIMITE vezes ou mais com parâmetros diferentes numa requisição.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with detectar_n_mais_um() as detector:
+            response = self.get_response(request)
+        for sql, execucoes in detector.repetidas():
+            logger.warning('N+1 em %s %s: %d execuções de %s', request.method, request.path, execucoes, sql)
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-19 13:32
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0024_alter_tbbanners_ban_link_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TBCEP',
+            fields=[
+                ('CEP_cep', models.CharField(help_text='Somente dígitos', max_length=8, primary_key=True, serialize=False, verbose_name='CEP')),
+                ('CEP_logradouro', models.CharField(blank=True, default='', max_length=200, verbose_name='Logradouro')),
+                ('CEP_bairro', models.CharField(blank=True, default='', max_length=100, verbose_name='Bairro')),
+                ('CEP_cidade', models.CharField(blank=True, default='', max_length=100, verbose_name='Cidade')),
+                ('CEP_estado', models.CharField(blank=True, default='', max_length=2, verbose_name='Estado')),
+                ('CEP_complemento', models.CharField(blank=True, default='', max_length=100, verbose_name='Complemento')),
+                ('CEP_valido', models.BooleanField(default=True, help_text='False = CEP não encontrado (cache negativo)', verbose_name='Válido')),
+                ('CEP_fonte', models.CharField(choices=[('VIACEP', 'ViaCEP'), ('IMPORTACAO', 'Importação')], default='VIACEP', max_length=20, verbose_name='Fonte')),
+                ('CEP_data_consulta', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Data da Consulta')),
+            ],
+            options={
+                'verbose_name': 'CEP',
+                'verbose_name_plural': 'CEPs',
+                'db_table': 'TBCEP',
+                'ordering': ['CEP_cep'],
+            },
+        ),
+    ]
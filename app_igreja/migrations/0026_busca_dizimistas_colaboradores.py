@@ -0,0 +1,44 @@
+# Generated by Django 5.0.3 on 2026-10-19 13:34
+
+from django.db import migrations, models
+
+from app_igreja.utils_busca import montar_texto_busca, somente_digitos
+
+
+def preencher_busca(apps, schema_editor):
+    """Preenche DIS_busca/COL_busca dos registros já existentes."""
+    TBDIZIMISTAS = apps.get_model('app_igreja', 'TBDIZIMISTAS')
+    TBCOLABORADORES = apps.get_model('app_igreja', 'TBCOLABORADORES')
+
+    lote = []
+    for d in TBDIZIMISTAS.objects.only('DIS_nome', 'DIS_telefone', 'DIS_email', 'DIS_cidade').iterator(chunk_size=500):
+        d.DIS_busca = montar_texto_busca(d.DIS_nome, somente_digitos(d.DIS_telefone), d.DIS_email, d.DIS_cidade)
+        lote.append(d)
+    TBDIZIMISTAS.objects.bulk_update(lote, ['DIS_busca'], batch_size=500)
+
+    lote = []
+    for c in TBCOLABORADORES.objects.only('COL_nome_completo', 'COL_apelido', 'COL_telefone').iterator(chunk_size=500):
+        c.COL_busca = montar_texto_busca(c.COL_nome_completo, c.COL_apelido, somente_digitos(c.COL_telefone))
+        lote.append(c)
+    TBCOLABORADORES.objects.bulk_update(lote, ['COL_busca'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0025_tbcep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tbcolaboradores',
+            name='COL_busca',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Nome, apelido e telefone normalizados (minúsculas, sem acentos)', max_length=500, verbose_name='Texto de Busca'),
+        ),
+        migrations.AddField(
+            model_name='tbdizimistas',
+            name='DIS_busca',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Nome, telefone, e-mail e cidade normalizados (minúsculas, sem acentos)', max_length=500, verbose_name='Texto de Busca'),
+        ),
+        migrations.RunPython(preencher_busca, migrations.RunPython.noop),
+    ]
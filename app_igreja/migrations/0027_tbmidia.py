@@ -0,0 +1,48 @@
+# Generated by Django 5.0.3 on 2026-10-19 13:38
+
+from django.db import migrations, models
+
+
+def preencher_manifesto(apps, schema_editor):
+    """Registra no manifesto os arquivos já referenciados pelas tabelas."""
+    TBMIDIA = apps.get_model('app_igreja', 'TBMIDIA')
+
+    lote = []
+    for model in apps.get_app_config('app_igreja').get_models():
+        campos = [f.name for f in model._meta.concrete_fields if isinstance(f, models.FileField)]
+        if not campos:
+            continue
+        tabela = f'app_igreja.{model.__name__}'
+        for pk, *arquivos in model.objects.values_list('pk', *campos).iterator(chunk_size=500):
+            for campo, arquivo in zip(campos, arquivos):
+                if arquivo:
+                    lote.append(TBMIDIA(MID_arquivo=arquivo, MID_tabela=tabela, MID_objeto_id=str(pk), MID_campo=campo))
+    TBMIDIA.objects.bulk_create(lote, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0026_busca_dizimistas_colaboradores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TBMIDIA',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('MID_arquivo', models.CharField(db_index=True, help_text='Nome do arquivo no storage', max_length=255, verbose_name='Arquivo')),
+                ('MID_tabela', models.CharField(help_text='app_label.Model de origem', max_length=100, verbose_name='Tabela')),
+                ('MID_objeto_id', models.CharField(max_length=64, verbose_name='ID do Registro')),
+                ('MID_campo', models.CharField(max_length=100, verbose_name='Campo')),
+                ('MID_data_atualizacao', models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')),
+            ],
+            options={
+                'verbose_name': 'Mídia',
+                'verbose_name_plural': 'Mídias',
+                'db_table': 'TBMIDIA',
+                'constraints': [models.UniqueConstraint(fields=('MID_tabela', 'MID_objeto_id', 'MID_campo'), name='uq_midia_origem')],
+            },
+        ),
+        migrations.RunPython(preencher_manifesto, migrations.RunPython.noop),
+    ]
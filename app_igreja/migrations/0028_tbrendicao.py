@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-19 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0027_tbmidia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TBRENDICAO',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('REN_original', models.CharField(db_index=True, max_length=255, verbose_name='Arquivo Original')),
+                ('REN_hash', models.CharField(db_index=True, max_length=64, verbose_name='Hash SHA-256 do Original')),
+                ('REN_tamanho', models.CharField(choices=[('thumb', 'Miniatura'), ('medio', 'Médio'), ('grande', 'Grande')], max_length=10, verbose_name='Tamanho')),
+                ('REN_formato', models.CharField(choices=[('jpeg', 'JPEG'), ('webp', 'WebP')], max_length=10, verbose_name='Formato')),
+                ('REN_arquivo', models.FileField(max_length=255, upload_to='rendicoes/', verbose_name='Arquivo')),
+                ('REN_largura', models.PositiveIntegerField(default=0, verbose_name='Largura')),
+                ('REN_altura', models.PositiveIntegerField(default=0, verbose_name='Altura')),
+                ('REN_data_criacao', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+            ],
+            options={
+                'verbose_name': 'Rendição de Imagem',
+                'verbose_name_plural': 'Rendições de Imagens',
+                'db_table': 'TBRENDICAO',
+                'constraints': [models.UniqueConstraint(fields=('REN_original', 'REN_tamanho', 'REN_formato'), name='uq_rendicao_original')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.3 on 2026-10-19 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+from app_igreja.utils_busca import chave_telefone
+
+
+def preencher_chave_telefone(apps, schema_editor):
+    """Preenche CEL_telefone_chave/ORA_telefone_chave dos registros já existentes."""
+    for nome, campo_telefone, campo_chave in (
+        ('TBCELEBRACOES', 'CEL_telefone', 'CEL_telefone_chave'),
+        ('TBORACOES', 'ORA_telefone_pedinte', 'ORA_telefone_chave'),
+    ):
+        model = apps.get_model('app_igreja', nome)
+        lote = []
+        for obj in model.objects.only(campo_telefone).iterator(chunk_size=500):
+            setattr(obj, campo_chave, chave_telefone(getattr(obj, campo_telefone)))
+            lote.append(obj)
+        model.objects.bulk_update(lote, [campo_chave], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0028_tbrendicao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tbcelebracoes',
+            name='CEL_telefone_chave',
+            field=models.CharField(blank=True, default='', editable=False, help_text='DDD + últimos 8 dígitos (utils_busca.chave_telefone), para o histórico por telefone', max_length=20, verbose_name='Chave do Telefone'),
+        ),
+        migrations.AddField(
+            model_name='tboracoes',
+            name='ORA_telefone_chave',
+            field=models.CharField(blank=True, default='', editable=False, help_text='DDD + últimos 8 dígitos (utils_busca.chave_telefone), para o histórico por telefone', max_length=20, verbose_name='Chave do Telefone'),
+        ),
+        migrations.AddIndex(
+            model_name='tbcelebracoes',
+            index=models.Index(fields=['CEL_telefone_chave', 'CEL_data_celebracao'], name='idx_cel_telefone_data'),
+        ),
+        migrations.AddIndex(
+            model_name='tboracoes',
+            index=models.Index(fields=['ORA_telefone_chave', 'ORA_data_pedido'], name='idx_ora_telefone_data'),
+        ),
+        migrations.RunPython(preencher_chave_telefone, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0029_telefone_chave_celebracoes_oracoes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tbaviso',
+            name='AVI_atualizado_em',
+            field=models.DateTimeField(auto_now=True, verbose_name='Última Alteração'),
+        ),
+        migrations.AddIndex(
+            model_name='tbaviso',
+            index=models.Index(fields=['AVI_data', 'AVI_id'], name='idx_avi_data'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:07
+
+from django.db import migrations, models
+
+from app_igreja.utils_segmentos import dia_do_ano
+
+
+def preencher_dia_ano(apps, schema_editor):
+    """Preenche DIS_dia_ano/COL_dia_ano dos cadastros já existentes."""
+    for nome, campo_data, campo_dia in (
+        ('TBDIZIMISTAS', 'DIS_data_nascimento', 'DIS_dia_ano'),
+        ('TBCOLABORADORES', 'COL_data_nascimento', 'COL_dia_ano'),
+    ):
+        model = apps.get_model('app_igreja', nome)
+        lote = []
+        for obj in model.objects.filter(**{f'{campo_data}__isnull': False}).only(campo_data).iterator(chunk_size=500):
+            setattr(obj, campo_dia, dia_do_ano(getattr(obj, campo_data)))
+            lote.append(obj)
+        model.objects.bulk_update(lote, [campo_dia], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0030_avisos_indice_atualizado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tbcolaboradores',
+            name='COL_dia_ano',
+            field=models.SmallIntegerField(blank=True, db_index=True, editable=False, help_text='Mês * 100 + dia do nascimento (utils_segmentos.dia_do_ano), para janelas de aniversário', null=True, verbose_name='Dia do Aniversário'),
+        ),
+        migrations.AddField(
+            model_name='tbdizimistas',
+            name='DIS_dia_ano',
+            field=models.SmallIntegerField(blank=True, db_index=True, editable=False, help_text='Mês * 100 + dia do nascimento (utils_segmentos.dia_do_ano), para janelas de aniversário', null=True, verbose_name='Dia do Aniversário'),
+        ),
+        migrations.RunPython(preencher_dia_ano, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:16
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0031_aniversario_dia_ano'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TBWEBHOOKAMOSTRA',
+            fields=[
+                ('WAM_posicao', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='Posição')),
+                ('WAM_evento', models.CharField(max_length=50, verbose_name='Evento')),
+                ('WAM_payload', models.TextField(verbose_name='Payload')),
+                ('WAM_recebido_em', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Recebido em')),
+            ],
+            options={
+                'verbose_name': 'Amostra do Webhook WhatsApp',
+                'verbose_name_plural': 'Amostras do Webhook WhatsApp',
+                'db_table': 'TBWEBHOOKAMOSTRA',
+                'ordering': ['-WAM_recebido_em'],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0032_webhook_amostras'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TBFILAWHATSAPP',
+            fields=[
+                ('FIL_id', models.BigAutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('FIL_chave', models.CharField(max_length=120, unique=True, verbose_name='Chave de Idempotência')),
+                ('FIL_origem', models.CharField(max_length=30, verbose_name='Origem')),
+                ('FIL_telefone', models.CharField(max_length=20, verbose_name='Telefone')),
+                ('FIL_texto', models.TextField(verbose_name='Texto')),
+                ('FIL_status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('ENVIANDO', 'Enviando'), ('ENVIADA', 'Enviada'), ('ERRO', 'Erro')], default='PENDENTE', max_length=10, verbose_name='Status')),
+                ('FIL_tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('FIL_erro', models.TextField(blank=True, null=True, verbose_name='Erro')),
+                ('FIL_data_criacao', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Data de Criação')),
+                ('FIL_data_envio', models.DateTimeField(blank=True, null=True, verbose_name='Data de Envio')),
+            ],
+            options={
+                'verbose_name': 'Mensagem na Fila do WhatsApp',
+                'verbose_name_plural': 'Fila do WhatsApp',
+                'db_table': 'TBFILAWHATSAPP',
+                'ordering': ['FIL_id'],
+                'indexes': [models.Index(fields=['FIL_status', 'FIL_id'], name='TBFILAWHATS_FIL_sta_24e04a_idx')],
+            },
+        ),
+    ]
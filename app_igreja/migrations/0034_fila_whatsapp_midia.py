@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0033_fila_whatsapp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tbfilawhatsapp',
+            name='FIL_midia',
+            field=models.CharField(blank=True, default='', max_length=200, verbose_name='Imagem (media id ou URL)'),
+        ),
+    ]
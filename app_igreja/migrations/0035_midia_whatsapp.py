@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:23
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0034_fila_whatsapp_midia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TBMIDIAWHATSAPP',
+            fields=[
+                ('MWA_id', models.AutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('MWA_nome', models.CharField(max_length=500, unique=True, verbose_name='Nome no Storage ou URL')),
+                ('MWA_hash', models.CharField(db_index=True, max_length=64, verbose_name='SHA-256 do Conteúdo')),
+                ('MWA_media_id', models.CharField(max_length=200, verbose_name='Media ID na Whapi')),
+                ('MWA_tamanho', models.PositiveIntegerField(default=0, verbose_name='Tamanho (bytes)')),
+                ('MWA_enviado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Enviado em')),
+                ('MWA_expira_em', models.DateTimeField(db_index=True, verbose_name='Expira em')),
+            ],
+            options={
+                'verbose_name': 'Mídia na Whapi',
+                'verbose_name_plural': 'Mídias na Whapi',
+                'db_table': 'TBMIDIAWHATSAPP',
+                'ordering': ['-MWA_enviado_em'],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0035_midia_whatsapp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tbwhatsapp',
+            name='WHA_entregues',
+            field=models.IntegerField(default=0, verbose_name='Entregues'),
+        ),
+        migrations.AddField(
+            model_name='tbwhatsapp',
+            name='WHA_lidas',
+            field=models.IntegerField(default=0, verbose_name='Lidas'),
+        ),
+        migrations.CreateModel(
+            name='TBENTREGAWHATSAPP',
+            fields=[
+                ('ENT_id', models.BigAutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('ENT_message_id', models.CharField(max_length=100, unique=True, verbose_name='ID da Mensagem na Whapi')),
+                ('ENT_telefone', models.CharField(max_length=20, verbose_name='Telefone')),
+                ('ENT_status', models.CharField(choices=[('ENVIADA', 'Enviada'), ('ENTREGUE', 'Entregue'), ('LIDA', 'Lida'), ('ERRO', 'Erro')], default='ENVIADA', max_length=10, verbose_name='Status')),
+                ('ENT_erro', models.TextField(blank=True, null=True, verbose_name='Erro')),
+                ('ENT_data_envio', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Data de Envio')),
+                ('ENT_data_atualizacao', models.DateTimeField(blank=True, null=True, verbose_name='Data do Último Status')),
+                ('ENT_mensagem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entregas', to='app_igreja.tbwhatsapp', verbose_name='Mensagem')),
+            ],
+            options={
+                'verbose_name': 'Entrega de Mensagem WhatsApp',
+                'verbose_name_plural': 'Entregas de Mensagens WhatsApp',
+                'db_table': 'TBENTREGAWHATSAPP',
+                'ordering': ['ENT_id'],
+                'indexes': [models.Index(fields=['ENT_mensagem', 'ENT_status'], name='TBENTREGAWH_ENT_men_983390_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0036_entregas_whatsapp'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tbwhatsapp',
+            index=models.Index(fields=['WHA_data_criacao', 'WHA_id'], name='idx_wha_data'),
+        ),
+        migrations.AddIndex(
+            model_name='tbwhatsapp',
+            index=models.Index(fields=['WHA_status', 'WHA_data_criacao', 'WHA_id'], name='idx_wha_status_data'),
+        ),
+        migrations.AddIndex(
+            model_name='tbwhatsapp',
+            index=models.Index(fields=['WHA_destinatario_tipo', 'WHA_data_criacao', 'WHA_id'], name='idx_wha_tipo_data'),
+        ),
+    ]
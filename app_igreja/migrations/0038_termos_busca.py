@@ -0,0 +1,67 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:36
+
+from django.db import migrations, models
+
+from app_igreja.utils_busca import montar_termos
+
+
+def preencher_termos(apps, schema_editor):
+    """Gera os termos de busca dos dizimistas e colaboradores já existentes."""
+    TBTERMOBUSCA = apps.get_model('app_igreja', 'TBTERMOBUSCA')
+    TBDIZIMISTAS = apps.get_model('app_igreja', 'TBDIZIMISTAS')
+    TBCOLABORADORES = apps.get_model('app_igreja', 'TBCOLABORADORES')
+
+    def registros():
+        for d in TBDIZIMISTAS.objects.only('DIS_nome', 'DIS_telefone', 'DIS_email', 'DIS_cidade').iterator(chunk_size=500):
+            yield 'DIS', d.pk, montar_termos(nome=d.DIS_nome, telefone=d.DIS_telefone, outros=(d.DIS_email, d.DIS_cidade))
+        for c in TBCOLABORADORES.objects.only('COL_nome_completo', 'COL_apelido', 'COL_telefone').iterator(chunk_size=500):
+            yield 'COL', c.pk, montar_termos(nome=c.COL_nome_completo, apelido=c.COL_apelido, telefone=c.COL_telefone)
+
+    lote = []
+    for tabela, registro, termos in registros():
+        lote.extend(
+            TBTERMOBUSCA(TER_tabela=tabela, TER_registro=registro, TER_campo=campo, TER_termo=termo)
+            for campo, termo in termos
+        )
+        if len(lote) >= 2000:
+            TBTERMOBUSCA.objects.bulk_create(lote)
+            lote = []
+    TBTERMOBUSCA.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0037_whatsapp_historico'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tbcolaboradores',
+            name='COL_busca',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Nome, apelido e telefone normalizados (minúsculas, sem acentos)', max_length=500, verbose_name='Texto de Busca'),
+        ),
+        migrations.AlterField(
+            model_name='tbdizimistas',
+            name='DIS_busca',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Nome, telefone, e-mail e cidade normalizados (minúsculas, sem acentos)', max_length=500, verbose_name='Texto de Busca'),
+        ),
+        migrations.CreateModel(
+            name='TBTERMOBUSCA',
+            fields=[
+                ('TER_id', models.BigAutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('TER_tabela', models.CharField(choices=[('DIS', 'Dizimista'), ('COL', 'Colaborador')], max_length=3, verbose_name='Tabela')),
+                ('TER_registro', models.PositiveBigIntegerField(verbose_name='ID do Registro')),
+                ('TER_campo', models.CharField(choices=[('NOME', 'Nome'), ('APELIDO', 'Apelido'), ('TELEFONE', 'Telefone'), ('OUTROS', 'Outros')], max_length=10, verbose_name='Campo')),
+                ('TER_termo', models.CharField(max_length=40, verbose_name='Termo')),
+            ],
+            options={
+                'verbose_name': 'Termo de Busca',
+                'verbose_name_plural': 'Termos de Busca',
+                'db_table': 'TBTERMOBUSCA',
+                'ordering': ['TER_id'],
+                'indexes': [models.Index(fields=['TER_tabela', 'TER_termo'], name='idx_ter_termo'), models.Index(fields=['TER_tabela', 'TER_registro'], name='idx_ter_registro')],
+            },
+        ),
+        migrations.RunPython(preencher_termos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-19 14:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0038_termos_busca'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tbfilawhatsapp',
+            name='FIL_mensagem',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='fila', to='app_igreja.tbwhatsapp', verbose_name='Mensagem em Massa'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_igreja', '0039_fila_mensagem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TBVAGACELEBRACAO',
+            fields=[
+                ('VAG_id', models.BigAutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('VAG_data', models.DateField(verbose_name='Data')),
+                ('VAG_horario', models.TimeField(verbose_name='Horário')),
+                ('VAG_reservas', models.PositiveIntegerField(default=0, verbose_name='Reservas Feitas')),
+            ],
+            options={
+                'verbose_name': 'Trava de Horário de Celebração',
+                'verbose_name_plural': 'Travas de Horários de Celebração',
+                'db_table': 'TBVAGACELEBRACAO',
+                'constraints': [models.UniqueConstraint(fields=('VAG_data', 'VAG_horario'), name='uniq_vag_data_horario')],
+            },
+        ),
+    ]
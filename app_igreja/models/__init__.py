@@ -9,7 +9,7 @@ from .area_admin.models_grupos import TBGRUPOS
 from .area_admin.models_celebrantes import TBCELEBRANTES
 from .area_admin.models_colaboradores import TBCOLABORADORES
 from .area_admin.models_dizimistas import TBDIZIMISTAS
-from .area_admin.models_celebracoes import TBCELEBRACOES
+from .area_admin.models_celebracoes import TBCELEBRACOES, TBVAGACELEBRACAO
 from .area_admin.models_modelo import TBMODELO, TBITEM_MODELO
 
 # Models da área pública (removido TBEVENTO - agora está em area_admin)
@@ -31,6 +31,7 @@ __all__ = [
     'TBDIZIMISTAS',
     'TBDOACAODIZIMO',
     'TBCELEBRACOES',
+    'TBVAGACELEBRACAO',
     'TBMODELO',
     'TBITEM_MODELO',
 ]
@@ -8,7 +8,8 @@ from .models_funcoes import TBFUNCAO
 from .models_celebrantes import TBCELEBRANTES
 from .models_colaboradores import TBCOLABORADORES
 from .models_dizimistas import TBDIZIMISTAS, TBGERDIZIMO
-from .models_celebracoes import TBCELEBRACOES
+from .models_busca import TBTERMOBUSCA
+from .models_celebracoes import TBCELEBRACOES, TBVAGACELEBRACAO
 from .models_avisos import TBAVISO
 from .models_oracoes import TBORACOES
 from .models_planos import TBPLANO, TBITEMPLANO
@@ -16,11 +17,13 @@ from .models_eventos import TBEVENTO, TBITEM_EVENTO
 from .models_mural import TBMURAL
 from .models_modelo import TBMODELO, TBITEM_MODELO
 from .models_escala import TBESCALA, TBITEM_ESCALA
-from .models_whatsapp import TBWHATSAPP
+from .models_whatsapp import TBWHATSAPP, TBWEBHOOKAMOSTRA, TBFILAWHATSAPP, TBMIDIAWHATSAPP, TBENTREGAWHATSAPP
 from .models_visual import TBVISUAL
 from .models_banners import TBBANNERS
 from .models_agenda_mes import TBAGENDAMES, TBITEAGENDAMES
 from .models_extrator_liturgias import TBLITURGIA
+from .models_cep import TBCEP
+from .models_midia import TBMIDIA, TBRENDICAO
 
 __all__ = [
     'TBDIOCESE',
@@ -30,7 +33,9 @@ __all__ = [
     'TBCELEBRANTES',
     'TBCOLABORADORES',
     'TBDIZIMISTAS',
+    'TBTERMOBUSCA',
     'TBCELEBRACOES',
+    'TBVAGACELEBRACAO',
     'TBAVISO',
     'TBORACOES',
     'TBPLANO',
@@ -40,10 +45,17 @@ __all__ = [
     'TBESCALA',
     'TBITEM_ESCALA',
     'TBWHATSAPP',
+    'TBWEBHOOKAMOSTRA',
+    'TBFILAWHATSAPP',
+    'TBMIDIAWHATSAPP',
+    'TBENTREGAWHATSAPP',
     'TBMURAL',
     'TBVISUAL',
     'TBBANNERS',
     'TBAGENDAMES',
     'TBITEAGENDAMES',
     'TBLITURGIA',
+    'TBCEP',
+    'TBMIDIA',
+    'TBRENDICAO',
 ]
@@ -1,5 +1,10 @@
 """Agenda do mês: master (mês) e itens por dia (admin)."""
-from django.db import models
+from calendar import monthrange
+from datetime import date, timedelta
+
+from django.db import models, transaction
+
+from ...utils_cache import marcar_alteracao
 
 from .models_modelo import TBMODELO
 
@@ -19,6 +24,63 @@ class TBAGENDAMES(models.Model):
     def __str__(self):
         return f"Agenda - {self.AGE_MES.strftime('%m/%Y')}"
 
+    @classmethod
+    def inicializar(cls, primeiro_dia):
+        """Cria o mês com todos os dias em branco (um único INSERT). Retorna (agenda, criada)."""
+        with transaction.atomic():
+            agenda, criada = cls.objects.get_or_create(AGE_MES=primeiro_dia)
+            if criada:
+                TBITEAGENDAMES.objects.bulk_create([
+                    TBITEAGENDAMES(AGE_ITE_MES=agenda, AGE_ITE_DIA=dia, AGE_ITE_MODELO=None, AGE_ITE_ENCARGOS='')
+                    for dia in range(1, monthrange(primeiro_dia.year, primeiro_dia.month)[1] + 1)
+                ])
+                # bulk_create não dispara post_save: invalida a grade de horários (utils_celebracoes)
+                marcar_alteracao(TBITEAGENDAMES)
+        return agenda, criada
+
+    @classmethod
+    def copiar_mes_anterior(cls, primeiro_dia):
+        """
+        Cria o mês copiando os lançamentos do mês anterior (um SELECT e um INSERT).
+
+        A cópia segue o dia da semana, não o número do dia: a 1ª sexta recebe o que estava
+        na 1ª sexta do mês anterior, o 3º domingo o do 3º domingo etc. Dias sem
+        correspondente (5ª semana) ficam em branco. Retorna (agenda, criada); criada=False
+        se o mês já existia ou se o anterior não existe.
+        """
+        anterior = (primeiro_dia - timedelta(days=1)).replace(day=1)
+        itens_anteriores = {
+            item['AGE_ITE_DIA']: item
+            for item in TBITEAGENDAMES.objects.filter(AGE_ITE_MES__AGE_MES=anterior).values(
+                'AGE_ITE_DIA', 'AGE_ITE_MODELO', 'AGE_ITE_HORARIO', 'AGE_ITE_ENCARGOS'
+            )
+        }
+        if not itens_anteriores or cls.objects.filter(AGE_MES=primeiro_dia).exists():
+            return cls.objects.filter(AGE_MES=primeiro_dia).first(), False
+
+        # (dia da semana, ordem no mês) -> dia do mês anterior
+        por_semana = {}
+        for dia in range(1, monthrange(anterior.year, anterior.month)[1] + 1):
+            por_semana[(date(anterior.year, anterior.month, dia).weekday(), (dia - 1) // 7)] = dia
+
+        with transaction.atomic():
+            agenda, criada = cls.objects.get_or_create(AGE_MES=primeiro_dia)
+            if criada:
+                novos = []
+                for dia in range(1, monthrange(primeiro_dia.year, primeiro_dia.month)[1] + 1):
+                    chave = (date(primeiro_dia.year, primeiro_dia.month, dia).weekday(), (dia - 1) // 7)
+                    origem = itens_anteriores.get(por_semana.get(chave), {})
+                    novos.append(TBITEAGENDAMES(
+                        AGE_ITE_MES=agenda,
+                        AGE_ITE_DIA=dia,
+                        AGE_ITE_MODELO=origem.get('AGE_ITE_MODELO'),
+                        AGE_ITE_HORARIO=origem.get('AGE_ITE_HORARIO'),
+                        AGE_ITE_ENCARGOS=origem.get('AGE_ITE_ENCARGOS') or '',
+                    ))
+                TBITEAGENDAMES.objects.bulk_create(novos)
+                marcar_alteracao(TBITEAGENDAMES)
+        return agenda, criada
+
 
 class TBITEAGENDAMES(models.Model):
     """Detail: um item por dia do mês (modelo, horário, encargos)."""
@@ -46,10 +108,26 @@ class TBITEAGENDAMES(models.Model):
         ordering = ['AGE_ITE_MES', 'AGE_ITE_DIA']
 
     def __str__(self):
-        modelo_nome = "Sem modelo"
-        if self.AGE_ITE_MODELO:
-            try:
-                modelo_nome = TBMODELO.objects.get(pk=self.AGE_ITE_MODELO).MOD_DESCRICAO
-            except TBMODELO.DoesNotExist:
-                pass
-        return f"Dia {self.AGE_ITE_DIA} - {modelo_nome}"
+        # modelo_nome vem de anexar_nomes_modelos (listas); sem ele, uma consulta
+        modelo_nome = getattr(self, 'modelo_nome', None)
+        if modelo_nome is None and self.AGE_ITE_MODELO:
+            modelo = TBMODELO.objects.filter(pk=self.AGE_ITE_MODELO).only('MOD_DESCRICAO').first()
+            modelo_nome = modelo.MOD_DESCRICAO if modelo else None
+        return f"Dia {self.AGE_ITE_DIA} - {modelo_nome or 'Sem modelo'}"
+
+
+def anexar_nomes_modelos(itens, modelos=None):
+    """
+    Preenche item.modelo_nome em cada item da agenda com UMA consulta (in_bulk).
+
+    AGE_ITE_MODELO é um inteiro (0 = lançamento cancelado), não uma FK, por isso não há
+    select_related. modelos: dict {id: TBMODELO} já carregado, para não consultar de novo.
+    """
+    itens = list(itens)
+    if modelos is None:
+        ids = {item.AGE_ITE_MODELO for item in itens if item.AGE_ITE_MODELO}
+        modelos = TBMODELO.objects.in_bulk(ids) if ids else {}
+    for item in itens:
+        modelo = modelos.get(item.AGE_ITE_MODELO) if item.AGE_ITE_MODELO else None
+        item.modelo_nome = modelo.MOD_DESCRICAO if modelo else None
+    return itens
@@ -6,12 +6,17 @@ class TBAVISO(models.Model):
     AVI_titulo = models.CharField(max_length=255, verbose_name="Título do Aviso")
     AVI_texto = models.CharField(max_length=255, verbose_name="Texto do Aviso")
     AVI_data = models.DateField(default=timezone.now, verbose_name="Data Cadastro Aviso")
+    AVI_atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Última Alteração")
     
     class Meta:
         db_table = 'TBAVISO'
         verbose_name = 'Aviso'
         verbose_name_plural = 'Avisos'
         ordering = ['-AVI_data', 'AVI_titulo']
+        indexes = [
+            # Paginação por chave da lista pública: ORDER BY AVI_data DESC, AVI_id DESC
+            models.Index(fields=['AVI_data', 'AVI_id'], name='idx_avi_data'),
+        ]
     
     def __str__(self):
         return self.AVI_titulo
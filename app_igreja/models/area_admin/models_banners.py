@@ -1,8 +1,4 @@
-import io
-import os
 from django.db import models
-from django.core.files.base import ContentFile
-from PIL import Image
 
 class TBBANNERS(models.Model):
     """Banners de patrocinadores."""
@@ -77,29 +73,3 @@ class TBBANNERS(models.Model):
         if self.BAN_IMAGE:
             return self.BAN_IMAGE.url
         return "/static/img/default-banner.png"
-
-    # --- O REFORÇO ESTRATÉGICO: COMPRESSÃO DE BANNERS ---
-    def save(self, *args, **kwargs):
-        """Otimiza a imagem do patrocinador antes de enviar ao Wasabi."""
-        if self.BAN_IMAGE:
-            try:
-                img = Image.open(self.BAN_IMAGE)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                # Banners geralmente são largos (landscape). 
-                # Vamos limitar a 1200px de largura para manter a qualidade em telas grandes
-                output_size = (1200, 1200) 
-                img.thumbnail(output_size)
-
-                buffer = io.BytesIO()
-                # Qualidade 80% para banners, pois eles precisam ter boa nitidez visual
-                img.save(buffer, format='JPEG', quality=80, optimize=True)
-                buffer.seek(0)
-
-                nome_arquivo = os.path.splitext(self.BAN_IMAGE.name)[0] + '.jpg'
-                self.BAN_IMAGE.save(nome_arquivo, ContentFile(buffer.read()), save=False)
-            except Exception as e:
-                print(f"Erro na compressão do Banner: {e}")
-
-        super(TBBANNERS, self).save(*args, **kwargs)
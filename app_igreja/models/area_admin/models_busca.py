@@ -0,0 +1,42 @@
+"""Termos de busca de dizimistas e colaboradores (um registro por palavra, utils_busca)."""
+from django.db import models
+
+
+class TBTERMOBUSCA(models.Model):
+    """
+    Cada palavra normalizada do nome, apelido, e-mail e cidade, e cada sufixo dos dígitos
+    do telefone, de um dizimista (DIS) ou colaborador (COL). A busca compara o começo do
+    termo por intervalo (TER_termo >= 'mar' AND TER_termo < 'mas'), que usa o índice em
+    qualquer banco, no lugar de LIKE '%mar%' na tabela inteira.
+    """
+
+    TABELA_CHOICES = [
+        ('DIS', 'Dizimista'),
+        ('COL', 'Colaborador'),
+    ]
+
+    CAMPO_CHOICES = [
+        ('NOME', 'Nome'),
+        ('APELIDO', 'Apelido'),
+        ('TELEFONE', 'Telefone'),
+        ('OUTROS', 'Outros'),
+    ]
+
+    TER_id = models.BigAutoField(primary_key=True, verbose_name="ID")
+    TER_tabela = models.CharField(max_length=3, choices=TABELA_CHOICES, verbose_name="Tabela")
+    TER_registro = models.PositiveBigIntegerField(verbose_name="ID do Registro")
+    TER_campo = models.CharField(max_length=10, choices=CAMPO_CHOICES, verbose_name="Campo")
+    TER_termo = models.CharField(max_length=40, verbose_name="Termo")
+
+    class Meta:
+        db_table = 'TBTERMOBUSCA'
+        verbose_name = 'Termo de Busca'
+        verbose_name_plural = 'Termos de Busca'
+        ordering = ['TER_id']
+        indexes = [
+            models.Index(fields=['TER_tabela', 'TER_termo'], name='idx_ter_termo'),
+            models.Index(fields=['TER_tabela', 'TER_registro'], name='idx_ter_registro'),
+        ]
+
+    def __str__(self):
+        return f"{self.TER_tabela}:{self.TER_registro} {self.TER_termo}"
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 
+from ...utils_busca import chave_telefone
+
 
 class TBCELEBRACOES(models.Model):
     """Celebrações agendadas (admin)."""
@@ -27,6 +29,10 @@ class TBCELEBRACOES(models.Model):
     CEL_local = models.CharField(max_length=100, verbose_name="Local")
     CEL_nome_solicitante = models.CharField(max_length=200, verbose_name="Nome do Solicitante")
     CEL_telefone = models.CharField(max_length=20, verbose_name="Telefone", db_index=True)
+    CEL_telefone_chave = models.CharField(
+        max_length=20, blank=True, default='', editable=False, verbose_name='Chave do Telefone',
+        help_text='DDD + últimos 8 dígitos (utils_busca.chave_telefone), para o histórico por telefone',
+    )
     CEL_email = models.EmailField(max_length=254, blank=True, null=True, verbose_name="E-mail")
     CEL_participantes = models.PositiveIntegerField(verbose_name="Número de Participantes")
     CEL_observacoes = models.TextField(blank=True, null=True, verbose_name="Observações")
@@ -39,6 +45,9 @@ class TBCELEBRACOES(models.Model):
         verbose_name = 'Celebração'
         verbose_name_plural = 'Celebrações'
         ordering = ['CEL_data_celebracao', 'CEL_horario']
+        indexes = [
+            models.Index(fields=['CEL_telefone_chave', 'CEL_data_celebracao'], name='idx_cel_telefone_data'),
+        ]
 
     def __str__(self):
         return f"{self.CEL_tipo_celebracao} - {self.CEL_nome_solicitante} ({self.CEL_data_celebracao})"
@@ -65,4 +74,33 @@ class TBCELEBRACOES(models.Model):
                 self.CEL_telefone = f"({numeros[:2]}) {numeros[2:7]}-{numeros[7:]}"
             elif len(numeros) == 10:
                 self.CEL_telefone = f"({numeros[:2]}) {numeros[2:6]}-{numeros[6:]}"
+        self.CEL_telefone_chave = chave_telefone(self.CEL_telefone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'CEL_telefone_chave' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['CEL_telefone_chave']
         super().save(*args, **kwargs)
+
+
+class TBVAGACELEBRACAO(models.Model):
+    """
+    Uma linha por horário (data + hora) que já recebeu pedido de agendamento. Serve de
+    trava do horário: reservar_celebracao (utils_celebracoes) faz um UPDATE nela antes de
+    contar as vagas, então pedidos para o mesmo horário passam um por vez (no MySQL
+    e no SQLite) e horários diferentes não esperam um pelo outro.
+    """
+
+    VAG_id = models.BigAutoField(primary_key=True, verbose_name="ID")
+    VAG_data = models.DateField(verbose_name="Data")
+    VAG_horario = models.TimeField(verbose_name="Horário")
+    VAG_reservas = models.PositiveIntegerField(default=0, verbose_name="Reservas Feitas")
+
+    class Meta:
+        db_table = 'TBVAGACELEBRACAO'
+        verbose_name = 'Trava de Horário de Celebração'
+        verbose_name_plural = 'Travas de Horários de Celebração'
+        constraints = [
+            models.UniqueConstraint(fields=['VAG_data', 'VAG_horario'], name='uniq_vag_data_horario'),
+        ]
+
+    def __str__(self):
+        return f"{self.VAG_data:%d/%m/%Y} {self.VAG_horario:%H:%M}"
@@ -1,9 +1,5 @@
-import io
-import os
 from django.db import models
 from django.utils import timezone
-from django.core.files.base import ContentFile
-from PIL import Image
 
 class TBCELEBRANTES(models.Model):
     """Celebrantes da igreja."""
@@ -23,29 +19,3 @@ class TBCELEBRANTES(models.Model):
 
     def __str__(self):
         return str(self.CEL_nome_celebrante)
-
-    # --- O REFORÇO ESTRATÉGICO: COMPRESSÃO DE FOTOS DE CELEBRANTES ---
-    def save(self, *args, **kwargs):
-        """Otimiza a foto do celebrante para não pesar no Wasabi/Carregamento."""
-        if self.CEL_foto:
-            try:
-                img = Image.open(self.CEL_foto)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                # Fotos de celebrantes costumam ser exibidas em círculos ou cards pequenos.
-                # 600px é mais que o suficiente para manter a nitidez.
-                output_size = (600, 600) 
-                img.thumbnail(output_size)
-
-                buffer = io.BytesIO()
-                # Qualidade 75% para um equilíbrio perfeito entre peso e visão.
-                img.save(buffer, format='JPEG', quality=75, optimize=True)
-                buffer.seek(0)
-
-                nome_arquivo = os.path.splitext(self.CEL_foto.name)[0] + '.jpg'
-                self.CEL_foto.save(nome_arquivo, ContentFile(buffer.read()), save=False)
-            except Exception as e:
-                print(f"Erro na compressão do Celebrante: {e}")
-
-        super(TBCELEBRANTES, self).save(*args, **kwargs)
@@ -0,0 +1,42 @@
+"""Tabela local de CEPs já resolvidos (cache persistente do ViaCEP)."""
+from django.db import models
+from django.utils import timezone
+
+
+class TBCEP(models.Model):
+    """Um registro por CEP consultado ou importado; CEP_valido=False guarda CEPs inexistentes."""
+
+    FONTE_CHOICES = [
+        ('VIACEP', 'ViaCEP'),
+        ('IMPORTACAO', 'Importação'),
+    ]
+
+    CEP_cep = models.CharField(max_length=8, primary_key=True, verbose_name="CEP", help_text="Somente dígitos")
+    CEP_logradouro = models.CharField(max_length=200, blank=True, default='', verbose_name="Logradouro")
+    CEP_bairro = models.CharField(max_length=100, blank=True, default='', verbose_name="Bairro")
+    CEP_cidade = models.CharField(max_length=100, blank=True, default='', verbose_name="Cidade")
+    CEP_estado = models.CharField(max_length=2, blank=True, default='', verbose_name="Estado")
+    CEP_complemento = models.CharField(max_length=100, blank=True, default='', verbose_name="Complemento")
+    CEP_valido = models.BooleanField(default=True, verbose_name="Válido", help_text="False = CEP não encontrado (cache negativo)")
+    CEP_fonte = models.CharField(max_length=20, choices=FONTE_CHOICES, default='VIACEP', verbose_name="Fonte")
+    CEP_data_consulta = models.DateTimeField(default=timezone.now, verbose_name="Data da Consulta")
+
+    class Meta:
+        db_table = 'TBCEP'
+        verbose_name = 'CEP'
+        verbose_name_plural = 'CEPs'
+        ordering = ['CEP_cep']
+
+    def __str__(self):
+        return f"{self.CEP_cep[:5]}-{self.CEP_cep[5:]}"
+
+    def to_dict(self):
+        """Endereço no formato neutro usado pelas APIs de CEP."""
+        return {
+            'cep': str(self),
+            'logradouro': self.CEP_logradouro,
+            'bairro': self.CEP_bairro,
+            'cidade': self.CEP_cidade,
+            'estado': self.CEP_estado,
+            'complemento': self.CEP_complemento,
+        }
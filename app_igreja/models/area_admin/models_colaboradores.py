@@ -1,9 +1,8 @@
-import io
-import os
 from django.db import models
 from django.utils import timezone
-from django.core.files.base import ContentFile
-from PIL import Image
+
+from ...utils_busca import montar_termos, montar_texto_busca, somente_digitos
+from ...utils_segmentos import dia_do_ano
 
 class TBCOLABORADORES(models.Model):
     """
@@ -54,6 +53,16 @@ class TBCOLABORADORES(models.Model):
     )
     COL_data_cadastro = models.DateTimeField(default=timezone.now, verbose_name="Data de Cadastro")
     COL_data_atualizacao = models.DateTimeField(auto_now=True, verbose_name="Data de Atualização")
+    COL_busca = models.CharField(
+        max_length=500, blank=True, default='', editable=False,
+        help_text="Nome, apelido e telefone normalizados (minúsculas, sem acentos)",
+        verbose_name="Texto de Busca"
+    )
+    COL_dia_ano = models.SmallIntegerField(
+        blank=True, null=True, editable=False, db_index=True,
+        help_text="Mês * 100 + dia do nascimento (utils_segmentos.dia_do_ano), para janelas de aniversário",
+        verbose_name="Dia do Aniversário"
+    )
     
     class Meta:
         db_table = 'TBCOLABORADORES'
@@ -75,29 +84,24 @@ class TBCOLABORADORES(models.Model):
         except Exception:
             return None
 
+    def atualizar_busca(self):
+        self.COL_busca = montar_texto_busca(
+            self.COL_nome_completo, self.COL_apelido, somente_digitos(self.COL_telefone)
+        )
+
+    def termos_busca(self):
+        """Termos de TBTERMOBUSCA (gravados pelo signal de post_save)."""
+        return montar_termos(nome=self.COL_nome_completo, apelido=self.COL_apelido, telefone=self.COL_telefone)
+
     def save(self, *args, **kwargs):
-        """Override save para comprimir imagem, formatar telefone e atualizar sincronismo."""
-        
-        # 1. COMPRESSÃO DE IMAGEM (PENTE FINO)
-        if self.COL_foto:
-            try:
-                img = Image.open(self.COL_foto)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Tamanho padrão para foto de crachá/perfil
-                img.thumbnail((600, 600))
-                
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=75, optimize=True)
-                buffer.seek(0)
-                
-                novo_nome = os.path.splitext(self.COL_foto.name)[0] + '.jpg'
-                self.COL_foto.save(novo_nome, ContentFile(buffer.read()), save=False)
-            except Exception as e:
-                print(f"Erro na compressão do Colaborador: {e}")
+        """Override save para formatar telefone, atualizar sincronismo e texto de busca.
 
-        # 2. FORMATAÇÃO DE TELEFONE
+        A foto não é mais comprimida aqui: o upload é reduzido no pre_save (signals.py,
+        utils_image.reduzir_original) e as rendições são geradas em segundo plano
+        (ver utils_image.agendar_rendicoes).
+        """
+        
+        # 1. FORMATAÇÃO DE TELEFONE
         if self.COL_telefone:
             if '(' not in str(self.COL_telefone) and '-' not in str(self.COL_telefone):
                 numeros = ''.join(filter(str.isdigit, str(self.COL_telefone)))
@@ -109,9 +113,17 @@ class TBCOLABORADORES(models.Model):
                 elif len(numeros) == 10:
                     self.COL_telefone = f"({numeros[:2]}) {numeros[2:6]}-{numeros[6:]}"
 
-        # 3. SINCRONISMO DE CAMPOS
+        # 2. SINCRONISMO DE CAMPOS
         if self.COL_funcao is not None:
             self.COL_funcao_id = self.COL_funcao
+
+        # 3. TEXTO DE BUSCA (nome/apelido/telefone normalizados) E DIA DO ANIVERSÁRIO
+        self.atualizar_busca()
+        self.COL_dia_ano = dia_do_ano(self.COL_data_nascimento)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            extras = [campo for campo in ('COL_busca', 'COL_dia_ano') if campo not in update_fields]
+            kwargs['update_fields'] = list(update_fields) + extras
             
         # Nota: auto_now=True já cuida da data_atualizacao automaticamente
         super().save(*args, **kwargs)
@@ -1,6 +1,9 @@
 from django.db import models
 from django.utils import timezone
 
+from ...utils_busca import montar_termos, montar_texto_busca, somente_digitos
+from ...utils_segmentos import dia_do_ano
+
 
 class TBDIZIMISTAS(models.Model):
     """Modelo para cadastro de dizimistas."""
@@ -48,6 +51,16 @@ class TBDIZIMISTAS(models.Model):
     )
     DIS_data_cadastro = models.DateTimeField(auto_now_add=True, verbose_name='Data de Cadastro')
     DIS_data_atualizacao = models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')
+    DIS_busca = models.CharField(
+        max_length=500, blank=True, default='', editable=False,
+        help_text='Nome, telefone, e-mail e cidade normalizados (minúsculas, sem acentos)',
+        verbose_name='Texto de Busca'
+    )
+    DIS_dia_ano = models.SmallIntegerField(
+        blank=True, null=True, editable=False, db_index=True,
+        help_text='Mês * 100 + dia do nascimento (utils_segmentos.dia_do_ano), para janelas de aniversário',
+        verbose_name='Dia do Aniversário'
+    )
 
     class Meta:
         db_table = 'TBDIZIMISTAS'
@@ -58,6 +71,25 @@ class TBDIZIMISTAS(models.Model):
     def __str__(self):
         return self.DIS_nome or self.DIS_telefone or str(self.pk)
 
+    def atualizar_busca(self):
+        self.DIS_busca = montar_texto_busca(
+            self.DIS_nome, somente_digitos(self.DIS_telefone), self.DIS_email, self.DIS_cidade
+        )
+
+    def termos_busca(self):
+        """Termos de TBTERMOBUSCA (gravados pelo signal de post_save)."""
+        return montar_termos(nome=self.DIS_nome, telefone=self.DIS_telefone, outros=(self.DIS_email, self.DIS_cidade))
+
+    def save(self, *args, **kwargs):
+        """Mantém as colunas de busca e de aniversário sincronizadas com o cadastro."""
+        self.atualizar_busca()
+        self.DIS_dia_ano = dia_do_ano(self.DIS_data_nascimento)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            extras = [campo for campo in ('DIS_busca', 'DIS_dia_ano') if campo not in update_fields]
+            kwargs['update_fields'] = list(update_fields) + extras
+        super().save(*args, **kwargs)
+
 
 class TBGERDIZIMO(models.Model):
     """Modelo para gerenciamento mensal de dízimos."""
@@ -1,6 +1,10 @@
 from django.db import models
 from django.utils import timezone
 
+from .models_colaboradores import TBCOLABORADORES
+from .models_funcoes import TBFUNCAO
+from .models_grupos import TBGRUPOS
+
 
 class TBESCALA(models.Model):
     """
@@ -134,3 +138,31 @@ class TBITEM_ESCALA(models.Model):
     @property
     def id(self):
         return self.ITE_ESC_ID
+
+
+def anexar_nomes_escala(itens):
+    """
+    Resolve colaborador, função e grupo de uma lista de itens da escala com no máximo
+    três consultas (in_bulk), em vez de um objects.get por item.
+
+    ITE_ESC_COLABORADOR/FUNCAO/GRUPO são inteiros (não FKs), por isso não há
+    select_related. Preenche em cada item: colaborador (TBCOLABORADORES ou None),
+    colaborador_nome, funcao_nome e grupo_nome ('-' quando não há ou não existe mais).
+    """
+    itens = list(itens)
+
+    def carregar(model, campo):
+        ids = {getattr(item, campo) for item in itens if getattr(item, campo)}
+        return model.objects.in_bulk(ids) if ids else {}
+
+    colaboradores = carregar(TBCOLABORADORES, 'ITE_ESC_COLABORADOR')
+    funcoes = carregar(TBFUNCAO, 'ITE_ESC_FUNCAO')
+    grupos = carregar(TBGRUPOS, 'ITE_ESC_GRUPO')
+    for item in itens:
+        item.colaborador = colaboradores.get(item.ITE_ESC_COLABORADOR)
+        item.colaborador_nome = item.colaborador.COL_nome_completo if item.colaborador else '-'
+        funcao = funcoes.get(item.ITE_ESC_FUNCAO)
+        item.funcao_nome = funcao.FUN_nome_funcao if funcao else '-'
+        grupo = grupos.get(item.ITE_ESC_GRUPO)
+        item.grupo_nome = grupo.GRU_nome_grupo if grupo else '-'
+    return itens
@@ -0,0 +1,68 @@
+"""Manifesto de mídia: cada arquivo referenciado por um ImageField/FileField do app."""
+from django.db import models
+
+
+class TBMIDIA(models.Model):
+    """
+    Uma linha por (tabela, registro, campo) com arquivo preenchido.
+
+    Mantido pelos sinais post_save/post_delete (ver signals.py) e usado pelo comando
+    `limpar_storage` para achar arquivos órfãos no bucket sem varrer todas as tabelas.
+    """
+
+    MID_arquivo = models.CharField(max_length=255, db_index=True, verbose_name="Arquivo", help_text="Nome do arquivo no storage")
+    MID_tabela = models.CharField(max_length=100, verbose_name="Tabela", help_text="app_label.Model de origem")
+    MID_objeto_id = models.CharField(max_length=64, verbose_name="ID do Registro")
+    MID_campo = models.CharField(max_length=100, verbose_name="Campo")
+    MID_data_atualizacao = models.DateTimeField(auto_now=True, verbose_name="Data de Atualização")
+
+    class Meta:
+        db_table = 'TBMIDIA'
+        verbose_name = 'Mídia'
+        verbose_name_plural = 'Mídias'
+        constraints = [
+            models.UniqueConstraint(fields=['MID_tabela', 'MID_objeto_id', 'MID_campo'], name='uq_midia_origem'),
+        ]
+
+    def __str__(self):
+        return self.MID_arquivo
+
+
+class TBRENDICAO(models.Model):
+    """
+    Versão redimensionada (thumb/medio/grande, JPEG ou WebP) de uma imagem original.
+
+    Gerada em segundo plano por utils_image.gerar_rendicoes; os arquivos ficam em
+    rendicoes/<pasta do original>/ e são compartilhados entre originais de mesmo
+    conteúdo (REN_hash) na mesma pasta.
+    """
+
+    TAMANHO_CHOICES = [
+        ('thumb', 'Miniatura'),
+        ('medio', 'Médio'),
+        ('grande', 'Grande'),
+    ]
+    FORMATO_CHOICES = [
+        ('jpeg', 'JPEG'),
+        ('webp', 'WebP'),
+    ]
+
+    REN_original = models.CharField(max_length=255, db_index=True, verbose_name="Arquivo Original")
+    REN_hash = models.CharField(max_length=64, db_index=True, verbose_name="Hash SHA-256 do Original")
+    REN_tamanho = models.CharField(max_length=10, choices=TAMANHO_CHOICES, verbose_name="Tamanho")
+    REN_formato = models.CharField(max_length=10, choices=FORMATO_CHOICES, verbose_name="Formato")
+    REN_arquivo = models.FileField(upload_to='rendicoes/', max_length=255, verbose_name="Arquivo")
+    REN_largura = models.PositiveIntegerField(default=0, verbose_name="Largura")
+    REN_altura = models.PositiveIntegerField(default=0, verbose_name="Altura")
+    REN_data_criacao = models.DateTimeField(auto_now_add=True, verbose_name="Data de Criação")
+
+    class Meta:
+        db_table = 'TBRENDICAO'
+        verbose_name = 'Rendição de Imagem'
+        verbose_name_plural = 'Rendições de Imagens'
+        constraints = [
+            models.UniqueConstraint(fields=['REN_original', 'REN_tamanho', 'REN_formato'], name='uq_rendicao_original'),
+        ]
+
+    def __str__(self):
+        return f"{self.REN_original} ({self.REN_tamanho}/{self.REN_formato})"
@@ -1,12 +1,13 @@
-import io
-import os
 from django.db import models
 from django.utils import timezone
-from django.core.files.base import ContentFile
-from PIL import Image
 
 class TBMURAL(models.Model):
-    """Modelo para Mural de Fotos com compressão automática."""
+    """
+    Modelo para Mural de Fotos.
+
+    As fotos são codificadas e enviadas em paralelo pela view
+    (utils_image.salvar_imagens_em_paralelo); as rendições saem em segundo plano.
+    """
 
     MUR_ID = models.AutoField(primary_key=True, verbose_name="ID")
     MUR_data_mural = models.DateField(default=timezone.now, verbose_name="Data do Mural")
@@ -44,36 +45,3 @@ class TBMURAL(models.Model):
 
     def get_fotos_count(self):
         return sum(1 for f in [self.MUR_foto1_mural, self.MUR_foto2_mural, self.MUR_foto3_mural, self.MUR_foto4_mural, self.MUR_foto5_mural] if f)
-
-    # --- O PENTE FINO: COMPRESSÃO EM MASSA ---
-    def save(self, *args, **kwargs):
-        """Processa as 5 fotos antes de salvar no Wasabi."""
-        fotos = [
-            'MUR_foto1_mural', 'MUR_foto2_mural', 'MUR_foto3_mural', 
-            'MUR_foto4_mural', 'MUR_foto5_mural'
-        ]
-
-        for campo_nome in fotos:
-            foto_campo = getattr(self, campo_nome)
-            
-            # Se a foto existe e não é apenas uma string (garante que é um arquivo novo)
-            if foto_campo and not isinstance(foto_campo, str):
-                try:
-                    img = Image.open(foto_campo)
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    
-                    # Para murais, 800px é o ideal para visualização em galeria
-                    img.thumbnail((800, 800))
-                    
-                    buffer = io.BytesIO()
-                    img.save(buffer, format='JPEG', quality=70, optimize=True)
-                    buffer.seek(0)
-                    
-                    novo_nome = os.path.splitext(foto_campo.name)[0] + '.jpg'
-                    # O save=False é vital para não entrar em loop infinito no save()
-                    foto_campo.save(novo_nome, ContentFile(buffer.read()), save=False)
-                except Exception as e:
-                    print(f"Erro ao processar {campo_nome}: {e}")
-
-        super(TBMURAL, self).save(*args, **kwargs)
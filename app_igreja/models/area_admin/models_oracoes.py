@@ -3,6 +3,8 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.contrib.auth.models import User
 
+from ...utils_busca import chave_telefone
+
 
 def _telefone_formatado(telefone):
     if not telefone:
@@ -32,6 +34,10 @@ class TBORACOES(models.Model):
 
     ORA_nome_solicitante = models.CharField(max_length=200, verbose_name="Nome do Solicitante")
     ORA_telefone_pedinte = models.CharField(max_length=20, verbose_name="Telefone do Solicitante")
+    ORA_telefone_chave = models.CharField(
+        max_length=20, blank=True, default='', editable=False, verbose_name='Chave do Telefone',
+        help_text='DDD + últimos 8 dígitos (utils_busca.chave_telefone), para o histórico por telefone',
+    )
     ORA_tipo_oracao = models.CharField(max_length=100, verbose_name="Tipo de Oração", choices=TIPO_ORACAO_CHOICES)
     ORA_descricao = models.TextField(verbose_name="Descrição da Oração")
     ORA_status = models.CharField(max_length=20, verbose_name="Status", choices=STATUS_CHOICES, default='PENDENTE')
@@ -46,6 +52,9 @@ class TBORACOES(models.Model):
         verbose_name_plural = "Pedidos de Orações"
         db_table = 'TBORACOES'
         ordering = ['-ORA_data_pedido', 'ORA_nome_solicitante']
+        indexes = [
+            models.Index(fields=['ORA_telefone_chave', 'ORA_data_pedido'], name='idx_ora_telefone_data'),
+        ]
 
     def __str__(self):
         return f"{self.ORA_nome_solicitante} - {self.get_ORA_tipo_oracao_display()}"
@@ -85,4 +94,8 @@ class TBORACOES(models.Model):
         if self.ORA_telefone_pedinte and '(' not in str(self.ORA_telefone_pedinte) and '-' not in str(self.ORA_telefone_pedinte):
             self.ORA_telefone_pedinte = _telefone_formatado(self.ORA_telefone_pedinte)
         self.clean()
+        self.ORA_telefone_chave = chave_telefone(self.ORA_telefone_pedinte)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'ORA_telefone_chave' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['ORA_telefone_chave']
         super().save(*args, **kwargs)
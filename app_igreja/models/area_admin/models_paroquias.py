@@ -1,10 +1,6 @@
 import json
-import io
-import os
 from django.db import models
 from django.utils import timezone
-from django.core.files.base import ContentFile
-from PIL import Image
 
 from .models_dioceses import TBDIOCESE
 from ...utils import TIPOS_PIX
@@ -74,27 +70,3 @@ class TBPAROQUIA(models.Model):
         if not self.PAR_pix_tipo:
             return None
         return dict(TIPOS_PIX).get(self.PAR_pix_tipo, self.PAR_pix_tipo)
-
-    # --- O PENTE FINO: COMPRESSÃO DE IMAGEM ---
-    def save(self, *args, **kwargs):
-        """Reduz a foto do pároco antes de enviar ao Wasabi."""
-        if self.PAR_foto_paroco:
-            try:
-                img = Image.open(self.PAR_foto_paroco)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                output_size = (600, 600) # Foto de perfil não precisa ser maior que isso
-                img.thumbnail(output_size)
-
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=75, optimize=True)
-                buffer.seek(0)
-
-                # Gera o nome do arquivo garantindo a extensão .jpg
-                nome_limpo = os.path.splitext(self.PAR_foto_paroco.name)[0] + '.jpg'
-                self.PAR_foto_paroco.save(nome_limpo, ContentFile(buffer.read()), save=False)
-            except Exception as e:
-                print(f"Erro na compressão (Paróquia): {e}")
-
-        super(TBPAROQUIA, self).save(*args, **kwargs)
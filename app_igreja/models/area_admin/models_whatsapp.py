@@ -56,6 +56,9 @@ class TBWHATSAPP(models.Model):
     WHA_total_enviadas = models.IntegerField(default=0, verbose_name="Total Enviadas")
     WHA_sucessos = models.IntegerField(default=0, verbose_name="Sucessos")
     WHA_erros = models.IntegerField(default=0, verbose_name="Erros")
+    # Atualizados a cada lote de status do webhook (utils_entregas_whatsapp), sem recontar TBENTREGAWHATSAPP
+    WHA_entregues = models.IntegerField(default=0, verbose_name="Entregues")
+    WHA_lidas = models.IntegerField(default=0, verbose_name="Lidas")
     
     # Status e controle
     WHA_status = models.CharField(
@@ -83,6 +86,13 @@ class TBWHATSAPP(models.Model):
         verbose_name = 'Mensagem WhatsApp'
         verbose_name_plural = 'Mensagens WhatsApp'
         ordering = ['-WHA_data_criacao']
+        # Histórico (views_whatsapp.historico_mensagens): ordem da paginação por chave, sozinha
+        # ou depois do filtro por status / tipo de destinatário
+        indexes = [
+            models.Index(fields=['WHA_data_criacao', 'WHA_id'], name='idx_wha_data'),
+            models.Index(fields=['WHA_status', 'WHA_data_criacao', 'WHA_id'], name='idx_wha_status_data'),
+            models.Index(fields=['WHA_destinatario_tipo', 'WHA_data_criacao', 'WHA_id'], name='idx_wha_tipo_data'),
+        ]
     
     def __str__(self):
         return f"Mensagem {self.WHA_id} - {self.get_WHA_destinatario_tipo_display()} - {self.WHA_data_criacao.strftime('%d/%m/%Y %H:%M')}"
@@ -113,3 +123,134 @@ class TBWHATSAPP(models.Model):
         status_dict = dict(self.STATUS_CHOICES)
         return status_dict.get(self.WHA_status, self.WHA_status)
 
+
+
+class TBWEBHOOKAMOSTRA(models.Model):
+    """
+    Amostras (sem dados pessoais) das entregas do webhook do WhatsApp, para depuração.
+    Buffer circular: WAM_posicao vai de 0 a WHATSAPP_AMOSTRAS_MAX - 1 e a linha de cada
+    posição é sobrescrita pela amostra mais nova (utils_log.capturar_payload).
+    """
+
+    WAM_posicao = models.PositiveIntegerField(primary_key=True, verbose_name="Posição")
+    WAM_evento = models.CharField(max_length=50, verbose_name="Evento")
+    WAM_payload = models.TextField(verbose_name="Payload")
+    WAM_recebido_em = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="Recebido em")
+
+    class Meta:
+        db_table = 'TBWEBHOOKAMOSTRA'
+        verbose_name = 'Amostra do Webhook WhatsApp'
+        verbose_name_plural = 'Amostras do Webhook WhatsApp'
+        ordering = ['-WAM_recebido_em']
+
+    def __str__(self):
+        return f"{self.WAM_evento} - {self.WAM_recebido_em.strftime('%d/%m/%Y %H:%M:%S')}"
+
+
+class TBFILAWHATSAPP(models.Model):
+    """
+    Fila de envio de mensagens do WhatsApp (lembretes de dízimo, mensagens em massa etc.).
+    FIL_chave identifica a mensagem (ex.: "dizimo:123:atrasado"): é única, então gerar a
+    mesma campanha de novo não duplica o envio (utils_fila_whatsapp).
+    """
+
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('ENVIANDO', 'Enviando'),
+        ('ENVIADA', 'Enviada'),
+        ('ERRO', 'Erro'),
+    ]
+
+    FIL_id = models.BigAutoField(primary_key=True, verbose_name="ID")
+    FIL_chave = models.CharField(max_length=120, unique=True, verbose_name="Chave de Idempotência")
+    FIL_origem = models.CharField(max_length=30, verbose_name="Origem")
+    FIL_telefone = models.CharField(max_length=20, verbose_name="Telefone")
+    FIL_texto = models.TextField(verbose_name="Texto")
+    FIL_midia = models.CharField(max_length=200, blank=True, default='', verbose_name="Imagem (media id ou URL)")
+    # Mensagem em massa da área administrativa: cada envio soma nos totais dela
+    FIL_mensagem = models.ForeignKey(
+        TBWHATSAPP, on_delete=models.CASCADE, null=True, blank=True, related_name='fila',
+        verbose_name="Mensagem em Massa",
+    )
+    FIL_status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDENTE', verbose_name="Status")
+    FIL_tentativas = models.PositiveSmallIntegerField(default=0, verbose_name="Tentativas")
+    FIL_erro = models.TextField(blank=True, null=True, verbose_name="Erro")
+    FIL_data_criacao = models.DateTimeField(default=timezone.now, verbose_name="Data de Criação")
+    FIL_data_envio = models.DateTimeField(blank=True, null=True, verbose_name="Data de Envio")
+
+    class Meta:
+        db_table = 'TBFILAWHATSAPP'
+        verbose_name = 'Mensagem na Fila do WhatsApp'
+        verbose_name_plural = 'Fila do WhatsApp'
+        ordering = ['FIL_id']
+        indexes = [
+            models.Index(fields=['FIL_status', 'FIL_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.FIL_chave} - {self.FIL_status}"
+
+
+class TBMIDIAWHATSAPP(models.Model):
+    """
+    Arquivos já enviados para a Whapi (POST /media) e o media id devolvido.
+    Um registro por nome no storage (ou URL); MWA_hash reaproveita o id quando o mesmo
+    conteúdo aparece com outro nome. Passado MWA_expira_em o arquivo sobe de novo
+    (utils_midia_whatsapp).
+    """
+
+    MWA_id = models.AutoField(primary_key=True, verbose_name="ID")
+    MWA_nome = models.CharField(max_length=500, unique=True, verbose_name="Nome no Storage ou URL")
+    MWA_hash = models.CharField(max_length=64, db_index=True, verbose_name="SHA-256 do Conteúdo")
+    MWA_media_id = models.CharField(max_length=200, verbose_name="Media ID na Whapi")
+    MWA_tamanho = models.PositiveIntegerField(default=0, verbose_name="Tamanho (bytes)")
+    MWA_enviado_em = models.DateTimeField(default=timezone.now, verbose_name="Enviado em")
+    MWA_expira_em = models.DateTimeField(db_index=True, verbose_name="Expira em")
+
+    class Meta:
+        db_table = 'TBMIDIAWHATSAPP'
+        verbose_name = 'Mídia na Whapi'
+        verbose_name_plural = 'Mídias na Whapi'
+        ordering = ['-MWA_enviado_em']
+
+    def __str__(self):
+        return f"{self.MWA_nome} - {self.MWA_media_id}"
+
+
+class TBENTREGAWHATSAPP(models.Model):
+    """
+    Situação de cada destinatário de uma mensagem em massa (TBWHATSAPP), pelo id da
+    mensagem na Whapi. Os eventos "statuses" do webhook avançam ENT_status
+    (ENVIADA -> ENTREGUE -> LIDA, ou ENVIADA -> ERRO) e os totais da mensagem
+    (utils_entregas_whatsapp).
+    """
+
+    STATUS_CHOICES = [
+        ('ENVIADA', 'Enviada'),
+        ('ENTREGUE', 'Entregue'),
+        ('LIDA', 'Lida'),
+        ('ERRO', 'Erro'),
+    ]
+
+    ENT_id = models.BigAutoField(primary_key=True, verbose_name="ID")
+    ENT_mensagem = models.ForeignKey(
+        TBWHATSAPP, on_delete=models.CASCADE, related_name='entregas', verbose_name="Mensagem"
+    )
+    ENT_message_id = models.CharField(max_length=100, unique=True, verbose_name="ID da Mensagem na Whapi")
+    ENT_telefone = models.CharField(max_length=20, verbose_name="Telefone")
+    ENT_status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='ENVIADA', verbose_name="Status")
+    ENT_erro = models.TextField(blank=True, null=True, verbose_name="Erro")
+    ENT_data_envio = models.DateTimeField(default=timezone.now, verbose_name="Data de Envio")
+    ENT_data_atualizacao = models.DateTimeField(blank=True, null=True, verbose_name="Data do Último Status")
+
+    class Meta:
+        db_table = 'TBENTREGAWHATSAPP'
+        verbose_name = 'Entrega de Mensagem WhatsApp'
+        verbose_name_plural = 'Entregas de Mensagens WhatsApp'
+        ordering = ['ENT_id']
+        indexes = [
+            models.Index(fields=['ENT_mensagem', 'ENT_status']),
+        ]
+
+    def __str__(self):
+        return f"{self.ENT_telefone} - {self.ENT_status}"
@@ -0,0 +1,139 @@
+"""
+Sinais (signals) do app_igreja
+
+Conectados em AppIgrejaConfig.ready().
+"""
+import hashlib
+
+from django.core.files.base import ContentFile
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models.area_admin.models_agenda_mes import TBAGENDAMES, TBITEAGENDAMES
+from .models.area_admin.models_avisos import TBAVISO
+from .models.area_admin.models_banners import TBBANNERS
+from .models.area_admin.models_colaboradores import TBCOLABORADORES
+from .models.area_admin.models_dizimistas import TBDIZIMISTAS
+from .models.area_admin.models_eventos import TBEVENTO
+from .models.area_admin.models_midia import TBRENDICAO
+from .models.area_admin.models_mural import TBMURAL
+from .models.area_admin.models_paroquias import TBPAROQUIA
+from .models.area_admin.models_planos import TBPLANO
+from .models.area_admin.models_visual import TBVISUAL
+from .utils_busca import indexar_registro, remover_registro
+from .utils_cache import marcar_alteracao
+from .utils_estatisticas import (
+    CHAVE_DIZIMISTAS, CHAVE_EVENTOS, CHAVE_PLANOS, invalidar_estatisticas,
+)
+from .utils_image import agendar_rendicoes, conteudo_inalterado, hash_arquivo, reduzir_original
+from .utils_midia import campos_de_imagem, models_com_arquivo, registrar_midia, remover_midia
+
+
+# ==================== ESTATÍSTICAS DOS DASHBOARDS ====================
+
+@receiver([post_save, post_delete], sender=TBDIZIMISTAS)
+def invalidar_estatisticas_dizimistas(sender, **kwargs):
+    invalidar_estatisticas(CHAVE_DIZIMISTAS)
+
+
+@receiver([post_save, post_delete], sender=TBPLANO)
+def invalidar_estatisticas_planos(sender, **kwargs):
+    invalidar_estatisticas(CHAVE_PLANOS)
+
+
+@receiver([post_save, post_delete], sender=TBEVENTO)
+def invalidar_estatisticas_eventos(sender, **kwargs):
+    invalidar_estatisticas(CHAVE_EVENTOS)
+
+
+# ==================== TERMOS DE BUSCA (TBTERMOBUSCA) ====================
+
+TABELAS_BUSCA = {TBDIZIMISTAS: 'DIS', TBCOLABORADORES: 'COL'}
+
+
+@receiver(post_save, sender=TBDIZIMISTAS)
+@receiver(post_save, sender=TBCOLABORADORES)
+def indexar_busca(sender, instance, **kwargs):
+    indexar_registro(TABELAS_BUSCA[sender], instance.pk, instance.termos_busca())
+
+
+@receiver(post_delete, sender=TBDIZIMISTAS)
+@receiver(post_delete, sender=TBCOLABORADORES)
+def remover_busca(sender, instance, **kwargs):
+    remover_registro(TABELAS_BUSCA[sender], instance.pk)
+
+
+# ==================== VERSÕES DE CONTEÚDO (HOME, GRADE DE CELEBRAÇÕES, FEED DE AVISOS) ====================
+
+@receiver([post_save, post_delete], sender=TBPAROQUIA)
+@receiver([post_save, post_delete], sender=TBVISUAL)
+@receiver([post_save, post_delete], sender=TBMURAL)
+@receiver([post_save, post_delete], sender=TBBANNERS)
+@receiver([post_save, post_delete], sender=TBRENDICAO)
+@receiver([post_save, post_delete], sender=TBAGENDAMES)
+@receiver([post_save, post_delete], sender=TBITEAGENDAMES)
+@receiver([post_save, post_delete], sender=TBAVISO)
+def registrar_alteracao_conteudo(sender, **kwargs):
+    marcar_alteracao(sender)
+
+
+# ==================== MANIFESTO DE MÍDIA ====================
+
+def atualizar_manifesto_midia(sender, instance, **kwargs):
+    registrar_midia(instance)
+
+
+def remover_do_manifesto_midia(sender, instance, **kwargs):
+    remover_midia(instance)
+
+
+# Todo model do app com ImageField/FileField (inclusive os criados no futuro)
+for _model in models_com_arquivo():
+    post_save.connect(atualizar_manifesto_midia, sender=_model, dispatch_uid=f'midia_save_{_model._meta.label}')
+    post_delete.connect(remover_do_manifesto_midia, sender=_model, dispatch_uid=f'midia_delete_{_model._meta.label}')
+
+
+# ==================== RENDIÇÕES DE IMAGENS ====================
+
+def detectar_imagens_novas(sender, instance, raw=False, **kwargs):
+    """
+    Marca os ImageField com upload novo (ainda não gravado no storage).
+
+    O upload é reduzido para CAIXA_ORIGINAL antes de ir ao storage (reduzir_original):
+    fotos de celular não ficam guardadas com o tamanho da câmera. Se o resultado tem o
+    mesmo conteúdo do arquivo atual (mesmo hash), o campo volta a apontar para o arquivo
+    existente: nada é reenviado nem reprocessado.
+    """
+    novas = []
+    if not raw:
+        for campo in campos_de_imagem(sender):
+            arquivo = getattr(instance, campo)
+            if not arquivo or arquivo._committed:
+                continue
+            reduzido = reduzir_original(arquivo.file)
+            if reduzido:
+                nome, conteudo = reduzido
+                setattr(instance, campo, ContentFile(conteudo, name=nome))
+                hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+            else:
+                hash_conteudo = hash_arquivo(arquivo.file)
+            atual = None
+            if instance.pk is not None:
+                atual = sender.objects.filter(pk=instance.pk).values_list(campo, flat=True).first()
+            if atual and conteudo_inalterado(atual, hash_conteudo):
+                setattr(instance, campo, atual)
+                continue
+            novas.append((campo, hash_conteudo))
+    instance._imagens_novas = novas
+
+
+def processar_imagens_novas(sender, instance, **kwargs):
+    for campo, hash_conteudo in getattr(instance, '_imagens_novas', ()):
+        agendar_rendicoes(getattr(instance, campo).name, hash_conteudo)
+    instance._imagens_novas = []
+
+
+for _model in models_com_arquivo():
+    if campos_de_imagem(_model):
+        pre_save.connect(detectar_imagens_novas, sender=_model, dispatch_uid=f'imagens_pre_{_model._meta.label}')
+        post_save.connect(processar_imagens_novas, sender=_model, dispatch_uid=f'imagens_post_{_model._meta.label}')
@@ -0,0 +1,124 @@
+"""
+Storages do projeto
+
+Estáticos (collectstatic), ArmazenamentoEstatico:
+- Nomes com hash do conteúdo (app.3f2a9c1b7e4d.js) via ManifestStaticFilesStorage: o
+  navegador pode guardar cada arquivo "para sempre" e só baixa o que mudou.
+- Versões pré-comprimidas .gz e .br ao lado de cada arquivo de texto, servidas
+  diretamente pelo nginx (gzip_static / brotli_static, ver scripts/nginx_static.conf).
+
+Mídia no Wasabi/S3, ArmazenamentoMidia:
+- Pastas públicas (banners, mural, visual, ...) usam URL sem assinatura
+  (MIDIA_PUBLICA_SEM_ASSINATURA) ou assinada com validade longa.
+- Pastas privadas (MIDIA_PREFIXOS_PRIVADOS: dizimistas, colaboradores) continuam
+  com assinatura de validade curta (AWS_QUERYSTRING_EXPIRE).
+- A URL gerada é memorizada no cache por 3/4 da validade: a mesma imagem tem a mesma
+  URL entre páginas e renderizações (cache do navegador funciona) e a assinatura
+  S3v4 é calculada uma vez, não a cada .url no template.
+"""
+import gzip
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.cache import cache
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli é opcional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+EXTENSOES_COMPRIMIVEIS = ('.css', '.js', '.json', '.svg', '.html', '.txt', '.xml', '.map', '.ico')
+TAMANHO_MINIMO_COMPRESSAO = 512  # bytes; abaixo disso o cabeçalho gzip não compensa
+
+
+class ArmazenamentoEstatico(ManifestStaticFilesStorage):
+    # Referência a arquivo inexistente não derruba a página (volta ao nome sem hash)
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Fora do manifesto e do STATIC_ROOT (collectstatic não rodou: testes, dev)
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        nomes = {nome for nome in paths if nome.endswith(EXTENSOES_COMPRIMIVEIS)}
+        nomes.update(nome for nome in self.hashed_files.values() if nome.endswith(EXTENSOES_COMPRIMIVEIS))
+        with ThreadPoolExecutor() as executor:
+            comprimidos = sum(executor.map(self._comprimir, sorted(nomes)))
+        logger.info("Estáticos pré-comprimidos: %s arquivo(s)", comprimidos)
+
+    def _comprimir(self, nome):
+        """Grava nome.gz e nome.br quando ficam menores que o original."""
+        caminho = self.path(nome)
+        with open(caminho, 'rb') as arquivo:
+            conteudo = arquivo.read()
+        if len(conteudo) < TAMANHO_MINIMO_COMPRESSAO:
+            return 0
+
+        variantes = [('.gz', gzip.compress(conteudo, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variantes.append(('.br', brotli.compress(conteudo, quality=11)))
+        for extensao, comprimido in variantes:
+            if len(comprimido) < len(conteudo):
+                with open(caminho + extensao, 'wb') as destino:
+                    destino.write(comprimido)
+            elif os.path.exists(caminho + extensao):
+                os.remove(caminho + extensao)
+        return 1
+
+
+def midia_privada(nome):
+    """True para arquivos de pastas privadas (inclusive as rendições delas)."""
+    nome = nome.lstrip('/')
+    if nome.startswith('rendicoes/'):
+        nome = nome[len('rendicoes/'):]
+    return nome.startswith(tuple(settings.MIDIA_PREFIXOS_PRIVADOS))
+
+
+class ArmazenamentoMidia(S3Storage):
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        # Chamadas com parâmetros próprios (download com nome, PUT...) não são memorizadas
+        if parameters or expire or http_method:
+            return super().url(name, parameters, expire, http_method)
+
+        privada = midia_privada(name)
+        chave = 'midia_url:' + hashlib.md5(f'{int(privada)}:{name}'.encode()).hexdigest()
+        url = cache.get(chave)
+        if url is not None:
+            return url
+
+        if privada:
+            validade = self.querystring_expire
+            url = super().url(name, expire=validade)
+        elif settings.MIDIA_PUBLICA_SEM_ASSINATURA:
+            validade = None
+            url = self._url_sem_assinatura(name)
+        else:
+            validade = settings.MIDIA_PUBLICA_EXPIRACAO
+            url = super().url(name, expire=validade)
+
+        # Devolve a mesma URL por 3/4 da validade: quem a recebe ainda tem 1/4 para usá-la
+        cache.set(chave, url, None if validade is None else max(validade * 3 // 4, 60))
+        return url
+
+    def _url_sem_assinatura(self, name):
+        if self.custom_domain and not self.cloudfront_signer:
+            return super().url(name)
+        return self.unsigned_connection.meta.client.generate_presigned_url(
+            'get_object', Params={'Bucket': self.bucket_name, 'Key': self._normalize_name(clean_name(name))},
+        )
@@ -0,0 +1,29 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from ..utils_image import rendicoes_do_arquivo
+
+register = template.Library()
+
+
+def aceita_webp(request):
+    """True se o navegador declara suporte a WebP (cabeçalho Accept)."""
+    return request is not None and 'image/webp' in request.META.get('HTTP_ACCEPT', '')
+
+
+@register.simple_tag(takes_context=True)
+def imagem_url(context, arquivo, tamanho='medio'):
+    """
+    URL da rendição de uma imagem: {% imagem_url colaborador.COL_foto 'thumb' %}
+
+    Tamanhos: thumb (200px), medio (600px), grande (1600px). Usa WebP quando o navegador
+    aceita; enquanto as rendições não foram geradas, devolve a URL do arquivo original.
+    """
+    if not arquivo:
+        return ''
+    rendicoes = rendicoes_do_arquivo(arquivo.name)
+    if aceita_webp(context.get('request')):
+        nome = rendicoes.get(f'{tamanho}.webp') or rendicoes.get(f'{tamanho}.jpeg')
+    else:
+        nome = rendicoes.get(f'{tamanho}.jpeg')
+    return default_storage.url(nome) if nome else arquivo.url
@@ -1,3 +1,1002 @@
-from django.test import TestCase
+"""
+Testes do app_igreja
 
-# Create your tests here.
+Orçamento de consultas por view: com uma base semeada de tamanho realista (centenas de
+colaboradores e dizimistas, a escala de um mês inteiro e um ano de mensalidades de
+dízimo), cada view tem um teto de consultas que não depende da quantidade de registros.
+Além do teto, o detector de N+1 (utils_desempenho) reprova a view que executar a mesma
+consulta várias vezes com parâmetros diferentes - o objects.get por item de uma lista.
+
+Se uma mudança legítima precisar de mais consultas, ajuste o teto no teste junto com a
+mudança, explicando o motivo no commit.
+"""
+import base64
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+import requests
+
+from .management.commands.aniversariantes_whatsapp import felicitacoes
+from .models.area_admin.models_avisos import TBAVISO
+from .models.area_admin.models_banners import TBBANNERS
+from .models.area_admin.models_busca import TBTERMOBUSCA
+from .models.area_admin.models_cep import TBCEP
+from .models.area_admin.models_celebracoes import TBCELEBRACOES, TBVAGACELEBRACAO
+from .models.area_admin.models_colaboradores import TBCOLABORADORES
+from .models.area_admin.models_dizimistas import TBDIZIMISTAS, TBGERDIZIMO
+from .models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA
+from .models.area_admin.models_funcoes import TBFUNCAO
+from .models.area_admin.models_grupos import TBGRUPOS
+from .models.area_admin.models_midia import TBMIDIA, TBRENDICAO
+from .models.area_admin.models_paroquias import TBPAROQUIA
+from .models.area_admin.models_whatsapp import (
+    TBENTREGAWHATSAPP, TBFILAWHATSAPP, TBMIDIAWHATSAPP, TBWEBHOOKAMOSTRA, TBWHATSAPP,
+)
+from .utils_busca import buscar_colaboradores, buscar_dizimistas
+from .utils_celebracoes import HorarioIndisponivel, reservar_celebracao
+from .utils_cep import CepServicoIndisponivel, buscar_cep, limpar_cache_cep
+from .utils_chatbot import mensagens_suprimidas, verificar_cache_compartilhado
+from .utils_desempenho import (
+    detectar_n_mais_um, encerrar_medicao, endpoints_mais_lentos, iniciar_medicao, instrumentar,
+)
+from .utils_entregas_whatsapp import aplicar_status, descarregar, limpar_pendentes, marcar_envio, registrar_envios
+from .utils_fila_whatsapp import enviar_item, processar_fila
+from .utils_image import url_rendicao
+from .utils_log import Evento, FilaLogHandler
+from .utils_midia_whatsapp import media_id_arquivo
+from .utils_segmentos import Segmento
+from .utils_webhook import sanitizar_payload, telefone_ficticio
+from .views.area_publica import views_whatsapp_api
+
+# Sem medição de desempenho por padrão: ela sorteia requisições e escreve linhas de log JSON
+_sem_medicao = override_settings(DESEMPENHO_AMOSTRAGEM=0)
+
+
+def setUpModule():
+    _sem_medicao.enable()
+
+
+def tearDownModule():
+    _sem_medicao.disable()
+
+
+TOTAL_COLABORADORES = 300
+TOTAL_DIZIMISTAS = 300
+HORARIOS_ESCALA = [time(7, 0), time(19, 0)]
+ENCARGOS_ESCALA = ['1ª Leitura', 'Salmo', '2ª Leitura', 'Preces']
+
+
+def _proximo_mes(hoje=None):
+    """Primeiro dia do mês que vem: a escala semeada fica toda no futuro."""
+    hoje = hoje or date.today()
+    return (hoje.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+class BaseSemeada(TestCase):
+    """Base de dados compartilhada pelos testes de orçamento (criada uma vez por classe)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create: sem save() nem sinais, para a semeadura ser rápida
+        cls.funcoes = TBFUNCAO.objects.bulk_create([
+            TBFUNCAO(FUN_nome_funcao=f'Função {i}') for i in range(8)
+        ])
+        cls.grupos = TBGRUPOS.objects.bulk_create([
+            TBGRUPOS(GRU_nome_grupo=f'Grupo {i}') for i in range(6)
+        ])
+        cls.colaboradores = TBCOLABORADORES.objects.bulk_create([
+            TBCOLABORADORES(
+                COL_telefone=f'(11) 9{i:04d}-0000',
+                COL_nome_completo=f'Colaborador {i} da Silva',
+                COL_status='ATIVO' if i % 5 else 'INATIVO',
+                COL_data_nascimento=date(1980, i % 12 + 1, i % 28 + 1),
+                COL_funcao=cls.funcoes[i % len(cls.funcoes)].FUN_id,
+                COL_grupo_liturgico=cls.grupos[i % len(cls.grupos)].GRU_id,
+            )
+            for i in range(TOTAL_COLABORADORES)
+        ])
+        cls.dizimistas = TBDIZIMISTAS.objects.bulk_create([
+            TBDIZIMISTAS(
+                DIS_telefone=f'(21) 9{i:04d}-0000',
+                DIS_nome=f'Dizimista {i} de Souza',
+                DIS_data_nascimento=date(1975, i % 12 + 1, i % 28 + 1),
+                DIS_dia_pagamento=i % 28 + 1,
+                DIS_valor=Decimal('50.00'),
+                DIS_status=True,
+            )
+            for i in range(TOTAL_DIZIMISTAS)
+        ])
+
+        # Escala do mês que vem: todos os dias, dois horários, quatro encargos
+        cls.mes_escala = _proximo_mes()
+        escala = TBESCALA.objects.create(ESC_MESANO=cls.mes_escala, ESC_TEMAMES='Tema')
+        itens = []
+        dia = cls.mes_escala
+        while dia.month == cls.mes_escala.month:
+            for horario in HORARIOS_ESCALA:
+                for encargo in ENCARGOS_ESCALA:
+                    n = len(itens)
+                    itens.append(TBITEM_ESCALA(
+                        ITE_ESC_ESCALA=escala,
+                        ITE_ESC_DATA=dia,
+                        ITE_ESC_HORARIO=horario,
+                        ITE_ESC_ENCARGO=encargo,
+                        ITE_ESC_STATUS='DEFINIDO' if n % 3 else 'EM_ABERTO',
+                        ITE_ESC_COLABORADOR=cls.colaboradores[n % TOTAL_COLABORADORES].COL_id if n % 3 else None,
+                        ITE_ESC_FUNCAO=cls.funcoes[n % len(cls.funcoes)].FUN_id if n % 3 else None,
+                        ITE_ESC_GRUPO=cls.grupos[n % len(cls.grupos)].GRU_id,
+                        ITE_ESC_SITUACAO=True,
+                    ))
+            dia += timedelta(days=1)
+        TBITEM_ESCALA.objects.bulk_create(itens)
+
+        # Um ano de mensalidades de todos os dizimistas, metade paga
+        cls.mes_dizimo = date.today().replace(day=1)
+        mensalidades = []
+        for m in range(12):
+            mesano = (cls.mes_dizimo - timedelta(days=31 * m)).replace(day=1)
+            for i, dizimista in enumerate(cls.dizimistas):
+                pago = (i + m) % 2 == 0
+                mensalidades.append(TBGERDIZIMO(
+                    GER_mesano=mesano,
+                    GER_dizimista=dizimista,
+                    GER_dtvencimento=mesano.replace(day=dizimista.DIS_dia_pagamento),
+                    GER_vlr_dizimo=Decimal('50.00'),
+                    GER_dtpagto=mesano if pago else None,
+                    GER_vlr_pago=Decimal('50.00') if pago else None,
+                ))
+        TBGERDIZIMO.objects.bulk_create(mensalidades)
+
+        TBAVISO.objects.bulk_create([
+            TBAVISO(AVI_titulo=f'Aviso {i}', AVI_texto='Texto', AVI_data=date.today() - timedelta(days=i))
+            for i in range(60)
+        ])
+        cls.admin = User.objects.create_superuser('admin', 'admin@exemplo.com', 'senha')
+
+
+class OrcamentoConsultasTests(BaseSemeada):
+    """Teto de consultas por view sobre a base semeada, sem N+1."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(HTTP_HOST='localhost')
+        self.client.force_login(self.admin)
+
+    @contextmanager
+    def assertOrcamento(self, maximo):
+        """Como assertNumQueries, mas com teto (<=) e reprovando consultas repetidas (N+1)."""
+        with CaptureQueriesContext(connection) as consultas, detectar_n_mais_um() as detector:
+            yield
+        self.assertLessEqual(
+            len(consultas), maximo,
+            f'{len(consultas)} consultas (teto {maximo}):\n'
+            + '\n'.join(q['sql'] for q in consultas.captured_queries),
+        )
+        self.assertEqual(detector.repetidas(), [], 'Consulta repetida por item (N+1)')
+
+    def _get(self, url, maximo, **params):
+        with self.assertOrcamento(maximo):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    # ---------- Escala ----------
+
+    def test_relatorio_escala_mensal(self):
+        response = self._get(
+            '/app_igreja/admin-area/relatorios/escala-mensal-missas/', 11,
+            mes=self.mes_escala.month, ano=self.mes_escala.year,
+        )
+        self.assertEqual(response.context['total_encontrado'], TBITEM_ESCALA.objects.count())
+
+    def test_gerenciar_escala(self):
+        response = self._get(
+            '/app_igreja/admin-area/gerenciar-escala/', 8,
+            mes=self.mes_escala.month, ano=self.mes_escala.year,
+        )
+        self.assertEqual(len(response.context['page_obj'].object_list), 50)
+
+    def test_apontamentos_escala(self):
+        self._get(
+            '/app_igreja/admin-area/apontamentos-escala-missa/', 9,
+            mes=self.mes_escala.month, ano=self.mes_escala.year,
+        )
+
+    def test_visualizar_escala_mensal(self):
+        self._get(
+            f'/app_igreja/admin-area/escala-mensal/{self.mes_escala.month}/{self.mes_escala.year}/', 4,
+        )
+
+    def test_escala_publica(self):
+        self.client.logout()
+        self._get('/app_igreja/escala-missas/', 5, mes=self.mes_escala.month, ano=self.mes_escala.year)
+
+    # ---------- Relatórios e cadastros ----------
+
+    def test_relatorio_aniversariantes(self):
+        self._get(
+            '/app_igreja/admin-area/relatorios/aniversariantes/', 5,
+            data=date.today().strftime('%Y-%m'), tipo='TODOS',
+        )
+
+    def test_listar_colaboradores(self):
+        self._get('/app_igreja/admin-area/colaboradores/', 7, busca_nome='todos')
+
+    def test_listar_dizimistas(self):
+        self._get('/app_igreja/gerenciar-dizimistas/', 6, status='ativo')
+
+    # ---------- Dízimo ----------
+
+    def test_gerenciar_coleta_dizimo(self):
+        response = self._get(
+            '/app_igreja/admin-area/gerenciar-coleta-dizimo/', 3,
+            mes=self.mes_dizimo.month, ano=self.mes_dizimo.year, status='TODOS',
+        )
+        self.assertEqual(len(response.context['mensalidades']), TOTAL_DIZIMISTAS)
+
+    # ---------- WhatsApp ----------
+
+    def test_historico_whatsapp(self):
+        inicio = timezone.now() - timedelta(days=30)
+        TBWHATSAPP.objects.bulk_create([
+            TBWHATSAPP(WHA_texto='x' * 2000, WHA_status='ENVIADA', WHA_data_criacao=inicio + timedelta(hours=i))
+            for i in range(25)
+        ])
+        with CaptureQueriesContext(connection) as consultas:
+            primeira = self._get('/app_igreja/admin-area/whatsapp/', 3, status='ENVIADA')
+        self.assertFalse(any('WHA_texto' in q['sql'] for q in consultas.captured_queries))
+        pagina = primeira.context['page_obj']
+        self.assertEqual(len(pagina), 20)
+        segunda = self._get('/app_igreja/admin-area/whatsapp/', 3, status='ENVIADA', apos=pagina.proximo_cursor)
+        ids = [m.WHA_id for m in pagina] + [m.WHA_id for m in segunda.context['page_obj']]
+        self.assertEqual(ids, list(TBWHATSAPP.objects.order_by('-WHA_data_criacao', '-WHA_id').values_list('WHA_id', flat=True)))
+        self.assertFalse(segunda.context['page_obj'].tem_proxima)
+        # Cursor editado (valores que não são do tipo dos campos): volta para a primeira página
+        adulterado = base64.urlsafe_b64encode(json.dumps(['abc', 'x']).encode()).decode()
+        response = self._get('/app_igreja/admin-area/whatsapp/', 3, status='ENVIADA', apos=adulterado)
+        self.assertTrue(response.context['page_obj'].eh_primeira)
+        self.assertEqual(len(response.context['page_obj']), 20)
+
+    # ---------- Área pública ----------
+
+    def test_home_anonima(self):
+        self.client.logout()
+        self._get('/', 4)
+        # Segunda visita: página inteira no cache
+        self._get('/', 1)
+
+    def test_avisos_publicos(self):
+        self.client.logout()
+        response = self._get('/app_igreja/avisos/', 3)
+        self.assertTrue(response.context['avisos'].tem_proxima)
+
+
+@override_settings(DESEMPENHO_AMOSTRAGEM=1)
+class MedicaoDesempenhoTests(TestCase):
+    """Server-Timing da medição de desempenho (middleware) só para a equipe."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(HTTP_HOST='localhost')
+
+    def _get(self):
+        with self.assertLogs('app_igreja.desempenho', 'INFO'):
+            return self.client.get('/app_igreja/avisos/')
+
+    def test_publico_sem_server_timing(self):
+        self.assertNotIn('Server-Timing', self._get())
+
+    def test_equipe_recebe_server_timing(self):
+        self.client.force_login(User.objects.create_user('equipe', password='senha', is_staff=True))
+        self.assertIn('db;dur=', self._get()['Server-Timing'])
+
+    def test_acumulado_por_endpoint(self):
+        self._get()
+        self._get()
+        [linha] = endpoints_mais_lentos()
+        self.assertEqual((linha['endpoint'], linha['requisicoes']), ('GET app_igreja:avisos_paroquia_pub', 2))
+        self.assertGreaterEqual(linha['max_ms'], linha['media_ms'])
+
+    def test_get_many_conta_cada_chave_uma_vez(self):
+        instrumentar()
+        cache.set('presente', 1)
+        medicao, token = iniciar_medicao()
+        try:
+            cache.get_many(['presente', 'ausente'])
+        finally:
+            encerrar_medicao(token)
+        self.assertEqual((medicao.cache_acertos, medicao.cache_faltas), (1, 1))
+
+
+class BuscaTests(TestCase):
+    """Busca de dizimistas e colaboradores pelos termos indexados (utils_busca)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        TBDIZIMISTAS.objects.create(DIS_telefone='(18) 99736-6866', DIS_nome='Maria da Conceição', DIS_cidade='Assis')
+        TBDIZIMISTAS.objects.create(DIS_telefone='(18) 99111-2222', DIS_nome='Mariana Souza', DIS_cidade='Marília')
+        TBCOLABORADORES.objects.create(COL_telefone='(18) 99555-6666', COL_nome_completo='Zeca Pereira', COL_apelido='Tião')
+        cls.davi = TBCOLABORADORES.objects.create(
+            COL_telefone='(18) 99333-4444', COL_nome_completo='Davi Tiago', COL_apelido='Dudu',
+        )
+
+    def _nomes(self, termo, **kwargs):
+        return [d.DIS_nome for d in buscar_dizimistas(termo, **kwargs)]
+
+    def test_inicio_de_palavra_sem_acento(self):
+        self.assertEqual(self._nomes('conceicao'), ['Maria da Conceição'])
+        self.assertEqual(self._nomes('MAR'), ['Maria da Conceição', 'Mariana Souza'])
+        self.assertEqual(self._nomes('aria'), [])
+        self.assertEqual(self._nomes('marilia'), ['Mariana Souza'])
+
+    def test_telefone_em_qualquer_posicao(self):
+        self.assertEqual(self._nomes('7366'), ['Maria da Conceição'])
+        self.assertEqual(self._nomes('2222'), ['Mariana Souza'])
+
+    def test_apelido_so_no_apelido(self):
+        # "Ti" está no apelido de um e no nome (Tiago) do outro
+        apelidos = buscar_colaboradores('ti', ordenar=False, campos=['APELIDO'])
+        self.assertEqual([c.COL_apelido for c in apelidos], ['Tião'])
+
+    def test_termos_acompanham_alteracao_e_exclusao(self):
+        self.davi.COL_apelido = 'Davizinho'
+        self.davi.save()
+        self.assertFalse(buscar_colaboradores('dudu').exists())
+        self.assertTrue(buscar_colaboradores('daviz').exists())
+        self.davi.delete()
+        self.assertFalse(TBTERMOBUSCA.objects.filter(TER_tabela='COL', TER_registro=self.davi.pk).exists())
+
+    def test_reindexar_depois_de_update_em_massa(self):
+        TBDIZIMISTAS.objects.filter(DIS_nome='Mariana Souza').update(DIS_nome='Joana Prado')  # sem sinal
+        self.assertEqual(self._nomes('joana'), [])
+        saida = io.StringIO()
+        call_command('reindexar_busca', stdout=saida)
+        self.assertIn('DIS: 2 registro(s)', saida.getvalue())
+        self.assertEqual(self._nomes('joana'), ['Joana Prado'])
+        self.assertEqual(self._nomes('mariana'), [])
+
+    def test_prefixo_usa_intervalo_no_indice(self):
+        sql = str(buscar_dizimistas('maz', ordenar=False).query)
+        self.assertNotIn('LIKE', sql.upper())
+        self.assertIn('"TER_termo" >= maz', sql)
+        self.assertIn('"TER_termo" < mb', sql)
+
+
+class CepTests(TestCase):
+    """Resolução de CEP (utils_cep): LRU, TBCEP e ViaCEP, e a importação em massa."""
+
+    def setUp(self):
+        limpar_cache_cep()
+        self.addCleanup(limpar_cache_cep)
+        viacep = mock.patch('app_igreja.utils_cep.requests.get')
+        self.get = viacep.start()
+        self.addCleanup(viacep.stop)
+
+    def _viacep(self, dados):
+        self.get.return_value.status_code = 200
+        self.get.return_value.json.return_value = dados
+
+    def test_viacep_gravado_e_lru(self):
+        self._viacep({'logradouro': 'Rua Sete', 'bairro': 'Centro', 'localidade': 'Assis', 'uf': 'SP'})
+        self.assertEqual(buscar_cep('19800-000')['cidade'], 'Assis')
+        self.assertEqual(TBCEP.objects.get().CEP_fonte, 'VIACEP')
+        with self.assertNumQueries(0):
+            self.assertEqual(buscar_cep('19800000')['logradouro'], 'Rua Sete')
+        self.get.assert_called_once()
+
+    def test_tbcep_sem_consultar_viacep(self):
+        TBCEP.objects.create(CEP_cep='19800000', CEP_cidade='Assis', CEP_estado='SP', CEP_fonte='IMPORTACAO')
+        self.assertEqual(buscar_cep('19800-000')['estado'], 'SP')
+        self.get.assert_not_called()
+
+    def test_cep_inexistente_volta_ao_viacep_depois_da_validade(self):
+        self._viacep({'erro': True})
+        self.assertIsNone(buscar_cep('99999-999'))
+        limpar_cache_cep()
+        self.assertIsNone(buscar_cep('99999-999'))  # cache negativo em TBCEP
+        self.assertEqual(self.get.call_count, 1)
+
+        TBCEP.objects.update(CEP_data_consulta=timezone.now() - timedelta(days=31))
+        limpar_cache_cep()
+        self._viacep({'logradouro': 'Rua Nova', 'localidade': 'Assis', 'uf': 'SP'})
+        self.assertEqual(buscar_cep('99999-999')['logradouro'], 'Rua Nova')
+        self.assertEqual(self.get.call_count, 2)
+        self.assertTrue(TBCEP.objects.get().CEP_valido)
+
+    def test_viacep_fora_do_ar(self):
+        self.get.side_effect = requests.exceptions.ConnectTimeout('timeout')
+        with self.assertRaises(CepServicoIndisponivel):
+            buscar_cep('19800-000')
+
+    def test_importar_ceps(self):
+        self._viacep({'erro': True})
+        self.assertIsNone(buscar_cep('19800-000'))  # inexistente no LRU antes da importação
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False) as arquivo:
+            arquivo.write('CEP;Endereco;Cidade;UF\n19800-000;Rua Sete;Assis;sp\nabc;;;\n19800000;Rua 7;Assis;SP\n')
+        self.addCleanup(os.remove, arquivo.name)
+        saida = io.StringIO()
+        call_command('importar_ceps', arquivo.name, stdout=saida)
+        self.assertIn('1 CEP(s) importado(s), 1 linha(s) ignorada(s).', saida.getvalue())
+        registro = TBCEP.objects.get()
+        self.assertEqual((registro.CEP_logradouro, registro.CEP_estado, registro.CEP_fonte), ('Rua 7', 'SP', 'IMPORTACAO'))
+        self.assertEqual(buscar_cep('19800-000')['logradouro'], 'Rua 7')
+
+
+class _S3Local:
+    """Bucket em memória com a parte da API S3 que o limpar_storage usa."""
+
+    def __init__(self, objetos):
+        self.objetos = dict(objetos)  # chave -> LastModified
+        self.exclusoes = []
+
+    def get_paginator(self, operacao):
+        assert operacao == 'list_objects_v2'
+        return self
+
+    def paginate(self, Bucket, Prefix='', Delimiter=None, PaginationConfig=None):
+        tamanho = (PaginationConfig or {}).get('PageSize', 1000)
+        chaves = sorted(k for k in self.objetos if k.startswith(Prefix))
+        prefixos = []
+        if Delimiter:
+            prefixos = sorted({k[:k.index(Delimiter) + 1] for k in chaves if Delimiter in k})
+            chaves = [k for k in chaves if Delimiter not in k]
+        for inicio in range(0, max(len(chaves), 1), tamanho):
+            yield {
+                'Contents': [{'Key': k, 'LastModified': self.objetos[k]} for k in chaves[inicio:inicio + tamanho]],
+                'CommonPrefixes': [{'Prefix': p} for p in prefixos] if inicio == 0 else [],
+            }
+
+    def delete_objects(self, Bucket, Delete):
+        chaves = [o['Key'] for o in Delete['Objects']]
+        self.exclusoes.append(chaves)
+        for chave in chaves:
+            self.objetos.pop(chave, None)
+        return {}
+
+
+class LimparStorageTests(TestCase):
+    """Comando limpar_storage contra um bucket local (cliente S3 substituído)."""
+
+    def setUp(self):
+        antigo = timezone.now() - timedelta(days=10)
+        self.s3 = _S3Local({
+            'mural/foto1.jpg': antigo,
+            'mural/orfa1.jpg': antigo,
+            'mural/orfa2.jpg': antigo,
+            'bispos/orfa3.jpg': antigo,
+            'solta.txt': antigo,
+            'mural/enviando.jpg': timezone.now(),  # upload recente: fica
+        })
+        patcher = mock.patch('app_igreja.management.commands.limpar_storage.cliente_s3', return_value=self.s3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _rodar(self, *args):
+        saida = io.StringIO()
+        call_command('limpar_storage', '--bucket', 'teste', *args, stdout=saida, stderr=io.StringIO())
+        return saida.getvalue()
+
+    def _manifesto(self, *arquivos):
+        TBMIDIA.objects.bulk_create([
+            TBMIDIA(MID_arquivo=arquivo, MID_tabela='app_igreja.TBMURAL', MID_objeto_id=str(i), MID_campo='foto')
+            for i, arquivo in enumerate(arquivos)
+        ])
+
+    def test_simulacao_por_padrao(self):
+        self._manifesto('mural/foto1.jpg')
+        saida = self._rodar()
+        self.assertIn('4 arquivo(s) órfão(s). Nada foi apagado', saida)
+        self.assertEqual(self.s3.exclusoes, [])
+        self.assertEqual(len(self.s3.objetos), 6)
+
+    def test_manifesto_vazio_nao_apaga(self):
+        with self.assertRaisesMessage(CommandError, 'Manifesto de mídia vazio'):
+            self._rodar('--executar')
+        self.assertEqual(self.s3.exclusoes, [])
+
+    def test_apaga_orfaos_em_lotes(self):
+        self._manifesto('mural/foto1.jpg')
+        with mock.patch('app_igreja.management.commands.limpar_storage.MAX_CHAVES_POR_EXCLUSAO', 2):
+            saida = self._rodar('--executar', '--workers', '2')
+        self.assertIn('4 arquivo(s) órfão(s) apagado(s).', saida)
+        self.assertEqual([len(lote) for lote in self.s3.exclusoes], [2, 2])
+        self.assertEqual(sorted(self.s3.objetos), ['mural/enviando.jpg', 'mural/foto1.jpg'])
+
+
+class SegmentoTests(TestCase):
+    """Público dos envios de WhatsApp (utils_segmentos)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.grupo = TBGRUPOS.objects.create(GRU_nome_grupo='Coral')
+        for telefone, nome, nascimento in (
+            ('(18) 99736-6866', 'Ana', date(1980, 12, 28)),
+            ('(18) 99111-2222', 'Bruno', date(1990, 1, 5)),
+            ('(18) 99333-4444', 'Carla', date(1985, 6, 15)),
+        ):
+            TBDIZIMISTAS.objects.create(
+                DIS_telefone=telefone, DIS_nome=nome, DIS_data_nascimento=nascimento, DIS_status=True,
+            )
+        # Ana de novo, com o telefone digitado de outro jeito, e um colaborador só
+        TBCOLABORADORES.objects.create(
+            COL_telefone='5518997366866', COL_nome_completo='Ana Maria', COL_status='ATIVO',
+            COL_grupo_liturgico=cls.grupo.GRU_id, COL_data_nascimento=date(1980, 12, 28),
+        )
+        TBCOLABORADORES.objects.create(
+            COL_telefone='(18) 99555-6666', COL_nome_completo='Davi', COL_status='ATIVO',
+        )
+
+    def test_todos_sem_telefone_repetido(self):
+        segmento = Segmento('TODOS')
+        nomes = [d['nome'] for d in segmento.destinatarios()]
+        self.assertEqual(nomes, ['Ana', 'Bruno', 'Carla', 'Davi'])
+        self.assertEqual(segmento.contar(), 4)
+
+    def test_janela_de_aniversario_na_virada_do_ano(self):
+        segmento = Segmento('DIZIMISTAS', aniversario_inicio=date(2025, 12, 20), aniversario_fim=date(2026, 1, 10))
+        self.assertEqual([d['nome'] for d in segmento.destinatarios()], ['Ana', 'Bruno'])
+
+    def test_grupo_do_colaborador(self):
+        segmento = Segmento('COLABORADORES', grupo=self.grupo)
+        self.assertEqual([d['nome'] for d in segmento.destinatarios()], ['Ana Maria'])
+        self.assertEqual(segmento.contar(), 1)
+
+
+@override_settings(CELEBRACOES_CAPACIDADE_HORARIO=1)
+class ReservaCelebracaoTests(TestCase):
+    """Agendamento com vaga conferida sob a trava do horário (utils_celebracoes)."""
+
+    def setUp(self):
+        self.dia = date(2026, 11, 7)
+        grade = mock.patch('app_igreja.utils_celebracoes.grade_do_mes', return_value={self.dia: [time(19, 0)]})
+        grade.start()
+        self.addCleanup(grade.stop)
+
+    def _celebracao(self, nome):
+        return TBCELEBRACOES(
+            CEL_tipo_celebracao='batismo', CEL_data_celebracao=self.dia, CEL_horario=time(19, 0),
+            CEL_local='Matriz', CEL_nome_solicitante=nome, CEL_telefone='18997366866', CEL_participantes=10,
+        )
+
+    def test_ultima_vaga_so_uma_vez(self):
+        reservar_celebracao(self._celebracao('Ana'))
+        with self.assertRaises(HorarioIndisponivel):
+            reservar_celebracao(self._celebracao('Bruno'))
+        self.assertEqual(TBCELEBRACOES.objects.count(), 1)
+        vaga = TBVAGACELEBRACAO.objects.get()  # o pedido recusado desfaz o próprio UPDATE
+        self.assertEqual((vaga.VAG_data, vaga.VAG_horario, vaga.VAG_reservas), (self.dia, time(19, 0), 1))
+
+
+@override_settings(WHATSAPP_AMOSTRAGEM_PAYLOAD=0)
+class ChatbotTests(TestCase):
+    """Webhook do WhatsApp: resposta por tabela de rotas, sem consulta ao banco por mensagem."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(HTTP_HOST='localhost')
+        resposta = mock.Mock(status_code=200)
+        resposta.json.return_value = {'sent': True, 'message': {'id': 'x'}}
+        patcher = mock.patch.object(views_whatsapp_api._sessao, 'post', return_value=resposta)
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+        log_whatsapp = logging.getLogger('app_igreja.whatsapp')
+        self.addCleanup(log_whatsapp.setLevel, log_whatsapp.level)
+        log_whatsapp.setLevel(logging.WARNING)
+
+    def _mensagem(self, message_id, **mensagem):
+        payload = {
+            'event': {'type': 'messages'},
+            'messages': [{'id': message_id, 'from_me': False, 'from': '5518997366866', **mensagem}],
+        }
+        return self.client.post(
+            '/app_igreja/api/whatsapp/webhook/', json.dumps(payload), content_type='application/json',
+        )
+
+    def _clique_lista(self, message_id, item_id):
+        return self._mensagem(message_id, type='list', list={'id': f'ListV3:{item_id}', 'title': ''})
+
+    def test_item_da_lista_pelo_id(self):
+        TBPAROQUIA.objects.create(PAR_nome_paroquia='São José')
+        self._clique_lista('m1', 'dizimo_ofertas')  # monta os payloads do processo
+        self.post.reset_mock()
+        with self.assertNumQueries(0):
+            self._clique_lista('m2', 'Escala_Missas')
+        self.assertEqual(self.post.call_count, 1)
+        url, = self.post.call_args.args
+        corpo = json.loads(self.post.call_args.kwargs['data'])
+        self.assertTrue(url.endswith('/messages/interactive'))
+        self.assertEqual(corpo['to'], '5518997366866')
+        self.assertTrue(corpo['action']['buttons'][0]['url'].endswith('/escala-missas/?telefone=18997366866'))
+
+    def test_mensagem_repetida_e_ignorada(self):
+        self._clique_lista('m1', 'pedido_oracao')
+        self._clique_lista('m1', 'pedido_oracao')
+        self.assertEqual(self.post.call_count, 1)
+
+    def test_gravacao_sem_dados_pessoais(self):
+        entrega = {'messages': [{
+            'id': 'm1', 'from': '5518997366866', 'from_name': 'Maria', 'type': 'text', 'text': {'body': 'oi'},
+        }]}
+        gravada = sanitizar_payload(entrega)['messages'][0]
+        self.assertEqual(gravada['from'], telefone_ficticio('5518997366866'))
+        self.assertNotIn('997366866', json.dumps(gravada))
+        self.assertEqual((gravada['id'], gravada['from_name'], gravada['text']), ('m1', 'Contato', {'body': 'xx'}))
+        # Telefone em campo qualquer e texto como string simples também saem
+        outra = sanitizar_payload({'messages': [{
+            'id': 'm2', 'type': 'text', 'text': 'meu número é 18997366866',
+            'context': {'quoted_author': '5518997366866@s.whatsapp.net'},
+        }]})['messages'][0]
+        self.assertNotIn('997366866', json.dumps(outra))
+        self.assertEqual(outra['text'], 'x' * 24)
+        self.assertEqual(outra['context']['quoted_author'], f"{telefone_ficticio('5518997366866')}@s.whatsapp.net")
+
+    def test_rajada_recebe_um_menu(self):
+        for n in range(5):
+            self._mensagem(f'm{n}', type='sticker')
+        menus = [c for c in self.post.call_args_list if c.args[0].endswith('/messages/interactive')]
+        self.assertEqual(len(menus), 1)
+        self.assertEqual(mensagens_suprimidas()['agrupadas'], 4)
+
+    @override_settings(WHATSAPP_LIMITE_MENSAGENS=3)
+    def test_limite_por_remetente(self):
+        for n in range(5):
+            self._clique_lista(f'm{n}', 'pedido_oracao')
+        self.assertEqual(self.post.call_count, 3)
+        self.assertEqual(mensagens_suprimidas()['limitadas'], 2)
+
+    def test_aviso_cache_por_worker(self):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        arquivos = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                'LOCATION': tempfile.gettempdir()}}
+        with mock.patch.dict('os.environ', {'WEB_CONCURRENCY': '5'}):
+            with override_settings(CACHES=locmem):
+                self.assertEqual([a.id for a in verificar_cache_compartilhado()], ['app_igreja.W001'])
+            with override_settings(CACHES=arquivos):
+                self.assertEqual(verificar_cache_compartilhado(), [])
+        with mock.patch.dict('os.environ', {'WEB_CONCURRENCY': '1'}), override_settings(CACHES=locmem):
+            self.assertEqual(verificar_cache_compartilhado(), [])
+
+    @override_settings(WHATSAPP_AMOSTRAGEM_PAYLOAD=1, WHATSAPP_AMOSTRAS_MAX=2)
+    def test_amostras_em_buffer_circular(self):
+        for n in range(3):
+            self._clique_lista(f'm{n}', 'pedido_oracao')
+        self.assertEqual(TBWEBHOOKAMOSTRA.objects.count(), 2)
+        self.assertNotIn('997366866', ''.join(TBWEBHOOKAMOSTRA.objects.values_list('WAM_payload', flat=True)))
+
+    def test_log_em_fila_formata_na_thread(self):
+        saida = io.StringIO()
+        handler = FilaLogHandler(tamanho=1, stream=saida)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        registro = logging.LogRecord('app_igreja.whatsapp.eventos', logging.INFO, __file__, 0, '%s',
+                                     (Evento('whapi_envio', {'status': 200}),), None)
+        handler.emit(registro)
+        handler.parar()
+        self.assertEqual(json.loads(saida.getvalue()), {'evento': 'whapi_envio', 'status': 200})
+
+    def test_log_descartado_avisado_pela_thread(self):
+        escrevendo, liberar = threading.Event(), threading.Event()
+
+        class SaidaLenta(io.StringIO):
+            def write(self, texto):
+                escrevendo.set()
+                liberar.wait(5)
+                return super().write(texto)
+
+        saida = SaidaLenta()
+        handler = FilaLogHandler(tamanho=1, stream=saida)
+        registro = logging.LogRecord('app_igreja.whatsapp', logging.INFO, __file__, 0, 'envio', (), None)
+        handler.emit(registro)
+        escrevendo.wait(5)  # a thread está presa no primeiro registro; cabe mais um na fila
+        for _ in range(2):
+            handler.emit(registro)
+        liberar.set()
+        handler.parar()
+        self.assertEqual(handler.descartados, 1)
+        self.assertIn('1 registro(s) de log descartado(s)', saida.getvalue())
+
+
+class FilaWhatsappTests(TestCase):
+    """Lembretes de dízimo pela fila do WhatsApp (utils_fila_whatsapp)."""
+
+    def setUp(self):
+        hoje = date.today()
+        ana = TBDIZIMISTAS.objects.create(DIS_telefone='(18) 99736-6866', DIS_nome='Ana Souza', DIS_status=True)
+        bruno = TBDIZIMISTAS.objects.create(DIS_telefone='(18) 99111-2222', DIS_nome='Bruno', DIS_status=True)
+        self.dizimos = [
+            TBGERDIZIMO.objects.create(
+                GER_mesano=vencimento.replace(day=1), GER_dizimista=dizimista, GER_dtvencimento=vencimento,
+                GER_vlr_dizimo=Decimal('50.00'), GER_vlr_pago=pago,
+            )
+            for dizimista, vencimento, pago in (
+                (ana, hoje + timedelta(days=2), None),     # a vencer
+                (ana, hoje - timedelta(days=10), None),    # atrasado
+                (bruno, hoje - timedelta(days=5), Decimal('50.00')),  # pago
+                (bruno, hoje + timedelta(days=20), None),  # fora da janela
+            )
+        ]
+        self.enviados = []
+
+    def _enviar(self, telefone, texto, midia=''):
+        self.enviados.append((telefone, texto))
+        return {'sent': True}
+
+    def test_reexecucao_nao_duplica(self):
+        call_command('lembretes_dizimo', stdout=io.StringIO())
+        call_command('lembretes_dizimo', stdout=io.StringIO())
+        a_vencer, atrasado = self.dizimos[:2]
+        self.assertEqual(
+            sorted(TBFILAWHATSAPP.objects.values_list('FIL_chave', flat=True)),
+            [f'dizimo:{a_vencer.GER_id}:a_vencer', f'dizimo:{atrasado.GER_id}:atrasado'],
+        )
+        totais = processar_fila(enviar=self._enviar, dormir=lambda segundos: None)
+        self.assertEqual(totais['enviadas'], 2)
+        self.assertEqual({telefone for telefone, _ in self.enviados}, {'5518997366866'})
+        self.assertTrue(self.enviados[0][1].startswith('Olá, Ana!'))
+        self.assertEqual(processar_fila(enviar=self._enviar, dormir=lambda segundos: None)['enviadas'], 0)
+
+    def test_limite_da_whapi_interrompe_e_devolve_a_fila(self):
+        call_command('lembretes_dizimo', stdout=io.StringIO())
+        totais = processar_fila(enviar=lambda telefone, texto, midia: {'error': 'Erro 429: limite'}, dormir=lambda s: None)
+        self.assertEqual(totais['limite'], 1)
+        self.assertEqual(TBFILAWHATSAPP.objects.filter(FIL_status='PENDENTE', FIL_tentativas=0).count(), 2)
+
+    def test_aniversariantes_uma_mensagem_por_telefone_e_um_upload(self):
+        hoje = timezone.localdate()
+        TBDIZIMISTAS.objects.filter(DIS_nome='Ana Souza').update(DIS_data_nascimento=hoje.replace(year=1980))
+        TBDIZIMISTAS.objects.get(DIS_nome='Ana Souza').save()  # preenche DIS_dia_ano
+        TBCOLABORADORES.objects.create(
+            COL_telefone='5518997366866', COL_nome_completo='Ana Souza', COL_status='ATIVO',
+            COL_data_nascimento=hoje.replace(year=1980),
+        )
+        with mock.patch(
+            'app_igreja.management.commands.aniversariantes_whatsapp.subir_foto_capa', return_value='media-1',
+        ) as subir:
+            call_command('aniversariantes_whatsapp', stdout=io.StringIO())
+            call_command('aniversariantes_whatsapp', stdout=io.StringIO())
+        self.assertEqual(subir.call_count, 1)
+        fila = TBFILAWHATSAPP.objects.filter(FIL_origem='ANIVERSARIO')
+        self.assertEqual(list(fila.values_list('FIL_telefone', 'FIL_midia')), [('5518997366866', 'media-1')])
+
+    def test_aniversario_29_de_fevereiro_em_ano_nao_bissexto(self):
+        ana = TBDIZIMISTAS.objects.get(DIS_nome='Ana Souza')
+        ana.DIS_data_nascimento = date(1980, 2, 29)
+        ana.save()
+        self.assertEqual(len(felicitacoes(date(2027, 2, 28), 'São José')), 1)
+        self.assertEqual(felicitacoes(date(2028, 2, 28), 'São José'), [])
+        self.assertEqual(len(felicitacoes(date(2028, 2, 29), 'São José')), 1)
+
+    @override_settings(WHATSAPP_ENVIO_IMEDIATO=0)
+    def test_mensagem_em_massa_vai_pela_fila(self):
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(User.objects.create_superuser('admin', 'admin@exemplo.com', 'senha'))
+        with mock.patch.object(views_whatsapp_api._sessao, 'post') as post:
+            response = client.post('/app_igreja/admin-area/whatsapp/enviar/', {
+                'tipo_destinatario': 'DIZIMISTAS', 'tipo_midia': 'TEXTO', 'texto': 'Missa às 19h',
+            })
+        self.assertEqual(response.status_code, 302)
+        post.assert_not_called()  # nada sai para a Whapi dentro da requisição
+        mensagem = TBWHATSAPP.objects.get()
+        self.assertEqual((mensagem.WHA_status, mensagem.WHA_total_enviadas), ('PENDENTE', 2))
+        self.assertEqual(mensagem.fila.count(), 2)
+
+        totais = processar_fila(
+            enviar=lambda telefone, texto, midia: {'message': {'id': f'w{telefone}'}}, dormir=lambda s: None,
+        )
+        self.assertEqual(totais['enviadas'], 2)
+        mensagem.refresh_from_db()
+        self.assertEqual((mensagem.WHA_status, mensagem.WHA_sucessos, mensagem.WHA_erros), ('ENVIADA', 2, 0))
+        self.assertEqual(
+            set(mensagem.entregas.values_list('ENT_message_id', flat=True)), {'w5518997366866', 'w5518991112222'},
+        )
+
+    @override_settings(WHATSAPP_ENVIO_IMEDIATO=5, WHATSAPP_FILA_POR_MINUTO=60000)
+    def test_mensagem_em_massa_pequena_sai_na_hora(self):
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(User.objects.create_superuser('admin', 'admin@exemplo.com', 'senha'))
+        with mock.patch.object(views_whatsapp_api._sessao, 'post') as post:
+            post.return_value.status_code = 200
+            post.return_value.json.side_effect = [{'sent': True, 'message': {'id': 'w1'}}, {'sent': True, 'message': {'id': 'w2'}}]
+            client.post('/app_igreja/admin-area/whatsapp/enviar/', {
+                'tipo_destinatario': 'DIZIMISTAS', 'tipo_midia': 'TEXTO', 'texto': 'Missa às 19h',
+            })
+        self.assertEqual(post.call_count, 2)
+        mensagem = TBWHATSAPP.objects.get()
+        self.assertEqual((mensagem.WHA_status, mensagem.WHA_sucessos), ('ENVIADA', 2))
+        self.assertFalse(mensagem.fila.filter(FIL_status='PENDENTE').exists())
+
+    def test_media_id_recusado_vai_pela_url(self):
+        url = 'https://exemplo.com/aviso.jpg'
+        with mock.patch('app_igreja.utils_midia_whatsapp.media_id_url', return_value='media-1'), \
+                mock.patch('app_igreja.utils_midia_whatsapp.invalidar_midia') as invalidar, \
+                mock.patch.object(
+                    views_whatsapp_api, 'send_whatsapp_image',
+                    side_effect=[{'error': 'Erro 404: media not found'}, {'sent': True}],
+                ) as enviar_imagem:
+            self.assertEqual(enviar_item('5518997366866', 'Aviso', url), {'sent': True})
+        invalidar.assert_called_once_with('media-1')
+        self.assertEqual([c.args[1] for c in enviar_imagem.call_args_list], ['media-1', url])
+
+
+class RendicoesTests(TestCase):
+    """Rendições geradas no post_save de um ImageField (signals + utils_image)."""
+
+    def setUp(self):
+        cache.clear()
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        armazenamento = override_settings(
+            STORAGES={
+                **settings.STORAGES,
+                'default': {
+                    'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                    'OPTIONS': {'location': pasta.name, 'base_url': '/media/'},
+                },
+            },
+            IMAGENS_SINCRONO=True,
+            IMAGENS_WEBP=False,
+        )
+        armazenamento.enable()
+        self.addCleanup(armazenamento.disable)
+
+    def _png(self, largura, altura):
+        buffer = io.BytesIO()
+        Image.new('RGB', (largura, altura), (200, 30, 30)).save(buffer, format='PNG')
+        return ContentFile(buffer.getvalue(), name='patrocinador.png')
+
+    def test_salvar_gera_rendicoes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            banner = TBBANNERS.objects.create(BAN_NOME_PATROCINADOR='Padaria', BAN_IMAGE=self._png(2400, 1200))
+
+        rendicoes = {
+            r.REN_tamanho: r for r in TBRENDICAO.objects.filter(REN_original=banner.BAN_IMAGE.name)
+        }
+        self.assertEqual(set(rendicoes), {'thumb', 'medio', 'grande'})
+        self.assertEqual((rendicoes['grande'].REN_largura, rendicoes['grande'].REN_altura), (1600, 800))
+        self.assertEqual(rendicoes['thumb'].REN_largura, 200)
+        # O original também foi reduzido no upload (CAIXA_ORIGINAL), em JPEG
+        self.assertTrue(banner.BAN_IMAGE.name.endswith('.jpg'))
+        with default_storage.open(banner.BAN_IMAGE.name) as original:
+            self.assertEqual(Image.open(original).size, (1920, 960))
+        for rendicao in rendicoes.values():
+            self.assertEqual(rendicao.REN_formato, 'jpeg')
+            self.assertTrue(default_storage.exists(rendicao.REN_arquivo.name))
+        cache.clear()
+        self.assertEqual(url_rendicao(banner.BAN_IMAGE), default_storage.url(rendicoes['grande'].REN_arquivo.name))
+
+
+class MidiaWhatsappTests(TestCase):
+    """Cache de mídias da Whapi (utils_midia_whatsapp): cada arquivo sobe uma vez."""
+
+    def setUp(self):
+        cache.clear()
+        resposta = mock.Mock(status_code=200)
+        resposta.json.return_value = {'media': [{'id': 'media-1'}]}
+        patcher = mock.patch.object(views_whatsapp_api._sessao, 'post', return_value=resposta)
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+        log_whatsapp = logging.getLogger('app_igreja.whatsapp')
+        self.addCleanup(log_whatsapp.setLevel, log_whatsapp.level)
+        log_whatsapp.setLevel(logging.WARNING)
+
+    def test_sobe_uma_vez_e_reaproveita_pelo_hash(self):
+        capa = ContentFile(b'jpeg', name='visual/capa/capa.jpg')
+        self.assertEqual(media_id_arquivo(capa), 'media-1')
+        with self.assertNumQueries(0):
+            self.assertEqual(media_id_arquivo(capa), 'media-1')
+        self.assertEqual(media_id_arquivo(ContentFile(b'jpeg', name='visual/capa/copia.jpg')), 'media-1')
+        self.assertEqual(self.post.call_count, 1)
+        self.assertEqual(self.post.call_args.kwargs['headers']['content-type'], 'image/jpeg')
+
+    def test_expirada_sobe_de_novo(self):
+        capa = ContentFile(b'jpeg', name='visual/capa/capa.jpg')
+        media_id_arquivo(capa)
+        TBMIDIAWHATSAPP.objects.update(MWA_expira_em=timezone.now() - timedelta(days=1))
+        cache.clear()
+        media_id_arquivo(capa)
+        self.assertEqual(self.post.call_count, 2)
+
+
+@override_settings(WHATSAPP_AMOSTRAGEM_PAYLOAD=0, WHATSAPP_STATUS_LOTE=3, WHATSAPP_STATUS_INTERVALO=60)
+class EntregasWhatsappTests(TestCase):
+    """Status de entrega do webhook (utils_entregas_whatsapp): acumulados e gravados em lote."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(HTTP_HOST='localhost')
+        self.addCleanup(limpar_pendentes)
+        self.mensagem = TBWHATSAPP.objects.create(
+            WHA_texto='Aviso', WHA_total_enviadas=3, WHA_sucessos=3, WHA_status='ENVIADA',
+        )
+        registrar_envios(self.mensagem, [('m1', '5518900000001'), ('m2', '5518900000002'), ('m3', '5518900000003')])
+        log_whatsapp = logging.getLogger('app_igreja.whatsapp')
+        self.addCleanup(log_whatsapp.setLevel, log_whatsapp.level)
+        log_whatsapp.setLevel(logging.WARNING)
+
+    def _status(self, *statuses):
+        payload = {
+            'event': {'type': 'statuses'},
+            'statuses': [{'id': message_id, 'status': status} for message_id, status in statuses],
+        }
+        return self.client.post(
+            '/app_igreja/api/whatsapp/webhook/', json.dumps(payload), content_type='application/json',
+        )
+
+    def test_status_acumulados_gravados_no_lote(self):
+        self._status(('m1', 'delivered'))
+        self._status(('m1', 'read'), ('m2', 'delivered'))
+        self.assertFalse(TBENTREGAWHATSAPP.objects.exclude(ENT_status='ENVIADA').exists())
+
+        self._status(('m3', 'delivered'))
+        self.mensagem.refresh_from_db()
+        self.assertEqual((self.mensagem.WHA_entregues, self.mensagem.WHA_lidas), (3, 1))
+        self.assertEqual(self.mensagem.WHA_status, 'ENTREGUE')
+        self.assertEqual(
+            dict(TBENTREGAWHATSAPP.objects.values_list('ENT_message_id', 'ENT_status')),
+            {'m1': 'LIDA', 'm2': 'ENTREGUE', 'm3': 'ENTREGUE'},
+        )
+
+    def test_status_so_avanca_e_falha_vira_erro(self):
+        aplicar_status({'m1': ('LIDA', None), 'm2': ('ERRO', 'sem WhatsApp')})
+        # Fora de ordem (delivered depois de read) e repetidos não mudam os totais: só o SELECT
+        # do lote (entre o SAVEPOINT e o RELEASE da transação)
+        with self.assertNumQueries(3):
+            self.assertEqual(aplicar_status({'m1': ('ENTREGUE', None), 'm2': ('ERRO', 'sem WhatsApp')}), 0)
+        self.mensagem.refresh_from_db()
+        self.assertEqual(
+            (self.mensagem.WHA_sucessos, self.mensagem.WHA_erros, self.mensagem.WHA_entregues, self.mensagem.WHA_lidas),
+            (2, 1, 1, 1),
+        )
+        self.assertEqual(TBENTREGAWHATSAPP.objects.get(ENT_message_id='m2').ENT_erro, 'sem WhatsApp')
+
+    def test_status_antes_do_registro_do_envio(self):
+        # O "sent"/"delivered" chega antes de a fila gravar a entrega: fica no acumulador
+        self._status(('m4', 'delivered'))
+        marcar_envio('m4')
+        self.assertEqual(descarregar(), 0)
+        registrar_envios(self.mensagem, [('m4', '5518900000004')])
+        self.assertEqual(descarregar(), 1)
+        self.assertEqual(TBENTREGAWHATSAPP.objects.get(ENT_message_id='m4').ENT_status, 'ENTREGUE')
+        self.mensagem.refresh_from_db()
+        self.assertEqual(self.mensagem.WHA_entregues, 1)
+
+    @override_settings(WHATSAPP_STATUS_ESPERA=0)
+    def test_status_sem_registro_descartado_apos_espera(self):
+        self._status(('m9', 'delivered'))
+        marcar_envio('m9')
+        descarregar()
+        with self.assertLogs('app_igreja.utils_entregas_whatsapp', 'INFO'):
+            descarregar()
+        self.assertEqual(descarregar(), 0)
+
+    def test_status_fora_da_fila_descartado_na_hora(self):
+        # Resposta do chatbot: nunca terá entrega gravada, não volta ao acumulador
+        self._status(('chatbot1', 'delivered'))
+        descarregar()
+        with self.assertNumQueries(0):
+            self.assertEqual(descarregar(), 0)
+
+    def test_mensagem_nao_fica_entregue_durante_o_envio(self):
+        TBWHATSAPP.objects.filter(pk=self.mensagem.pk).update(WHA_total_enviadas=10)
+        self._status(('m1', 'delivered'), ('m2', 'delivered'), ('m3', 'delivered'))
+        descarregar()
+        self.mensagem.refresh_from_db()
+        self.assertEqual((self.mensagem.WHA_entregues, self.mensagem.WHA_status), (3, 'ENVIADA'))
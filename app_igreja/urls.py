@@ -65,17 +65,17 @@ from .views.admin_area.views_relatorios import relatorio_aniversariantes, relato
 from .views.admin_area.views_extrator_liturgias import extrator_liturgias, extrator_liturgias_api
 
 # Área Administrativa - WhatsApp (Envio Manual e Debug)
-from .views.admin_area.views_whatsapp import whatsapp_enviar_mensagem, whatsapp_list, whatsapp_detail, whatsapp_excluir, whatsapp_debug
+from .views.admin_area.views_whatsapp import whatsapp_enviar_mensagem, whatsapp_list, whatsapp_detail, whatsapp_excluir, whatsapp_debug, whatsapp_buscar_destinatarios, whatsapp_contar_destinatarios
 
 # Área Pública
 from .views.area_publica.views_liturgias_publico import liturgias_publico
 from .views.area_publica.views_contato import contatos_publico
 from .views.area_publica.views_cadastro_dizimista_pub import cadastro_dizimista_pub, quero_ser_dizimista, verificar_telefone_cadastro_dizimista_pub
 from .views.area_publica.views_oracoes import meus_pedidos_oracoes, detalhar_oracao_publico, criar_pedido_oracao_publico
-from .views.area_publica.views_avisos_paroquia_pub import avisos_paroquia_pub
+from .views.area_publica.views_avisos_paroquia_pub import avisos_paroquia_pub, avisos_paroquia_pub_json, avisos_paroquia_rss, avisos_paroquia_atom
 from .views.area_publica.views_calendario_eventos_pub import calendario_eventos_publico, ver_programacao_evento
 from .views.area_publica.views_aniversariantes_pub import aniversariantes_publico
-from .views.area_publica.views_celebracoes_agendadas_pub import list_celebracoes_agendadas_pub, agendar_celebracoes_agendadas_pub, detalhe_celebracoes_agendadas_pub
+from .views.area_publica.views_celebracoes_agendadas_pub import list_celebracoes_agendadas_pub, agendar_celebracoes_agendadas_pub, detalhe_celebracoes_agendadas_pub, disponibilidade_celebracoes_pub
 from .views.area_publica.views_doacoes import doacoes_publico
 from .views.area_publica.views_mural import mural_publico, mural_publico_redirect
 from .views.area_publica.views_escala_publico import escala_publico, atribuir_colaborador_escala 
@@ -97,6 +97,8 @@ app_name = 'app_igreja'
 urlpatterns = [
     # Painel Administrativo
     path('admin-area/', views.admin_area, name='admin_area'),
+    path('admin-area/estatisticas/', views.admin_estatisticas_api, name='admin_estatisticas'),
+    path('admin-area/desempenho/', views.admin_desempenho, name='admin_desempenho'),
     path('admin-area/dioceses/', diocese_crud_unico, name='diocese_crud_unico'),
     path('admin-area/paroquias/', paroquia_crud_unico, name='paroquia_crud_unico'),
     # Grupos
@@ -153,6 +155,7 @@ urlpatterns = [
     path('gerenciar-dizimistas/<int:dizimista_id>/editar/', editar_dizimista, name='editar_dizimista'),
     path('gerenciar-dizimistas/<int:dizimista_id>/excluir/', excluir_dizimista, name='excluir_dizimista'),
     path('gerenciar-dizimistas/api/cep/<str:cep>/', api_cep, name='api_cep_dizimistas'),
+    path('api/cep/<str:cep>/', api_cep, name='api_cep'),
     
     # Conteúdo (Liturgias, Avisos, Mural, Banners)
     path('admin-area/liturgias/', listar_liturgias, name='listar_liturgias'),
@@ -223,6 +226,8 @@ urlpatterns = [
     path('admin-area/whatsapp/', whatsapp_list, name='whatsapp_list'),
     path('admin-area/whatsapp/enviar/', whatsapp_enviar_mensagem, name='whatsapp_enviar_mensagem'),
     path('admin-area/whatsapp/debug/', whatsapp_debug, name='whatsapp_debug'),
+    path('admin-area/whatsapp/buscar-destinatarios/', whatsapp_buscar_destinatarios, name='whatsapp_buscar_destinatarios'),
+    path('admin-area/whatsapp/contar-destinatarios/', whatsapp_contar_destinatarios, name='whatsapp_contar_destinatarios'),
     path('admin-area/whatsapp/<int:pk>/', whatsapp_detail, name='whatsapp_detail'),
     path('admin-area/whatsapp/<int:pk>/excluir/', whatsapp_excluir, name='whatsapp_excluir'),
     
@@ -234,6 +239,9 @@ urlpatterns = [
     path('cadastro-dizimista/', cadastro_dizimista_pub, name='cadastro_dizimista_pub'),
     path('cadastro-dizimista/verificar-telefone/', verificar_telefone_cadastro_dizimista_pub, name='verificar_telefone_ajax'),
     path('avisos/', avisos_paroquia_pub, name='avisos_paroquia_pub'),
+    path('avisos/json/', avisos_paroquia_pub_json, name='avisos_paroquia_pub_json'),
+    path('avisos/rss/', avisos_paroquia_rss, name='avisos_paroquia_rss'),
+    path('avisos/atom/', avisos_paroquia_atom, name='avisos_paroquia_atom'),
     path('cadastro-colaborador/', cadastro_colaborador, name='cadastro_colaborador'),
     path('quero-ser-colaborador/', quero_ser_colaborador, name='quero_ser_colaborador'),
     path('doacoes/', doacoes_publico, name='doacoes_publico'),
@@ -246,9 +254,11 @@ urlpatterns = [
     path('calendario-eventos/<int:evento_id>/programacao/', ver_programacao_evento, name='ver_programacao_evento'),
     path('celebracoes-agendadas-pub/', list_celebracoes_agendadas_pub, name='celebracoes_agendadas_pub'),
     path('celebracoes-agendadas-pub/agendar/', agendar_celebracoes_agendadas_pub, name='celebracoes_agendadas_pub_agendar'),
+    path('celebracoes-agendadas-pub/disponibilidade/', disponibilidade_celebracoes_pub, name='celebracoes_agendadas_pub_disponibilidade'),
     path('agendar-celebracao/', agendar_celebracoes_agendadas_pub, name='agendar_celebracao'),
     path('meus-pedidos-oracoes/', meus_pedidos_oracoes, name='meus_pedidos_oracoes'),
     path('meus-pedidos-oracoes/novo/', criar_pedido_oracao_publico, name='criar_pedido_oracao_publico'),
+    path('meus-pedidos-oracoes/<int:oracao_id>/', detalhar_oracao_publico, name='detalhar_oracao_publico'),
     path('celebracoes-agendadas-pub/<int:celebracao_id>/', detalhe_celebracoes_agendadas_pub, name='celebracoes_agendadas_pub_detalhe'),
     # App Flutter e API de Autenticação
     path('app/home/', app_home, name='app_home'),
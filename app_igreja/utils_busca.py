@@ -0,0 +1,160 @@
+"""
+Busca textual de dizimistas e colaboradores
+
+O texto pesquisável de cada registro vira termos em TBTERMOBUSCA (signals, ao salvar):
+cada palavra em minúsculas, sem acentos e sem pontuação, e cada sufixo dos dígitos do
+telefone. Assim:
+- "Conceição" e "conceicao" encontram o mesmo registro;
+- termo de texto casa com o início de qualquer palavra;
+- termo numérico casa em qualquer posição do telefone (é o início de um sufixo);
+- a comparação é um intervalo no índice (TER_termo >= 'mar' AND < 'mas'), não um
+  LIKE com curinga no começo, que leria a tabela inteira;
+- resultado vem ordenado por relevância (nome começando pelo termo primeiro), pela
+  coluna DIS_busca / COL_busca (" maria da conceicao 18997366866 ...") das linhas já
+  filtradas.
+
+Usado pelas listagens do admin e pelo seletor de destinatários do WhatsApp.
+
+TBTERMOBUSCA só acompanha o cadastro pelos sinais de save() e delete() (signals.py).
+QuerySet.update(), bulk_create(), bulk_update() e SQL direto não disparam sinais e
+deixam o índice desatualizado; depois deles, rode `python manage.py reindexar_busca`.
+
+Históricos por telefone (celebrações, pedidos de oração) usam chave_telefone: uma
+coluna indexada com o telefone normalizado, consultada por igualdade.
+"""
+import re
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .templatetags.format_utils import remover_acentos
+
+TAMANHO_COLUNA_BUSCA = 500
+TAMANHO_TERMO = 40
+
+# Ordem dos caracteres de um termo; a mesma em ASCII e nas collations do MySQL/PostgreSQL
+ALFABETO_TERMO = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+_NAO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+
+
+def normalizar_busca(texto):
+    """Minúsculas, sem acentos e só letras/dígitos separados por um espaço."""
+    texto = remover_acentos(str(texto or '')).lower()
+    return _NAO_ALFANUMERICO.sub(' ', texto).strip()
+
+
+def montar_texto_busca(*partes):
+    """Monta o valor da coluna de busca a partir dos campos do registro (nome primeiro)."""
+    palavras = []
+    for parte in partes:
+        palavras.extend(normalizar_busca(parte).split())
+    return (' ' + ' '.join(palavras))[:TAMANHO_COLUNA_BUSCA] if palavras else ''
+
+
+def montar_termos(nome='', apelido='', telefone='', outros=()):
+    """[(campo, termo)] de um registro para TBTERMOBUSCA, sem repetição."""
+    termos = set()
+    for campo, texto in [('NOME', nome), ('APELIDO', apelido)] + [('OUTROS', t) for t in outros]:
+        termos.update((campo, palavra[:TAMANHO_TERMO]) for palavra in normalizar_busca(texto).split())
+    digitos = somente_digitos(telefone)[-TAMANHO_TERMO:]
+    termos.update(('TELEFONE', digitos[i:]) for i in range(len(digitos)))
+    return sorted(termos)
+
+
+def indexar_registro(tabela, registro, termos):
+    """Substitui os termos de busca do registro (tabela 'DIS' ou 'COL')."""
+    from .models.area_admin.models_busca import TBTERMOBUSCA
+    TBTERMOBUSCA.objects.filter(TER_tabela=tabela, TER_registro=registro).delete()
+    TBTERMOBUSCA.objects.bulk_create([
+        TBTERMOBUSCA(TER_tabela=tabela, TER_registro=registro, TER_campo=campo, TER_termo=termo)
+        for campo, termo in termos
+    ])
+
+
+def remover_registro(tabela, registro):
+    from .models.area_admin.models_busca import TBTERMOBUSCA
+    TBTERMOBUSCA.objects.filter(TER_tabela=tabela, TER_registro=registro).delete()
+
+
+def _intervalo_prefixo(prefixo):
+    """
+    Termos que começam por `prefixo` como intervalo: 'mar' -> >= 'mar' e < 'mas'
+    ('maz' -> < 'mb'; só 'z' -> sem limite superior).
+    """
+    filtro = {'TER_termo__gte': prefixo}
+    fim = prefixo.rstrip('z')
+    if fim:
+        filtro['TER_termo__lt'] = fim[:-1] + ALFABETO_TERMO[ALFABETO_TERMO.index(fim[-1]) + 1]
+    return filtro
+
+
+def filtrar_por_busca(queryset, tabela, campo_busca, termo, campo_ordem, ordenar=True, campos=None):
+    """
+    Filtra o queryset pelo termo (todas as palavras precisam casar) e ordena por relevância.
+
+    Cada palavra é um IN (SELECT TER_registro ...) pelo intervalo do índice de TBTERMOBUSCA;
+    campos limita os termos considerados (ex.: ['APELIDO']).
+    Relevância: 0 = coluna começa pelo termo inteiro (nome), 1 = alguma palavra começa
+    pelo termo inteiro, 2 = demais; empate pelo campo_ordem.
+    Com ordenar=False apenas filtra (para combinar vários filtros no mesmo queryset).
+    """
+    from .models.area_admin.models_busca import TBTERMOBUSCA
+    termo_normalizado = normalizar_busca(termo)
+    if not termo_normalizado:
+        return queryset
+
+    filtro = Q()
+    for palavra in termo_normalizado.split():
+        termos = TBTERMOBUSCA.objects.filter(TER_tabela=tabela, **_intervalo_prefixo(palavra[:TAMANHO_TERMO]))
+        if campos:
+            termos = termos.filter(TER_campo__in=campos)
+        filtro &= Q(pk__in=termos.values('TER_registro'))
+
+    queryset = queryset.filter(filtro)
+    if not ordenar:
+        return queryset
+    return queryset.annotate(
+        relevancia_busca=Case(
+            When(**{f'{campo_busca}__startswith': f' {termo_normalizado}'}, then=Value(0)),
+            When(**{f'{campo_busca}__contains': f' {termo_normalizado}'}, then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        )
+    ).order_by('relevancia_busca', campo_ordem)
+
+
+def buscar_dizimistas(termo, queryset=None, ordenar=True, campos=None):
+    """Busca dizimistas por nome, telefone, e-mail ou cidade."""
+    from .models.area_admin.models_dizimistas import TBDIZIMISTAS
+    if queryset is None:
+        queryset = TBDIZIMISTAS.objects.all()
+    return filtrar_por_busca(queryset, 'DIS', 'DIS_busca', termo, 'DIS_nome', ordenar, campos)
+
+
+def buscar_colaboradores(termo, queryset=None, ordenar=True, campos=None):
+    """Busca colaboradores por nome, apelido ou telefone (campos: ex. ['APELIDO'])."""
+    from .models.area_admin.models_colaboradores import TBCOLABORADORES
+    if queryset is None:
+        queryset = TBCOLABORADORES.objects.all()
+    return filtrar_por_busca(queryset, 'COL', 'COL_busca', termo, 'COL_nome_completo', ordenar, campos)
+
+
+def somente_digitos(texto):
+    """Dígitos do texto (para telefones digitados com máscara)."""
+    return re.sub(r'[^\d]', '', str(texto or ''))
+
+
+def chave_telefone(telefone):
+    """
+    Chave de busca exata de um telefone: DDD + últimos 8 dígitos.
+
+    "(18) 99736-6866", "5518997366866" e "(18) 9736-6866" (sem o 9 do celular)
+    têm a mesma chave "1897366866". Números com menos de 10 dígitos ficam só com
+    os dígitos.
+    """
+    numeros = somente_digitos(telefone)
+    if numeros.startswith('55') and len(numeros) > 11:
+        numeros = numeros[2:]
+    if len(numeros) in (10, 11):
+        return numeros[:2] + numeros[-8:]
+    return numeros
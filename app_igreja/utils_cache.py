@@ -0,0 +1,40 @@
+"""
+Versões de conteúdo para chaves de cache
+
+Cada model registrado guarda no cache o instante da sua última alteração, atualizado
+por sinais no save/delete (ver signals.py). Chaves que incluem essas versões ficam
+obsoletas sozinhas quando o conteúdo muda: nada precisa ser apagado fragmento a
+fragmento, e a entrada antiga expira pelo próprio TTL.
+
+Com vários workers do gunicorn o cache precisa ser compartilhado (em produção, o
+FileBasedCache de pro_igreja/settings/production.py); com o cache em memória de cada
+processo, o TTL limita o atraso.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+def _chave_versao(model):
+    return f'versao:{model._meta.label}'
+
+
+def versao_model(model):
+    """Instante (float, como string) da última alteração registrada do model."""
+    chave = _chave_versao(model)
+    versao = cache.get(chave)
+    if versao is None:
+        # Primeiro acesso (ou cache limpo): qualquer valor novo invalida o que havia antes
+        cache.add(chave, repr(time.time()), None)
+        versao = cache.get(chave)
+    return versao
+
+
+def versao_conteudo(*models):
+    """Versão combinada de vários models (curta, para compor chaves de cache)."""
+    return hashlib.md5('|'.join(versao_model(m) for m in models).encode()).hexdigest()[:12]
+
+
+def marcar_alteracao(model):
+    cache.set(_chave_versao(model), repr(time.time()), None)
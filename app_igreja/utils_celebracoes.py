@@ -0,0 +1,156 @@
+"""
+Disponibilidade de horários para agendamento de celebrações
+
+Horários válidos de um mês = horários fixos da paróquia (PAR_horarios_fixos_json, por
+dia da semana) + horário lançado na agenda do mês (TBITEAGENDAMES) quando diferente.
+A grade do mês é calculada uma vez e guardada no cache com a versão de conteúdo da
+paróquia e da agenda (utils_cache); a ocupação vem de UMA consulta agrupada por
+(data, horário).
+
+Cada horário aceita até CELEBRACOES_CAPACIDADE_HORARIO agendamentos não cancelados.
+reservar_celebracao grava o agendamento dentro de uma transação que começa com um UPDATE
+na linha do horário em TBVAGACELEBRACAO (criada no primeiro pedido): a trava fica com o
+horário até o commit, então dois pedidos simultâneos para a última vaga não passam os
+dois. Funciona também no SQLite, onde select_for_update não trava nada (a escrita já
+serializa as transações).
+"""
+import calendar
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models.area_admin.models_agenda_mes import TBAGENDAMES, TBITEAGENDAMES
+from .models.area_admin.models_celebracoes import TBCELEBRACOES, TBVAGACELEBRACAO
+from .models.area_admin.models_paroquias import TBPAROQUIA
+from .utils_cache import versao_conteudo
+
+TEMPO_CACHE_GRADE = 24 * 60 * 60  # segundos; a versão muda quando paróquia/agenda mudam
+
+# date.weekday() -> chave de PAR_horarios_fixos_json
+DIAS_SEMANA = ['segunda', 'terca', 'quarta', 'quinta', 'sexta', 'sabado', 'domingo']
+
+
+class HorarioIndisponivel(Exception):
+    """Horário fora da grade de celebrações ou sem vagas."""
+
+
+def capacidade_por_horario():
+    return getattr(settings, 'CELEBRACOES_CAPACIDADE_HORARIO', 5)
+
+
+def _para_time(valor):
+    """'8:00', '08:00:00' ou time -> time (None se inválido)."""
+    if hasattr(valor, 'hour'):
+        return valor.replace(second=0, microsecond=0)
+    partes = str(valor or '').strip().split(':')
+    try:
+        return datetime.strptime(f'{int(partes[0]):02d}:{int(partes[1]):02d}', '%H:%M').time()
+    except (ValueError, IndexError):
+        return None
+
+
+def _calcular_grade(ano, mes, horarios_fixos):
+    agenda = dict(
+        TBITEAGENDAMES.objects.filter(
+            AGE_ITE_MES__AGE_MES=date(ano, mes, 1), AGE_ITE_HORARIO__isnull=False,
+        ).exclude(AGE_ITE_MODELO=0).values_list('AGE_ITE_DIA', 'AGE_ITE_HORARIO')
+    )
+    grade = {}
+    for dia in range(1, calendar.monthrange(ano, mes)[1] + 1):
+        data = date(ano, mes, dia)
+        fixos = horarios_fixos.get(DIAS_SEMANA[data.weekday()], [])
+        if isinstance(fixos, str):
+            fixos = [fixos]
+        horarios = {h for h in map(_para_time, fixos) if h}
+        if dia in agenda:
+            horarios.add(_para_time(agenda[dia]))
+        if horarios:
+            grade[data] = sorted(horarios)
+    return grade
+
+
+def grade_do_mes(ano, mes):
+    """{date: [time, ...]} com os horários de celebração do mês (em cache)."""
+    chave = f'celebracoes:grade:{ano}-{mes:02d}:{versao_conteudo(TBPAROQUIA, TBAGENDAMES, TBITEAGENDAMES)}'
+    grade = cache.get(chave)
+    if grade is None:
+        paroquia = TBPAROQUIA.objects.first()
+        grade = _calcular_grade(ano, mes, paroquia.get_horarios_fixos() if paroquia else {})
+        cache.set(chave, grade, TEMPO_CACHE_GRADE)
+    return grade
+
+
+def ocupacao_do_mes(ano, mes):
+    """{(date, time): agendamentos não cancelados} numa consulta agrupada."""
+    linhas = TBCELEBRACOES.objects.filter(
+        CEL_data_celebracao__year=ano, CEL_data_celebracao__month=mes,
+    ).exclude(CEL_status='cancelada').values('CEL_data_celebracao', 'CEL_horario').annotate(
+        total=Count('id')
+    ).order_by()
+    ocupacao = {}
+    for linha in linhas:
+        chave = (linha['CEL_data_celebracao'], _para_time(linha['CEL_horario']))
+        ocupacao[chave] = ocupacao.get(chave, 0) + linha['total']
+    return ocupacao
+
+
+def disponibilidade_do_mes(ano, mes, a_partir_de=None):
+    """
+    [{'data': date, 'horario': time, 'ocupadas': n, 'livres': n}, ...] do mês.
+
+    Dias anteriores a a_partir_de (padrão: hoje) ficam de fora.
+    """
+    a_partir_de = a_partir_de or date.today()
+    capacidade = capacidade_por_horario()
+    ocupacao = ocupacao_do_mes(ano, mes)
+    vagas = []
+    for data, horarios in sorted(grade_do_mes(ano, mes).items()):
+        if data < a_partir_de:
+            continue
+        for horario in horarios:
+            ocupadas = ocupacao.get((data, horario), 0)
+            vagas.append({
+                'data': data, 'horario': horario,
+                'ocupadas': ocupadas, 'livres': max(capacidade - ocupadas, 0),
+            })
+    return vagas
+
+
+def verificar_horario(data, horario, ignorar_pk=None):
+    """
+    Levanta HorarioIndisponivel se o horário não está na grade ou não tem vaga.
+
+    Sem nenhum horário configurado no mês (paróquia sem grade), qualquer horário é aceito.
+    """
+    grade = grade_do_mes(data.year, data.month)
+    if not grade:
+        return
+    horario = _para_time(horario)
+    if horario not in grade.get(data, []):
+        disponiveis = ', '.join(h.strftime('%H:%M') for h in grade.get(data, [])) or 'nenhum'
+        raise HorarioIndisponivel(
+            f'Não há celebração às {horario:%H:%M} em {data:%d/%m/%Y}. Horários do dia: {disponiveis}.'
+        )
+    ocupadas = TBCELEBRACOES.objects.filter(
+        CEL_data_celebracao=data, CEL_horario=horario,
+    ).exclude(CEL_status='cancelada').exclude(pk=ignorar_pk).count()
+    if ocupadas >= capacidade_por_horario():
+        raise HorarioIndisponivel(
+            f'O horário das {horario:%H:%M} em {data:%d/%m/%Y} está lotado. Escolha outro horário.'
+        )
+
+
+def reservar_celebracao(celebracao):
+    """Confere a vaga e grava o agendamento na mesma transação (HorarioIndisponivel se lotado)."""
+    data, horario = celebracao.CEL_data_celebracao, _para_time(celebracao.CEL_horario)
+    with transaction.atomic():
+        if horario is not None:
+            # Trava só este horário: o UPDATE segura a linha até o fim da transação
+            vaga, _ = TBVAGACELEBRACAO.objects.get_or_create(VAG_data=data, VAG_horario=horario)
+            TBVAGACELEBRACAO.objects.filter(pk=vaga.pk).update(VAG_reservas=F('VAG_reservas') + 1)
+        verificar_horario(celebracao.CEL_data_celebracao, celebracao.CEL_horario, ignorar_pk=celebracao.pk)
+        celebracao.save()
+    return celebracao
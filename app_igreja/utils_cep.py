@@ -0,0 +1,153 @@
+"""
+Resolução de CEP com cache local
+
+Ordem de consulta:
+1. LRU em memória do processo (CEPs recentes, inclusive os inexistentes)
+2. Tabela TBCEP (CEPs já resolvidos ou importados via `importar_ceps`)
+3. ViaCEP, apenas quando o CEP não está em nenhum dos dois
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+import requests
+from django.utils import timezone
+
+from .models.area_admin.models_cep import TBCEP
+
+logger = logging.getLogger(__name__)
+
+VIACEP_URL = 'https://viacep.com.br/ws/{cep}/json/'
+VIACEP_TIMEOUT = 5  # segundos
+
+LRU_MAX_ITENS = 2048
+# CEP inexistente volta a ser consultado no ViaCEP depois deste prazo (CEPs novos surgem)
+VALIDADE_CEP_INEXISTENTE = timedelta(days=30)
+
+# Marca CEP inexistente no LRU (None significa "não está no cache")
+_CEP_INEXISTENTE = object()
+
+
+class CepServicoIndisponivel(Exception):
+    """ViaCEP fora do ar, com timeout ou resposta inesperada."""
+
+
+class _LRU:
+    """LRU simples e thread-safe (workers do gunicorn podem usar threads)."""
+
+    def __init__(self, max_itens):
+        self.max_itens = max_itens
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            valor = self._dados.get(chave)
+            if valor is not None:
+                self._dados.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor):
+        with self._lock:
+            self._dados[chave] = valor
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_itens:
+                self._dados.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+
+
+_lru = _LRU(LRU_MAX_ITENS)
+
+
+def limpar_cep(cep):
+    """Retorna só os dígitos do CEP ou None se não tiver 8 dígitos."""
+    cep_limpo = re.sub(r'[^\d]', '', str(cep or ''))
+    return cep_limpo if len(cep_limpo) == 8 else None
+
+
+def _consultar_viacep(cep_limpo):
+    """Consulta o ViaCEP e grava o resultado (positivo ou negativo) em TBCEP."""
+    try:
+        response = requests.get(VIACEP_URL.format(cep=cep_limpo), timeout=VIACEP_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        raise CepServicoIndisponivel(str(e)) from e
+
+    # ViaCEP responde 400 para formato inválido e 200 com {"erro": true} para CEP inexistente
+    if response.status_code == 400:
+        dados = {'erro': True}
+    elif response.status_code == 200:
+        try:
+            dados = response.json()
+        except ValueError as e:
+            raise CepServicoIndisponivel('Resposta inválida do ViaCEP') from e
+    else:
+        raise CepServicoIndisponivel(f'ViaCEP retornou {response.status_code}')
+
+    if dados.get('erro'):
+        registro, _ = TBCEP.objects.update_or_create(
+            CEP_cep=cep_limpo,
+            defaults={'CEP_valido': False, 'CEP_fonte': 'VIACEP', 'CEP_data_consulta': timezone.now()},
+        )
+        return registro
+
+    registro, _ = TBCEP.objects.update_or_create(
+        CEP_cep=cep_limpo,
+        defaults={
+            'CEP_logradouro': (dados.get('logradouro') or '')[:200],
+            'CEP_bairro': (dados.get('bairro') or '')[:100],
+            'CEP_cidade': (dados.get('localidade') or '')[:100],
+            'CEP_estado': (dados.get('uf') or '')[:2],
+            'CEP_complemento': (dados.get('complemento') or '')[:100],
+            'CEP_valido': True,
+            'CEP_fonte': 'VIACEP',
+            'CEP_data_consulta': timezone.now(),
+        },
+    )
+    return registro
+
+
+def buscar_cep(cep):
+    """
+    Resolve um CEP.
+
+    Returns:
+        dict com cep, logradouro, bairro, cidade, estado e complemento,
+        ou None se o CEP for inválido ou não existir.
+
+    Raises:
+        CepServicoIndisponivel: CEP fora do cache e ViaCEP indisponível.
+    """
+    cep_limpo = limpar_cep(cep)
+    if not cep_limpo:
+        return None
+
+    em_memoria = _lru.get(cep_limpo)
+    if em_memoria is not None:
+        return None if em_memoria is _CEP_INEXISTENTE else dict(em_memoria)
+
+    registro = TBCEP.objects.filter(CEP_cep=cep_limpo).first()
+    expirado = (
+        registro is not None
+        and not registro.CEP_valido
+        and registro.CEP_data_consulta < timezone.now() - VALIDADE_CEP_INEXISTENTE
+    )
+    if registro is None or expirado:
+        registro = _consultar_viacep(cep_limpo)
+
+    if not registro.CEP_valido:
+        _lru.set(cep_limpo, _CEP_INEXISTENTE)
+        return None
+
+    endereco = registro.to_dict()
+    _lru.set(cep_limpo, endereco)
+    return dict(endereco)
+
+
+def limpar_cache_cep():
+    """Esvazia o LRU do processo (usado após importação em massa)."""
+    _lru.clear()
@@ -0,0 +1,358 @@
+"""
+Chatbot do WhatsApp: tabela de rotas, menus pré-serializados e estado por remetente
+
+Cada resposta recebida pelo webhook (item da lista do menu principal ou botão de um
+submenu) é resolvida por um dicionário indexado pelo ID: ROTAS_LISTA e ROTAS_BOTAO
+apontam para o nome do payload a enviar. Para acrescentar uma opção basta uma linha
+em MENU_PRINCIPAL e outra em SUBMENUS.
+
+Os corpos JSON das mensagens são montados uma vez por processo a partir do nome da
+paróquia e do SITE_URL e guardados já serializados; destinatário e telefone entram por
+substituição de texto. O conjunto é refeito quando a paróquia é salva (versão de
+conteúdo, utils_cache), então responder a uma mensagem não consulta o banco.
+
+Primeiro contato e mensagens já processadas ficam no cache (cache.add), com validade -
+no lugar dos sets em memória, que cresciam sem limite. A garantia depende do backend:
+- FileBasedCache (produção: pro_igreja/settings/production.py, pasta fixa cache_django
+  do projeto): a marca é vista por todos os workers do gunicorn, mas add() é "existe?
+  grava", sem trava entre processos. Duas entregas do mesmo evento no mesmo instante em
+  workers diferentes podem passar as duas (resposta duplicada rara); fora dessa
+  corrida, a repetição é descartada.
+- LocMemCache (desenvolvimento e testes, sem CACHE_DIR): add() é atômico, mas cada
+  processo tem o seu cache; com vários workers, cada um só enxerga as marcas que ele
+  mesmo gravou.
+Para "exatamente uma vez" entre workers é preciso um backend com add() atômico
+compartilhado (Redis, Memcached). Os contadores abaixo (incr) têm a mesma ressalva.
+
+Contra rajadas de um mesmo número (várias mensagens seguidas, figurinhas):
+- dentro_do_limite(): janela deslizante de WHATSAPP_LIMITE_MENSAGENS mensagens por
+  WHATSAPP_JANELA_LIMITE segundos, aproximada por dois baldes fixos no cache (o balde
+  anterior entra com peso proporcional ao trecho ainda dentro da janela);
+- menu_liberado(): o menu principal vai uma vez por WHATSAPP_JANELA_AGRUPAMENTO
+  segundos; as demais mensagens da rajada são agrupadas nessa resposta.
+As mensagens descartadas são contadas por motivo (mensagens_suprimidas) e aparecem na
+página de desempenho da área administrativa. Os dois dependem do cache compartilhado
+entre os workers: com LocMemCache e vários workers o limite vale por processo, e
+verificar_cache_compartilhado() avisa na inicialização.
+"""
+import json
+import os
+import re
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+
+from .utils_busca import chave_telefone, normalizar_busca, somente_digitos
+from .utils_cache import versao_conteudo
+from .utils_log import evento
+
+TEMPO_MENSAGEM_PROCESSADA = 24 * 60 * 60  # segundos; a Whapi reenvia por bem menos tempo
+TEMPO_PRIMEIRO_CONTATO = 30 * 24 * 60 * 60  # depois disso a foto da capa vai de novo
+TEMPO_ESTADO_CONVERSA = 24 * 60 * 60
+
+_PARA = '__PARA__'
+_TELEFONE = '__TELEFONE__'
+
+# (id do item, título, descrição, submenu)
+MENU_PRINCIPAL = [
+    ('liturgias', '📖 Liturgias', 'Selecione a liturgia do dia desejado', 'liturgias'),
+    ('cadastro_membro', '👥 Quero ser Colaborador',
+     'Cadastro de colaborador para celebração das missas e eventos', 'colaborador'),
+    ('Escala_Missas', '⏰ Escalas de Missas',
+     'Para Colaboradores cadastrados escalar celebrações como colaborador', 'escalas'),
+    ('dizimo_ofertas', '💰 Dízimo, ofertas e donativos',
+     'Veja como ajudar em nosso trabalho de evangelização', 'dizimista'),
+    ('Agendar_Celebracoes', '🕯️ Agendar Celebrações', 'Missa de 7º dia, agradecimentos, Louvor, etc.', 'agendar'),
+    ('pedido_oracao', '🙏 Pedido de Oração', 'Orações, agradecimentos, Louvores...', 'oracoes'),
+]
+
+Submenu = namedtuple('Submenu', 'pergunta caminho com_telefone titulo_nao depois')
+
+# Submenus Sim/Não: os botões têm id "<chave>_sim" (link) e "<chave>_nao" (resposta em texto)
+SUBMENUS = {
+    'liturgias': Submenu(
+        'Posso redirecioná-lo para nosso Site ?', '/app_igreja/liturgia-diaria/', False,
+        '📖 **LITURGIAS**', 'acessar as liturgias depois',
+    ),
+    'dizimista': Submenu(
+        'Posso redirecioná-lo para nosso Site de Cadastro ?', '/app_igreja/quero-ser-dizimista/', True,
+        '💰 **CADASTRO DE DIZIMISTA**', 'se cadastrar depois',
+    ),
+    'colaborador': Submenu(
+        'Posso redirecioná-lo para nosso Site de Cadastro de Colaborador ?', '/app_igreja/quero-ser-colaborador/', True,
+        '👥 **CADASTRO DE COLABORADOR**', 'se cadastrar depois',
+    ),
+    'escalas': Submenu(
+        'Posso redirecioná-lo para nosso Site para ver as Escalas de Missas?', '/app_igreja/escala-missas/', True,
+        '⏰ **ESCALAS DE MISSAS**', 'acessar as escalas depois',
+    ),
+    'agendar': Submenu(
+        'Posso redirecioná-lo para nosso Site para Agendar uma Celebração?',
+        '/app_igreja/celebracoes-agendadas-pub/agendar/', True,
+        '🕯️ **AGENDAR CELEBRAÇÕES**', 'agendar depois',
+    ),
+    'oracoes': Submenu(
+        'Posso redirecioná-lo para nosso Site de Pedidos de Oração ?', '/app_igreja/meus-pedidos-oracoes/novo/', True,
+        '🙏 **PEDIDO DE ORAÇÃO**', 'fazer um pedido depois',
+    ),
+}
+
+# id recebido -> nome do payload
+ROTAS_LISTA = {item_id: f'submenu:{submenu}' for item_id, _, _, submenu in MENU_PRINCIPAL}
+ROTAS_BOTAO = {f'{chave}_nao': f'nao:{chave}' for chave in SUBMENUS}
+# Clientes que devolvem só o título do item: título normalizado e "opcao N"
+ROTAS_TITULO = {
+    **{normalizar_busca(titulo): f'submenu:{submenu}' for _, titulo, _, submenu in MENU_PRINCIPAL},
+    **{f'opcao {n}': f'submenu:{item[3]}' for n, item in enumerate(MENU_PRINCIPAL, start=1)},
+}
+
+
+def get_site_url():
+    """
+    Obtém a URL do site para uso na API do WhatsApp.
+    Usa SITE_URL do .env ou padrão https://oncristo.com.br
+    """
+    site_url = os.getenv('SITE_URL', 'https://oncristo.com.br').strip().rstrip('/')
+    if not site_url.startswith('http://') and not site_url.startswith('https://'):
+        site_url = f'https://{site_url}'
+    return site_url
+
+
+def limpar_telefone(telefone):
+    """Remove caracteres não numéricos e o código do país (55) do número do telefone"""
+    if not telefone:
+        return telefone
+    telefone_limpo = re.sub(r'[^\d]', '', str(telefone))
+    if telefone_limpo.startswith('55'):
+        telefone_limpo = telefone_limpo[2:]
+    return telefone_limpo
+
+
+def nome_paroquia():
+    """Nome da paróquia cadastrada ou "Paróquia"."""
+    from .models.area_admin.models_paroquias import TBPAROQUIA
+    nome = TBPAROQUIA.objects.values_list('PAR_nome_paroquia', flat=True).first()
+    return (nome or '').strip() or 'Paróquia'
+
+
+# ==================== PAYLOADS ====================
+
+def _menu_principal(nome):
+    return {
+        'to': _PARA,
+        'type': 'list',
+        'header': {'text': f'Bem vindo a Paroquia {nome} - Menu Principal'},
+        'body': {'text': 'Escolha uma opção para continuar:'},
+        'footer': {'text': 'Sua paróquia sempre com você'},
+        'action': {
+            'list': {
+                'label': 'Menu Principal',
+                'sections': [{
+                    'title': 'Opções Disponíveis',
+                    'rows': [
+                        {'title': titulo, 'id': item_id, 'description': descricao}
+                        for item_id, titulo, descricao, _ in MENU_PRINCIPAL
+                    ],
+                }],
+            }
+        },
+    }
+
+
+def _submenu(chave, submenu, site_url):
+    url = f'{site_url}{submenu.caminho}'
+    if submenu.com_telefone:
+        url += f'?telefone={_TELEFONE}'
+    return {
+        'header': {'text': 'Obrigado por interagir conosco.'},
+        'body': {'text': submenu.pergunta},
+        'footer': {'text': 'Escolha sua Opção'},
+        'action': {
+            'buttons': [
+                {'type': 'url', 'title': 'Sim', 'id': f'{chave}_sim', 'url': url},
+                # O "Não" chega ao webhook como clique de botão (ROTAS_BOTAO)
+                {'type': 'url', 'title': 'Não', 'id': f'{chave}_nao', 'url': '#'},
+            ]
+        },
+        'type': 'button',
+        'to': _PARA,
+    }
+
+
+def _resposta_nao(submenu, site_url):
+    return {
+        'to': _PARA,
+        'body': (
+            f'{submenu.titulo_nao}\n\n'
+            f'Entendido! Se precisar {submenu.depois}, é só digitar qualquer mensagem para ver o menu novamente.\n\n'
+            f'Ou acesse diretamente:\n{site_url}{submenu.caminho}'
+        ),
+    }
+
+
+def montar_payloads():
+    """{nome: (endpoint da Whapi, JSON serializado com os marcadores de destinatário/telefone)}"""
+    site_url = get_site_url()
+    payloads = {'menu': ('/messages/interactive', _menu_principal(nome_paroquia()))}
+    for chave, submenu in SUBMENUS.items():
+        payloads[f'submenu:{chave}'] = ('/messages/interactive', _submenu(chave, submenu, site_url))
+        payloads[f'nao:{chave}'] = ('/messages/text', _resposta_nao(submenu, site_url))
+    return {
+        nome: (endpoint, json.dumps(corpo, ensure_ascii=False))
+        for nome, (endpoint, corpo) in payloads.items()
+    }
+
+
+_payloads = (None, {})  # (versão, payloads) do processo
+
+
+def payloads():
+    """Payloads do processo, refeitos quando a paróquia (ou o SITE_URL) muda."""
+    global _payloads
+    from .models.area_admin.models_paroquias import TBPAROQUIA
+    versao = f'{versao_conteudo(TBPAROQUIA)}|{get_site_url()}'
+    if _payloads[0] != versao:
+        _payloads = (versao, montar_payloads())
+    return _payloads[1]
+
+
+def corpo_mensagem(nome, destinatario):
+    """(endpoint, corpo em bytes) do payload `nome` para o destinatário."""
+    endpoint, modelo = payloads()[nome]
+    corpo = modelo.replace(f'"{_PARA}"', json.dumps(str(destinatario)))
+    corpo = corpo.replace(_TELEFONE, somente_digitos(limpar_telefone(destinatario)))
+    return endpoint, corpo.encode('utf-8')
+
+
+def rota_item(item_id, item_title=None):
+    """Payload da resposta a um item da lista (pelo id; pelo título se o id não vier)."""
+    if item_id and item_id.startswith('ListV3:'):
+        item_id = item_id[len('ListV3:'):]
+    return ROTAS_LISTA.get(item_id) or ROTAS_TITULO.get(normalizar_busca(item_title))
+
+
+def rota_botao(button_id):
+    return ROTAS_BOTAO.get(button_id)
+
+
+# ==================== ESTADO DA CONVERSA ====================
+
+def mensagem_nova(message_id):
+    """
+    True na primeira vez que o id aparece no cache. Entre workers, só sem corrida: ver a
+    nota sobre o backend no início do módulo.
+    """
+    if not message_id:
+        return True
+    return cache.add(f'chatbot:mensagem:{message_id}', 1, TEMPO_MENSAGEM_PROCESSADA)
+
+
+def primeiro_contato(remetente):
+    """
+    True se o número ainda não recebeu o menu e marca o contato. Verificar e marcar é uma
+    operação só no LocMemCache; no FileBasedCache, dois workers ao mesmo tempo podem
+    receber True.
+    """
+    return cache.add(f'chatbot:contato:{chave_telefone(remetente)}', 1, TEMPO_PRIMEIRO_CONTATO)
+
+
+def estado_conversa(remetente):
+    """{'ultimo_payload': ..., 'atualizado_em': ...} do remetente ({} se não houver)."""
+    return cache.get(f'chatbot:estado:{chave_telefone(remetente)}') or {}
+
+
+def registrar_estado(remetente, **valores):
+    estado = estado_conversa(remetente)
+    estado.update(valores, atualizado_em=time.time())
+    cache.set(f'chatbot:estado:{chave_telefone(remetente)}', estado, TEMPO_ESTADO_CONVERSA)
+
+
+# ==================== LIMITE POR REMETENTE ====================
+
+MOTIVOS_SUPRESSAO = {
+    'limitadas': 'Acima do limite por remetente',
+    'agrupadas': 'Agrupadas no mesmo menu',
+}
+
+
+def _incrementar(chave, validade):
+    cache.add(chave, 0, validade)
+    try:
+        return cache.incr(chave)
+    except ValueError:  # expirou entre o add e o incr
+        cache.set(chave, 1, validade)
+        return 1
+
+
+def contar_supressao(motivo):
+    _incrementar(f'chatbot:suprimidas:{motivo}', None)
+    evento('webhook_suprimida', motivo=motivo)
+
+
+def mensagens_suprimidas():
+    """{motivo: quantidade} das mensagens descartadas pelo limite e pelo agrupamento."""
+    valores = cache.get_many([f'chatbot:suprimidas:{motivo}' for motivo in MOTIVOS_SUPRESSAO])
+    return {motivo: valores.get(f'chatbot:suprimidas:{motivo}', 0) for motivo in MOTIVOS_SUPRESSAO}
+
+
+def limpar_supressoes():
+    cache.delete_many([f'chatbot:suprimidas:{motivo}' for motivo in MOTIVOS_SUPRESSAO])
+
+
+def verificar_cache_compartilhado(app_configs=None, **kwargs):
+    """
+    Verificação do Django (registrada em apps.py e repetida na subida de cada worker):
+    avisa quando o cache é por processo (LocMemCache) e o gunicorn roda com mais de um
+    worker (WEB_CONCURRENCY, exportado por gunicorn_config.py). Nesse caso o limite por
+    remetente e o agrupamento do menu valem por worker.
+    """
+    workers = int(os.getenv('WEB_CONCURRENCY') or 1)
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if workers > 1 and backend.endswith('.LocMemCache'):
+        return [checks.Warning(
+            f'Cache LocMemCache com {workers} workers: o limite por remetente e o '
+            'agrupamento do menu do chatbot valem por processo.',
+            hint='Use o cache compartilhado de pro_igreja/settings/production.py '
+                 '(FileBasedCache) ou defina CACHE_DIR.',
+            id='app_igreja.W001',
+        )]
+    return []
+
+
+def dentro_do_limite(remetente, agora=None):
+    """
+    False (e conta a supressão) se o remetente passou do limite de mensagens da janela.
+    Limite aproximado: no FileBasedCache o incr não é atômico entre workers e mensagens
+    simultâneas podem contar uma vez só.
+    """
+    limite = getattr(settings, 'WHATSAPP_LIMITE_MENSAGENS', 0)
+    janela = getattr(settings, 'WHATSAPP_JANELA_LIMITE', 60)
+    if limite <= 0:
+        return True
+    agora = time.time() if agora is None else agora
+    balde = int(agora // janela)
+    prefixo = f'chatbot:limite:{chave_telefone(remetente)}'
+    atual = _incrementar(f'{prefixo}:{balde}', janela * 2)
+    anterior = cache.get(f'{prefixo}:{balde - 1}') or 0
+    if anterior * (1 - (agora % janela) / janela) + atual > limite:
+        contar_supressao('limitadas')
+        return False
+    return True
+
+
+def menu_liberado(remetente):
+    """
+    True se o menu pode ir agora; False se já foi enviado dentro da janela de agrupamento.
+    Mesma ressalva de primeiro_contato: em workers diferentes, no mesmo instante, o menu
+    pode sair duas vezes.
+    """
+    janela = getattr(settings, 'WHATSAPP_JANELA_AGRUPAMENTO', 0)
+    if janela <= 0:
+        return True
+    if cache.add(f'chatbot:menu:{chave_telefone(remetente)}', 1, janela):
+        return True
+    contar_supressao('agrupadas')
+    return False
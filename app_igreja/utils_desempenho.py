@@ -0,0 +1,310 @@
+"""
+Medição de desempenho por requisição
+
+MedicaoDesempenhoMiddleware (middleware.py) abre uma Medicao para cada requisição
+sorteada (DESEMPENHO_AMOSTRAGEM, de 0 a 1) e, enquanto ela está ativa, registra:
+- consultas ao banco: quantidade e tempo (execute_wrapper em cada conexão);
+- chamadas HTTP de saída feitas com requests (Whapi, ViaCEP, site da liturgia):
+  host e latência, via requests.Session.send;
+- leituras do cache: acertos e faltas, via get da classe do backend (e get_many, se o
+  backend tiver o seu; o get_many padrão chama get e contaria cada chave duas vezes).
+
+Fora de uma medição os pontos instrumentados só conferem uma ContextVar, sem custo
+perceptível. Os totais de cada endpoint ficam no cache para a página de endpoints mais
+lentos da área administrativa: uma chave por métrica e endpoint, somada com cache.incr
+(tempos em microssegundos), em vez de reler e regravar um dicionário com todos. O
+registro dos endpoints (CHAVE_ENDPOINTS) só é regravado quando aparece um endpoint novo,
+e o máximo é gravado só quando aumenta; nesses dois pontos uma corrida entre workers
+pode perder uma amostra. No FileBasedCache o próprio incr é "lê e grava", então a
+garantia completa depende de um backend com incr atômico (Redis, Memcached).
+
+DetectorNMaisUm aponta a mesma consulta (mesmo SQL) executada várias vezes com
+parâmetros diferentes dentro de uma requisição - o padrão de um objects.get por item de
+uma lista. Em DEBUG o DetectorNMaisUmMiddleware avisa no log; nos testes (tests.py) ele
+é usado como context manager para reprovar views que voltem a fazer isso.
+"""
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import BaseCache
+from django.db import connections
+
+logger = logging.getLogger('app_igreja.desempenho')
+
+CHAVE_ENDPOINTS = 'desempenho:endpoints'  # {"GET /rota": prefixo das chaves do endpoint}
+MAX_ENDPOINTS = 300
+# Métricas somadas por requisição; tempos em microssegundos (incr só soma inteiros)
+METRICAS = ('requisicoes', 'total_us', 'consultas', 'db_us', 'http_us')
+_AUSENTE = object()
+
+_medicao_atual = ContextVar('medicao_desempenho', default=None)
+_instrumentado = False
+
+
+class Medicao:
+    """Contadores de uma requisição."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.duracao_ms = 0.0
+        self.consultas = 0
+        self.tempo_db_ms = 0.0
+        self.chamadas_http = []  # [(host, ms, status)]
+        self.cache_acertos = 0
+        self.cache_faltas = 0
+
+    def medir_consulta(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas += 1
+            self.tempo_db_ms += (time.perf_counter() - inicio) * 1000
+
+    def finalizar(self):
+        self.duracao_ms = (time.perf_counter() - self.inicio) * 1000
+
+    @property
+    def tempo_http_ms(self):
+        return sum(ms for _, ms, _ in self.chamadas_http)
+
+    def server_timing(self):
+        """Valor do cabeçalho Server-Timing (visível no DevTools do navegador)."""
+        return ', '.join([
+            f'total;dur={self.duracao_ms:.1f}',
+            f'db;dur={self.tempo_db_ms:.1f};desc="{self.consultas} consultas"',
+            f'http;dur={self.tempo_http_ms:.1f};desc="{len(self.chamadas_http)} chamadas"',
+            f'cache;desc="{self.cache_acertos} acertos, {self.cache_faltas} faltas"',
+        ])
+
+    def como_dict(self):
+        return {
+            'ms': round(self.duracao_ms, 1),
+            'consultas': self.consultas,
+            'db_ms': round(self.tempo_db_ms, 1),
+            'http': [
+                {'host': host, 'ms': round(ms, 1), 'status': status}
+                for host, ms, status in self.chamadas_http
+            ],
+            'http_ms': round(self.tempo_http_ms, 1),
+            'cache_acertos': self.cache_acertos,
+            'cache_faltas': self.cache_faltas,
+        }
+
+
+def medicao_atual():
+    return _medicao_atual.get()
+
+
+def iniciar_medicao():
+    """Ativa uma Medicao no contexto atual. Retorna (medicao, token para encerrar)."""
+    medicao = Medicao()
+    return medicao, _medicao_atual.set(medicao)
+
+
+def encerrar_medicao(token):
+    _medicao_atual.reset(token)
+
+
+def amostrar():
+    """True se a requisição deve ser medida (sorteio com DESEMPENHO_AMOSTRAGEM)."""
+    taxa = getattr(settings, 'DESEMPENHO_AMOSTRAGEM', 0)
+    return taxa > 0 and (taxa >= 1 or random.random() < taxa)
+
+
+class DetectorNMaisUm:
+    """Agrupa as consultas pelo SQL (com placeholders) e guarda os parâmetros de cada execução."""
+
+    def __init__(self, limite=None):
+        self.limite = limite or getattr(settings, 'N_MAIS_UM_LIMITE', 5)
+        self.execucoes = defaultdict(list)
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many:
+            self.execucoes[sql].append(repr(params))
+        return execute(sql, params, many, context)
+
+    def repetidas(self):
+        """[(sql, execuções)] das consultas repetidas ao menos `limite` vezes com parâmetros diferentes."""
+        return sorted(
+            (
+                (sql, len(params)) for sql, params in self.execucoes.items()
+                if len(params) >= self.limite and len(set(params)) > 1
+            ),
+            key=lambda par: par[1], reverse=True,
+        )
+
+
+@contextmanager
+def conexoes_instrumentadas(wrapper):
+    """Instala o execute_wrapper em todas as conexões enquanto o bloco executa."""
+    with ExitStack() as pilha:
+        for conexao in connections.all():
+            pilha.enter_context(conexao.execute_wrapper(wrapper))
+        yield
+
+
+@contextmanager
+def detectar_n_mais_um(limite=None):
+    """with detectar_n_mais_um() as detector: ... ; detector.repetidas()"""
+    detector = DetectorNMaisUm(limite)
+    with conexoes_instrumentadas(detector):
+        yield detector
+
+
+# ==================== INSTRUMENTAÇÃO (requests e cache) ====================
+
+def _instrumentar_requests():
+    enviar = requests.Session.send
+
+    def send(self, request, **kwargs):
+        medicao = _medicao_atual.get()
+        if medicao is None:
+            return enviar(self, request, **kwargs)
+        inicio = time.perf_counter()
+        status = None
+        try:
+            response = enviar(self, request, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            medicao.chamadas_http.append(
+                (urlsplit(request.url).hostname or '', (time.perf_counter() - inicio) * 1000, status)
+            )
+
+    requests.Session.send = send
+
+
+def _instrumentar_cache(classe):
+    obter = classe.get
+    obter_varios = classe.get_many
+
+    def get(self, key, default=None, version=None):
+        valor = obter(self, key, _AUSENTE, version)
+        medicao = _medicao_atual.get()
+        if medicao is not None:
+            if valor is _AUSENTE:
+                medicao.cache_faltas += 1
+            else:
+                medicao.cache_acertos += 1
+        return default if valor is _AUSENTE else valor
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        valores = obter_varios(self, keys, version)
+        medicao = _medicao_atual.get()
+        if medicao is not None:
+            medicao.cache_acertos += len(valores)
+            medicao.cache_faltas += len(keys) - len(valores)
+        return valores
+
+    classe.get = get
+    if obter_varios is not BaseCache.get_many:  # o padrão já passa pelo get acima
+        classe.get_many = get_many
+
+
+def instrumentar():
+    """Instala os pontos de medição uma vez por processo (chamado pelo middleware)."""
+    global _instrumentado
+    if _instrumentado:
+        return
+    _instrumentado = True
+    _instrumentar_requests()
+    for classe in {type(caches[alias]) for alias in settings.CACHES}:
+        _instrumentar_cache(classe)
+
+
+# ==================== REGISTRO (log e ranking de endpoints) ====================
+
+def _prefixo(chave_endpoint):
+    return 'desempenho:endpoint:' + hashlib.md5(chave_endpoint.encode()).hexdigest()
+
+
+def _somar(chave, valor):
+    try:
+        cache.incr(chave, valor)
+    except ValueError:  # primeira amostra (ou chave descartada pelo cache)
+        if not cache.add(chave, valor, None):
+            cache.incr(chave, valor)
+
+
+def _registrar_endpoint(chave_endpoint):
+    """Prefixo das chaves do endpoint; inclui no registro se for novo (descarta o mais antigo)."""
+    prefixo = _prefixo(chave_endpoint)
+    endpoints = cache.get(CHAVE_ENDPOINTS) or {}
+    if chave_endpoint in endpoints:
+        return prefixo
+    if len(endpoints) >= MAX_ENDPOINTS:
+        ultimas = cache.get_many([f'{p}:ultima' for p in endpoints.values()])
+        antigo = min(endpoints, key=lambda k: ultimas.get(f'{endpoints[k]}:ultima', 0))
+        _apagar_endpoint(endpoints.pop(antigo))
+    endpoints[chave_endpoint] = prefixo
+    cache.set(CHAVE_ENDPOINTS, endpoints, None)
+    return prefixo
+
+
+def _apagar_endpoint(prefixo):
+    cache.delete_many([f'{prefixo}:{metrica}' for metrica in (*METRICAS, 'max_us', 'ultima')])
+
+
+def registrar_medicao(endpoint, metodo, status, medicao):
+    """Linha de log estruturada (JSON) e acumulado do endpoint para a área administrativa."""
+    dados = {'endpoint': endpoint, 'metodo': metodo, 'status': status, **medicao.como_dict()}
+    logger.info(json.dumps(dados, ensure_ascii=False))
+
+    prefixo = _registrar_endpoint(f'{metodo} {endpoint}')
+    duracao_us = int(medicao.duracao_ms * 1000)
+    valores = {
+        'requisicoes': 1,
+        'total_us': duracao_us,
+        'consultas': medicao.consultas,
+        'db_us': int(medicao.tempo_db_ms * 1000),
+        'http_us': int(medicao.tempo_http_ms * 1000),
+    }
+    for metrica, valor in valores.items():
+        _somar(f'{prefixo}:{metrica}', valor)
+    if duracao_us > (cache.get(f'{prefixo}:max_us') or 0):
+        cache.set(f'{prefixo}:max_us', duracao_us, None)
+    cache.set(f'{prefixo}:ultima', time.time(), None)
+
+
+def endpoints_mais_lentos(ordem='media_ms', limite=50):
+    """Acumulados por endpoint com médias, do mais lento para o mais rápido."""
+    endpoints = cache.get(CHAVE_ENDPOINTS) or {}
+    chaves = [f'{p}:{metrica}' for p in endpoints.values() for metrica in (*METRICAS, 'max_us')]
+    valores = cache.get_many(chaves)
+    linhas = []
+    for chave_endpoint, prefixo in endpoints.items():
+        total = {metrica: valores.get(f'{prefixo}:{metrica}', 0) for metrica in (*METRICAS, 'max_us')}
+        n = total['requisicoes']
+        if not n:
+            continue
+        linhas.append({
+            'endpoint': chave_endpoint,
+            'requisicoes': n,
+            'consultas': total['consultas'],
+            'max_ms': total['max_us'] / 1000,
+            'total_ms': total['total_us'] / 1000,
+            'media_ms': total['total_us'] / 1000 / n,
+            'media_consultas': total['consultas'] / n,
+            'media_db_ms': total['db_us'] / 1000 / n,
+            'media_http_ms': total['http_us'] / 1000 / n,
+        })
+    linhas.sort(key=lambda linha: linha.get(ordem, 0), reverse=True)
+    return linhas[:limite]
+
+
+def limpar_endpoints():
+    for prefixo in (cache.get(CHAVE_ENDPOINTS) or {}).values():
+        _apagar_endpoint(prefixo)
+    cache.delete(CHAVE_ENDPOINTS)
@@ -0,0 +1,281 @@
+"""
+Situação de entrega das mensagens em massa do WhatsApp (TBENTREGAWHATSAPP)
+
+A mensagem em massa (views_whatsapp) vai pela fila (utils_fila_whatsapp); cada envio
+feito grava, logo em seguida, um registro com o id que a Whapi devolveu
+(contabilizar_envio). A Whapi depois manda eventos "statuses" no webhook (sent,
+delivered, read, failed) com esse id. Uma mensagem para 500 pessoas gera mais de mil
+eventos em poucos minutos, então eles não viram um UPDATE cada:
+
+- receber_status() acumula os eventos no worker, um por id (fica o status mais
+  avançado), e descarrega a cada WHATSAPP_STATUS_LOTE eventos ou WHATSAPP_STATUS_INTERVALO
+  segundos (um timer cobre o fim de uma rajada, quando não chega evento novo).
+- O "sent" pode chegar antes de o envio gravar a entrega (a Whapi avisa enquanto a fila
+  ainda trata a resposta). A fila marca no cache o id de cada envio de mensagem em massa
+  (marcar_envio, validade de WHATSAPP_STATUS_ESPERA segundos); ids marcados ainda sem
+  TBENTREGAWHATSAPP voltam ao acumulador e são tentados de novo a cada descarga, até a
+  espera acabar. Ids sem marca (respostas do chatbot e outros envios fora da fila) nunca
+  terão entrega gravada e são descartados na primeira descarga.
+- aplicar_status() lê a situação atual dos ids do lote em um SELECT (ENT_message_id é
+  único) e faz um UPDATE por (mensagem, de, para): WHERE ENT_status = <de>, então um
+  status que outro worker já aplicou não conta duas vezes. Status só avançam
+  (ENVIADA -> ENTREGUE -> LIDA; ENVIADA -> ERRO); eventos fora de ordem são ignorados.
+- Os totais de TBWHATSAPP (WHA_entregues, WHA_lidas, WHA_sucessos, WHA_erros) recebem a
+  diferença com F(), sem recontar as entregas; WHA_status passa a ENTREGUE quando todos
+  os destinatários sem erro (WHA_total_enviadas - WHA_erros) receberam e a LIDA quando
+  todos leram. Enquanto a fila ainda envia, os que faltam contam como não entregues.
+Eventos ainda no acumulador quando o processo cai se perdem: é estatística, não envio.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_LOTE = 500
+
+# Status da Whapi -> ENT_status
+STATUS_WHAPI = {
+    'sent': 'ENVIADA',
+    'delivered': 'ENTREGUE',
+    'read': 'LIDA',
+    'played': 'LIDA',
+    'failed': 'ERRO',
+}
+# Só avança para um status de ordem maior; de ERRO não sai
+ORDEM = {'ENVIADA': 0, 'ERRO': 1, 'ENTREGUE': 2, 'LIDA': 3}
+
+CHAVE_ENVIO = 'whatsapp:envio:{}'  # marca do id de um envio da fila (marcar_envio)
+
+_trava = threading.Lock()
+_pendentes = {}  # message_id -> (status, erro)
+_sem_registro = {}  # message_id -> quando ficou sem TBENTREGAWHATSAPP pela primeira vez
+_desde = None
+_timer = None
+
+
+def registrar_envios(mensagem, enviados):
+    """Grava (message_id, telefone) de cada envio com sucesso da mensagem (instância ou pk)."""
+    from .models.area_admin.models_whatsapp import TBENTREGAWHATSAPP
+    mensagem_id = getattr(mensagem, 'pk', mensagem)
+    TBENTREGAWHATSAPP.objects.bulk_create(
+        [
+            TBENTREGAWHATSAPP(ENT_mensagem_id=mensagem_id, ENT_message_id=message_id, ENT_telefone=telefone)
+            for message_id, telefone in enviados if message_id
+        ],
+        batch_size=TAMANHO_LOTE,
+        ignore_conflicts=True,
+    )
+
+
+def marcar_envio(message_id):
+    """Marca o id como envio da fila: seus status esperam a entrega ser gravada."""
+    if message_id:
+        cache.set(CHAVE_ENVIO.format(message_id), 1, getattr(settings, 'WHATSAPP_STATUS_ESPERA', 120) + 60)
+
+
+def contabilizar_envio(mensagem_id, telefone, resultado=None, erro=None):
+    """
+    Resultado de um envio da fila feito para uma mensagem em massa (FIL_mensagem): soma em
+    WHA_sucessos ou WHA_erros e, no sucesso, grava a entrega logo depois do envio. A
+    mensagem sai de PENDENTE no primeiro sucesso (ENVIADA) ou quando todos falharam (ERRO).
+    """
+    from .models.area_admin.models_whatsapp import TBWHATSAPP
+    mensagens = TBWHATSAPP.objects.filter(pk=mensagem_id)
+    if erro:
+        mensagens.update(WHA_erros=F('WHA_erros') + 1)
+        mensagens.filter(WHA_status='PENDENTE', WHA_erros__gte=F('WHA_total_enviadas')).update(WHA_status='ERRO')
+        return
+    message_id = (resultado or {}).get('message', {}).get('id')
+    marcar_envio(message_id)
+    # Mensagem excluída no meio do envio: nada a contar
+    if mensagens.update(WHA_sucessos=F('WHA_sucessos') + 1):
+        mensagens.filter(WHA_status='PENDENTE').update(WHA_status='ENVIADA')
+        registrar_envios(mensagem_id, [(message_id, telefone)])
+
+
+def _guardar(message_id, status, erro):
+    anterior = _pendentes.get(message_id)
+    if anterior is None or ORDEM[status] > ORDEM[anterior[0]]:
+        _pendentes[message_id] = (status, erro)
+
+
+def _acumular(statuses):
+    global _desde
+    recebidos = 0
+    for item in statuses:
+        status = STATUS_WHAPI.get(str(item.get('status', '')).lower())
+        message_id = item.get('id')
+        if not status or not message_id:
+            continue
+        erro = item.get('error') or item.get('errors')
+        _guardar(message_id, status, str(erro) if erro else None)
+        recebidos += 1
+    if _pendentes and _desde is None:
+        _desde = time.monotonic()
+    return recebidos
+
+
+def _agendar_descarga(intervalo):
+    global _timer
+    if _pendentes and _timer is None:
+        _timer = threading.Timer(intervalo, _descarregar_no_timer)
+        _timer.daemon = True
+        _timer.start()
+
+
+def receber_status(statuses):
+    """Acumula os eventos "statuses" do webhook; descarrega quando o lote enche ou envelhece."""
+    lote = getattr(settings, 'WHATSAPP_STATUS_LOTE', 50)
+    intervalo = getattr(settings, 'WHATSAPP_STATUS_INTERVALO', 5)
+    with _trava:
+        recebidos = _acumular(statuses)
+        cheio = len(_pendentes) >= lote or (_desde is not None and time.monotonic() - _desde >= intervalo)
+        if not cheio:
+            _agendar_descarga(intervalo)
+    if cheio:
+        descarregar()
+    return recebidos
+
+
+def descarregar():
+    """Aplica os status acumulados neste worker. Retorna quantas entregas mudaram."""
+    global _pendentes, _desde, _timer
+    with _trava:
+        pendentes, _pendentes, _desde = _pendentes, {}, None
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not pendentes:
+        return 0
+    sem_registro = set()
+    try:
+        alteradas = aplicar_status(pendentes, sem_registro)
+    except Exception as e:
+        logger.error('Status de entrega do WhatsApp não gravados (%s eventos): %s', len(pendentes), e)
+        return 0
+    _aguardar_registro(pendentes, sem_registro)
+    return alteradas
+
+
+def _aguardar_registro(pendentes, sem_registro):
+    """
+    Devolve ao acumulador os eventos de envios da fila (marcar_envio) ainda sem entrega
+    gravada, enquanto estiverem na espera; os demais ids sem entrega são descartados.
+    """
+    global _desde
+    espera = getattr(settings, 'WHATSAPP_STATUS_ESPERA', 120)
+    marcados = cache.get_many([CHAVE_ENVIO.format(message_id) for message_id in sem_registro]) if sem_registro else {}
+    agora = time.monotonic()
+    descartados = 0
+    with _trava:
+        for message_id in pendentes:
+            if message_id not in sem_registro or CHAVE_ENVIO.format(message_id) not in marcados:
+                _sem_registro.pop(message_id, None)
+            elif agora - _sem_registro.setdefault(message_id, agora) > espera:
+                del _sem_registro[message_id]
+                descartados += 1
+            else:
+                _guardar(message_id, *pendentes[message_id])
+        if _pendentes and _desde is None:
+            _desde = agora
+        _agendar_descarga(getattr(settings, 'WHATSAPP_STATUS_INTERVALO', 5))
+    if descartados:
+        logger.info('%s status de entrega do WhatsApp descartados: envio sem registro após %ss', descartados, espera)
+
+
+def limpar_pendentes():
+    """Descarta o acumulador deste worker sem gravar (testes)."""
+    global _pendentes, _desde, _timer
+    with _trava:
+        _pendentes, _desde = {}, None
+        _sem_registro.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+
+
+def _descarregar_no_timer():
+    global _timer
+    with _trava:
+        _timer = None
+    try:
+        descarregar()
+    finally:
+        connection.close()
+
+
+def _diferenca(de, para, quantidade):
+    """Quanto cada total de TBWHATSAPP muda quando `quantidade` entregas vão de `de` para `para`."""
+    diferenca = Counter()
+    if para in ('ENTREGUE', 'LIDA') and de not in ('ENTREGUE', 'LIDA'):
+        diferenca['WHA_entregues'] += quantidade
+    if para == 'LIDA':
+        diferenca['WHA_lidas'] += quantidade
+    if para == 'ERRO':
+        diferenca['WHA_sucessos'] -= quantidade
+        diferenca['WHA_erros'] += quantidade
+    return diferenca
+
+
+def aplicar_status(novos, sem_registro=None):
+    """
+    Aplica {message_id: (status, erro)} em TBENTREGAWHATSAPP e nos totais de TBWHATSAPP.
+    Retorna quantas entregas mudaram de status; os ids sem entrega gravada vão para o
+    set sem_registro, se informado.
+    """
+    from .models.area_admin.models_whatsapp import TBENTREGAWHATSAPP, TBWHATSAPP
+    agora = timezone.now()
+    alteradas = 0
+    totais = defaultdict(Counter)
+    iterador = iter(novos)
+    with transaction.atomic():
+        while ids := list(islice(iterador, TAMANHO_LOTE)):
+            grupos = defaultdict(list)
+            atuais = TBENTREGAWHATSAPP.objects.filter(ENT_message_id__in=ids).order_by().values_list(
+                'ENT_id', 'ENT_message_id', 'ENT_mensagem_id', 'ENT_status'
+            )
+            encontrados = set()
+            for ent_id, message_id, mensagem_id, atual in atuais:
+                encontrados.add(message_id)
+                para, erro = novos[message_id]
+                if atual != 'ERRO' and ORDEM[para] > ORDEM[atual]:
+                    grupos[(mensagem_id, atual, para, erro)].append(ent_id)
+            if sem_registro is not None:
+                sem_registro.update(set(ids) - encontrados)
+
+            for (mensagem_id, de, para, erro), ent_ids in grupos.items():
+                campos = {'ENT_status': para, 'ENT_data_atualizacao': agora}
+                if para == 'ERRO':
+                    campos['ENT_erro'] = erro
+                quantidade = TBENTREGAWHATSAPP.objects.filter(ENT_id__in=ent_ids, ENT_status=de).update(**campos)
+                alteradas += quantidade
+                totais[mensagem_id].update(_diferenca(de, para, quantidade))
+
+        for mensagem_id, diferenca in totais.items():
+            if any(diferenca.values()):
+                TBWHATSAPP.objects.filter(pk=mensagem_id).update(
+                    **{campo: F(campo) + valor for campo, valor in diferenca.items()}
+                )
+        if totais:
+            mensagens = TBWHATSAPP.objects.filter(pk__in=list(totais), WHA_sucessos__gt=0)
+            # Os destinatários ainda na fila entram no total: a mensagem não fica "entregue" no meio do envio
+            sem_erro = F('WHA_total_enviadas') - F('WHA_erros')
+            mensagens.filter(WHA_status='ENVIADA', WHA_entregues__gte=sem_erro).update(WHA_status='ENTREGUE')
+            mensagens.filter(WHA_status__in=['ENVIADA', 'ENTREGUE'], WHA_lidas__gte=sem_erro).update(
+                WHA_status='LIDA'
+            )
+    return alteradas
+
+
+# Fim do worker (deploy, reinício): grava o que ainda estiver acumulado
+atexit.register(descarregar)
@@ -0,0 +1,85 @@
+"""
+Estatísticas dos dashboards do admin
+
+Cada dashboard calcula seus contadores com UMA consulta (Count com filter=Q(...)),
+guarda o resultado no cache por alguns segundos e é invalidado no save/delete do
+model correspondente (ver signals.py).
+"""
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models.area_admin.models_dizimistas import TBDIZIMISTAS
+from .models.area_admin.models_eventos import TBEVENTO
+from .models.area_admin.models_planos import TBPLANO
+
+TEMPO_CACHE_ESTATISTICAS = 60  # segundos
+
+CHAVE_DIZIMISTAS = 'estatisticas:dizimistas'
+CHAVE_PLANOS = 'estatisticas:planos'
+CHAVE_EVENTOS = 'estatisticas:eventos'
+
+
+def _em_cache(chave, calcular):
+    dados = cache.get(chave)
+    if dados is None:
+        dados = calcular()
+        cache.set(chave, dados, TEMPO_CACHE_ESTATISTICAS)
+    return dados
+
+
+def _calcular_dizimistas():
+    inicio_mes = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    dados = TBDIZIMISTAS.objects.aggregate(
+        total_dizimistas=Count('id'),
+        ativos=Count('id', filter=Q(DIS_status=True)),
+        pendentes=Count('id', filter=Q(DIS_status=False)),
+        masculinos=Count('id', filter=Q(DIS_sexo='M')),
+        femininos=Count('id', filter=Q(DIS_sexo='F')),
+        novos_mes=Count('id', filter=Q(DIS_data_cadastro__gte=inicio_mes)),
+    )
+    dados['dizimistas_por_cidade'] = list(
+        TBDIZIMISTAS.objects.values('DIS_cidade').annotate(count=Count('id')).order_by('-count')[:5]
+    )
+    return dados
+
+
+def _calcular_planos():
+    hoje = date.today()
+    return TBPLANO.objects.aggregate(
+        total_planos=Count('PLA_id'),
+        ativos=Count('PLA_id', filter=Q(PLA_ativo=True)),
+        inativos=Count('PLA_id', filter=Q(PLA_ativo=False)),
+        planos_mes=Count('PLA_id', filter=Q(
+            PLA_data_cadastro__year=hoje.year, PLA_data_cadastro__month=hoje.month
+        )),
+    )
+
+
+def _calcular_eventos():
+    return TBEVENTO.objects.aggregate(
+        total_eventos=Count('EVE_ID'),
+        ativos=Count('EVE_ID', filter=Q(EVE_STATUS='Ativo')),
+        inativos=Count('EVE_ID', filter=Q(EVE_STATUS='Inativo')),
+    )
+
+
+def estatisticas_dizimistas():
+    """total_dizimistas, ativos, pendentes, masculinos, femininos, novos_mes, dizimistas_por_cidade."""
+    return _em_cache(CHAVE_DIZIMISTAS, _calcular_dizimistas)
+
+
+def estatisticas_planos():
+    """total_planos, ativos, inativos, planos_mes."""
+    return _em_cache(CHAVE_PLANOS, _calcular_planos)
+
+
+def estatisticas_eventos():
+    """total_eventos, ativos, inativos."""
+    return _em_cache(CHAVE_EVENTOS, _calcular_eventos)
+
+
+def invalidar_estatisticas(*chaves):
+    cache.delete_many(chaves)
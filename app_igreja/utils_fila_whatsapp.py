@@ -0,0 +1,178 @@
+"""
+Fila de envio de mensagens automáticas do WhatsApp (TBFILAWHATSAPP)
+
+Campanhas agendadas (lembretes de dízimo, aniversários) e as mensagens em massa da
+área administrativa não chamam a Whapi direto: geram as mensagens, enfileiram e um
+processador (enviar_fila_whatsapp, no cron - scripts/servidor_configurar_cron.sh) envia
+no ritmo permitido. Mensagens em massa pequenas (até WHATSAPP_ENVIO_IMEDIATO
+destinatários) são processadas na própria requisição, sem esperar o cron.
+
+- enfileirar(): cada mensagem tem uma chave de idempotência (FIL_chave, única). Chaves
+  já presentes na fila são ignoradas, então rodar a mesma campanha de novo (cron
+  repetido, execução manual) não manda a mensagem duas vezes.
+- processar_fila(): envia as pendentes em ordem, no máximo WHATSAPP_FILA_POR_MINUTO por
+  minuto. Cada mensagem é reservada (PENDENTE -> ENVIANDO) por um UPDATE condicional
+  antes do envio: dois processadores ao mesmo tempo não enviam a mesma mensagem. Se o
+  processo cair no meio, a mensagem fica em ENVIANDO e não é reenviada (melhor perder um
+  lembrete do que mandar dois). Erros voltam para PENDENTE até MAX_TENTATIVAS; um 429
+  da Whapi encerra a execução para a próxima continuar de onde parou.
+- Mensagens com FIL_midia vão como imagem com o texto de legenda. Para campanhas, suba a
+  imagem uma vez (upload_whatsapp_media) e enfileire o media id: a Whapi não baixa o
+  arquivo do nosso servidor para cada destinatário. Uma URL enfileirada vai pelo media id
+  em cache (utils_midia_whatsapp); se a Whapi recusar o id, o envio é refeito pela URL.
+- Itens de uma mensagem em massa (FIL_mensagem) somam o resultado nos totais dela e
+  gravam a entrega logo após o envio (utils_entregas_whatsapp.contabilizar_envio).
+"""
+import time
+from collections import Counter
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .utils_entregas_whatsapp import contabilizar_envio
+
+TAMANHO_LOTE = 500
+MAX_TENTATIVAS = 3
+
+
+def limpar_telefone_para_envio(telefone):
+    """Formata telefone para o formato da API"""
+    if not telefone:
+        return None
+
+    # Remove caracteres não numéricos
+    telefone_limpo = ''.join(filter(str.isdigit, str(telefone)))
+
+    # Adiciona código do país se não tiver
+    if len(telefone_limpo) == 11 and telefone_limpo.startswith('0'):
+        telefone_limpo = '55' + telefone_limpo[1:]
+    elif len(telefone_limpo) == 10:
+        telefone_limpo = '55' + telefone_limpo
+    elif len(telefone_limpo) == 11:
+        telefone_limpo = '55' + telefone_limpo
+
+    return telefone_limpo
+
+
+def _lotes(iteravel, tamanho=TAMANHO_LOTE):
+    iterador = iter(iteravel)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+def enfileirar(mensagens, origem, midia='', mensagem=None):
+    """
+    Enfileira (chave, telefone, texto) ainda não enfileirados. Retorna quantas entraram.
+    Telefones sem dígitos suficientes são descartados. midia: media id (ou URL) da imagem
+    que acompanha todas as mensagens; mensagem: TBWHATSAPP de uma mensagem em massa.
+    """
+    from .models.area_admin.models_whatsapp import TBFILAWHATSAPP
+    novas = 0
+    for lote in _lotes(mensagens):
+        por_chave = {}
+        for chave, telefone, texto in lote:
+            telefone = limpar_telefone_para_envio(telefone)
+            if telefone and len(telefone) >= 12:
+                por_chave.setdefault(chave, (telefone, texto))
+        existentes = set(
+            TBFILAWHATSAPP.objects.filter(FIL_chave__in=list(por_chave)).values_list('FIL_chave', flat=True)
+        )
+        objetos = [
+            TBFILAWHATSAPP(
+                FIL_chave=chave, FIL_origem=origem, FIL_telefone=telefone, FIL_texto=texto, FIL_midia=midia or '',
+                FIL_mensagem=mensagem,
+            )
+            for chave, (telefone, texto) in por_chave.items() if chave not in existentes
+        ]
+        # ignore_conflicts cobre outra execução enfileirando a mesma chave entre a consulta e o insert
+        TBFILAWHATSAPP.objects.bulk_create(objetos, ignore_conflicts=True)
+        novas += len(objetos)
+    return novas
+
+
+def enviar_item(telefone, texto, midia=''):
+    """
+    Envio padrão da fila: imagem com legenda se houver mídia, senão texto. Mídia por URL
+    vai pelo media id; id recusado é esquecido e a imagem vai pela URL (uma vez).
+    """
+    from .utils_midia_whatsapp import invalidar_midia, media_id_url
+    from .views.area_publica.views_whatsapp_api import send_whatsapp_image, send_whatsapp_message
+    if not midia:
+        return send_whatsapp_message(telefone, texto)
+    if midia.startswith(('http://', 'https://')):
+        media_id = media_id_url(midia)
+        if media_id:
+            resultado = send_whatsapp_image(telefone, media_id, texto)
+            erro = resultado.get('error')
+            if not erro or 'Erro 429' in erro:
+                return resultado
+            invalidar_midia(media_id)
+    return send_whatsapp_image(telefone, midia, texto)
+
+
+def _reservar(pk):
+    from .models.area_admin.models_whatsapp import TBFILAWHATSAPP
+    return TBFILAWHATSAPP.objects.filter(pk=pk, FIL_status='PENDENTE').update(FIL_status='ENVIANDO') == 1
+
+
+def processar_fila(por_minuto=None, maximo=None, enviar=None, dormir=time.sleep, mensagem=None):
+    """
+    Envia as mensagens pendentes respeitando o ritmo por minuto (só as da mensagem em
+    massa de pk mensagem, se informada).
+    Retorna Counter com enviadas, erros, reenvios (voltaram para a fila) e limite (429).
+    """
+    from .models.area_admin.models_whatsapp import TBFILAWHATSAPP
+    enviar = enviar or enviar_item
+    por_minuto = por_minuto or getattr(settings, 'WHATSAPP_FILA_POR_MINUTO', 30)
+    intervalo = 60 / por_minuto
+    totais = Counter()
+    proximo_envio = time.monotonic()
+    ultimo_id = 0
+    pendentes = TBFILAWHATSAPP.objects.filter(FIL_status='PENDENTE')
+    if mensagem is not None:
+        pendentes = pendentes.filter(FIL_mensagem_id=mensagem)
+
+    while True:
+        lote = list(
+            pendentes.filter(FIL_id__gt=ultimo_id)
+            .order_by('FIL_id').values_list(
+                'FIL_id', 'FIL_telefone', 'FIL_texto', 'FIL_midia', 'FIL_tentativas', 'FIL_mensagem_id',
+            )[:TAMANHO_LOTE]
+        )
+        if not lote:
+            return totais
+        for pk, telefone, texto, midia, tentativas, mensagem_id in lote:
+            ultimo_id = pk
+            if maximo is not None and totais['enviadas'] + totais['erros'] + totais['reenvios'] >= maximo:
+                return totais
+            if not _reservar(pk):
+                continue  # outro processador pegou
+
+            espera = proximo_envio - time.monotonic()
+            if espera > 0:
+                dormir(espera)
+            proximo_envio = max(proximo_envio, time.monotonic()) + intervalo
+
+            resultado = enviar(telefone, texto, midia) or {}
+            erro = resultado.get('error')
+            fila = TBFILAWHATSAPP.objects.filter(pk=pk)
+            if not erro:
+                fila.update(FIL_status='ENVIADA', FIL_data_envio=timezone.now(), FIL_tentativas=F('FIL_tentativas') + 1)
+                totais['enviadas'] += 1
+                if mensagem_id:
+                    contabilizar_envio(mensagem_id, telefone, resultado)
+            elif 'Erro 429' in erro:
+                # Limite da Whapi: devolve sem gastar tentativa e para; a próxima execução continua
+                fila.update(FIL_status='PENDENTE', FIL_erro=erro)
+                totais['limite'] += 1
+                return totais
+            elif tentativas + 1 < MAX_TENTATIVAS:
+                fila.update(FIL_status='PENDENTE', FIL_erro=erro, FIL_tentativas=F('FIL_tentativas') + 1)
+                totais['reenvios'] += 1
+            else:
+                fila.update(FIL_status='ERRO', FIL_erro=erro, FIL_tentativas=F('FIL_tentativas') + 1)
+                totais['erros'] += 1
+                if mensagem_id:
+                    contabilizar_envio(mensagem_id, telefone, erro=erro)
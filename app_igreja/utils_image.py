@@ -1,78 +1,301 @@
 """
 Utilitários para processamento de imagens
+
+Pipeline de rendições: quando um ImageField recebe um upload novo, o original é
+reduzido para CAIXA_ORIGINAL no save (signals.py, reduzir_original), o hash do conteúdo
+é calculado e, após o commit, um worker em segundo plano gera as
+versões thumb/medio/grande (JPEG e, se disponível, WebP) uma única vez por conteúdo.
+O template tag {% imagem_url %} (templatetags/imagens.py) escolhe a rendição.
+
+Formulários com várias fotos (mural) usam salvar_imagens_em_paralelo: cada foto é
+lida e codificada uma vez e enviada ao storage em paralelo com as outras.
 """
+import hashlib
+import logging
+import posixpath
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from PIL import Image
-from django.core.files.uploadedfile import InMemoryUploadedFile
-import sys
+from PIL import Image, ImageOps, features
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Caixa máxima (largura, altura) de cada rendição, da maior para a menor
+RENDICOES = {
+    'grande': (1600, 1600),
+    'medio': (600, 600),
+    'thumb': (200, 200),
+}
+QUALIDADE = {'jpeg': 80, 'webp': 75}
+# Arquivo gravado no upload (as rendições são geradas a partir dele)
+CAIXA_ORIGINAL = (1920, 1920)
+QUALIDADE_ORIGINAL = 85
+TEMPO_CACHE_RENDICOES = 60 * 60  # segundos (sem rendição ainda: 60s, o worker pode estar rodando)
+
+_executor = ThreadPoolExecutor(max_workers=getattr(settings, 'IMAGENS_WORKERS', 2), thread_name_prefix='imagens')
+
+
+def converter_para_rgb(img):
+    """Converte para RGB, usando fundo branco em imagens com transparência."""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
 
+# ==================== UPLOAD EM PARALELO ====================
 
-def redimensionar_imagem(image_field, max_width=1920, max_height=1080, quality=85):
+def codificar_upload(arquivo, caixa=CAIXA_ORIGINAL, qualidade=QUALIDADE_ORIGINAL):
     """
-    Redimensiona uma imagem mantendo a proporção e reduzindo o tamanho do arquivo.
-    
-    Args:
-        image_field: Campo de imagem do Django (InMemoryUploadedFile ou UploadedFile)
-        max_width: Largura máxima em pixels (padrão: 1920)
-        max_height: Altura máxima em pixels (padrão: 1080)
-        quality: Qualidade JPEG (0-100, padrão: 85)
-    
-    Returns:
-        InMemoryUploadedFile redimensionado ou None se não houver imagem
+    Lê o upload uma única vez: corrige a orientação (EXIF), reduz para caber na caixa e
+    recodifica em JPEG. Retorna (nome com extensão .jpg, bytes).
+    """
+    arquivo.seek(0)
+    img = converter_para_rgb(ImageOps.exif_transpose(Image.open(arquivo)))
+    img.thumbnail(caixa, Image.Resampling.LANCZOS)
+    buffer = BytesIO()
+    img.save(buffer, format='JPEG', quality=qualidade, optimize=True)
+    nome = posixpath.splitext(posixpath.basename(arquivo.name or 'imagem'))[0] + '.jpg'
+    return nome, buffer.getvalue()
+
+
+def reduzir_original(arquivo):
+    """
+    Upload de um ImageField salvo pelo model (signals.py), reduzido como no mural
+    (codificar_upload). Imagens com transparência (logos em PNG) e arquivos que o Pillow
+    não abre ficam como vieram: retorna None.
     """
-    if not image_field:
-        return None
-    
     try:
-        # Abrir a imagem
-        img = Image.open(image_field)
-        
-        # Converter para RGB se necessário (para JPEG)
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Criar fundo branco para imagens com transparência
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        # Obter dimensões originais
-        width, height = img.size
-        
-        # Calcular novas dimensões mantendo proporção
-        if width > max_width or height > max_height:
-            ratio = min(max_width / width, max_height / height)
-            new_width = int(width * ratio)
-            new_height = int(height * ratio)
-            
-            # Redimensionar
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Salvar em memória
-        output = BytesIO()
-        img.save(output, format='JPEG', quality=quality, optimize=True)
-        output.seek(0)
-        
-        # Criar novo arquivo InMemoryUploadedFile
-        filename = image_field.name
-        if not filename:
-            filename = 'image.jpg'
-        elif not filename.lower().endswith(('.jpg', '.jpeg')):
-            # Garantir extensão .jpg
-            filename = filename.rsplit('.', 1)[0] + '.jpg'
-        
-        return InMemoryUploadedFile(
-            output,
-            'ImageField',
-            filename,
-            'image/jpeg',
-            sys.getsizeof(output),
-            None
+        arquivo.seek(0)
+        with Image.open(arquivo) as img:
+            transparente = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+    except (OSError, Image.DecompressionBombError):
+        return None
+    finally:
+        arquivo.seek(0)
+    return None if transparente else codificar_upload(arquivo)
+
+
+def salvar_imagens_em_paralelo(instance, uploads):
+    """
+    Codifica e envia ao storage as imagens de um formulário, todas ao mesmo tempo.
+
+    uploads: {campo: arquivo enviado}. Cada foto passa por um worker que a codifica
+    (codificar_upload) e já a envia, sem esperar as demais; o storage S3 divide arquivos
+    grandes em partes (AWS_S3_TRANSFER_CONFIG). Foto com o mesmo conteúdo da atual não é
+    reenviada. Ao final os campos apontam para os arquivos gravados, então o save() do
+    model não faz mais nenhum upload.
+
+    Retorna (novas, tempos): novas = [(campo, hash)] para agendar_rendicoes depois do
+    save; tempos = {'codificacao': ms, 'envio': ms, 'total': ms}, somados entre as fotos
+    (exceto o total, que é o tempo de relógio).
+    """
+    from .models.area_admin.models_midia import TBRENDICAO
+
+    inicio = time.perf_counter()
+    tempos = {'codificacao': 0.0, 'envio': 0.0}
+    uploads = {campo: arquivo for campo, arquivo in uploads.items() if arquivo}
+    if not uploads:
+        tempos['total'] = 0.0
+        return [], tempos
+
+    # Hashes dos arquivos atuais, consultados antes: os workers não acessam o banco
+    atuais = {}
+    if instance.pk is not None:
+        atuais = type(instance).objects.filter(pk=instance.pk).values(*uploads).first() or {}
+    hashes_atuais = dict(
+        TBRENDICAO.objects.filter(REN_original__in=[n for n in atuais.values() if n]).values_list(
+            'REN_original', 'REN_hash'
+        )
+    )
+
+    def processar(campo, arquivo):
+        t0 = time.perf_counter()
+        nome, conteudo = codificar_upload(arquivo)
+        hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+        t1 = time.perf_counter()
+        atual = atuais.get(campo)
+        if atual and hashes_atuais.get(atual) == hash_conteudo:
+            return campo, atual, None, t1 - t0, 0.0
+        campo_model = instance._meta.get_field(campo)
+        gravado = campo_model.storage.save(
+            campo_model.generate_filename(instance, nome), ContentFile(conteudo),
         )
-    except Exception as e:
-        # Se houver erro, retornar a imagem original
-        print(f"Erro ao redimensionar imagem: {e}")
-        return image_field
+        return campo, gravado, hash_conteudo, t1 - t0, time.perf_counter() - t1
+
+    novas = []
+    workers = min(len(uploads), getattr(settings, 'IMAGENS_UPLOADS_PARALELOS', 5))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='upload') as executor:
+        futuros = [executor.submit(processar, campo, arquivo) for campo, arquivo in uploads.items()]
+        for futuro in futuros:
+            campo, gravado, hash_conteudo, codificacao, envio = futuro.result()
+            setattr(instance, campo, gravado)
+            if hash_conteudo:
+                novas.append((campo, hash_conteudo))
+            tempos['codificacao'] += codificacao * 1000
+            tempos['envio'] += envio * 1000
+    tempos['total'] = (time.perf_counter() - inicio) * 1000
+    return novas, tempos
+
+
+# ==================== RENDIÇÕES ====================
+
+def formatos_rendicao():
+    """JPEG sempre; WebP quando habilitado no settings e suportado pelo Pillow."""
+    if getattr(settings, 'IMAGENS_WEBP', True) and features.check('webp'):
+        return ('jpeg', 'webp')
+    return ('jpeg',)
+
+
+def hash_arquivo(arquivo):
+    """SHA-256 do conteúdo de um arquivo (lido em blocos; posição restaurada ao início)."""
+    sha = hashlib.sha256()
+    arquivo.seek(0)
+    for bloco in iter(lambda: arquivo.read(64 * 1024), b''):
+        sha.update(bloco)
+    arquivo.seek(0)
+    return sha.hexdigest()
+
+
+def _chave_cache(nome_original):
+    return 'rendicoes:' + hashlib.md5(nome_original.encode()).hexdigest()
+
+
+def rendicoes_do_arquivo(nome_original):
+    """{'medio.webp': 'rendicoes/mural/..._medio.webp', ...} do original (consulta em cache)."""
+    from .models.area_admin.models_midia import TBRENDICAO
+
+    chave = _chave_cache(nome_original)
+    rendicoes = cache.get(chave)
+    if rendicoes is None:
+        rendicoes = {
+            f'{tamanho}.{formato}': arquivo
+            for tamanho, formato, arquivo in TBRENDICAO.objects.filter(
+                REN_original=nome_original
+            ).values_list('REN_tamanho', 'REN_formato', 'REN_arquivo')
+        }
+        cache.set(chave, rendicoes, TEMPO_CACHE_RENDICOES if rendicoes else 60)
+    return rendicoes
+
+
+def nome_rendicao(arquivo, tamanho='grande', formato='jpeg'):
+    """Nome no storage da rendição do arquivo; o do original enquanto ela não foi gerada."""
+    return rendicoes_do_arquivo(arquivo.name).get(f'{tamanho}.{formato}') or arquivo.name
+
+
+def url_rendicao(arquivo, tamanho='grande', formato='jpeg'):
+    """URL da rendição do arquivo (a do original enquanto ela não foi gerada)."""
+    nome = rendicoes_do_arquivo(arquivo.name).get(f'{tamanho}.{formato}')
+    return default_storage.url(nome) if nome else arquivo.url
+
+
+def conteudo_inalterado(nome_original, hash_conteudo):
+    """True se o arquivo já salvo tem o mesmo conteúdo (mesmo hash) que o upload."""
+    from .models.area_admin.models_midia import TBRENDICAO
+    return TBRENDICAO.objects.filter(REN_original=nome_original, REN_hash=hash_conteudo).exists()
+
+
+def gerar_rendicoes(nome_original, hash_conteudo=None):
+    """
+    Gera (ou reaproveita) as rendições de uma imagem já gravada no storage.
+
+    As rendições ficam em rendicoes/<pasta do original>/ (a pasta define se a URL é
+    pública ou assinada, ver storage.midia_privada). Se outro original da mesma pasta e
+    com o mesmo hash já foi processado, só cria as linhas apontando para os mesmos
+    arquivos. Retorna a quantidade de rendições registradas.
+    """
+    from .models.area_admin.models_midia import TBRENDICAO
+
+    pasta = f"rendicoes/{posixpath.dirname(nome_original) or 'raiz'}/"
+
+    with default_storage.open(nome_original, 'rb') as arquivo:
+        if hash_conteudo is None:
+            hash_conteudo = hash_arquivo(arquivo)
+
+        existentes = {
+            (r['REN_tamanho'], r['REN_formato']): r
+            for r in TBRENDICAO.objects.filter(REN_hash=hash_conteudo, REN_arquivo__startswith=pasta).values(
+                'REN_tamanho', 'REN_formato', 'REN_arquivo', 'REN_largura', 'REN_altura'
+            )
+        }
+        faltantes = [
+            (tamanho, formato) for tamanho in RENDICOES for formato in formatos_rendicao()
+            if (tamanho, formato) not in existentes
+        ]
+        if faltantes:
+            img = converter_para_rgb(ImageOps.exif_transpose(Image.open(arquivo)))
+            # Reduz a partir da rendição anterior (maior), que é mais barato que partir do original
+            for tamanho, caixa in RENDICOES.items():
+                img = img.copy()
+                img.thumbnail(caixa, Image.Resampling.LANCZOS)
+                for formato in formatos_rendicao():
+                    if (tamanho, formato) not in faltantes:
+                        continue
+                    buffer = BytesIO()
+                    img.save(buffer, format=formato.upper(), quality=QUALIDADE[formato], optimize=True)
+                    extensao = 'jpg' if formato == 'jpeg' else formato
+                    nome = default_storage.save(
+                        f'{pasta}{hash_conteudo}_{tamanho}.{extensao}',
+                        ContentFile(buffer.getvalue()),
+                    )
+                    existentes[(tamanho, formato)] = {
+                        'REN_tamanho': tamanho, 'REN_formato': formato, 'REN_arquivo': nome,
+                        'REN_largura': img.width, 'REN_altura': img.height,
+                    }
+
+    # save() individual (e não bulk_create) para o manifesto de mídia registrar os arquivos
+    for (tamanho, formato), dados in existentes.items():
+        TBRENDICAO.objects.update_or_create(
+            REN_original=nome_original, REN_tamanho=tamanho, REN_formato=formato,
+            defaults={
+                'REN_hash': hash_conteudo, 'REN_arquivo': dados['REN_arquivo'],
+                'REN_largura': dados['REN_largura'], 'REN_altura': dados['REN_altura'],
+            },
+        )
+    cache.delete(_chave_cache(nome_original))
+    return len(existentes)
+
+
+def _gerar_rendicoes_seguro(nome_original, hash_conteudo):
+    try:
+        gerar_rendicoes(nome_original, hash_conteudo)
+    except Exception:
+        logger.exception("Erro ao gerar rendições de %s", nome_original)
+
+
+def agendar_rendicoes(nome_original, hash_conteudo=None):
+    """
+    Gera as rendições em segundo plano depois do commit da transação atual.
+
+    Com IMAGENS_SINCRONO=True (testes, comandos) roda na própria thread.
+    """
+    if getattr(settings, 'IMAGENS_SINCRONO', False):
+        transaction.on_commit(lambda: _gerar_rendicoes_seguro(nome_original, hash_conteudo))
+    else:
+        transaction.on_commit(lambda: _executor.submit(_gerar_rendicoes_seguro, nome_original, hash_conteudo))
+
+
+def limpar_rendicoes_orfas(referenciados):
+    """Apaga as rendições cujo original não está mais entre os arquivos referenciados."""
+    from .models.area_admin.models_midia import TBRENDICAO
 
+    orfas = {}
+    for pk, original in TBRENDICAO.objects.values_list('pk', 'REN_original').iterator(chunk_size=2000):
+        if original not in referenciados:
+            orfas[pk] = original
+    # delete() do queryset dispara post_delete por objeto e atualiza o manifesto de mídia
+    pks = list(orfas)
+    for inicio in range(0, len(pks), 500):
+        TBRENDICAO.objects.filter(pk__in=pks[inicio:inicio + 500]).delete()
+    cache.delete_many([_chave_cache(original) for original in set(orfas.values())])
+    return len(orfas)
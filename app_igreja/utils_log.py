@@ -0,0 +1,148 @@
+"""
+Log estruturado do WhatsApp (webhook e envios para a Whapi)
+
+- evento('whapi_envio', endpoint=..., status=..., ms=...) grava uma linha JSON no logger
+  app_igreja.whatsapp.eventos. O JSON só é montado se o nível estiver habilitado e,
+  mesmo assim, na thread do FilaLogHandler - nunca na requisição.
+- FilaLogHandler: o worker só coloca o registro numa fila limitada (put_nowait) e volta
+  a atender; uma thread formata e escreve no stdout. Fila cheia descarta o registro e
+  conta o descarte, em vez de travar o worker esperando o terminal ou o journald; a
+  própria thread avisa os descartes com uma linha WARNING assim que volta a escrever.
+- capturar_payload(): uma amostra das entregas do webhook (WHATSAPP_AMOSTRAGEM_PAYLOAD),
+  já sem dados pessoais (utils_webhook), vai para TBWEBHOOKAMOSTRA, que funciona como
+  buffer circular de WHATSAPP_AMOSTRAS_MAX linhas: a posição é um contador no cache e a
+  linha mais antiga é sobrescrita. Substitui o dump de cada payload no log.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueListener
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOGGER_EVENTOS = 'app_igreja.whatsapp.eventos'
+TAMANHO_FILA = 10000
+
+_eventos = logging.getLogger(LOGGER_EVENTOS)
+
+
+class Evento:
+    """Mensagem de log de um evento; vira JSON só quando o handler formata."""
+
+    __slots__ = ('nome', 'campos')
+
+    def __init__(self, nome, campos):
+        self.nome = nome
+        self.campos = campos
+
+    def __str__(self):
+        return json.dumps({'evento': self.nome, **self.campos}, ensure_ascii=False, default=str, separators=(',', ':'))
+
+
+def evento(nome, nivel=logging.INFO, **campos):
+    """Registra um evento estruturado (nome + campos) no log do WhatsApp."""
+    if _eventos.isEnabledFor(nivel):
+        _eventos.log(nivel, '%s', Evento(nome, campos), extra={'evento': nome})
+
+
+class _EscritorFila(QueueListener):
+    """Thread do FilaLogHandler: escreve cada registro e avisa os descartes desde o último aviso."""
+
+    def __init__(self, handler):
+        super().__init__(handler.fila, handler.destino, respect_handler_level=False)
+        self.handler = handler
+        self.avisados = handler.descartados  # descartes herdados no fork já foram avisados no pai
+
+    def handle(self, record):
+        super().handle(record)
+        descartados = self.handler.descartados
+        if descartados > self.avisados:
+            self.handler.destino.handle(logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                '%s registro(s) de log descartado(s) com a fila cheia (%s desde o início do processo)',
+                (descartados - self.avisados, descartados), None,
+            ))
+            self.avisados = descartados
+
+    def enqueue_sentinel(self):
+        # Na parada a fila pode estar cheia: espera a thread abrir espaço
+        self.queue.put(self._sentinel)
+
+
+class FilaLogHandler(logging.Handler):
+    """
+    Handler que não bloqueia: enfileira o registro e uma thread o escreve.
+
+    Formatação (inclusive dos argumentos %s e do JSON dos eventos) acontece na thread.
+    Se o processo for copiado por fork (gunicorn com preload), a thread é recriada no
+    processo filho na primeira mensagem.
+    """
+
+    def __init__(self, tamanho=TAMANHO_FILA, stream=None):
+        super().__init__()
+        self.tamanho = tamanho
+        self.destino = logging.StreamHandler(stream or sys.stdout)
+        self.descartados = 0
+        self._pid = None
+        self._listener = None
+        self._trava_inicio = threading.Lock()
+        atexit.register(self.parar)
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.destino.setFormatter(fmt)
+
+    def _iniciar(self):
+        with self._trava_inicio:
+            if self._pid == os.getpid():
+                return
+            self.fila = queue.Queue(self.tamanho)
+            self._listener = _EscritorFila(self)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._iniciar()
+        try:
+            self.fila.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+    def parar(self):
+        """Esvazia a fila e encerra a thread (atexit)."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+    def close(self):
+        self.parar()
+        self.destino.close()
+        super().close()
+
+
+def capturar_payload(nome, dados):
+    """Guarda uma amostra (sanitizada) da entrega no buffer circular TBWEBHOOKAMOSTRA."""
+    taxa = getattr(settings, 'WHATSAPP_AMOSTRAGEM_PAYLOAD', 0)
+    maximo = getattr(settings, 'WHATSAPP_AMOSTRAS_MAX', 0)
+    if not dados or maximo <= 0 or taxa <= 0 or random.random() >= taxa:
+        return
+    from .models.area_admin.models_whatsapp import TBWEBHOOKAMOSTRA
+    from .utils_webhook import sanitizar_payload
+    try:
+        cache.add('whatsapp:amostra:contador', 0, None)
+        posicao = cache.incr('whatsapp:amostra:contador') % maximo
+        TBWEBHOOKAMOSTRA(
+            WAM_posicao=posicao,
+            WAM_evento=nome,
+            WAM_payload=json.dumps(sanitizar_payload(dados), ensure_ascii=False),
+        ).save()
+    except Exception as e:
+        logging.getLogger(__name__).warning('Amostra do webhook não gravada: %s', e)
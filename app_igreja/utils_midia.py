@@ -0,0 +1,121 @@
+"""
+Manifesto de mídia (TBMIDIA)
+
+Guarda o nome de todo arquivo referenciado por um ImageField/FileField dos models do
+app. É atualizado de forma incremental pelos sinais post_save/post_delete e pode ser
+reconstruído por completo (`limpar_storage --reconstruir`) lendo só as colunas de
+arquivo de cada tabela.
+"""
+import logging
+
+import boto3
+from botocore.config import Config
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+
+from .models.area_admin.models_midia import TBMIDIA
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_LOTE_MANIFESTO = 1000
+
+
+def campos_de_arquivo(model):
+    """Nomes dos FileField/ImageField concretos do model."""
+    return [f.name for f in model._meta.concrete_fields if isinstance(f, models.FileField)]
+
+
+def campos_de_imagem(model):
+    """Nomes dos ImageField concretos do model (os que recebem rendições)."""
+    return [f.name for f in model._meta.concrete_fields if isinstance(f, models.ImageField)]
+
+
+def models_com_arquivo():
+    """Models do app_igreja que possuem ao menos um campo de arquivo."""
+    return [m for m in apps.get_app_config('app_igreja').get_models() if campos_de_arquivo(m)]
+
+
+def _tabela(model):
+    return model._meta.label
+
+
+def registrar_midia(instance):
+    """Sincroniza as linhas do manifesto de um registro recém-salvo (1 consulta se nada mudou)."""
+    model = type(instance)
+    tabela = _tabela(model)
+    objeto_id = str(instance.pk)
+    existentes = {
+        campo: (pk, arquivo)
+        for pk, campo, arquivo in TBMIDIA.objects.filter(
+            MID_tabela=tabela, MID_objeto_id=objeto_id
+        ).values_list('pk', 'MID_campo', 'MID_arquivo')
+    }
+
+    novos, alterados, removidos = [], [], []
+    for campo in campos_de_arquivo(model):
+        arquivo = getattr(instance, campo).name or ''
+        atual = existentes.get(campo)
+        if not arquivo:
+            if atual:
+                removidos.append(atual[0])
+        elif atual is None:
+            novos.append(TBMIDIA(MID_arquivo=arquivo, MID_tabela=tabela, MID_objeto_id=objeto_id, MID_campo=campo))
+        elif atual[1] != arquivo:
+            alterados.append((atual[0], arquivo))
+
+    if removidos:
+        TBMIDIA.objects.filter(pk__in=removidos).delete()
+    for pk, arquivo in alterados:
+        TBMIDIA.objects.filter(pk=pk).update(MID_arquivo=arquivo)
+    if novos:
+        TBMIDIA.objects.bulk_create(novos)
+
+
+def remover_midia(instance):
+    """Remove do manifesto as linhas de um registro excluído."""
+    TBMIDIA.objects.filter(MID_tabela=_tabela(type(instance)), MID_objeto_id=str(instance.pk)).delete()
+
+
+def reconstruir_manifesto():
+    """
+    Recria o manifesto inteiro a partir das tabelas.
+
+    Cada tabela é lida com values_list (pk + colunas de arquivo) em blocos, sem
+    instanciar os models. Retorna o total de arquivos registrados.
+    """
+    linhas = []
+    for model in models_com_arquivo():
+        campos = campos_de_arquivo(model)
+        tabela = _tabela(model)
+        for pk, *arquivos in model.objects.values_list('pk', *campos).iterator(chunk_size=TAMANHO_LOTE_MANIFESTO):
+            for campo, arquivo in zip(campos, arquivos):
+                if arquivo:
+                    linhas.append(TBMIDIA(MID_arquivo=arquivo, MID_tabela=tabela, MID_objeto_id=str(pk), MID_campo=campo))
+
+    with transaction.atomic():
+        TBMIDIA.objects.all().delete()
+        TBMIDIA.objects.bulk_create(linhas, batch_size=TAMANHO_LOTE_MANIFESTO)
+    logger.info("Manifesto de mídia reconstruído: %s arquivo(s)", len(linhas))
+    return len(linhas)
+
+
+def arquivos_referenciados():
+    """Conjunto com o nome de todos os arquivos do manifesto."""
+    return set(TBMIDIA.objects.values_list('MID_arquivo', flat=True).iterator(chunk_size=5000))
+
+
+def cliente_s3(endpoint_url=None, max_conexoes=10):
+    """
+    Cliente boto3 com as credenciais do settings.
+
+    endpoint_url permite apontar para um S3 local (MinIO, moto_server) em testes.
+    """
+    return boto3.client(
+        's3',
+        endpoint_url=endpoint_url or settings.AWS_S3_ENDPOINT_URL,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+        config=Config(max_pool_connections=max_conexoes, signature_version=settings.AWS_S3_SIGNATURE_VERSION),
+    )
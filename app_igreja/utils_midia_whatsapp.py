@@ -0,0 +1,139 @@
+"""
+Cache de mídias enviadas à Whapi: cada arquivo sobe uma vez e é reenviado pelo media id
+
+Mandar uma imagem pela URL faz a Whapi baixá-la do nosso servidor (ou do Wasabi) a
+cada mensagem: a foto da capa no primeiro contato, na confirmação de escala, em cada
+aniversariante. Aqui o arquivo sobe uma vez (POST /media) e o id devolvido fica em
+TBMIDIAWHATSAPP, pelo nome no storage (ou pela URL), com o SHA-256 do conteúdo e a
+validade (WHATSAPP_MIDIA_VALIDADE_DIAS, abaixo do prazo de retenção da Whapi).
+
+- media_id_arquivo(FieldFile) / media_id_url(url): id válido no cache ou no banco; sem
+  ele, lê o conteúdo uma vez, reaproveita o id de um arquivo de mesmo hash ou sobe.
+  De um ImageField vai a rendição 'grande' (utils_image), não o original do upload.
+- O id também fica no cache compartilhado até expirar: a consulta ao banco acontece
+  uma vez por worker, e o arquivo só é lido de novo quando o nome muda (arquivo trocado
+  no admin) ou a validade vence.
+- invalidar_midia(): se a Whapi recusar um id (apagado antes do prazo), o registro sai
+  e o próximo envio sobe o arquivo outra vez.
+Qualquer falha devolve None e quem chamou segue com a URL, como antes.
+"""
+import hashlib
+import logging
+import mimetypes
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _chave_cache(nome):
+    return f"whatsapp:midia:{hashlib.sha1(nome.encode()).hexdigest()}"
+
+
+def _validade():
+    return timedelta(days=getattr(settings, 'WHATSAPP_MIDIA_VALIDADE_DIAS', 25))
+
+
+def _lembrar(nome, media_id, expira_em):
+    segundos = int((expira_em - timezone.now()).total_seconds())
+    if segundos > 0:
+        cache.set(_chave_cache(nome), media_id, segundos)
+
+
+def _media_id_registrado(nome):
+    from .models.area_admin.models_whatsapp import TBMIDIAWHATSAPP
+    media_id = cache.get(_chave_cache(nome))
+    if media_id:
+        return media_id
+    registro = (
+        TBMIDIAWHATSAPP.objects.filter(MWA_nome=nome, MWA_expira_em__gt=timezone.now())
+        .values_list('MWA_media_id', 'MWA_expira_em').first()
+    )
+    if registro:
+        _lembrar(nome, *registro)
+        return registro[0]
+    return None
+
+
+def media_id_conteudo(nome, conteudo, content_type=None):
+    """Media id do conteúdo (sobe para a Whapi só se nenhum arquivo igual tiver id válido)."""
+    from .models.area_admin.models_whatsapp import TBMIDIAWHATSAPP
+    from .views.area_publica.views_whatsapp_api import upload_whatsapp_media
+    agora = timezone.now()
+    hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+    igual = (
+        TBMIDIAWHATSAPP.objects.filter(MWA_hash=hash_conteudo, MWA_expira_em__gt=agora)
+        .values_list('MWA_media_id', 'MWA_expira_em').first()
+    )
+    if igual:
+        media_id, expira_em = igual
+    else:
+        content_type = content_type or mimetypes.guess_type(nome)[0] or 'image/jpeg'
+        media_id = upload_whatsapp_media(conteudo, content_type)
+        if not media_id:
+            return None
+        expira_em = agora + _validade()
+    TBMIDIAWHATSAPP.objects.update_or_create(
+        MWA_nome=nome,
+        defaults={
+            'MWA_hash': hash_conteudo, 'MWA_media_id': media_id, 'MWA_tamanho': len(conteudo),
+            'MWA_enviado_em': agora, 'MWA_expira_em': expira_em,
+        },
+    )
+    _lembrar(nome, media_id, expira_em)
+    return media_id
+
+
+def media_id_arquivo(arquivo):
+    """
+    Media id de um arquivo do storage (FieldFile de um ImageField/FileField), ou None.
+    Sobe a rendição 'grande' em JPEG quando já existe; o original fica no tamanho do upload.
+    """
+    if not arquivo:
+        return None
+    from .utils_image import nome_rendicao
+    nome = arquivo.name
+    try:
+        nome = nome_rendicao(arquivo)
+        media_id = _media_id_registrado(nome)
+        if media_id:
+            return media_id
+        if nome == arquivo.name:
+            with arquivo.open('rb') as aberto:
+                conteudo = aberto.read()
+        else:
+            with default_storage.open(nome, 'rb') as aberto:
+                conteudo = aberto.read()
+        return media_id_conteudo(nome, conteudo)
+    except Exception as e:
+        logger.warning('Mídia %s não enviada à Whapi: %s', nome, e)
+        return None
+
+
+def media_id_url(url):
+    """Media id de uma imagem externa (baixada uma vez), ou None."""
+    if not url:
+        return None
+    try:
+        media_id = _media_id_registrado(url)
+        if media_id:
+            return media_id
+        resposta = requests.get(url, timeout=30)
+        resposta.raise_for_status()
+        return media_id_conteudo(url, resposta.content, resposta.headers.get('content-type'))
+    except Exception as e:
+        logger.warning('Imagem %s não enviada à Whapi: %s', url, e)
+        return None
+
+
+def invalidar_midia(media_id):
+    """Esquece um media id recusado pela Whapi (o próximo envio sobe o arquivo de novo)."""
+    from .models.area_admin.models_whatsapp import TBMIDIAWHATSAPP
+    nomes = list(TBMIDIAWHATSAPP.objects.filter(MWA_media_id=media_id).values_list('MWA_nome', flat=True))
+    cache.delete_many([_chave_cache(nome) for nome in nomes])
+    TBMIDIAWHATSAPP.objects.filter(MWA_media_id=media_id).delete()
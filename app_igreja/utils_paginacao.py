@@ -0,0 +1,102 @@
+"""
+Paginação por chave (keyset)
+
+Em vez de OFFSET (o banco lê e descarta todas as linhas das páginas anteriores), cada
+página começa depois do último registro da anterior: WHERE (data, id) < (ultima_data,
+ultimo_id). Com um índice na mesma ordem, qualquer página custa o mesmo que a primeira.
+
+O cursor é opaco para o cliente (base64 dos valores do último registro) e a ordem
+precisa terminar num campo único (normalmente a pk) para não pular nem repetir linhas.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+TAMANHO_PAGINA = 10
+
+
+def _codificar_cursor(valores):
+    return base64.urlsafe_b64encode(json.dumps([str(v) for v in valores]).encode()).decode().rstrip('=')
+
+
+def _decodificar_cursor(cursor, campos):
+    """
+    Valores do cursor convertidos pelo to_python de cada campo, ou None se ele for
+    inválido (URL editada, ordem diferente, valor que não é do tipo do campo).
+    """
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(valores, list) or len(valores) != len(campos):
+        return None
+    try:
+        return [campo.to_python(valor) for campo, valor in zip(campos, valores)]
+    except (ValidationError, ValueError, TypeError):
+        return None
+
+
+def _filtro_depois_de(ordem, valores):
+    """(a, b, c) "depois de" (va, vb, vc) respeitando a direção de cada campo."""
+    filtro = Q()
+    for i, campo in enumerate(ordem):
+        nome = campo.lstrip('-')
+        iguais = {c.lstrip('-'): v for c, v in zip(ordem[:i], valores[:i])}
+        iguais[f"{nome}__{'lt' if campo.startswith('-') else 'gt'}"] = valores[i]
+        filtro |= Q(**iguais)
+    return filtro
+
+
+class PaginaPorChave:
+    """Uma página de resultados: iterável, com proximo_cursor (None na última página)."""
+
+    def __init__(self, itens, proximo_cursor, cursor_atual):
+        self.itens = itens
+        self.proximo_cursor = proximo_cursor
+        self.cursor_atual = cursor_atual
+
+    def __iter__(self):
+        return iter(self.itens)
+
+    def __len__(self):
+        return len(self.itens)
+
+    def __bool__(self):
+        return bool(self.itens)
+
+    @property
+    def tem_proxima(self):
+        return self.proximo_cursor is not None
+
+    @property
+    def eh_primeira(self):
+        return not self.cursor_atual
+
+
+def paginar_por_chave(queryset, ordem, cursor=None, tamanho=TAMANHO_PAGINA):
+    """
+    Página de `tamanho` registros de queryset na `ordem` dada, a partir do cursor.
+
+    ordem: lista de campos como em order_by (ex.: ['-CEL_data_celebracao', '-pk']).
+    Cursor inválido volta para a primeira página.
+    """
+    nomes = [campo.lstrip('-') for campo in ordem]
+    opcoes = queryset.model._meta
+    campos = [opcoes.pk if nome == 'pk' else opcoes.get_field(nome) for nome in nomes]
+    queryset = queryset.order_by(*ordem)
+    valores = _decodificar_cursor(cursor, campos) if cursor else None
+    if valores is not None:
+        queryset = queryset.filter(_filtro_depois_de(ordem, valores))
+    else:
+        cursor = None
+
+    # Um registro a mais indica se existe próxima página (sem COUNT)
+    itens = list(queryset[:tamanho + 1])
+    proximo = None
+    if len(itens) > tamanho:
+        itens = itens[:tamanho]
+        ultimo = itens[-1]
+        proximo = _codificar_cursor([getattr(ultimo, nome) for nome in nomes])
+    return PaginaPorChave(itens, proximo, cursor)
@@ -0,0 +1,117 @@
+"""
+Segmentação de público para os envios de WhatsApp
+
+Um Segmento descreve o público (dizimistas, colaboradores ou todos) com os filtros do
+formulário de envio: status, grupo do colaborador e janela de aniversário. Os
+destinatários são lidos em lotes (values_list + iterator), só com nome e telefone - sem
+carregar foto, endereço e demais campos dos cadastros.
+
+- Deduplicação pelo telefone normalizado (utils_busca.chave_telefone): a mesma pessoa
+  cadastrada como dizimista e colaboradora, ou com o telefone digitado de outro jeito,
+  recebe uma mensagem só.
+- Janela de aniversário pela coluna DIS_dia_ano / COL_dia_ano (mês * 100 + dia, indexada,
+  preenchida no save()): "de 20/12 a 10/01" vira uma comparação de inteiros, inclusive
+  na virada do ano.
+- contar() percorre só os telefones e guarda as chaves num set: serve de prévia do
+  envio sem montar a lista de destinatários.
+"""
+from datetime import date
+
+from django.db.models import Q
+
+from .utils_busca import chave_telefone
+
+TAMANHO_LOTE = 500
+
+
+def dia_do_ano(data):
+    """Chave do aniversário (mês * 100 + dia) de uma data (ou 'AAAA-MM-DD'), ou None."""
+    if not data:
+        return None
+    if isinstance(data, str):
+        try:
+            data = date.fromisoformat(data[:10])
+        except ValueError:
+            return None
+    return data.month * 100 + data.day
+
+
+def filtro_aniversario(campo, inicio, fim):
+    """Q da janela de aniversário de inicio a fim (só mês e dia contam; pode virar o ano)."""
+    inicio, fim = dia_do_ano(inicio), dia_do_ano(fim)
+    if inicio is None or fim is None:
+        return Q()
+    if inicio <= fim:
+        return Q(**{f'{campo}__gte': inicio, f'{campo}__lte': fim})
+    return Q(**{f'{campo}__gte': inicio}) | Q(**{f'{campo}__lte': fim})
+
+
+class Segmento:
+    """
+    Público de um envio.
+
+    tipo: 'DIZIMISTAS', 'COLABORADORES' ou 'TODOS'
+    status_dizimista: 'ATIVO' / 'INATIVO' (vazio = todos)
+    status_colaborador: 'ATIVO' / 'INATIVO' / 'PENDENTE' (vazio = todos)
+    grupo: GRU_id (ou TBGRUPOS) para filtrar os colaboradores pelo grupo litúrgico
+    aniversario_inicio / aniversario_fim: datas da janela de aniversário (ano ignorado)
+    """
+
+    def __init__(self, tipo, status_dizimista=None, status_colaborador=None, grupo=None,
+                 aniversario_inicio=None, aniversario_fim=None):
+        self.tipo = tipo
+        self.status_dizimista = status_dizimista
+        self.status_colaborador = status_colaborador
+        self.grupo = getattr(grupo, 'GRU_id', grupo)
+        self.aniversario_inicio = aniversario_inicio
+        self.aniversario_fim = aniversario_fim
+
+    def _dizimistas(self):
+        from .models.area_admin.models_dizimistas import TBDIZIMISTAS
+        queryset = TBDIZIMISTAS.objects.exclude(DIS_telefone='')
+        if self.status_dizimista == 'ATIVO':
+            queryset = queryset.filter(DIS_status=True)
+        elif self.status_dizimista == 'INATIVO':
+            queryset = queryset.filter(DIS_status=False)
+        queryset = queryset.filter(
+            filtro_aniversario('DIS_dia_ano', self.aniversario_inicio, self.aniversario_fim)
+        )
+        return queryset.order_by('DIS_nome', 'id'), 'DIS_nome', 'DIS_telefone'
+
+    def _colaboradores(self):
+        from .models.area_admin.models_colaboradores import TBCOLABORADORES
+        queryset = TBCOLABORADORES.objects.exclude(COL_telefone='')
+        if self.status_colaborador in ('ATIVO', 'INATIVO', 'PENDENTE'):
+            queryset = queryset.filter(COL_status=self.status_colaborador)
+        if self.grupo:
+            queryset = queryset.filter(COL_grupo_liturgico=self.grupo)
+        queryset = queryset.filter(
+            filtro_aniversario('COL_dia_ano', self.aniversario_inicio, self.aniversario_fim)
+        )
+        return queryset.order_by('COL_nome_completo', 'COL_id'), 'COL_nome_completo', 'COL_telefone'
+
+    def _fontes(self):
+        if self.tipo in ('DIZIMISTAS', 'TODOS'):
+            yield self._dizimistas()
+        if self.tipo in ('COLABORADORES', 'TODOS'):
+            yield self._colaboradores()
+
+    def destinatarios(self):
+        """Gera {'nome', 'telefone'} sem repetir telefone (dizimistas primeiro)."""
+        vistos = set()
+        for queryset, campo_nome, campo_telefone in self._fontes():
+            linhas = queryset.values_list(campo_nome, campo_telefone).iterator(chunk_size=TAMANHO_LOTE)
+            for nome, telefone in linhas:
+                chave = chave_telefone(telefone)
+                if not chave or chave in vistos:
+                    continue
+                vistos.add(chave)
+                yield {'nome': nome, 'telefone': telefone}
+
+    def contar(self):
+        """Quantidade de destinatários (telefones distintos), sem montar a lista."""
+        vistos = set()
+        for queryset, _, campo_telefone in self._fontes():
+            telefones = queryset.order_by().values_list(campo_telefone, flat=True)
+            vistos.update(filter(None, map(chave_telefone, telefones.iterator(chunk_size=TAMANHO_LOTE))))
+        return len(vistos)
@@ -0,0 +1,70 @@
+"""
+Gravação de tráfego do webhook do WhatsApp para replay e teste de carga
+
+Com WHATSAPP_GRAVAR_WEBHOOK apontando para um arquivo, cada entrega recebida pelo
+webhook é anexada a ele em JSONL (uma entrega por linha), já sem dados pessoais:
+- telefones viram números fictícios estáveis (o mesmo número real vira sempre o mesmo
+  fictício, então conversas de várias mensagens continuam encadeadas), em qualquer campo
+  de texto: um número de 10 a 15 dígitos em um campo novo da Whapi também é trocado;
+- nomes de contato e textos digitados são trocados por marcadores do mesmo tamanho.
+Tipos de mensagem, ids de botões/listas e a estrutura do JSON são mantidos: é o que
+decide o caminho percorrido no webhook.
+
+O arquivo alimenta o comando replay_webhook; whapi_stub faz o papel da Whapi para que
+o teste não chame gate.whapi.cloud.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_NOME = {'from_name', 'chat_name', 'name', 'pushname', 'notify'}
+# 'text' é um objeto {'body': ...} nas mensagens de texto, mas pode vir como string
+CAMPOS_TEXTO = {'body', 'caption', 'text'}
+
+# Telefone/JID ("5518997366866" ou "5518997366866@s.whatsapp.net") em qualquer valor
+_TELEFONE = re.compile(r'\d{10,15}')
+_trava_arquivo = threading.Lock()
+
+
+def telefone_ficticio(numero):
+    """Número fictício estável (55 + DDD 00 + 9 dígitos derivados do original)."""
+    digitos = int(hashlib.sha256(numero.encode()).hexdigest()[:12], 16) % 10 ** 9
+    return f'5500{digitos:09d}'
+
+
+def _sanitizar_valor(chave, valor):
+    if isinstance(valor, dict):
+        return {k: _sanitizar_valor(k, v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_sanitizar_valor(chave, v) for v in valor]
+    if not isinstance(valor, str):
+        return valor
+    if chave in CAMPOS_NOME:
+        return 'Contato'
+    if chave in CAMPOS_TEXTO:
+        return 'x' * len(valor)
+    return _TELEFONE.sub(lambda m: telefone_ficticio(m.group()), valor)
+
+
+def sanitizar_payload(dados):
+    """Cópia do payload do webhook sem telefones reais, nomes e textos digitados."""
+    return _sanitizar_valor(None, dados)
+
+
+def gravar_payload(dados):
+    """Anexa a entrega (sanitizada) ao arquivo WHATSAPP_GRAVAR_WEBHOOK, se configurado."""
+    caminho = getattr(settings, 'WHATSAPP_GRAVAR_WEBHOOK', '')
+    if not caminho or not dados:
+        return
+    linha = json.dumps(sanitizar_payload(dados), ensure_ascii=False, separators=(',', ':')) + '\n'
+    try:
+        with _trava_arquivo, open(caminho, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(linha)
+    except OSError as e:
+        logger.warning('Não foi possível gravar o payload do webhook em %s: %s', caminho, e)
@@ -1,6 +1,6 @@
 # ==================== IMPORTAÇÕES DOS VIEWS ====================
 # Importações das views específicas da área administrativa
-from .admin_area.views_admin_area import admin_area
+from .admin_area.views_admin_area import admin_area, admin_estatisticas_api, admin_desempenho
 from .admin_area.views_dioceses import diocese_crud_unico
 from .admin_area.views_paroquias import paroquia_crud_unico
 from .admin_area.views_visual import visual_generic_view
@@ -4,8 +4,23 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import JsonResponse
 from functools import wraps
 
+from django.conf import settings
+
+from ...utils_chatbot import MOTIVOS_SUPRESSAO, limpar_supressoes, mensagens_suprimidas
+from ...utils_desempenho import endpoints_mais_lentos, limpar_endpoints
+from ...utils_estatisticas import estatisticas_dizimistas, estatisticas_eventos, estatisticas_planos
+
+ORDENS_DESEMPENHO = {
+    'media_ms': 'Tempo médio',
+    'max_ms': 'Tempo máximo',
+    'total_ms': 'Tempo acumulado',
+    'media_consultas': 'Consultas por requisição',
+    'media_http_ms': 'Tempo em chamadas HTTP',
+}
+
 def admin_required(view_func):
     """Decorator para verificar se o usuário é administrador"""
     @wraps(view_func)
@@ -32,3 +47,48 @@ def admin_area(request):
         'user': request.user,
     }
     return render(request, 'admin_area/admin_area.html', context)
+
+
+@login_required
+@admin_required
+def admin_estatisticas_api(request):
+    """
+    Contadores dos dashboards em JSON (badges do painel), servidos do cache de estatísticas.
+    """
+    return JsonResponse({
+        'dizimistas': estatisticas_dizimistas(),
+        'planos': estatisticas_planos(),
+        'eventos': estatisticas_eventos(),
+    })
+
+
+@login_required
+@admin_required
+def admin_desempenho(request):
+    """
+    Endpoints mais lentos entre as requisições medidas pelo MedicaoDesempenhoMiddleware,
+    e as mensagens do WhatsApp descartadas pelo limite por remetente (utils_chatbot).
+    POST limpa os acumulados (para medir de novo após uma mudança).
+    """
+    if request.method == 'POST':
+        limpar_endpoints()
+        limpar_supressoes()
+        messages.success(request, 'Medições de desempenho apagadas.')
+        return redirect('app_igreja:admin_desempenho')
+
+    ordem = request.GET.get('ordem', 'media_ms')
+    if ordem not in ORDENS_DESEMPENHO:
+        ordem = 'media_ms'
+    endpoints = endpoints_mais_lentos(ordem)
+    context = {
+        'titulo_relatorio': 'Desempenho - Endpoints Mais Lentos',
+        'titulo_filtro': 'Medições',
+        'busca_realizada': True,
+        'total_encontrado': len(endpoints),
+        'endpoints': endpoints,
+        'ordem': ordem,
+        'ordens': ORDENS_DESEMPENHO,
+        'amostragem': settings.DESEMPENHO_AMOSTRAGEM * 100,
+        'whatsapp_suprimidas': [(MOTIVOS_SUPRESSAO[motivo], n) for motivo, n in mensagens_suprimidas().items()],
+    }
+    return render(request, 'admin_area/tpl_desempenho.html', context)
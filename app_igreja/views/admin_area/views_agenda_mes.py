@@ -1,7 +1,7 @@
 """Agenda do mês: calendário e itens por dia (admin)."""
 import json
-from calendar import monthrange, monthcalendar, setfirstweekday, SUNDAY
-from datetime import date, datetime
+from calendar import monthcalendar, setfirstweekday, SUNDAY
+from datetime import date, datetime, timedelta
 from functools import wraps
 
 from django.contrib import messages
@@ -10,7 +10,7 @@ from django.http import JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse
 
-from ...models.area_admin.models_agenda_mes import TBAGENDAMES, TBITEAGENDAMES
+from ...models.area_admin.models_agenda_mes import TBAGENDAMES, TBITEAGENDAMES, anexar_nomes_modelos
 from ...models.area_admin.models_modelo import TBMODELO, TBITEM_MODELO
 from ...forms.area_admin.forms_agenda_mes import AgendaMesForm, AgendaDiaForm
 
@@ -108,25 +108,31 @@ def agenda_mes(request):
     dia_str = request.GET.get('dia', '').strip()
     acao = request.GET.get('acao', '')
     criar_mes = request.GET.get('criar_mes', '')
+    copiar_mes = request.GET.get('copiar_mes', '')
     hoje = date.today()
 
     # Criar mês se solicitado
     if criar_mes == 'sim' and mes and ano:
-        p = _primeiro_dia(mes, ano)
-        agenda_mes_obj, created = TBAGENDAMES.objects.get_or_create(AGE_MES=p)
+        _, created = TBAGENDAMES.inicializar(_primeiro_dia(mes, ano))
         if created:
-            for d in range(1, monthrange(ano, mes)[1] + 1):
-                TBITEAGENDAMES.objects.create(
-                    AGE_ITE_MES=agenda_mes_obj,
-                    AGE_ITE_DIA=d,
-                    AGE_ITE_MODELO=None,
-                    AGE_ITE_ENCARGOS=''
-                )
             messages.success(request, f'Agenda do mês {mes}/{ano} criada com sucesso!')
         else:
             messages.info(request, f'Agenda do mês {mes}/{ano} já existe!')
         return _redirect_agenda(mes, ano)
 
+    # Criar mês copiando os lançamentos do mês anterior
+    if copiar_mes == 'sim' and mes and ano:
+        p = _primeiro_dia(mes, ano)
+        if TBAGENDAMES.objects.filter(AGE_MES=p).exists():
+            messages.info(request, f'Agenda do mês {mes}/{ano} já existe!')
+        else:
+            _, created = TBAGENDAMES.copiar_mes_anterior(p)
+            if created:
+                messages.success(request, f'Agenda do mês {mes}/{ano} criada a partir do mês anterior!')
+            else:
+                messages.error(request, 'O mês anterior não tem agenda para copiar.')
+        return _redirect_agenda(mes, ano)
+
     # Dia selecionado e se passou
     dia = None
     dia_passado = False
@@ -198,6 +204,8 @@ def agenda_mes(request):
             return _redirect_agenda(mes, ano)
 
     # Calendário e detalhes
+    # Modelos carregados uma vez (in_bulk): nomes do calendário, formulário e seleção saem daqui
+    modelos_por_id = TBMODELO.objects.in_bulk()
     calendario = []
     dias_com_agenda = set()
     agendas_mes_detalhes = {}
@@ -205,50 +213,33 @@ def agenda_mes(request):
         setfirstweekday(SUNDAY)
         calendario = monthcalendar(ano, mes)
         if agenda_mes_obj:
-            itens_agenda = TBITEAGENDAMES.objects.filter(AGE_ITE_MES=agenda_mes_obj)
-            dias_com_agenda = set(itens_agenda.values_list('AGE_ITE_DIA', flat=True))
+            itens_agenda = anexar_nomes_modelos(
+                TBITEAGENDAMES.objects.filter(AGE_ITE_MES=agenda_mes_obj), modelos_por_id
+            )
+            dias_com_agenda = {item.AGE_ITE_DIA for item in itens_agenda}
             for item in itens_agenda:
-                modelo_id = item.AGE_ITE_MODELO or 0
-                modelo_nome = None
-                if item.AGE_ITE_MODELO:
-                    try:
-                        modelo_nome = TBMODELO.objects.get(pk=item.AGE_ITE_MODELO).MOD_DESCRICAO
-                    except TBMODELO.DoesNotExist:
-                        pass
                 agendas_mes_detalhes[item.AGE_ITE_DIA] = {
                     'tem_agenda': True,
                     'tem_modelo': bool(item.AGE_ITE_MODELO),
-                    'modelo_nome': modelo_nome,
-                    'modelo_id': modelo_id,
+                    'modelo_nome': item.modelo_nome,
+                    'modelo_id': item.AGE_ITE_MODELO or 0,
                     'agenda_id': item.AGE_ITE_ID
                 }
 
     form_mes = AgendaMesForm(initial={'mes': mes, 'ano': ano} if mes and ano else {})
     form_dia = None
-    modelo_obj = None
+    modelo_dia_selecionado = modelos_por_id.get(agenda_dia.AGE_ITE_MODELO) if agenda_dia else None
     if acao in ('incluir', 'editar') and dia and agenda_mes_obj:
         if agenda_dia:
-            if agenda_dia.AGE_ITE_MODELO:
-                try:
-                    modelo_obj = TBMODELO.objects.get(pk=agenda_dia.AGE_ITE_MODELO)
-                except TBMODELO.DoesNotExist:
-                    pass
             form_dia = AgendaDiaForm(initial={
-                'modelo': modelo_obj,
+                'modelo': modelo_dia_selecionado,
                 'horario': agenda_dia.AGE_ITE_HORARIO,
                 'encargos': agenda_dia.AGE_ITE_ENCARGOS
             })
         else:
             form_dia = AgendaDiaForm()
 
-    modelo_dia_selecionado = None
-    if agenda_dia and agenda_dia.AGE_ITE_MODELO:
-        try:
-            modelo_dia_selecionado = TBMODELO.objects.get(pk=agenda_dia.AGE_ITE_MODELO)
-        except TBMODELO.DoesNotExist:
-            pass
-
-    modelos = TBMODELO.objects.all().order_by('MOD_DESCRICAO')
+    modelos = sorted(modelos_por_id.values(), key=lambda m: m.MOD_DESCRICAO)
     modelos_json = json.dumps([{'id': m.MOD_ID, 'descricao': m.MOD_DESCRICAO} for m in modelos])
 
     if dia and mes and ano and not dia_passado:
@@ -273,6 +264,9 @@ def agenda_mes(request):
         'hoje': hoje,
         'primeiro_dia_mes': _primeiro_dia(mes, ano),
         'mes_existe': agenda_mes_obj is not None if mes and ano else False,
+        'mes_anterior_existe': bool(mes and ano and not agenda_mes_obj and TBAGENDAMES.objects.filter(
+            AGE_MES=(_primeiro_dia(mes, ano) - timedelta(days=1)).replace(day=1)
+        ).exists()),
         'dia_passado': dia_passado,
     }
     return render(request, 'admin_area/tpl_agenda_mes.html', context)
@@ -15,7 +15,7 @@ from django.core.paginator import Paginator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA
+from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA, anexar_nomes_escala
 from ...models.area_admin.models_colaboradores import TBCOLABORADORES
 from ...models.area_admin.models_grupos import TBGRUPOS
 
@@ -66,32 +66,14 @@ def _parse_mes_ano(mes_str, ano_str):
     return None, None
 
 
-def _enrich_item_apontamento(item):
-    """Atribui dia_semana_nome, colaborador_*, grupo_nome, situacao_bloqueado e janela_descricao ao item."""
-    item.dia_semana_nome = DIAS_SEMANA_PT.get(item.ITE_ESC_DATA.weekday(), '')
-    if item.ITE_ESC_COLABORADOR:
-        try:
-            col = TBCOLABORADORES.objects.get(COL_id=item.ITE_ESC_COLABORADOR)
-            item.colaborador_nome = col.COL_nome_completo
-            item.colaborador_telefone = col.COL_telefone
-            item.colaborador_email = getattr(col, 'COL_email', None)
-        except TBCOLABORADORES.DoesNotExist:
-            item.colaborador_nome = '-'
-            item.colaborador_telefone = None
-            item.colaborador_email = None
-    else:
-        item.colaborador_nome = '-'
-        item.colaborador_telefone = None
-        item.colaborador_email = None
-    if item.ITE_ESC_GRUPO:
-        try:
-            item.grupo_nome = TBGRUPOS.objects.get(GRU_id=item.ITE_ESC_GRUPO).GRU_nome_grupo
-        except TBGRUPOS.DoesNotExist:
-            item.grupo_nome = '-'
-    else:
-        item.grupo_nome = '-'
-    item.situacao_bloqueado = not item.ITE_ESC_SITUACAO
-    item.janela_descricao = JANELA_MAP.get(item.ITE_ESC_JANELA, '-') if item.ITE_ESC_JANELA else '-'
+def _enrich_itens_apontamento(itens):
+    """Atribui dia_semana_nome, colaborador_*, grupo_nome, situacao_bloqueado e janela_descricao aos itens."""
+    for item in anexar_nomes_escala(itens):
+        item.dia_semana_nome = DIAS_SEMANA_PT.get(item.ITE_ESC_DATA.weekday(), '')
+        item.colaborador_telefone = item.colaborador.COL_telefone if item.colaborador else None
+        item.colaborador_email = getattr(item.colaborador, 'COL_email', None)
+        item.situacao_bloqueado = not item.ITE_ESC_SITUACAO
+        item.janela_descricao = JANELA_MAP.get(item.ITE_ESC_JANELA, '-') if item.ITE_ESC_JANELA else '-'
 
 
 @login_required
@@ -137,11 +119,11 @@ def apontamentos_escala_missa(request):
         itens = TBITEM_ESCALA.objects.filter(ITE_ESC_ESCALA=escala_master).order_by(
             'ITE_ESC_DATA', 'ITE_ESC_HORARIO'
         )
-        for item in itens:
-            _enrich_item_apontamento(item)
 
         paginator = Paginator(itens, 50)
         page_obj = paginator.get_page(request.GET.get('page'))
+        page_obj.object_list = list(page_obj.object_list)
+        _enrich_itens_apontamento(page_obj.object_list)
 
         context = {
             'page_obj': page_obj,
@@ -264,16 +246,14 @@ def atribuir_apontamento(request, item_id):
                     try:
                         from ...views.area_publica.views_whatsapp_api import (
                             send_whatsapp_message,
-                            send_whatsapp_image,
-                            get_imagem_capa_url,
+                            send_whatsapp_capa,
                         )
-                        imagem_url = get_imagem_capa_url(optimized=False)
-                        if imagem_url:
-                            res_img = send_whatsapp_image(telefone_completo, imagem_url)
-                            if res_img.get('error'):
-                                logger.warning("Erro ao enviar imagem: %s", res_img.get('error'))
-                            else:
-                                time.sleep(1)
+                        # Foto da capa pelo media id em cache (sobe para a Whapi uma vez)
+                        res_img = send_whatsapp_capa(telefone_completo)
+                        if res_img.get('error'):
+                            logger.warning("Erro ao enviar imagem: %s", res_img.get('error'))
+                        else:
+                            time.sleep(1)
                         res_msg = send_whatsapp_message(telefone_completo, texto)
                         if res_msg.get('error'):
                             logger.error("Erro ao enviar WhatsApp: %s", res_msg.get('error'))
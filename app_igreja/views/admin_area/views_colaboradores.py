@@ -8,6 +8,7 @@ from functools import wraps
 from ...models.area_admin.models_colaboradores import TBCOLABORADORES
 from ...forms.area_admin.forms_colaboradores import ColaboradorForm
 from ...utils import reconstruir_url_com_filtros
+from ...utils_busca import buscar_colaboradores, somente_digitos
 
 FILTROS_COLABORADORES = ['busca_telefone', 'busca_nome', 'busca_apelido', 'busca_status', 'page']
 
@@ -58,18 +59,21 @@ def listar_colaboradores(request):
             # Mantém todos os registros sem filtros adicionais
             pass
         else:
-            # Aplicar filtros normais
+            # Aplicar filtros normais (busca sem acentos pelos termos de TBTERMOBUSCA)
             if busca_telefone:
-                colaboradores_qs = colaboradores_qs.filter(COL_telefone__icontains=busca_telefone)
-            
-            if busca_nome:
-                colaboradores_qs = colaboradores_qs.filter(COL_nome_completo__icontains=busca_nome)
+                colaboradores_qs = buscar_colaboradores(
+                    somente_digitos(busca_telefone), colaboradores_qs, ordenar=False, campos=['TELEFONE'],
+                )
             
             if busca_apelido:
-                colaboradores_qs = colaboradores_qs.filter(COL_apelido__icontains=busca_apelido)
+                colaboradores_qs = buscar_colaboradores(busca_apelido, colaboradores_qs, ordenar=False, campos=['APELIDO'])
             
             if busca_status:
                 colaboradores_qs = colaboradores_qs.filter(COL_status=busca_status)
+            
+            # Por último, para ordenar por relevância do nome
+            if busca_nome:
+                colaboradores_qs = buscar_colaboradores(busca_nome, colaboradores_qs)
     else:
         # Queryset vazio até que o usuário faça a primeira busca
         colaboradores_qs = TBCOLABORADORES.objects.none()
@@ -1,12 +1,9 @@
 import logging
-from datetime import datetime
 from functools import wraps
 
-import requests
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Q, Count
 from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
@@ -14,6 +11,9 @@ from django.views.decorators.csrf import csrf_exempt
 
 from ...forms.area_admin.forms_dizimistas import DizimistaForm
 from ...models.area_admin.models_dizimistas import TBDIZIMISTAS
+from ...utils_busca import buscar_dizimistas
+from ...utils_estatisticas import estatisticas_dizimistas
+from ...utils_cep import buscar_cep, limpar_cep, CepServicoIndisponivel
 
 logger = logging.getLogger(__name__)
 
@@ -66,22 +66,18 @@ def gerenciar_dizimistas(request):
     if busca_realizada:
         dizimistas = TBDIZIMISTAS.objects.all()
 
-        # Texto "todos/todas" não aplica filtro de busca; caso contrário filtra por nome, telefone, email, cidade
-        if query and query.lower() not in ('todos', 'todas'):
-            dizimistas = dizimistas.filter(
-                Q(DIS_nome__icontains=query)
-                | Q(DIS_telefone__icontains=query)
-                | Q(DIS_email__icontains=query)
-                | Q(DIS_cidade__icontains=query)
-            )
-
         if status_filter:
             if status_filter == 'ativo':
                 dizimistas = dizimistas.filter(DIS_status=True)
             elif status_filter == 'pendente':
                 dizimistas = dizimistas.filter(DIS_status=False)
 
-        dizimistas = dizimistas.order_by('DIS_nome')
+        # Texto "todos/todas" não aplica filtro de busca; caso contrário busca por nome, telefone,
+        # email e cidade (sem acentos, por início de palavra, ordenado por relevância)
+        if query and query.lower() not in ('todos', 'todas'):
+            dizimistas = buscar_dizimistas(query, dizimistas)
+        else:
+            dizimistas = dizimistas.order_by('DIS_nome')
     else:
         # Queryset vazio até que o usuário faça a primeira busca
         dizimistas = TBDIZIMISTAS.objects.none()
@@ -91,18 +87,16 @@ def gerenciar_dizimistas(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Estatísticas
-    total_dizimistas = TBDIZIMISTAS.objects.count()
-    ativos = TBDIZIMISTAS.objects.filter(DIS_status=True).count()
-    pendentes = TBDIZIMISTAS.objects.filter(DIS_status=False).count()
+    # Estatísticas (uma consulta agregada, em cache)
+    estatisticas = estatisticas_dizimistas()
     
     context = {
         'page_obj': page_obj,
         'query': query,
         'status_filter': status_filter,
-        'total_dizimistas': total_dizimistas,
-        'ativos': ativos,
-        'pendentes': pendentes,
+        'total_dizimistas': estatisticas['total_dizimistas'],
+        'ativos': estatisticas['ativos'],
+        'pendentes': estatisticas['pendentes'],
         'modo_dashboard': True,
         'busca_realizada': busca_realizada,
     }
@@ -224,33 +218,10 @@ def dashboard_dizimistas(request):
     """
     Dashboard com estatísticas dos dizimistas
     """
-    
-    total_dizimistas = TBDIZIMISTAS.objects.count()
-    ativos = TBDIZIMISTAS.objects.filter(DIS_status=True).count()
-    pendentes = TBDIZIMISTAS.objects.filter(DIS_status=False).count()
-    
-    # Dizimistas por cidade
-    dizimistas_por_cidade = TBDIZIMISTAS.objects.values('DIS_cidade').annotate(
-        count=Count('id')
-    ).order_by('-count')[:5]
-    
-    # Dizimistas por sexo
-    masculinos = TBDIZIMISTAS.objects.filter(DIS_sexo='M').count()
-    femininos = TBDIZIMISTAS.objects.filter(DIS_sexo='F').count()
-    
-    # Dizimistas cadastrados este mês
-    hoje = datetime.now()
-    inicio_mes = hoje.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    novos_mes = TBDIZIMISTAS.objects.filter(DIS_data_cadastro__gte=inicio_mes).count()
+    estatisticas = estatisticas_dizimistas()
     
     context = {
-        'total_dizimistas': total_dizimistas,
-        'ativos': ativos,
-        'pendentes': pendentes,
-        'dizimistas_por_cidade': dizimistas_por_cidade,
-        'masculinos': masculinos,
-        'femininos': femininos,
-        'novos_mes': novos_mes,
+        **estatisticas,
         'titulo': 'Dashboard de Dizimistas',
         'modo_dashboard': True,
     }
@@ -260,29 +231,26 @@ def dashboard_dizimistas(request):
 
 @csrf_exempt
 def api_cep(request, cep):
-    """API para buscar CEP (ViaCEP)."""
-    try:
-        cep_limpo = ''.join(filter(str.isdigit, cep))
-        if len(cep_limpo) != 8:
-            return JsonResponse({'error': 'CEP inválido'}, status=400)
+    """API para buscar CEP (cache local TBCEP, ViaCEP apenas quando não encontrado)."""
+    if not limpar_cep(cep):
+        return JsonResponse({'error': 'CEP inválido'}, status=400)
 
-        url = f'https://viacep.com.br/ws/{cep_limpo}/json/'
-        response = requests.get(url, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            if 'erro' not in data:
-                return JsonResponse({
-                    'cep': data.get('cep', ''),
-                    'logradouro': data.get('logradouro', ''),
-                    'bairro': data.get('bairro', ''),
-                    'cidade': data.get('localidade', ''),
-                    'estado': data.get('uf', ''),
-                })
-        
-        return JsonResponse({'error': 'CEP não encontrado'}, status=404)
-        
+    try:
+        endereco = buscar_cep(cep)
+    except CepServicoIndisponivel as e:
+        logger.warning('ViaCEP indisponível para CEP %s: %s', cep, e)
+        return JsonResponse({'error': 'Serviço de CEP indisponível'}, status=503)
     except Exception as e:
         logger.exception('Erro ao buscar CEP %s: %s', cep, e)
         return JsonResponse({'error': 'Erro interno do servidor'}, status=500)
+
+    if not endereco:
+        return JsonResponse({'error': 'CEP não encontrado'}, status=404)
+
+    return JsonResponse({
+        'cep': endereco['cep'],
+        'logradouro': endereco['logradouro'],
+        'bairro': endereco['bairro'],
+        'cidade': endereco['cidade'],
+        'estado': endereco['estado'],
+    })
@@ -14,6 +14,7 @@ from django.core.paginator import Paginator
 from django.db.models import Q
 
 from app_igreja.models.area_admin.models_eventos import TBEVENTO, TBITEM_EVENTO
+from app_igreja.utils_estatisticas import estatisticas_eventos
 
 
 def grava_item_evento(evento, data_inicial, acao, data_final, hora_inicial, hora_final):
@@ -87,18 +88,16 @@ class MasterDetailEventoListView(View):
         page_number = request.GET.get('page')
         page_obj = paginator.get_page(page_number)
         
-        # Estatísticas
-        total_eventos = TBEVENTO.objects.count()
-        ativos = TBEVENTO.objects.filter(EVE_STATUS='Ativo').count()
-        inativos = TBEVENTO.objects.filter(EVE_STATUS='Inativo').count()
+        # Estatísticas (uma consulta agregada, em cache)
+        estatisticas = estatisticas_eventos()
         
         context = {
             'page_obj': page_obj,
             'busca': busca,
             'status': status,
-            'total_eventos': total_eventos,
-            'ativos': ativos,
-            'inativos': inativos,
+            'total_eventos': estatisticas['total_eventos'],
+            'ativos': estatisticas['ativos'],
+            'inativos': estatisticas['inativos'],
             'modo_dashboard': True,
             'model_verbose_name': 'Evento',
             'master_detail_mode': True,  # Flag para identificar modo master-detail
@@ -9,7 +9,7 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
-from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA
+from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA, anexar_nomes_escala
 from ...models.area_admin.models_colaboradores import TBCOLABORADORES
 from ...models.area_admin.models_grupos import TBGRUPOS
 from ...forms.area_admin.forms_gerenciar_escala import ItemEscalaForm
@@ -57,24 +57,12 @@ def _parse_mes_ano(mes_str, ano_str):
     return None, None
 
 
-def _enrich_item(item):
-    """Atribui dia_semana_nome, colaborador_nome e grupo_nome ao item."""
-    item.dia_semana_nome = DIAS_SEMANA_PT.get(item.ITE_ESC_DATA.weekday(), '')
-    if item.ITE_ESC_COLABORADOR:
-        try:
-            col = TBCOLABORADORES.objects.get(COL_id=item.ITE_ESC_COLABORADOR)
-            item.colaborador_nome = col.COL_nome_completo.split()[0] if col.COL_nome_completo else '-'
-        except TBCOLABORADORES.DoesNotExist:
-            item.colaborador_nome = '-'
-    else:
-        item.colaborador_nome = '-'
-    if item.ITE_ESC_GRUPO:
-        try:
-            item.grupo_nome = TBGRUPOS.objects.get(GRU_id=item.ITE_ESC_GRUPO).GRU_nome_grupo
-        except TBGRUPOS.DoesNotExist:
-            item.grupo_nome = '-'
-    else:
-        item.grupo_nome = '-'
+def _enrich_itens(itens):
+    """Atribui dia_semana_nome, colaborador_nome (primeiro nome) e grupo_nome aos itens."""
+    for item in anexar_nomes_escala(itens):
+        item.dia_semana_nome = DIAS_SEMANA_PT.get(item.ITE_ESC_DATA.weekday(), '')
+        if item.colaborador and item.colaborador.COL_nome_completo:
+            item.colaborador_nome = item.colaborador.COL_nome_completo.split()[0]
 
 
 @login_required
@@ -111,11 +99,12 @@ def listar_itens_escala(request):
     itens = TBITEM_ESCALA.objects.filter(ITE_ESC_ESCALA=escala_master).filter(
         ITE_ESC_DATA__gte=hoje
     ).order_by('ITE_ESC_DATA', 'ITE_ESC_HORARIO')
-    for item in itens:
-        _enrich_item(item)
 
     paginator = Paginator(itens, 50)
     page_obj = paginator.get_page(request.GET.get('page'))
+    # Nomes só dos itens da página (3 consultas, qualquer que seja o tamanho da escala)
+    page_obj.object_list = list(page_obj.object_list)
+    _enrich_itens(page_obj.object_list)
 
     context = {
         'page_obj': page_obj,
@@ -1,4 +1,6 @@
 """CRUD de Murais da Paróquia (admin)."""
+import logging
+import time
 from datetime import date
 from functools import wraps
 
@@ -10,7 +12,9 @@ from django.urls import reverse
 
 from ...models.area_admin.models_mural import TBMURAL
 from ...forms.area_admin.forms_mural import MuralForm
-from ...utils_image import redimensionar_imagem
+from ...utils_image import agendar_rendicoes, salvar_imagens_em_paralelo
+
+logger = logging.getLogger(__name__)
 
 URL_LISTAR_MURAIS = 'app_igreja:listar_murais'
 CAMPOS_FOTO_MURAL = [
@@ -35,12 +39,22 @@ def _redirect_listar_murais():
     return redirect(URL_LISTAR_MURAIS)
 
 
-def _aplicar_redimensionamento(mural, files):
-    for campo in CAMPOS_FOTO_MURAL:
-        if campo in files:
-            img = redimensionar_imagem(files[campo])
-            if img:
-                setattr(mural, campo, img)
+def _salvar_mural(mural, files):
+    """Envia as fotos novas em paralelo, grava o mural e agenda as rendições."""
+    novas, tempos = salvar_imagens_em_paralelo(
+        mural, {campo: files[campo] for campo in CAMPOS_FOTO_MURAL if campo in files}
+    )
+    inicio = time.perf_counter()
+    mural.save()
+    tempos['banco'] = (time.perf_counter() - inicio) * 1000
+    for campo, hash_conteudo in novas:
+        agendar_rendicoes(getattr(mural, campo).name, hash_conteudo)
+    logger.info(
+        "Mural %s salvo: %s foto(s) nova(s); codificação %.0f ms, envio %.0f ms, "
+        "fotos (relógio) %.0f ms, banco %.0f ms",
+        mural.pk, len(novas), tempos['codificacao'], tempos['envio'], tempos['total'], tempos['banco'],
+    )
+    return tempos
 
 
 def _contar_fotos(mural):
@@ -101,8 +115,7 @@ def criar_mural(request):
         form = MuralForm(request.POST, request.FILES)
         if form.is_valid():
             mural = form.save(commit=False)
-            _aplicar_redimensionamento(mural, request.FILES)
-            mural.save()
+            _salvar_mural(mural, request.FILES)
             messages.success(request, 'Mural criado com sucesso!')
             return _redirect_listar_murais()
         messages.error(request, 'Por favor, corrija os erros no formulário.')
@@ -149,8 +162,7 @@ def editar_mural(request, mural_id):
         form = MuralForm(request.POST, request.FILES, instance=mural)
         if form.is_valid():
             mural = form.save(commit=False)
-            _aplicar_redimensionamento(mural, request.FILES)
-            mural.save()
+            _salvar_mural(mural, request.FILES)
             messages.success(request, 'Mural atualizado com sucesso!')
             return _redirect_listar_murais()
         messages.error(request, 'Por favor, corrija os erros no formulário.')
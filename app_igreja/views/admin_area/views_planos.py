@@ -14,10 +14,11 @@ from django.views.decorators.csrf import csrf_exempt
 from django.urls import reverse
 from django.views import View
 from django.utils.decorators import method_decorator
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 
 from app_igreja.models.area_admin.models_planos import TBPLANO, TBITEMPLANO
 from app_igreja.forms.area_admin.forms_planos import PlanoForm, ItemPlanoForm
+from app_igreja.utils_estatisticas import estatisticas_planos
 
 
 @login_required
@@ -49,32 +50,23 @@ def listar_planos(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Estatísticas
-    total_planos = TBPLANO.objects.count()
-    ativos = TBPLANO.objects.filter(PLA_ativo=True).count()
-    inativos = TBPLANO.objects.filter(PLA_ativo=False).count()
+    # Estatísticas (uma consulta agregada, em cache)
+    estatisticas = estatisticas_planos()
     
     # Planos recentes (últimos 5)
     planos_recentes = TBPLANO.objects.filter(
         PLA_ativo=True
     ).order_by('-PLA_data_cadastro')[:5]
     
-    # Planos do mês atual
-    hoje = date.today()
-    planos_mes = TBPLANO.objects.filter(
-        PLA_data_cadastro__year=hoje.year,
-        PLA_data_cadastro__month=hoje.month
-    ).count()
-    
     context = {
         'page_obj': page_obj,
         'busca': busca,
         'status': status,
-        'total_planos': total_planos,
-        'ativos': ativos,
-        'inativos': inativos,
+        'total_planos': estatisticas['total_planos'],
+        'ativos': estatisticas['ativos'],
+        'inativos': estatisticas['inativos'],
         'planos_recentes': planos_recentes,
-        'planos_mes': planos_mes,
+        'planos_mes': estatisticas['planos_mes'],
         'modo_dashboard': True,  # Migrado para nova tela pai dashboard
         'model_verbose_name': 'Plano de Ação',
     }
@@ -410,18 +402,16 @@ class MasterDetailPlanoListView(View):
         page_number = request.GET.get('page')
         page_obj = paginator.get_page(page_number)
         
-        # Estatísticas
-        total_planos = TBPLANO.objects.count()
-        ativos = TBPLANO.objects.filter(PLA_ativo=True).count()
-        inativos = TBPLANO.objects.filter(PLA_ativo=False).count()
+        # Estatísticas (uma consulta agregada, em cache)
+        estatisticas = estatisticas_planos()
         
         context = {
             'page_obj': page_obj,
             'busca': busca,
             'status': status,
-            'total_planos': total_planos,
-            'ativos': ativos,
-            'inativos': inativos,
+            'total_planos': estatisticas['total_planos'],
+            'ativos': estatisticas['ativos'],
+            'inativos': estatisticas['inativos'],
             'modo_dashboard': True,
             'model_verbose_name': 'Plano de Ação',
             'master_detail_mode': True,
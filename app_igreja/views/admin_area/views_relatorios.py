@@ -12,7 +12,7 @@ import logging
 from ...models.area_admin.models_dizimistas import TBDIZIMISTAS
 from ...models.area_admin.models_colaboradores import TBCOLABORADORES
 from ...models.area_admin.models_paroquias import TBPAROQUIA
-from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA
+from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA, anexar_nomes_escala
 from ...models.area_admin.models_grupos import TBGRUPOS
 from ...models.area_admin.models_funcoes import TBFUNCAO
 
@@ -250,41 +250,10 @@ def relatorio_escala_mensal_missas(request):
                         'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
                     ]
                     
-                    # Adicionar informações para cada item
-                    for item in itens:
+                    # Nomes de colaborador, função e grupo em 3 consultas (anexar_nomes_escala)
+                    itens_escala = anexar_nomes_escala(itens)
+                    for item in itens_escala:
                         item.dia_semana_nome = dias_semana_pt.get(item.ITE_ESC_DATA.weekday(), '')
-                        
-                        # Buscar nome do colaborador
-                        if item.ITE_ESC_COLABORADOR:
-                            try:
-                                colaborador = TBCOLABORADORES.objects.get(COL_id=item.ITE_ESC_COLABORADOR)
-                                item.colaborador_nome = colaborador.COL_nome_completo
-                            except TBCOLABORADORES.DoesNotExist:
-                                item.colaborador_nome = '-'
-                        else:
-                            item.colaborador_nome = '-'
-                        
-                        # Buscar nome da função
-                        if item.ITE_ESC_FUNCAO:
-                            try:
-                                funcao = TBFUNCAO.objects.get(FUN_id=item.ITE_ESC_FUNCAO)
-                                item.funcao_nome = funcao.FUN_nome_funcao
-                            except TBFUNCAO.DoesNotExist:
-                                item.funcao_nome = '-'
-                        else:
-                            item.funcao_nome = '-'
-                        
-                        # Buscar nome do grupo
-                        if item.ITE_ESC_GRUPO:
-                            try:
-                                grupo = TBGRUPOS.objects.get(GRU_id=item.ITE_ESC_GRUPO)
-                                item.grupo_nome = grupo.GRU_nome_grupo
-                            except TBGRUPOS.DoesNotExist:
-                                item.grupo_nome = '-'
-                        else:
-                            item.grupo_nome = '-'
-                    
-                    itens_escala = list(itens)
                     
         except (ValueError, TypeError):
             mes = None
@@ -535,38 +504,9 @@ def relatorio_escala_mensal_missas_pdf(request):
                             'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
                         ]
                         
-                        for item in itens:
+                        itens_escala = anexar_nomes_escala(itens)
+                        for item in itens_escala:
                             item.dia_semana_nome = dias_semana_pt.get(item.ITE_ESC_DATA.weekday(), '')
-                            
-                            if item.ITE_ESC_COLABORADOR:
-                                try:
-                                    colaborador = TBCOLABORADORES.objects.get(COL_id=item.ITE_ESC_COLABORADOR)
-                                    item.colaborador_nome = colaborador.COL_nome_completo
-                                except TBCOLABORADORES.DoesNotExist:
-                                    item.colaborador_nome = '-'
-                            else:
-                                item.colaborador_nome = '-'
-                            
-                            # Buscar nome da função
-                            if item.ITE_ESC_FUNCAO:
-                                try:
-                                    funcao = TBFUNCAO.objects.get(FUN_id=item.ITE_ESC_FUNCAO)
-                                    item.funcao_nome = funcao.FUN_nome_funcao
-                                except TBFUNCAO.DoesNotExist:
-                                    item.funcao_nome = '-'
-                            else:
-                                item.funcao_nome = '-'
-                            
-                            if item.ITE_ESC_GRUPO:
-                                try:
-                                    grupo = TBGRUPOS.objects.get(GRU_id=item.ITE_ESC_GRUPO)
-                                    item.grupo_nome = grupo.GRU_nome_grupo
-                                except TBGRUPOS.DoesNotExist:
-                                    item.grupo_nome = '-'
-                            else:
-                                item.grupo_nome = '-'
-                        
-                        itens_escala = list(itens)
                         
             except (ValueError, TypeError):
                 pass
@@ -4,23 +4,81 @@ Arquivo com views específicas para envio de mensagens WhatsApp
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.db.models import Q
-from datetime import datetime, date
-from django.core.paginator import Paginator
+from django.db import transaction
+from datetime import datetime, date, timedelta
+from collections import Counter
+from itertools import chain
+from urllib.parse import urlencode
+from django.utils import timezone
 
 from ...models.area_admin.models_whatsapp import TBWHATSAPP
-from ...models.area_admin.models_dizimistas import TBDIZIMISTAS
-from ...models.area_admin.models_colaboradores import TBCOLABORADORES
 from ...models.area_admin.models_grupos import TBGRUPOS
 from ...forms.area_admin.forms_whatsapp import MensagemWhatsAppForm
-# from ...views.area_publica.views_whatsapp_api import send_whatsapp_message, send_whatsapp_image
+from ...utils_busca import buscar_colaboradores, buscar_dizimistas, normalizar_busca
+from ...utils_fila_whatsapp import enfileirar, limpar_telefone_para_envio, processar_fila
+from ...utils_segmentos import Segmento
+from ...utils_paginacao import paginar_por_chave
 import logging
 
 logger = logging.getLogger(__name__)
 
+LIMITE_BUSCA_DESTINATARIOS = 20
+ORIGEM_MENSAGEM = 'MENSAGEM_MASSA'  # FIL_origem das mensagens em massa
+
+# Histórico de mensagens: só as colunas da listagem (sem WHA_texto/WHA_api_response) e
+# paginação por chave na ordem do índice (WHA_data_criacao, WHA_id)
+CAMPOS_HISTORICO = [
+    'WHA_id', 'WHA_data_criacao', 'WHA_destinatario_tipo', 'WHA_tipo_midia', 'WHA_status',
+    'WHA_total_enviadas', 'WHA_sucessos', 'WHA_erros', 'WHA_entregues', 'WHA_lidas',
+]
+ORDEM_HISTORICO = ['-WHA_data_criacao', '-WHA_id']
+MENSAGENS_POR_PAGINA = 20
+
+
+def _itens_fila(destinatarios, prefixo_chave, texto, contagem):
+    """(chave, telefone, texto) de cada destinatário para a fila, contados em contagem['destinatarios']."""
+    for destinatario in destinatarios:
+        contagem['destinatarios'] += 1
+        telefone = destinatario.get('telefone')
+        yield f"{prefixo_chave}:{limpar_telefone_para_envio(telefone)}", telefone, texto
+
+
+def historico_mensagens(status='', tipo_destinatario='', data_inicio=None, data_fim=None):
+    """
+    Mensagens do histórico com os filtros da listagem. O período vira um intervalo em
+    WHA_data_criacao (>= início do primeiro dia, < início do dia seguinte ao último), que
+    usa o índice; __date aplicaria uma função na coluna e leria a tabela inteira.
+    """
+    mensagens = TBWHATSAPP.objects.only(*CAMPOS_HISTORICO)
+    if status:
+        mensagens = mensagens.filter(WHA_status=status)
+    if tipo_destinatario:
+        mensagens = mensagens.filter(WHA_destinatario_tipo=tipo_destinatario)
+    if data_inicio:
+        mensagens = mensagens.filter(
+            WHA_data_criacao__gte=timezone.make_aware(datetime.combine(data_inicio, datetime.min.time()))
+        )
+    if data_fim:
+        mensagens = mensagens.filter(
+            WHA_data_criacao__lt=timezone.make_aware(datetime.combine(data_fim + timedelta(days=1), datetime.min.time()))
+        )
+    return mensagens
+
+
+def _data_do_filtro(valor):
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date() if valor else None
+    except ValueError:
+        return None
+
+
+def _pagina_historico(request, mensagens):
+    return paginar_por_chave(mensagens, ORDEM_HISTORICO, request.GET.get('apos'), MENSAGENS_POR_PAGINA)
+
 
 def admin_required(view_func):
     """Decorator para verificar se o usuário é admin"""
@@ -69,11 +127,6 @@ def whatsapp_enviar_mensagem(request):
             dizimista_especifico = form.cleaned_data.get('dizimista_especifico')
             colaborador_especifico = form.cleaned_data.get('colaborador_especifico')
             
-            # Extrair filtros
-            filtrar_dizimista = form.cleaned_data.get('filtrar_dizimista')
-            filtrar_colaborador = form.cleaned_data.get('filtrar_colaborador')
-            grupo_colaborador = form.cleaned_data.get('grupo_colaborador')
-            
             # Extrair dados de mídia
             url_imagem = form.cleaned_data.get('url_imagem', '')
             arquivo_imagem = form.cleaned_data.get('arquivo_imagem')
@@ -84,58 +137,26 @@ def whatsapp_enviar_mensagem(request):
             arquivo_video = form.cleaned_data.get('arquivo_video')
             legenda_video = form.cleaned_data.get('legenda_video', '')
             
-            # Determinar destinatários
-            destinatarios = []
-            
-            if tipo_destinatario == 'DIZIMISTAS':
-                if dizimista_especifico:
-                    if dizimista_especifico.DIS_telefone:
-                        destinatarios = [{
-                            'nome': dizimista_especifico.DIS_nome,
-                            'telefone': dizimista_especifico.DIS_telefone
-                        }]
-                else:
-                    destinatarios = obter_destinatarios_dizimistas(
-                        filtrar_dizimista=filtrar_dizimista,
-                        data_inicial=form.cleaned_data.get('data_nascimento_dizimista_inicio'),
-                        data_final=form.cleaned_data.get('data_nascimento_dizimista_fim')
-                    )
-                    
-            elif tipo_destinatario == 'COLABORADORES':
-                if colaborador_especifico:
-                    if colaborador_especifico.COL_telefone:
-                        destinatarios = [{
-                            'nome': colaborador_especifico.COL_nome_completo,
-                            'telefone': colaborador_especifico.COL_telefone
-                        }]
-                else:
-                    destinatarios = obter_destinatarios_colaboradores(
-                        filtrar_colaborador=filtrar_colaborador,
-                        grupo_colaborador=grupo_colaborador,
-                        data_inicial=form.cleaned_data.get('data_nascimento_colaborador_inicio'),
-                        data_final=form.cleaned_data.get('data_nascimento_colaborador_fim')
-                    )
-            
-            elif tipo_destinatario == 'TODOS':
-                # Combinar dizimistas e colaboradores
-                dizimistas = obter_destinatarios_dizimistas()
-                colaboradores = obter_destinatarios_colaboradores()
-                
-                telefones_existentes = {d['telefone'] for d in dizimistas}
-                for colab in colaboradores:
-                    if colab['telefone'] not in telefones_existentes:
-                        dizimistas.append(colab)
-                        telefones_existentes.add(colab['telefone'])
-                
-                destinatarios = dizimistas
+            # Determinar destinatários (lidos do banco em lotes, sem telefone repetido)
+            if tipo_destinatario == 'DIZIMISTAS' and dizimista_especifico:
+                destinatarios = iter([{
+                    'nome': dizimista_especifico.DIS_nome,
+                    'telefone': dizimista_especifico.DIS_telefone
+                }] if dizimista_especifico.DIS_telefone else [])
+            elif tipo_destinatario == 'COLABORADORES' and colaborador_especifico:
+                destinatarios = iter([{
+                    'nome': colaborador_especifico.COL_nome_completo,
+                    'telefone': colaborador_especifico.COL_telefone
+                }] if colaborador_especifico.COL_telefone else [])
+            else:
+                destinatarios = segmento_do_formulario(tipo_destinatario, form.cleaned_data).destinatarios()
             
-            if not destinatarios:
+            primeiro_destinatario = next(destinatarios, None)
+            if primeiro_destinatario is None:
                 messages.error(request, 'Nenhum destinatário encontrado com os critérios especificados.')
                 # Carregar listagem apenas se não estiver em modo de criar/editar
                 if acao != 'incluir' and acao != 'editar':
-                    mensagens = TBWHATSAPP.objects.all().order_by('-WHA_data_criacao')[:20]
-                    paginator = Paginator(mensagens, 20)
-                    page_obj = paginator.get_page(1)
+                    page_obj = _pagina_historico(request, historico_mensagens())
                 else:
                     page_obj = None
                 return render(request, 'admin_area/tpl_mensagens_whatapp.html', {
@@ -151,138 +172,96 @@ def whatsapp_enviar_mensagem(request):
             
             # Processar uploads de arquivos se necessário
             url_final_imagem = url_imagem
-            url_final_audio = url_audio
-            url_final_video = url_video
             
             # TODO: Implementar upload de arquivos quando necessário
             
-            # ENVIAR MENSAGENS PRIMEIRO (antes de salvar no banco)
-            sucessos = 0
-            erros = 0
-            erros_detalhes = []
-            
-            for destinatario in destinatarios:
-                try:
-                    telefone = limpar_telefone_para_envio(destinatario.get('telefone'))
-                    nome = destinatario.get('nome', 'Destinatário')
-                    
-                    if not telefone:
-                        erros += 1
-                        erros_detalhes.append(f"{nome}: Telefone inválido")
-                        continue
-                    
-                    # Montar mensagem com texto
-                    mensagem_texto = texto
-                    if tipo_midia == 'TEXTO':
-                        # Enviar mensagem de texto
-                        resultado = send_whatsapp_message(telefone, mensagem_texto)
-                        if resultado.get("error"):
-                            erros += 1
-                            erros_detalhes.append(f"{nome}: {resultado.get('error')}")
-                            logger.error(f"Erro ao enviar mensagem para {nome} ({telefone}): {resultado.get('error')}")
-                        else:
-                            sucessos += 1
-                            logger.info(f"Mensagem enviada com sucesso para {nome} ({telefone})")
-                    
-                    elif tipo_midia == 'IMAGEM':
-                        # Enviar imagem
-                        if url_final_imagem:
-                            resultado = send_whatsapp_image(telefone, url_final_imagem, legenda_imagem or mensagem_texto)
-                            if resultado.get("error"):
-                                erros += 1
-                                erros_detalhes.append(f"{nome}: {resultado.get('error')}")
-                                logger.error(f"Erro ao enviar imagem para {nome} ({telefone}): {resultado.get('error')}")
-                            else:
-                                sucessos += 1
-                                logger.info(f"Imagem enviada com sucesso para {nome} ({telefone})")
-                        else:
-                            erros += 1
-                            erros_detalhes.append(f"{nome}: URL da imagem não fornecida")
-                    
-                    elif tipo_midia == 'AUDIO':
-                        # TODO: Implementar envio de áudio
-                        erros += 1
-                        erros_detalhes.append(f"{nome}: Envio de áudio ainda não implementado")
-                    
-                    elif tipo_midia == 'VIDEO':
-                        # TODO: Implementar envio de vídeo
-                        erros += 1
-                        erros_detalhes.append(f"{nome}: Envio de vídeo ainda não implementado")
-                    
-                    else:
-                        # Tipo não suportado, enviar como texto
-                        resultado = send_whatsapp_message(telefone, mensagem_texto)
-                        if resultado.get("error"):
-                            erros += 1
-                            erros_detalhes.append(f"{nome}: {resultado.get('error')}")
-                        else:
-                            sucessos += 1
-                    
-                    # Pequeno delay entre envios para não sobrecarregar a API
-                    import time
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    erros += 1
-                    nome = destinatario.get('nome', 'Destinatário')
-                    erros_detalhes.append(f"{nome}: {str(e)}")
-                    logger.error(f"Erro ao processar destinatário {nome}: {str(e)}", exc_info=True)
-            
-            # SALVAR NO BANCO APENAS DEPOIS DE ENVIAR
-            if editar_id and mensagem_editando:
-                # Atualizar mensagem existente
-                mensagem_editando.WHA_texto = texto
-                mensagem_editando.WHA_destinatario_tipo = tipo_destinatario
-                mensagem_editando.WHA_tipo_midia = tipo_midia
-                mensagem_editando.WHA_url_imagem = url_imagem
-                mensagem_editando.WHA_legenda_imagem = legenda_imagem
-                mensagem_editando.WHA_url_audio = url_audio
-                mensagem_editando.WHA_url_video = url_video
-                mensagem_editando.WHA_legenda_video = legenda_video
-                mensagem_editando.WHA_total_enviadas = len(destinatarios)
-                mensagem_editando.WHA_sucessos = sucessos
-                mensagem_editando.WHA_erros = erros
-                mensagem_editando.WHA_usuario = request.user
-                mensagem_editando.WHA_status = 'ENVIADA' if sucessos > 0 else 'ERRO'
-                mensagem_editando.save()
-                mensagem = mensagem_editando
+            # Registro da mensagem antes do envio: a fila soma cada resultado nele e grava a
+            # entrega logo após cada envio (os status do webhook já encontram o registro)
+            dados_mensagem = {
+                'WHA_texto': texto,
+                'WHA_destinatario_tipo': tipo_destinatario,
+                'WHA_tipo_midia': tipo_midia,
+                'WHA_url_imagem': url_imagem,
+                'WHA_legenda_imagem': legenda_imagem,
+                'WHA_url_audio': url_audio,
+                'WHA_url_video': url_video,
+                'WHA_legenda_video': legenda_video,
+                'WHA_total_enviadas': 0,
+                'WHA_sucessos': 0,
+                'WHA_erros': 0,
+                'WHA_entregues': 0,
+                'WHA_lidas': 0,
+                'WHA_usuario': request.user,
+                'WHA_status': 'PENDENTE',
+            }
+            # ENFILEIRAR: o envio segue no ritmo da fila (enviar_fila_whatsapp), fora da
+            # requisição; a imagem sobe uma vez para a Whapi e vai pelo media id
+            if tipo_midia in ('AUDIO', 'VIDEO'):
+                # TODO: Implementar envio de áudio e vídeo
+                texto_envio, midia_envio, nao_enviavel = None, '', 'Envio de áudio/vídeo ainda não implementado'
+            elif tipo_midia == 'IMAGEM':
+                texto_envio, midia_envio = legenda_imagem or texto, url_final_imagem
+                nao_enviavel = None if url_final_imagem else 'URL da imagem não fornecida'
             else:
-                # Criar nova mensagem
-                mensagem = TBWHATSAPP.objects.create(
-                    WHA_texto=texto,
-                    WHA_destinatario_tipo=tipo_destinatario,
-                    WHA_tipo_midia=tipo_midia,
-                    WHA_url_imagem=url_imagem,
-                    WHA_legenda_imagem=legenda_imagem,
-                    WHA_url_audio=url_audio,
-                    WHA_url_video=url_video,
-                    WHA_legenda_video=legenda_video,
-                    WHA_total_enviadas=len(destinatarios),
-                    WHA_sucessos=sucessos,
+                texto_envio, midia_envio, nao_enviavel = texto, '', None
+            
+            # Uma transação: a fila só vê os itens com os totais da mensagem já gravados
+            with transaction.atomic():
+                if editar_id and mensagem_editando:
+                    # Reenvio: as entregas do envio anterior deixam de contar
+                    mensagem = mensagem_editando
+                    for campo, valor in dados_mensagem.items():
+                        setattr(mensagem, campo, valor)
+                    mensagem.save()
+                    mensagem.entregas.all().delete()
+                else:
+                    mensagem = TBWHATSAPP.objects.create(**dados_mensagem)
+                
+                # Chave por envio: reenviar uma mensagem editada não esbarra nas chaves do envio anterior
+                prefixo_chave = f"mensagem:{mensagem.pk}:{timezone.now():%Y%m%d%H%M%S}"
+                todos = chain([primeiro_destinatario], destinatarios)
+                contagem = Counter()
+                if nao_enviavel:
+                    contagem['destinatarios'] = sum(1 for _ in todos)
+                    enfileiradas = 0
+                else:
+                    enfileiradas = enfileirar(
+                        _itens_fila(todos, prefixo_chave, texto_envio, contagem),
+                        ORIGEM_MENSAGEM, midia=midia_envio, mensagem=mensagem,
+                    )
+                
+                # Destinatários que não entraram na fila (telefone inválido) já contam como erro
+                erros = contagem['destinatarios'] - enfileiradas
+                TBWHATSAPP.objects.filter(pk=mensagem.pk).update(
+                    WHA_total_enviadas=contagem['destinatarios'],
                     WHA_erros=erros,
-                    WHA_usuario=request.user,
-                    WHA_status='ENVIADA' if sucessos > 0 else 'ERRO'
+                    WHA_erro=nao_enviavel,
+                    WHA_status='PENDENTE' if enfileiradas else 'ERRO',
                 )
             
-            if sucessos > 0:
-                messages.success(request, f'Mensagem enviada com sucesso para {sucessos} destinatário(s)!')
-            if erros > 0:
-                mensagem_erro = f'Erro ao enviar para {erros} destinatário(s).'
-                if erros_detalhes:
-                    mensagem_erro += f' Detalhes: {"; ".join(erros_detalhes[:5])}'  # Mostrar apenas os 5 primeiros erros
-                    if len(erros_detalhes) > 5:
-                        mensagem_erro += f'... e mais {len(erros_detalhes) - 5} erro(s).'
-                messages.warning(request, mensagem_erro)
+            # Poucos destinatários: envia já, no ritmo da fila; o restante fica para o cron
+            if 0 < enfileiradas <= getattr(settings, 'WHATSAPP_ENVIO_IMEDIATO', 0):
+                totais = processar_fila(maximo=enfileiradas, mensagem=mensagem.pk)
+                if totais['enviadas']:
+                    messages.success(request, f'Mensagem enviada para {totais["enviadas"]} destinatário(s).')
+                if totais['erros']:
+                    messages.warning(request, f'Erro ao enviar para {totais["erros"]} destinatário(s).')
+                enfileiradas -= totais['enviadas'] + totais['erros']
+            if enfileiradas:
+                messages.success(
+                    request,
+                    f'Mensagem na fila para {enfileiradas} destinatário(s). '
+                    f'O envio segue em segundo plano, {getattr(settings, "WHATSAPP_FILA_POR_MINUTO", 30)} por minuto.',
+                )
+            if erros:
+                messages.warning(request, f'Erro ao enviar para {erros} destinatário(s): {nao_enviavel or "telefone inválido"}.')
             
             return redirect('app_igreja:whatsapp_list')
         else:
             messages.error(request, 'Por favor, corrija os erros no formulário.')
             # Carregar listagem apenas se não estiver em modo de criar/editar
             if acao != 'incluir' and acao != 'editar':
-                mensagens = TBWHATSAPP.objects.all().order_by('-WHA_data_criacao')
-                paginator = Paginator(mensagens, 20)
-                page_number = request.GET.get('page', 1)
-                page_obj = paginator.get_page(page_number)
+                page_obj = _pagina_historico(request, historico_mensagens())
             else:
                 page_obj = None
             return render(request, 'admin_area/tpl_mensagens_whatapp.html', {
@@ -315,10 +294,7 @@ def whatsapp_enviar_mensagem(request):
     
     # Carregar listagem apenas se não estiver em modo de criar/editar
     if acao != 'incluir' and acao != 'editar':
-        mensagens = TBWHATSAPP.objects.all().order_by('-WHA_data_criacao')
-        paginator = Paginator(mensagens, 20)
-        page_number = request.GET.get('page', 1)
-        page_obj = paginator.get_page(page_number)
+        page_obj = _pagina_historico(request, historico_mensagens())
     else:
         page_obj = None
     
@@ -338,9 +314,7 @@ def whatsapp_enviar_mensagem(request):
 @login_required
 @admin_required
 def whatsapp_list(request):
-    """Lista de mensagens enviadas usando formulário PAI"""
-    from datetime import datetime
-    
+    """Lista de mensagens enviadas usando formulário PAI (filtros indexados, paginação ?apos=<cursor>)"""
     # Filtros
     status_filter = request.GET.get('status', '').strip()
     tipo_filter = request.GET.get('tipo_destinatario', '').strip()
@@ -348,43 +322,16 @@ def whatsapp_list(request):
     data_fim = request.GET.get('data_fim', '').strip()
     
     # Controla se o usuário já executou uma busca (preencheu algum filtro ou navegou na paginação)
-    busca_realizada = bool(status_filter or tipo_filter or data_inicio or data_fim or request.GET.get('page'))
+    busca_realizada = bool(status_filter or tipo_filter or data_inicio or data_fim or request.GET.get('apos'))
     
     # Só carrega os registros no grid DEPOIS que o usuário aplicar um filtro
     if busca_realizada:
-        mensagens = TBWHATSAPP.objects.all().order_by('-WHA_data_criacao')
-        
-        if status_filter:
-            mensagens = mensagens.filter(WHA_status=status_filter)
-        
-        if tipo_filter:
-            mensagens = mensagens.filter(WHA_destinatario_tipo=tipo_filter)
-        
-        # Filtro por data
-        if data_inicio:
-            try:
-                data_inicio_obj = datetime.strptime(data_inicio, '%Y-%m-%d').date()
-                mensagens = mensagens.filter(WHA_data_criacao__date__gte=data_inicio_obj)
-            except ValueError:
-                pass
-        
-        if data_fim:
-            try:
-                data_fim_obj = datetime.strptime(data_fim, '%Y-%m-%d').date()
-                mensagens = mensagens.filter(WHA_data_criacao__date__lte=data_fim_obj)
-            except ValueError:
-                pass
-        
-        # Ordenação
-        mensagens = mensagens.order_by('-WHA_data_criacao')
+        mensagens = historico_mensagens(
+            status_filter, tipo_filter, _data_do_filtro(data_inicio), _data_do_filtro(data_fim),
+        )
+        page_obj = _pagina_historico(request, mensagens)
     else:
-        # Queryset vazio até que o usuário faça a primeira busca
-        mensagens = TBWHATSAPP.objects.none()
-    
-    # Paginação
-    paginator = Paginator(mensagens, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+        page_obj = None
     
     context = {
         'page_obj': page_obj,
@@ -392,6 +339,13 @@ def whatsapp_list(request):
         'tipo_filter': tipo_filter,
         'data_inicio': data_inicio,
         'data_fim': data_fim,
+        # Filtros repetidos nos links de página
+        'filtros_url': urlencode({
+            chave: valor for chave, valor in (
+                ('status', status_filter), ('tipo_destinatario', tipo_filter),
+                ('data_inicio', data_inicio), ('data_fim', data_fim),
+            ) if valor
+        }),
         'modo_dashboard': True,
         'busca_realizada': busca_realizada,
     }
@@ -460,7 +414,7 @@ def whatsapp_debug(request):
     }
     
     # Últimas mensagens
-    mensagens = TBWHATSAPP.objects.all().order_by('-WHA_data_criacao')[:10]
+    mensagens = historico_mensagens().order_by(*ORDEM_HISTORICO)[:10]
     
     # Logs de erro atualizados
     logs_erro = [
@@ -484,86 +438,77 @@ def whatsapp_debug(request):
     return render(request, 'admin_area/tpl_mensagens_whatapp.html', context)
 
 
-# Funções auxiliares
+@login_required
+@admin_required
+def whatsapp_buscar_destinatarios(request):
+    """
+    Busca de destinatário específico (JSON) para os selects de dizimista/colaborador.
+    GET ?tipo=DIZIMISTAS|COLABORADORES&q=<nome, apelido ou telefone>
+    """
+    tipo = request.GET.get('tipo', 'DIZIMISTAS').strip().upper()
+    termo = request.GET.get('q', '').strip()
+    if len(normalizar_busca(termo)) < 2:
+        return JsonResponse({'resultados': []})
 
-def obter_destinatarios_dizimistas(filtrar_dizimista=None, data_inicial=None, data_final=None):
-    """Obtém lista de dizimistas baseado nos filtros fornecidos"""
-    queryset = TBDIZIMISTAS.objects.all()
-    
-    if filtrar_dizimista:
-        if filtrar_dizimista == 'ATIVO':
-            queryset = queryset.filter(DIS_status=True)
-        elif filtrar_dizimista == 'INATIVO':
-            queryset = queryset.filter(DIS_status=False)
-    
-    if data_inicial and data_final:
-        # Filtrar por período de aniversário
-        queryset = queryset.filter(
-            Q(DIS_data_nascimento__month__gte=data_inicial.month, DIS_data_nascimento__day__gte=data_inicial.day) |
-            Q(DIS_data_nascimento__month__lte=data_final.month, DIS_data_nascimento__day__lte=data_final.day)
-        )
-    
-    destinatarios = []
-    for dizimista in queryset:
-        if dizimista.DIS_telefone:
-            destinatarios.append({
-                'nome': dizimista.DIS_nome,
-                'telefone': dizimista.DIS_telefone
-            })
-    
-    return destinatarios
+    if tipo == 'COLABORADORES':
+        registros = buscar_colaboradores(termo).values_list('COL_id', 'COL_nome_completo', 'COL_telefone')
+    else:
+        registros = buscar_dizimistas(termo).values_list('id', 'DIS_nome', 'DIS_telefone')
 
+    resultados = [
+        {'id': pk, 'nome': nome, 'telefone': telefone}
+        for pk, nome, telefone in registros[:LIMITE_BUSCA_DESTINATARIOS]
+    ]
+    return JsonResponse({'resultados': resultados})
 
-def obter_destinatarios_colaboradores(filtrar_colaborador=None, grupo_colaborador=None, data_inicial=None, data_final=None):
-    """Obtém lista de colaboradores baseado nos filtros fornecidos"""
-    queryset = TBCOLABORADORES.objects.all()
-    
-    if filtrar_colaborador:
-        if filtrar_colaborador == 'ATIVO':
-            queryset = queryset.filter(COL_status='ATIVO')
-        elif filtrar_colaborador == 'INATIVO':
-            queryset = queryset.filter(COL_status='INATIVO')
-        elif filtrar_colaborador == 'PENDENTE':
-            queryset = queryset.filter(COL_status='PENDENTE')
-    
-    if grupo_colaborador:
-        # Filtrar por grupo específico (se houver relação)
-        # Por enquanto, não há relação direta, então pulamos
-        pass
-    
-    if data_inicial and data_final:
-        # Filtrar por período de aniversário
-        queryset = queryset.filter(
-            Q(COL_data_nascimento__month__gte=data_inicial.month, COL_data_nascimento__day__gte=data_inicial.day) |
-            Q(COL_data_nascimento__month__lte=data_final.month, COL_data_nascimento__day__lte=data_final.day)
-        )
-    
-    destinatarios = []
-    for colaborador in queryset:
-        if colaborador.COL_telefone:
-            destinatarios.append({
-                'nome': colaborador.COL_nome_completo,
-                'telefone': colaborador.COL_telefone
-            })
-    
-    return destinatarios
 
+@login_required
+@admin_required
+def whatsapp_contar_destinatarios(request):
+    """
+    Prévia do envio (JSON): quantos telefones distintos o filtro atual alcança.
+    GET com os mesmos campos do formulário (tipo_destinatario, filtros e datas).
+    """
+    dados = {}
+    for campo in ('filtrar_dizimista', 'filtrar_colaborador', 'grupo_colaborador'):
+        dados[campo] = request.GET.get(campo, '').strip()
+    if not dados['grupo_colaborador'].isdigit():
+        dados['grupo_colaborador'] = None
+    for campo in (
+        'data_nascimento_dizimista_inicio', 'data_nascimento_dizimista_fim',
+        'data_nascimento_colaborador_inicio', 'data_nascimento_colaborador_fim',
+    ):
+        try:
+            dados[campo] = datetime.strptime(request.GET.get(campo, '').strip(), '%Y-%m-%d').date()
+        except ValueError:
+            dados[campo] = None
 
-def limpar_telefone_para_envio(telefone):
-    """Formata telefone para o formato da API"""
-    if not telefone:
-        return None
-    
-    # Remove caracteres não numéricos
-    telefone_limpo = ''.join(filter(str.isdigit, str(telefone)))
-    
-    # Adiciona código do país se não tiver
-    if len(telefone_limpo) == 11 and telefone_limpo.startswith('0'):
-        telefone_limpo = '55' + telefone_limpo[1:]
-    elif len(telefone_limpo) == 10:
-        telefone_limpo = '55' + telefone_limpo
-    elif len(telefone_limpo) == 11:
-        telefone_limpo = '55' + telefone_limpo
-    
-    return telefone_limpo
+    tipo = request.GET.get('tipo_destinatario', 'DIZIMISTAS').strip().upper()
+    return JsonResponse({'total': segmento_do_formulario(tipo, dados).contar()})
+
+
+# Funções auxiliares
+
+def segmento_do_formulario(tipo_destinatario, dados):
+    """
+    Segmento (utils_segmentos) com os filtros do formulário de envio.
+
+    Em TODOS os filtros das abas não se aplicam: vão todos os dizimistas e colaboradores.
+    """
+    if tipo_destinatario == 'DIZIMISTAS':
+        return Segmento(
+            'DIZIMISTAS',
+            status_dizimista=dados.get('filtrar_dizimista'),
+            aniversario_inicio=dados.get('data_nascimento_dizimista_inicio'),
+            aniversario_fim=dados.get('data_nascimento_dizimista_fim'),
+        )
+    if tipo_destinatario == 'COLABORADORES':
+        return Segmento(
+            'COLABORADORES',
+            status_colaborador=dados.get('filtrar_colaborador'),
+            grupo=dados.get('grupo_colaborador'),
+            aniversario_inicio=dados.get('data_nascimento_colaborador_inicio'),
+            aniversario_fim=dados.get('data_nascimento_colaborador_fim'),
+        )
+    return Segmento('TODOS')
 
@@ -1,25 +1,85 @@
 """
 Avisos da Paróquia - Área Pública (avisos_paroquia_pub)
+
+Lista paginada por chave (utils_paginacao) sobre o índice (AVI_data, AVI_id), em HTML
+e em JSON para o app. As respostas têm ETag e Last-Modified calculados a partir do
+aviso mais recente (uma consulta agregada): o navegador/app que já tem a página
+recebe 304 sem que a lista seja consultada ou renderizada.
+
+Os feeds RSS/Atom são gerados uma vez por alteração dos avisos (versão de conteúdo,
+utils_cache) e servidos do cache.
 """
+import hashlib
+from datetime import datetime
 
+from django.contrib import messages
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.urls import reverse
-from datetime import datetime
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
 
 from ...models.area_admin.models_avisos import TBAVISO
 from ...models.area_admin.models_paroquias import TBPAROQUIA
+from ...utils_cache import versao_conteudo
+from ...utils_paginacao import paginar_por_chave
 
+ORDEM_AVISOS = ['-AVI_data', '-AVI_id']
+AVISOS_POR_PAGINA = 20
+AVISOS_NO_FEED = 30
+TEMPO_CACHE_FEED = 24 * 60 * 60  # segundos; a versão muda quando um aviso muda
 
-def avisos_paroquia_pub(request):
+
+def _estado_avisos(request):
+    """(última alteração, total) dos avisos, calculado uma vez por requisição."""
+    if not hasattr(request, '_estado_avisos'):
+        estado = TBAVISO.objects.aggregate(ultima=Max('AVI_atualizado_em'), total=Count('AVI_id'))
+        request._estado_avisos = (estado['ultima'], estado['total'])
+    return request._estado_avisos
+
+
+def _ultima_alteracao(request, *args, **kwargs):
+    return _estado_avisos(request)[0]
+
+
+def _etag_avisos(request, *args, **kwargs):
     """
-    Área pública para visualizar avisos da paróquia.
-    Filtro por período de data.
-    Template: tpl_avisos_paroquia_pub.html
-    URL name: avisos_paroquia_pub
+    ETag da lista (JSON e feeds): estado dos avisos + parâmetros da página.
+
+    O total entra na conta para que excluir um aviso antigo também mude o ETag.
+    """
+    ultima, total = _estado_avisos(request)
+    partes = [
+        ultima.isoformat() if ultima else '', total, request.path,
+        request.GET.get('apos', ''), request.GET.get('data_fim', ''),
+    ]
+    return hashlib.md5('|'.join(map(str, partes)).encode()).hexdigest()
+
+
+def _etag_pagina_avisos(request, *args, **kwargs):
     """
-    paroquia = TBPAROQUIA.objects.first()
-    avisos = TBAVISO.objects.all().order_by('-AVI_data')
+    ETag da página HTML: o da lista + usuário, modo app e paróquia (cabeçalho).
+
+    Com mensagens pendentes não há ETag, para a mensagem não ficar presa num 304.
+    """
+    if len(messages.get_messages(request)):
+        return None
+    partes = [_etag_avisos(request), request.user.pk or '', _url_retorno(request), versao_conteudo(TBPAROQUIA)]
+    return hashlib.md5('|'.join(map(str, partes)).encode()).hexdigest()
+
 
+def _url_retorno(request):
+    if request.GET.get('modo') == 'app' or request.session.get('modo_app'):
+        return reverse('app_igreja:app_info')
+    return reverse('home')
+
+
+def _pagina_avisos(request):
+    """Página de avisos da requisição (filtro data_fim e cursor apos)."""
+    avisos = TBAVISO.objects.all()
     data_fim_str = request.GET.get('data_fim', '').strip()
     if data_fim_str:
         try:
@@ -27,15 +87,95 @@ def avisos_paroquia_pub(request):
             avisos = avisos.filter(AVI_data__lte=data_fim)
         except ValueError:
             pass
+    return paginar_por_chave(avisos, ORDEM_AVISOS, request.GET.get('apos'), AVISOS_POR_PAGINA)
 
-    if request.GET.get('modo') == 'app' or request.session.get('modo_app'):
-        url_retorno = reverse('app_igreja:app_info')
-    else:
-        url_retorno = reverse('home')
 
+@condition(etag_func=_etag_pagina_avisos, last_modified_func=_ultima_alteracao)
+def avisos_paroquia_pub(request):
+    """
+    Área pública para visualizar avisos da paróquia.
+    Filtro por período de data, paginação por chave (?apos=<cursor>).
+    Template: tpl_avisos_paroquia_pub.html
+    URL name: avisos_paroquia_pub
+    """
     context = {
-        'paroquia': paroquia,
-        'avisos': avisos,
-        'url_retorno': url_retorno,
+        'paroquia': TBPAROQUIA.objects.first(),
+        'avisos': _pagina_avisos(request),
+        'url_retorno': _url_retorno(request),
     }
     return render(request, 'area_publica/tpl_avisos_paroquia_pub.html', context)
+
+
+@condition(etag_func=_etag_avisos, last_modified_func=_ultima_alteracao)
+def avisos_paroquia_pub_json(request):
+    """
+    Avisos em JSON para o app: mesma paginação e filtro da página HTML.
+    URL name: avisos_paroquia_pub_json
+    """
+    pagina = _pagina_avisos(request)
+    return JsonResponse({
+        'avisos': [
+            {
+                'id': aviso.AVI_id,
+                'titulo': aviso.AVI_titulo,
+                'texto': aviso.AVI_texto,
+                'data': aviso.AVI_data.isoformat(),
+            }
+            for aviso in pagina
+        ],
+        'proximo_cursor': pagina.proximo_cursor,
+    })
+
+
+# ==================== FEEDS RSS / ATOM ====================
+
+class AvisosRss(Feed):
+    title = 'Avisos da Paróquia'
+    description = 'Avisos publicados pela paróquia'
+
+    def link(self):
+        return reverse('app_igreja:avisos_paroquia_pub')
+
+    def items(self):
+        return TBAVISO.objects.order_by(*ORDEM_AVISOS)[:AVISOS_NO_FEED]
+
+    def item_title(self, item):
+        return item.AVI_titulo
+
+    def item_description(self, item):
+        return item.AVI_texto
+
+    def item_link(self, item):
+        return f"{reverse('app_igreja:avisos_paroquia_pub')}#aviso-{item.AVI_id}"
+
+    def item_pubdate(self, item):
+        return datetime.combine(item.AVI_data, datetime.min.time())
+
+    def item_updateddate(self, item):
+        return item.AVI_atualizado_em
+
+
+class AvisosAtom(AvisosRss):
+    feed_type = Atom1Feed
+    subtitle = AvisosRss.description
+
+
+def _feed_em_cache(feed_class):
+    """View do feed gerada uma vez por versão dos avisos (e host) e servida do cache."""
+    gerar_feed = feed_class()
+
+    @condition(etag_func=_etag_avisos, last_modified_func=_ultima_alteracao)
+    def view(request):
+        chave = f'avisos:feed:{feed_class.__name__}:{versao_conteudo(TBAVISO)}:{request.get_host()}'
+        em_cache = cache.get(chave)
+        if em_cache is None:
+            response = gerar_feed(request)
+            em_cache = (response.content, response['Content-Type'])
+            cache.set(chave, em_cache, TEMPO_CACHE_FEED)
+        return HttpResponse(em_cache[0], content_type=em_cache[1])
+
+    return view
+
+
+avisos_paroquia_rss = _feed_em_cache(AvisosRss)
+avisos_paroquia_atom = _feed_em_cache(AvisosAtom)
@@ -15,10 +15,10 @@ from django.urls import reverse
 import json
 import re
 import logging
-import requests
 
 from ...forms.area_publica.form_cadastro_colaborador import CadastroColaboradorForm
 from ...models.area_admin.models_colaboradores import TBCOLABORADORES
+from ...utils_cep import buscar_cep, limpar_cep, CepServicoIndisponivel
 
 logger = logging.getLogger(__name__)
 
@@ -165,50 +165,37 @@ def cadastro_colaborador_por_telefone(request, telefone):
 def api_buscar_cep_colaborador(request, cep):
     """
     API para buscar CEP e preencher endereço automaticamente
-    Integração com ViaCEP para melhor UX
+    Usa o cache local de CEPs (ViaCEP apenas quando o CEP ainda não é conhecido)
     
     URL: cadastro-colaborador/api/cep/<str:cep>/
     """
     try:
-        # Limpar CEP (remover caracteres não numéricos)
-        cep_limpo = re.sub(r'[^\d]', '', cep)
-        
-        if len(cep_limpo) != 8:
+        if not limpar_cep(cep):
             return JsonResponse({
                 'success': False,
                 'error': 'CEP deve ter 8 dígitos'
             }, status=400)
         
-        # Buscar CEP na API ViaCEP
-        response = requests.get(f'https://viacep.com.br/ws/{cep_limpo}/json/', timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            if data.get('erro'):
-                return JsonResponse({
-                    'success': False,
-                    'error': 'CEP não encontrado'
-                }, status=404)
-            
-            return JsonResponse({
-                'success': True,
-                'data': {
-                    'logradouro': data.get('logradouro', ''),
-                    'bairro': data.get('bairro', ''),
-                    'localidade': data.get('localidade', ''),
-                    'uf': data.get('uf', ''),
-                    'complemento': data.get('complemento', ''),
-                    'cep': data.get('cep', '')
-                }
-            })
-        else:
+        endereco = buscar_cep(cep)
+        if not endereco:
             return JsonResponse({
                 'success': False,
-                'error': 'Erro ao consultar CEP'
-            }, status=500)
+                'error': 'CEP não encontrado'
+            }, status=404)
+        
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'logradouro': endereco['logradouro'],
+                'bairro': endereco['bairro'],
+                'localidade': endereco['cidade'],
+                'uf': endereco['estado'],
+                'complemento': endereco['complemento'],
+                'cep': endereco['cep']
+            }
+        })
             
-    except requests.Timeout:
+    except CepServicoIndisponivel:
         return JsonResponse({
             'success': False,
             'error': 'Timeout ao consultar CEP'
@@ -1,9 +1,9 @@
 from django.shortcuts import render
-from django.db.models import Q
 from django.contrib import messages
 
 from ...models.area_admin.models_celebracoes import TBCELEBRACOES
 from ...models.area_admin.models_paroquias import TBPAROQUIA
+from ...utils_busca import chave_telefone
 
 
 def minhas_celebracaoes_publico(request):
@@ -19,15 +19,12 @@ def minhas_celebracaoes_publico(request):
     resultados_encontrados = False
     
     if telefone:
-        # Remove caracteres não numéricos para busca
-        telefone_limpo = ''.join(filter(str.isdigit, telefone))
+        chave = chave_telefone(telefone)
         
-        if len(telefone_limpo) >= 10:
-            # Buscar por telefone (com e sem formatação)
+        if len(chave) >= 10:
+            # Igualdade na chave normalizada (índice telefone + data)
             celebracaoes = TBCELEBRACOES.objects.filter(
-                Q(CEL_telefone__icontains=telefone_limpo) | 
-                Q(CEL_telefone__icontains=telefone) |
-                Q(CEL_telefone__icontains=f"({telefone_limpo[:2]}) {telefone_limpo[2:7]}-{telefone_limpo[7:]}")
+                CEL_telefone_chave=chave
             ).order_by('-CEL_data_celebracao', 'CEL_horario')
             
             resultados_encontrados = celebracaoes.exists()
@@ -3,16 +3,24 @@
 Views para agendamento público de celebrações via WhatsApp
 """
 
+from datetime import date
+
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.db.models import Q
-from datetime import date
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 import re
 import logging
 
 from ...models.area_admin.models_celebracoes import TBCELEBRACOES
 from ...models.area_admin.models_paroquias import TBPAROQUIA
 from ...forms.area_publica.forms_celebracoes_agendadas_pub import CelebracaoAgendadaPubForm
+from ...utils_busca import chave_telefone
+from ...utils_celebracoes import HorarioIndisponivel, capacidade_por_horario, disponibilidade_do_mes, reservar_celebracao
+from ...utils_paginacao import paginar_por_chave
+
+# Histórico por telefone: mais recentes primeiro (índice idx_cel_telefone_data)
+ORDEM_HISTORICO = ['-CEL_data_celebracao', 'CEL_horario', 'pk']
 
 logger = logging.getLogger(__name__)
 
@@ -84,7 +92,8 @@ def agendar_celebracoes_agendadas_pub(request):
                     # O form pode ter limpo o telefone, então formatamos novamente
                     celebracao.CEL_telefone = formatar_telefone_para_salvar(celebracao.CEL_telefone)
                 
-                celebracao.save()
+                # Confere a vaga de novo dentro da transação (outro pedido pode ter levado a última)
+                reservar_celebracao(celebracao)
                 
                 messages.success(
                     request, 
@@ -111,6 +120,9 @@ def agendar_celebracoes_agendadas_pub(request):
                 
                 form = CelebracaoAgendadaPubForm(initial=initial_data, telefone_readonly=telefone_readonly, telefone_initial=initial_data.get('CEL_telefone'))
                 
+            except HorarioIndisponivel as e:
+                form.add_error('CEL_horario', str(e))
+                messages.error(request, str(e))
             except Exception as e:
                 logger.error(f"Erro ao agendar celebração: {str(e)}")
                 messages.error(request, f'Erro ao agendar celebração: {str(e)}')
@@ -134,14 +146,9 @@ def agendar_celebracoes_agendadas_pub(request):
     # Buscar celebrações agendadas pelo mesmo telefone (para mostrar histórico)
     celebracaoes_agendadas = None
     if telefone_url:
-        telefone_limpo = limpar_telefone(telefone_url)
-        if telefone_limpo and telefone_limpo.startswith('55'):
-            telefone_limpo = telefone_limpo[2:]
-        
-        # Buscar todas as celebrações deste telefone (com e sem formatação)
         celebracaoes_agendadas = TBCELEBRACOES.objects.filter(
-            Q(CEL_telefone__icontains=telefone_limpo)
-        ).order_by('-CEL_data_celebracao', 'CEL_horario')[:10]  # Últimas 10
+            CEL_telefone_chave=chave_telefone(telefone_url)
+        ).order_by(*ORDEM_HISTORICO)[:10]  # Últimas 10
     
     # Determinar URL de retorno baseada no modo
     from django.urls import reverse
@@ -175,36 +182,18 @@ def list_celebracoes_agendadas_pub(request):
     resultados_encontrados = False
     
     if telefone:
-        # Remove caracteres não numéricos para busca
-        telefone_limpo = limpar_telefone(telefone)
-        # Remover código do país se existir
-        if telefone_limpo and telefone_limpo.startswith('55'):
-            telefone_limpo = telefone_limpo[2:]
+        chave = chave_telefone(telefone)
         
-        if len(telefone_limpo) >= 10:
-            # Formatar telefone para busca (pode estar formatado no banco)
-            telefone_formatado = formatar_telefone_para_salvar(telefone_limpo)
-            
-            # Buscar por telefone de várias formas para garantir que encontre
-            # 1. Busca pelos últimos 9 dígitos (sem DDD) - mais flexível
-            ultimos_9_digitos = telefone_limpo[-9:] if len(telefone_limpo) >= 9 else telefone_limpo
-            # 2. Busca pelos últimos 8 dígitos (sem DDD e sem 9 inicial) - para celular
-            ultimos_8_digitos = telefone_limpo[-8:] if len(telefone_limpo) >= 8 else telefone_limpo
-            
-            # Buscar por telefone (tanto formatado quanto não formatado)
-            celebracaoes = TBCELEBRACOES.objects.filter(
-                Q(CEL_telefone__icontains=telefone_limpo) |  # Busca pelo telefone limpo completo
-                Q(CEL_telefone__icontains=telefone_formatado) |  # Busca pelo telefone formatado
-                Q(CEL_telefone__icontains=ultimos_9_digitos) |  # Busca pelos últimos 9 dígitos
-                Q(CEL_telefone__icontains=ultimos_8_digitos)  # Busca pelos últimos 8 dígitos
-            ).order_by('-CEL_data_celebracao', 'CEL_horario')
+        if len(chave) >= 10:
+            # Igualdade na chave normalizada: usa o índice (telefone, data), sem varrer a tabela
+            celebracaoes = paginar_por_chave(
+                TBCELEBRACOES.objects.filter(CEL_telefone_chave=chave),
+                ORDEM_HISTORICO,
+                cursor=request.GET.get('apos'),
+            )
+            resultados_encontrados = bool(celebracaoes)
             
-            resultados_encontrados = celebracaoes.exists()
-            
-            # Log para debug
-            logger.info(f"🔍 Busca de celebrações - Telefone: {telefone}, Limpo: {telefone_limpo}, Formatado: {telefone_formatado}, Encontrados: {celebracaoes.count()}")
-            
-            if not resultados_encontrados:
+            if not resultados_encontrados and celebracaoes.eh_primeira:
                 messages.info(request, f'Nenhuma celebração encontrada para o telefone {telefone}')
         else:
             messages.warning(request, 'Digite um telefone válido com pelo menos 10 dígitos')
@@ -219,9 +208,8 @@ def list_celebracoes_agendadas_pub(request):
     context = {
         'paroquia': paroquia,
         'telefone': telefone,
-        'celebracaoes': celebracaoes,
+        'celebracoes': celebracaoes,
         'resultados_encontrados': resultados_encontrados,
-        'total_encontrado': celebracaoes.count() if celebracaoes else 0,
         'url_retorno': url_retorno,
     }
     
@@ -234,3 +222,29 @@ def detalhe_celebracoes_agendadas_pub(request, celebracao_id):
     """
     return redirect('app_igreja:celebracoes_agendadas_pub')
 
+
+@require_GET
+def disponibilidade_celebracoes_pub(request):
+    """
+    Horários com vaga para agendamento: GET ?mes=AAAA-MM (padrão: mês atual)
+
+    {"mes": "2026-11", "capacidade": 5,
+     "dias": {"2026-11-01": [{"horario": "08:00", "livres": 3}, ...], ...}}
+    Usado pelo formulário público e pelo menu do WhatsApp.
+    """
+    hoje = date.today()
+    try:
+        ano, mes = (int(p) for p in request.GET.get('mes', f'{hoje:%Y-%m}').split('-'))
+        date(ano, mes, 1)
+    except ValueError:
+        return JsonResponse({'erro': 'Parâmetro mes inválido (use AAAA-MM).'}, status=400)
+
+    dias = {}
+    for vaga in disponibilidade_do_mes(ano, mes):
+        dias.setdefault(vaga['data'].isoformat(), []).append({
+            'horario': vaga['horario'].strftime('%H:%M'),
+            'livres': vaga['livres'],
+        })
+    response = JsonResponse({'mes': f'{ano}-{mes:02d}', 'capacidade': capacidade_por_horario(), 'dias': dias})
+    response['Cache-Control'] = 'max-age=30'
+    return response
@@ -8,11 +8,11 @@ from django.http import JsonResponse, Http404
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
-import requests
 import re
 
 from ...models.area_admin.models_colaboradores import TBCOLABORADORES
 from ...forms.area_publica.forms_colaboradores_publico import ColaboradorPublicoForm
+from ...utils_cep import buscar_cep, limpar_cep, CepServicoIndisponivel
 
 
 def limpar_telefone(telefone):
@@ -211,55 +211,33 @@ def cadastro_colaborador_publico(request, telefone):
 @require_http_methods(["GET"])
 def api_buscar_cep(request, cep):
     """
-    API para buscar endereço por CEP usando ViaCEP
+    API para buscar endereço por CEP (cache local, ViaCEP apenas quando necessário)
     Similar ao Flask app_membros.py
     """
     try:
-        # Remove caracteres não numéricos
-        cep_limpo = re.sub(r'[^\d]', '', str(cep))
-        
-        if not cep_limpo or len(cep_limpo) != 8:
+        if not limpar_cep(cep):
             return JsonResponse({
                 'sucesso': False,
                 'erro': 'CEP inválido'
             })
         
-        # Busca na API ViaCEP
-        url = f"https://viacep.com.br/ws/{cep_limpo}/json/"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            dados = response.json()
-            
-            if 'erro' in dados:
-                return JsonResponse({
-                    'sucesso': False,
-                    'erro': 'CEP não encontrado'
-                })
-            
-            # Formata CEP
-            cep_formatado = f"{cep_limpo[:5]}-{cep_limpo[5:]}"
-            
-            return JsonResponse({
-                'sucesso': True,
-                'cep': cep_formatado,
-                'endereco': dados.get('logradouro', ''),
-                'bairro': dados.get('bairro', ''),
-                'cidade': dados.get('localidade', ''),
-                'estado': dados.get('uf', '')
-            })
-        else:
+        endereco = buscar_cep(cep)
+        if not endereco:
             return JsonResponse({
                 'sucesso': False,
-                'erro': f'Erro na consulta: {response.status_code}'
+                'erro': 'CEP não encontrado'
             })
-            
-    except requests.exceptions.Timeout:
+        
         return JsonResponse({
-            'sucesso': False,
-            'erro': 'Timeout na consulta'
+            'sucesso': True,
+            'cep': endereco['cep'],
+            'endereco': endereco['logradouro'],
+            'bairro': endereco['bairro'],
+            'cidade': endereco['cidade'],
+            'estado': endereco['estado']
         })
-    except requests.exceptions.RequestException as e:
+            
+    except CepServicoIndisponivel:
         return JsonResponse({
             'sucesso': False,
             'erro': 'Erro na conexão'
@@ -11,7 +11,7 @@ from django.db.models import Q
 from datetime import date, datetime
 import logging
 
-from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA
+from ...models.area_admin.models_escala import TBESCALA, TBITEM_ESCALA, anexar_nomes_escala
 from ...models.area_admin.models_colaboradores import TBCOLABORADORES
 
 logger = logging.getLogger(__name__)
@@ -106,7 +106,8 @@ def escala_publico(request):
             'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
         ]
         
-        # Adicionar informações para cada item
+        # Adicionar informações para cada item (colaboradores em uma consulta: anexar_nomes_escala)
+        itens = anexar_nomes_escala(itens)
         for item in itens:
             item.dia_semana_nome = dias_semana_pt.get(item.ITE_ESC_DATA.weekday(), '')
             item.dia_semana_abrev = item.dia_semana_nome[:3].upper() if item.dia_semana_nome else ''
@@ -114,14 +115,14 @@ def escala_publico(request):
             # Adicionar informação de bloqueio (ITE_ESC_SITUACAO = False significa bloqueado)
             item.bloqueado = not item.ITE_ESC_SITUACAO
             
-            # Buscar nome do colaborador (apelido/primeiro nome)
+            # Nome do colaborador (apelido/primeiro nome)
             if item.ITE_ESC_COLABORADOR:
-                try:
-                    colaborador = TBCOLABORADORES.objects.get(COL_id=item.ITE_ESC_COLABORADOR)
+                colaborador = item.colaborador
+                if colaborador:
                     # Pegar primeiro nome como apelido
                     item.colaborador_apelido = colaborador.COL_nome_completo.split()[0] if colaborador.COL_nome_completo else '-'
                     item.colaborador_id = colaborador.COL_id
-                except TBCOLABORADORES.DoesNotExist:
+                else:
                     item.colaborador_apelido = '-'
                     item.colaborador_id = None
             else:
@@ -0,0 +1,88 @@
+"""
+Página inicial pública
+
+A home é montada com três níveis de cache, todos com chaves que incluem a versão de
+conteúdo dos models envolvidos (utils_cache): editar paróquia, visual, mural ou banner
+gera chaves novas e a próxima visita já vê a alteração.
+- Paróquia e visual: objetos guardados no cache (sem consulta por visita).
+- Fragmentos do template (cabeçalho, faixa do mural, carrossel de banners): {% cache %}
+  em home.html; murais e banners são querysets preguiçosos, só consultados quando o
+  fragmento precisa ser renderizado.
+- Visitantes anônimos: a página inteira fica no cache por HOME_CACHE_PAGINA segundos.
+"""
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import redirect, render
+
+from ...models.area_admin.models_banners import TBBANNERS
+from ...models.area_admin.models_midia import TBRENDICAO
+from ...models.area_admin.models_mural import TBMURAL
+from ...models.area_admin.models_paroquias import TBPAROQUIA
+from ...models.area_admin.models_visual import TBVISUAL
+from ...templatetags.imagens import aceita_webp
+from ...utils_cache import versao_conteudo
+
+# Models cujo save/delete muda a home (ver signals.py)
+MODELS_HOME = (TBPAROQUIA, TBVISUAL, TBMURAL, TBBANNERS, TBRENDICAO)
+
+
+def _objeto_em_cache(model, versao):
+    """Primeiro registro do model, guardado no cache enquanto a versão não mudar."""
+    chave = f'home:{model._meta.model_name}:{versao}'
+    obj = cache.get(chave)
+    if obj is None:
+        # False distingue "não há registro" de "não está no cache"
+        obj = model.objects.first() or False
+        cache.set(chave, obj, settings.HOME_CACHE_FRAGMENTOS)
+    return obj or None
+
+
+def _contexto_home(request):
+    return {
+        'paroquia': _objeto_em_cache(TBPAROQUIA, versao_conteudo(TBPAROQUIA)),
+        'visual': _objeto_em_cache(TBVISUAL, versao_conteudo(TBVISUAL)),
+        'murais_recentes': TBMURAL.objects.filter(MUR_ativo=True).order_by('-MUR_data_mural')[:3],
+        'banners': TBBANNERS.objects.filter(BAN_ORDEM__gt=0).order_by('BAN_ORDEM'),
+        'versoes': {
+            'cabecalho': versao_conteudo(TBPAROQUIA, TBVISUAL, TBRENDICAO),
+            'murais': versao_conteudo(TBMURAL, TBRENDICAO),
+            'banners': versao_conteudo(TBBANNERS, TBRENDICAO),
+        },
+        'webp': aceita_webp(request),
+        'tempo_fragmentos': settings.HOME_CACHE_FRAGMENTOS,
+    }
+
+
+def _pagina_cacheavel(request):
+    """Só visitante anônimo, sem parâmetros na URL e sem mensagens pendentes."""
+    return (
+        request.method == 'GET'
+        and not request.GET
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def home(request):
+    """Página inicial da aplicação"""
+    # Se estiver no modo app, redirecionar para a home do app
+    if request.GET.get('modo') == 'app':
+        return redirect('app_igreja:app_home')
+
+    if not _pagina_cacheavel(request):
+        return render(request, 'home.html', _contexto_home(request))
+
+    chave = 'home:pagina:{}:{}:{}'.format(
+        versao_conteudo(*MODELS_HOME), int(aceita_webp(request)), request.get_host(),
+    )
+    conteudo = cache.get(chave)
+    if conteudo is not None:
+        return HttpResponse(conteudo)
+
+    response = render(request, 'home.html', _contexto_home(request))
+    # Página que gerou token CSRF depende do cookie deste visitante: não pode ser reaproveitada
+    if response.status_code == 200 and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        cache.set(chave, response.content, settings.HOME_CACHE_PAGINA)
+    return response
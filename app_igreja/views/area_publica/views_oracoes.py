@@ -1,12 +1,12 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q
 import re
 
 from ...models.area_admin.models_oracoes import TBORACOES, limpar_telefone_para_display
 from ...models.area_admin.models_paroquias import TBPAROQUIA
 from ...forms.area_admin.forms_oracoes import OracaoPublicoForm
+from ...utils_busca import chave_telefone
+from ...utils_paginacao import paginar_por_chave
 
 
 def formatar_telefone_para_salvar(telefone):
@@ -43,34 +43,27 @@ def meus_pedidos_oracoes(request):
     
     # Busca por telefone
     telefone = request.GET.get('telefone', '').strip()
-    oracoes = None
+    page_obj = None
     resultados_encontrados = False
+    total_encontrado = 0
     
     if telefone:
-        # Remove caracteres não numéricos para busca
-        telefone_limpo = ''.join(filter(str.isdigit, telefone))
+        chave = chave_telefone(telefone)
         
-        if len(telefone_limpo) >= 10:
-            # Buscar por telefone (com e sem formatação)
-            oracoes = TBORACOES.objects.filter(
-                Q(ORA_telefone_pedinte__icontains=telefone_limpo) | 
-                Q(ORA_telefone_pedinte__icontains=telefone)
-            ).filter(ORA_ativo=True).order_by('-ORA_data_pedido')
-            
-            resultados_encontrados = oracoes.exists()
+        if len(chave) >= 10:
+            # Igualdade na chave normalizada: usa o índice (telefone, data), sem varrer a tabela
+            oracoes = TBORACOES.objects.filter(ORA_telefone_chave=chave, ORA_ativo=True)
+            page_obj = paginar_por_chave(oracoes, ['-ORA_data_pedido', '-pk'], cursor=request.GET.get('apos'))
+            resultados_encontrados = bool(page_obj) or not page_obj.eh_primeira
+            # Total só na primeira página (e só um COUNT quando há mais de uma)
+            if page_obj.eh_primeira:
+                total_encontrado = oracoes.count() if page_obj.tem_proxima else len(page_obj)
             
             if not resultados_encontrados:
                 messages.info(request, f'Nenhum pedido de oração encontrado para o telefone {telefone}')
         else:
             messages.warning(request, 'Digite um telefone válido com pelo menos 10 dígitos')
     
-    # Paginação (se houver resultados)
-    page_obj = None
-    if oracoes:
-        paginator = Paginator(oracoes, 10)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
-    
     # Determinar URL de retorno baseada no modo
     from django.urls import reverse
     if request.GET.get('modo') == 'app' or request.session.get('modo_app'):
@@ -83,7 +76,7 @@ def meus_pedidos_oracoes(request):
         'telefone': telefone,
         'page_obj': page_obj,
         'resultados_encontrados': resultados_encontrados,
-        'total_encontrado': oracoes.count() if oracoes else 0,
+        'total_encontrado': total_encontrado,
         'acao': 'listar',  # Define a ação
         'url_retorno': url_retorno,
     }
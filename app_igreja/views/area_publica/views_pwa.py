@@ -0,0 +1,48 @@
+import hashlib
+import json
+from functools import lru_cache
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_GET
+
+# Estáticos baixados na instalação do service worker (nomes sem hash; a URL final vem do manifesto)
+PRECACHE_ESTATICOS = [
+    'manifest.json',
+    'favicon.ico',
+    'js/app.js',
+    'js/app_pa.js',
+    'js/global-utils.js',
+    'js/formularios.js',
+    'img/catedral.jpg',
+    'icons/icon-192x192.png',
+    'icons/icon-512x512.png',
+]
+
+
+@lru_cache(maxsize=1)
+def _conteudo_service_worker():
+    """
+    Gera o sw.js a partir do manifesto do collectstatic.
+
+    A lista de precache usa as URLs com hash e a versão do cache é o hash dessa lista:
+    um deploy que altera um estático muda a versão, e o navegador baixa só o que mudou.
+    O manifesto só muda com novo collectstatic + reinício do servidor, por isso o cache.
+    """
+    urls = [staticfiles_storage.url(nome) for nome in PRECACHE_ESTATICOS]
+    versao = hashlib.sha1('\n'.join(urls).encode()).hexdigest()[:12]
+    return render_to_string('sw.js', {
+        'cache_versao': f'on-cristo-{versao}',
+        'precache_urls': json.dumps(urls, indent=2),
+        'static_url': staticfiles_storage.base_url,
+    })
+
+
+@require_GET
+def service_worker(request):
+    """Service worker na raiz do site (escopo '/'), nunca guardado em cache HTTP."""
+    response = HttpResponse(_conteudo_service_worker(), content_type='application/javascript; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['Service-Worker-Allowed'] = '/'
+    return response
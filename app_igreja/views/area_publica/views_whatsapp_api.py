@@ -22,11 +22,20 @@ from ...models.area_admin.models_dizimistas import TBDIZIMISTAS
 from ...models.area_admin.models_extrator_liturgias import TBLITURGIA
 from ...models.area_admin.models_celebracoes import TBCELEBRACOES
 from ...models.area_admin.models_oracoes import TBORACOES
-from ...models.area_admin.models_paroquias import TBPAROQUIA
 from ...models.area_admin.models_visual import TBVISUAL
 from ...forms.area_publica.forms_dizimistas import DizimistaPublicoForm
-
-logger = logging.getLogger(__name__)
+from ...utils_chatbot import (
+    corpo_mensagem, dentro_do_limite, get_site_url, mensagem_nova, menu_liberado,
+    primeiro_contato, registrar_estado, rota_botao, rota_item,
+)
+from ...utils_entregas_whatsapp import receber_status
+from ...utils_image import url_rendicao
+from ...utils_log import capturar_payload, evento
+from ...utils_midia_whatsapp import invalidar_midia, media_id_arquivo
+from ...utils_webhook import gravar_payload
+
+# Sob app_igreja.whatsapp: vai para o FilaLogHandler (settings.LOGGING), nível WHATSAPP_LOG_NIVEL
+logger = logging.getLogger('app_igreja.whatsapp.webhook')
 
 # Nota: As variáveis de ambiente já são carregadas pelo Django settings.py
 # que carrega automaticamente o .env_local em desenvolvimento
@@ -40,38 +49,31 @@ CHANNEL_ID = os.getenv('CHANNEL_ID', os.getenv('WHATSAPP_CHANNEL_ID', ''))
 # Versão atual do webhook
 CURRENT_VERSION = "v2.0.0-django"
 
-# Set para armazenar IDs de mensagens já processadas (em produção, usar Redis ou DB)
-processed_messages = set()
-
-# Set para armazenar números que já receberam o menu (para detectar primeiro contato)
-numbers_with_menu = set()
+# Conexão HTTP reaproveitada entre as mensagens (keep-alive com a Whapi)
+_sessao = requests.Session()
 
 
-def limpar_telefone(telefone):
-    """Remove caracteres não numéricos e o código do país (55) do número do telefone"""
-    if not telefone:
-        return telefone
-    
-    # Remove caracteres não numéricos
-    import re
-    telefone_limpo = re.sub(r'[^\d]', '', str(telefone))
-    
-    # Remove código do país (55) se existir
-    if telefone_limpo and telefone_limpo.startswith('55'):
-        telefone_limpo = telefone_limpo[2:]  # Remove os primeiros 2 dígitos (55)
-    
-    return telefone_limpo
+def _headers():
+    return {
+        "accept": "application/json",
+        "content-type": "application/json",
+        "authorization": f"Bearer {API_KEY}",
+        "channel-id": CHANNEL_ID
+    }
 
 
-def get_site_url():
-    """
-    Obtém a URL do site para uso na API do WhatsApp.
-    Usa SITE_URL do .env ou padrão https://oncristo.com.br
-    """
-    site_url = os.getenv('SITE_URL', 'https://oncristo.com.br').strip().rstrip('/')
-    if not site_url.startswith('http://') and not site_url.startswith('https://'):
-        site_url = f'https://{site_url}'
-    return site_url
+def _post_whapi(endpoint, timeout=30, headers=None, **kwargs):
+    """POST na Whapi pela sessão compartilhada, com o evento whapi_envio (status e tempo)."""
+    inicio = time.perf_counter()
+    status = None
+    try:
+        response = _sessao.post(
+            f"{API_BASE_URL}{endpoint}", headers={**_headers(), **(headers or {})}, timeout=timeout, **kwargs
+        )
+        status = response.status_code
+        return response
+    finally:
+        evento('whapi_envio', endpoint=endpoint, status=status, ms=round((time.perf_counter() - inicio) * 1000, 1))
 
 
 def get_local_time():
@@ -86,49 +88,37 @@ def get_local_time():
 def send_whatsapp_message(phone, message):
     """Envia mensagem de texto via API Whapi Cloud"""
     try:
-        url = f"{API_BASE_URL}/messages/text"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
         message_data = {
             "to": phone,
             "body": message
         }
         
-        logger.info(f"📱 Enviando mensagem para {phone}")
-        logger.debug(f"Payload: {json.dumps(message_data, indent=2, ensure_ascii=False)}")
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
+        logger.info("📱 Enviando mensagem para %s", phone)
+        logger.debug("Payload: %s", message_data)
         
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
+        response = _post_whapi("/messages/text", json=message_data)
         
         if response.status_code == 200:
             result = response.json()
             if result.get("sent", False) or result.get("success", False):
                 message_id = result.get('message', {}).get('id', 'N/A')
-                logger.info(f"✅ Mensagem enviada com sucesso para {phone}. ID: {message_id}")
-                logger.debug(f"Resposta completa: {json.dumps(result, indent=2, ensure_ascii=False)}")
+                logger.info("✅ Mensagem enviada com sucesso para %s. ID: %s", phone, message_id)
+                logger.debug("Resposta completa: %s", result)
                 return result
             else:
                 error_msg = f"Erro ao enviar: {result}"
-                logger.error(f"❌ {error_msg}")
-                logger.error(f"   Telefone: {phone}")
-                logger.error(f"   Resposta completa: {json.dumps(result, indent=2, ensure_ascii=False)}")
+                logger.error("❌ %s", error_msg)
+                logger.error("   Telefone: %s", phone)
+                logger.error("   Resposta completa: %s", result)
                 return {"error": error_msg}
         else:
             error_msg = f"Erro {response.status_code}: {response.text}"
-            logger.error(f"❌ {error_msg}")
-            logger.error(f"   Telefone: {phone}")
+            logger.error("❌ %s", error_msg)
+            logger.error("   Telefone: %s", phone)
             return {"error": error_msg}
             
     except Exception as e:
-        logger.error(f"Erro de conexão ao enviar mensagem: {str(e)}")
+        logger.error("Erro de conexão ao enviar mensagem: %s", str(e))
         return {"error": f"Erro de conexão: {str(e)}"}
 
 
@@ -155,15 +145,16 @@ def get_imagem_capa_url(optimized=True):
         # Tentar buscar foto da capa do banco
         visual = TBVISUAL.objects.first()
         if visual and visual.VIS_FOTO_CAPA:
+            # Rendição 'grande' (JPEG); o original fica no tamanho do upload
             # Verificar se a URL já é completa (S3) ou relativa
-            foto_url = visual.VIS_FOTO_CAPA.url
+            foto_url = url_rendicao(visual.VIS_FOTO_CAPA)
             if foto_url.startswith('http://') or foto_url.startswith('https://'):
                 # URL completa (S3), usar diretamente
                 image_url = foto_url
             else:
                 # URL relativa, concatenar com base_url
                 image_url = f"{base_url}{foto_url}"
-            logger.info(f"✅ Foto da capa encontrada: {image_url}")
+            logger.info("✅ Foto da capa encontrada: %s", image_url)
             return image_url
         elif visual and visual.VIS_FOTO_PRINCIPAL:
             # Fallback: usar imagem principal se não houver capa
@@ -171,20 +162,20 @@ def get_imagem_capa_url(optimized=True):
                 image_url = f"{base_url}/app_igreja/api/whatsapp/imagem-principal/"
             else:
                 # Verificar se a URL já é completa (S3) ou relativa
-                foto_url = visual.VIS_FOTO_PRINCIPAL.url
+                foto_url = url_rendicao(visual.VIS_FOTO_PRINCIPAL)
                 if foto_url.startswith('http://') or foto_url.startswith('https://'):
                     image_url = foto_url
                 else:
                     image_url = f"{base_url}{foto_url}"
-            logger.info(f"ℹ️  Usando imagem principal como fallback: {image_url}")
+            logger.info("ℹ️  Usando imagem principal como fallback: %s", image_url)
             return image_url
         else:
             # Usar imagem padrão se não houver nenhuma configurada
             default_image = f"{base_url}/static/img/oncristo2.png"
-            logger.info(f"ℹ️  Usando imagem padrão: {default_image}")
+            logger.info("ℹ️  Usando imagem padrão: %s", default_image)
             return default_image
     except Exception as e:
-        logger.warning(f"⚠️  Erro ao buscar foto da capa: {str(e)}")
+        logger.warning("⚠️  Erro ao buscar foto da capa: %s", str(e))
         # Fallback para imagem padrão
         base_url = get_site_url()
         base_url = base_url.rstrip('/')
@@ -217,19 +208,20 @@ def get_imagem_principal_url(optimized=True):
                 # Usar endpoint otimizado para WhatsApp (menor consumo de bytes)
                 # O endpoint /api/whatsapp/imagem-principal/ serve a imagem otimizada
                 image_url = f"{base_url}/app_igreja/api/whatsapp/imagem-principal/"
-                logger.info(f"✅ Imagem principal otimizada para WhatsApp: {image_url}")
+                logger.info("✅ Imagem principal otimizada para WhatsApp: %s", image_url)
             else:
-                # URL original da imagem
-                image_url = f"{base_url}{visual.VIS_FOTO_PRINCIPAL.url}"
-                logger.info(f"✅ Imagem principal encontrada: {image_url}")
+                # Rendição 'grande' (JPEG); o original fica no tamanho do upload
+                foto_url = url_rendicao(visual.VIS_FOTO_PRINCIPAL)
+                image_url = foto_url if foto_url.startswith(('http://', 'https://')) else f"{base_url}{foto_url}"
+                logger.info("✅ Imagem principal encontrada: %s", image_url)
             return image_url
         else:
             # Usar imagem padrão se não houver imagem principal configurada
             default_image = f"{base_url}/static/img/oncristo2.png"
-            logger.info(f"ℹ️  Usando imagem padrão: {default_image}")
+            logger.info("ℹ️  Usando imagem padrão: %s", default_image)
             return default_image
     except Exception as e:
-        logger.warning(f"⚠️  Erro ao buscar imagem principal: {str(e)}")
+        logger.warning("⚠️  Erro ao buscar imagem principal: %s", str(e))
         # Fallback para imagem padrão
         base_url = get_site_url()
         base_url = base_url.rstrip('/')
@@ -252,15 +244,6 @@ def send_whatsapp_image(phone, image_url, caption=None):
     }
     """
     try:
-        url = f"{API_BASE_URL}/messages/image"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
         # Formato correto da API Whapi Cloud
         message_data = {
             "to": phone,
@@ -271,38 +254,74 @@ def send_whatsapp_image(phone, image_url, caption=None):
         if caption:
             message_data["caption"] = caption
         
-        logger.info(f"📸 Enviando imagem para {phone}: {image_url}")
-        logger.debug(f"Payload: {json.dumps(message_data, indent=2, ensure_ascii=False)}")
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
+        logger.info("📸 Enviando imagem para %s: %s", phone, image_url)
+        logger.debug("Payload: %s", message_data)
         
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
+        response = _post_whapi("/messages/image", json=message_data)
         
         if response.status_code == 200:
             result = response.json()
             if result.get("sent", False) or result.get("success", False):
                 message_id = result.get('message', {}).get('id', 'N/A')
-                logger.info(f"✅ Imagem enviada com sucesso para {phone}. ID: {message_id}")
-                logger.debug(f"Resposta completa: {json.dumps(result, indent=2, ensure_ascii=False)}")
+                logger.info("✅ Imagem enviada com sucesso para %s. ID: %s", phone, message_id)
+                logger.debug("Resposta completa: %s", result)
                 return result
             else:
                 error_msg = f"Erro ao enviar imagem: {result}"
-                logger.error(f"❌ {error_msg}")
-                logger.error(f"   Telefone: {phone}")
-                logger.error(f"   Resposta completa: {json.dumps(result, indent=2, ensure_ascii=False)}")
+                logger.error("❌ %s", error_msg)
+                logger.error("   Telefone: %s", phone)
+                logger.error("   Resposta completa: %s", result)
                 return {"error": error_msg}
         else:
             error_msg = f"Erro {response.status_code}: {response.text}"
-            logger.error(f"❌ {error_msg}")
-            logger.error(f"   Telefone: {phone}")
+            logger.error("❌ %s", error_msg)
+            logger.error("   Telefone: %s", phone)
             return {"error": error_msg}
             
     except Exception as e:
-        logger.error(f"❌ Erro de conexão ao enviar imagem: {str(e)}", exc_info=True)
+        logger.error("❌ Erro de conexão ao enviar imagem: %s", str(e), exc_info=True)
         return {"error": f"Erro de conexão: {str(e)}"}
 
 
+def send_whatsapp_capa(phone, caption=None):
+    """
+    Envia a foto da capa (VIS_FOTO_CAPA) pelo media id em cache (utils_midia_whatsapp):
+    o arquivo sobe para a Whapi uma vez, em vez de ser baixado do nosso servidor a cada
+    envio. Sem capa cadastrada, ou se o id for recusado, envia pela URL como antes.
+    """
+    visual = TBVISUAL.objects.only('VIS_ID', 'VIS_FOTO_CAPA').first()
+    if visual and visual.VIS_FOTO_CAPA:
+        media_id = media_id_arquivo(visual.VIS_FOTO_CAPA)
+        if media_id:
+            result = send_whatsapp_image(phone, media_id, caption)
+            if not result.get("error"):
+                return result
+            invalidar_midia(media_id)
+    image_url = get_imagem_capa_url(optimized=False)
+    if not image_url:
+        return {"error": "Imagem da capa não encontrada"}
+    return send_whatsapp_image(phone, image_url, caption)
+
+
+def upload_whatsapp_media(conteudo, content_type):
+    """
+    Sobe um arquivo para a Whapi (POST /media) e retorna o media id, ou None em caso de erro.
+    O id pode ser passado no lugar da URL em send_whatsapp_image: a Whapi não baixa a
+    imagem de novo a cada destinatário.
+    """
+    try:
+        response = _post_whapi("/media", data=conteudo, headers={"content-type": content_type}, timeout=60)
+        if response.status_code == 200:
+            midias = response.json().get("media") or []
+            if midias and midias[0].get("id"):
+                logger.info("✅ Mídia enviada para a Whapi: %s (%s bytes)", midias[0]["id"], len(conteudo))
+                return midias[0]["id"]
+        logger.error("❌ Erro ao subir mídia: %s - %s", response.status_code, response.text)
+    except Exception as e:
+        logger.error("❌ Erro de conexão ao subir mídia: %s", e, exc_info=True)
+    return None
+
+
 def reject_whatsapp_call(phone, call_id=None):
     """
     Rejeita chamada de voz recebida via API Whapi Cloud
@@ -311,18 +330,9 @@ def reject_whatsapp_call(phone, call_id=None):
     Neste caso, a chamada será apenas ignorada e logada.
     """
     try:
-        logger.warning(f"📞 CHAMADA RECUSADA - De: {phone} | ID: {call_id} | Horário: {get_local_time()}")
+        logger.warning("📞 CHAMADA RECUSADA - De: %s | ID: %s | Horário: %s", phone, call_id, get_local_time())
         
         # Tentar usar endpoint de chamadas se disponível (pode não existir na Whapi Cloud)
-        url = f"{API_BASE_URL}/calls/reject"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
         call_data = {
             "to": phone,
         }
@@ -330,42 +340,49 @@ def reject_whatsapp_call(phone, call_id=None):
         if call_id:
             call_data["call_id"] = call_id
         
-        response = requests.post(url, headers=headers, json=call_data, timeout=10)
+        response = _post_whapi("/calls/reject", json=call_data, timeout=10)
         
         if response.status_code == 200:
-            logger.info(f"✅ Chamada rejeitada via API para {phone}")
+            logger.info("✅ Chamada rejeitada via API para %s", phone)
             return {"success": True, "message": "Chamada rejeitada"}
         elif response.status_code == 404:
             # Endpoint não existe - apenas ignorar (comportamento esperado)
-            logger.info(f"ℹ️  Endpoint de rejeição não disponível - Chamada será ignorada automaticamente para {phone}")
+            logger.info("ℹ️  Endpoint de rejeição não disponível - Chamada será ignorada automaticamente para %s", phone)
             return {"success": True, "message": "Chamada ignorada (endpoint não disponível)"}
         else:
             # Outro erro - logar mas não falhar
-            logger.warning(f"⚠️  Erro ao rejeitar chamada ({response.status_code}): {response.text}")
+            logger.warning("⚠️  Erro ao rejeitar chamada (%s): %s", response.status_code, response.text)
             return {"success": True, "message": "Chamada ignorada"}
             
     except requests.exceptions.RequestException as e:
         # Se der erro de conexão, apenas logar (não é crítico - a chamada será ignorada mesmo)
-        logger.info(f"ℹ️  Chamada de {phone} será ignorada (erro de conexão na API: {str(e)})")
+        logger.info("ℹ️  Chamada de %s será ignorada (erro de conexão na API: %s)", phone, str(e))
         return {"success": True, "message": "Chamada ignorada"}
     except Exception as e:
-        logger.warning(f"⚠️  Erro ao processar rejeição de chamada: {str(e)}")
+        logger.warning("⚠️  Erro ao processar rejeição de chamada: %s", str(e))
         return {"success": True, "message": "Chamada ignorada"}
 
 
-def get_nome_paroquia():
+def enviar_payload(nome, phone):
     """
-    Busca o nome da paróquia cadastrada
-    Retorna o nome da paróquia ou "Paróquia" como padrão
+    Envia um payload pré-serializado do chatbot (utils_chatbot) para o telefone.
+    Retorna o JSON da Whapi ou {"error": ...}, como as demais funções de envio.
     """
     try:
-        paroquia = TBPAROQUIA.objects.first()
-        if paroquia and paroquia.PAR_nome_paroquia:
-            return paroquia.PAR_nome_paroquia.strip()
-        return "Paróquia"
+        endpoint, corpo = corpo_mensagem(nome, phone)
+        response = _post_whapi(endpoint, data=corpo)
+        if response.status_code == 200:
+            result = response.json()
+            if result.get("sent", False) or result.get("success", False):
+                logger.info("✅ %s enviado para %s. ID: %s", nome, phone, result.get('message', {}).get('id', 'N/A'))
+                return result
+            logger.error("❌ Erro ao enviar %s para %s: %s", nome, phone, result)
+            return {"error": f"Erro ao enviar: {result}"}
+        logger.error("❌ Erro ao enviar %s para %s: %s - %s", nome, phone, response.status_code, response.text)
+        return {"error": f"Erro {response.status_code}: {response.text}"}
     except Exception as e:
-        logger.warning(f"⚠️  Erro ao buscar nome da paróquia: {str(e)}")
-        return "Paróquia"
+        logger.error("❌ Erro de conexão ao enviar %s: %s", nome, e, exc_info=True)
+        return {"error": f"Erro de conexão: {str(e)}"}
 
 
 def send_whatsapp_menu(phone, send_image_first=True, use_capa=False):
@@ -378,127 +395,41 @@ def send_whatsapp_menu(phone, send_image_first=True, use_capa=False):
         send_image_first: Se True, envia imagem antes do menu
         use_capa: Se True, usa a foto da capa (VIS_FOTO_CAPA), senão usa imagem principal
     """
-    try:
-        # Buscar nome da paróquia para o cabeçalho
-        nome_paroquia = get_nome_paroquia()
-        header_text = f"Bem vindo a Paroquia {nome_paroquia} - Menu Principal"
-        
-        # Primeiro, enviar a imagem se solicitado
-        if send_image_first:
-            # Se use_capa=True, usar foto da capa, senão usar imagem principal
-            if use_capa:
-                image_url = get_imagem_capa_url(optimized=False)  # Foto da capa usa URL direta
-                logger.info(f"📸 Preparando para enviar FOTO DA CAPA antes do menu para {phone}")
-            else:
-                image_url = get_imagem_principal_url(optimized=True)
-                logger.info(f"📸 Preparando para enviar imagem principal antes do menu para {phone}")
-            
-            if image_url:
-                logger.info(f"📸 URL da imagem: {image_url}")
-                
-                # Verificar se a URL é acessível (teste rápido)
-                try:
-                    test_response = requests.head(image_url, timeout=5, allow_redirects=True)
-                    if test_response.status_code == 200:
-                        logger.info(f"✅ URL da imagem é acessível (Status: {test_response.status_code})")
-                    else:
-                        logger.warning(f"⚠️  URL da imagem retornou status {test_response.status_code}")
-                except Exception as e:
-                    logger.warning(f"⚠️  Não foi possível verificar acessibilidade da URL: {str(e)}")
-                
-                image_result = send_whatsapp_image(
-                    phone, 
-                    image_url, 
-                    caption="📖 Projeto On Cristo - Sua paróquia sempre com você"
-                )
-                # Não falhar se a imagem não for enviada, apenas logar
-                if image_result.get("error"):
-                    logger.warning(f"⚠️  Erro ao enviar imagem, mas continuando com menu: {image_result.get('error')}")
-                else:
-                    logger.info(f"✅ Imagem enviada com sucesso, aguardando antes de enviar menu...")
-                    # Aguardar um pouco para a imagem ser processada antes de enviar o menu
-                    time.sleep(1.5)
-            else:
-                logger.warning(f"⚠️  URL da imagem não encontrada, pulando envio de imagem")
-        
-        # Agora enviar o menu interativo
-        url = f"{API_BASE_URL}/messages/interactive"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
-        message_data = {
-            "to": phone,
-            "type": "list",
-            "header": {"text": header_text},
-            "body": {"text": "Escolha uma opção para continuar:"},
-            "footer": {"text": "Sua paróquia sempre com você"},
-            "action": {
-                "list": {
-                    "label": "Menu Principal",
-                    "sections": [
-                        {
-                            "title": "Opções Disponíveis",
-                            "rows": [
-                                {
-                                    "title": "📖 Liturgias",
-                                    "id": "liturgias",
-                                    "description": "Selecione a liturgia do dia desejado"
-                                },
-                                {
-                                    "title": "👥 Quero ser Colaborador",
-                                    "id": "cadastro_membro",
-                                    "description": "Cadastro de colaborador para celebração das missas e eventos"                                },
-                                {
-                                    "title": "⏰ Escalas de Missas",
-                                    "id": "Escala_Missas",
-                                    "description": "Para Colaboradores cadastrados escalar celebrações como colaborador"
-                                },
-                                {
-                                    "title": "💰 Dízimo, ofertas e donativos",
-                                    "id": "dizimo_ofertas",
-                                    "description": "Veja como ajudar em nosso trabalho de evangelização"
-                                },
-                                {
-                                    "title": "🕯️ Agendar Celebrações",
-                                    "id": "Agendar_Celebracoes",
-                                    "description": "Missa de 7º dia, agradecimentos, Louvor, etc."
-                                },
-                                {
-                                    "title": "🙏 Pedido de Oração",
-                                    "id": "pedido_oracao",
-                                    "description": "Orações, agradecimentos, Louvores..."
-                                }
-                            ]
-                        }
-                    ]
-                }
-            }
-        }
-        
-        logger.info(f"Enviando menu para {phone}")
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
+    if send_image_first:
+        caption = "📖 Projeto On Cristo - Sua paróquia sempre com você"
+        # Se use_capa=True, usar foto da capa (pelo media id em cache), senão usar imagem principal
+        if use_capa:
+            image_result = send_whatsapp_capa(phone, caption=caption)
+        else:
+            image_url = get_imagem_principal_url(optimized=True)
+            image_result = send_whatsapp_image(phone, image_url, caption=caption) if image_url else None
         
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("sent", False):
-                logger.info(f"Menu enviado com sucesso. ID: {result.get('message', {}).get('id')}")
-                return result
+        if image_result:
+            # Não falhar se a imagem não for enviada, apenas logar
+            if image_result.get("error"):
+                logger.warning("⚠️  Erro ao enviar imagem, mas continuando com menu: %s", image_result.get('error'))
             else:
-                logger.error(f"Erro ao enviar menu: {result}")
-                return {"error": f"Erro ao enviar menu: {result}"}
+                # Aguardar um pouco para a imagem ser processada antes de enviar o menu
+                time.sleep(1.5)
         else:
-            logger.error(f"Erro ao enviar menu: {response.status_code} - {response.text}")
-            return {"error": f"Erro {response.status_code}: {response.text}"}
-            
-    except Exception as e:
-        logger.error(f"Erro de conexão ao enviar menu: {str(e)}")
-        return {"error": f"Erro de conexão: {str(e)}"}
+            logger.warning("⚠️  URL da imagem não encontrada, pulando envio de imagem")
+    
+    return enviar_payload('menu', phone)
+
+
+def responder_com_menu(sender_number):
+    """
+    Resposta a texto/mídia: o menu (com a foto da capa no primeiro contato).
+    Numa rajada de mensagens do mesmo número só a primeira recebe o menu (menu_liberado).
+    """
+    if not menu_liberado(sender_number):
+        logger.info("Menu já enviado há pouco para %s - mensagem agrupada", sender_number)
+        return None
+    if primeiro_contato(sender_number):
+        logger.info("🎉 Primeiro contato detectado para %s - Enviando foto da capa", sender_number)
+        return send_whatsapp_menu(sender_number, send_image_first=True, use_capa=True)
+    # Contatos subsequentes: enviar menu sem imagem
+    return send_whatsapp_menu(sender_number, send_image_first=False)
 
 
 def get_liturgia_por_data(data_lit):
@@ -525,7 +456,7 @@ def get_liturgia_por_data(data_lit):
         return liturgia_dict
         
     except Exception as e:
-        logger.error(f"Erro ao buscar liturgia: {e}")
+        logger.error("Erro ao buscar liturgia: %s", e)
         return None
 
 
@@ -535,593 +466,59 @@ def get_liturgia_hoje():
 
 
 def send_whatsapp_menu_liturgias(phone):
-    """
-    Envia menu interativo com botões para liturgias
-    Pergunta se o usuário quer ser redirecionado para o site
-    """
-    try:
-        url = f"{API_BASE_URL}/messages/interactive"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
-        site_url = get_site_url()
-        liturgias_url = f"{site_url}/app_igreja/liturgia-diaria/"
-        logger.info(f"🔗 Link de liturgias gerado: {liturgias_url}")
-        
-        # Payload oficial da Whapi para mensagens interativas (type: button)
-        # Formato baseado no exemplo que funciona na API
-        message_data = {
-            "header": {"text": "Obrigado por interagir conosco."},
-            "body": {"text": "Posso redirecioná-lo para nosso Site ?"},
-            "footer": {"text": "Escolha sua Opção"},
-            "action": {
-                "buttons": [
-                    {
-                        "type": "url",
-                        "title": "Sim",
-                        "id": "liturgias_sim",
-                        "url": liturgias_url
-                    },
-                    {
-                        "type": "url",
-                        "title": "Não",
-                        "id": "liturgias_nao",
-                        "url": "#"  # URL temporária - será processado no webhook quando clicar em "Não"
-                    }
-                ]
-            },
-            "type": "button",
-            "to": phone
-        }
-        
-        logger.info(f"📖 Enviando menu de liturgias para {phone}")
-        logger.debug(f"Payload: {json.dumps(message_data, indent=2)}")
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
-        
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("sent", False) or result.get("success", False):
-                logger.info(f"✅ Menu de liturgias enviado com sucesso. ID: {result.get('message', {}).get('id', 'N/A')}")
-                return result
-            else:
-                logger.error(f"❌ Erro ao enviar menu de liturgias: {result}")
-                return {"error": f"Erro ao enviar: {result}"}
-        else:
-            logger.error(f"❌ Erro ao enviar menu de liturgias: {response.status_code} - {response.text}")
-            return {"error": f"Erro {response.status_code}: {response.text}"}
-            
-    except Exception as e:
-        logger.error(f"❌ Erro de conexão ao enviar menu de liturgias: {str(e)}", exc_info=True)
-        return {"error": f"Erro de conexão: {str(e)}"}
+    """Botões Sim/Não para as liturgias (Sim abre o site)"""
+    return enviar_payload('submenu:liturgias', phone)
 
 
 def send_whatsapp_menu_dizimista(phone):
-    """
-    Envia menu interativo com botões para cadastro de dizimista
-    Pergunta se o usuário quer ser redirecionado para o site de cadastro
-    """
-    try:
-        url = f"{API_BASE_URL}/messages/interactive"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
-        # Obter URL do site
-        site_url = get_site_url()
-        
-        # Limpar telefone para URL (remover código do país se existir)
-        telefone_limpo = limpar_telefone(phone)
-        if telefone_limpo and telefone_limpo.startswith('55'):
-            telefone_limpo = telefone_limpo[2:]
-        
-        dizimista_url = f"{site_url}/app_igreja/quero-ser-dizimista/?telefone={telefone_limpo}"
-        
-        logger.info(f"🌐 URL do dizimista: {dizimista_url}")
-        
-        # Payload oficial da Whapi para mensagens interativas (type: button)
-        message_data = {
-            "header": {"text": "Obrigado por interagir conosco."},
-            "body": {"text": "Posso redirecioná-lo para nosso Site de Cadastro ?"},
-            "footer": {"text": "Escolha sua Opção"},
-            "action": {
-                "buttons": [
-                    {
-                        "type": "url",
-                        "title": "Sim",
-                        "id": "dizimista_sim",
-                        "url": dizimista_url
-                    },
-                    {
-                        "type": "url",
-                        "title": "Não",
-                        "id": "dizimista_nao",
-                        "url": "#"  # URL temporária - será processado no webhook quando clicar em "Não"
-                    }
-                ]
-            },
-            "type": "button",
-            "to": phone
-        }
-        
-        logger.info(f"💰 Enviando menu de dizimista para {phone}")
-        logger.debug(f"Payload: {json.dumps(message_data, indent=2)}")
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
-        
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("sent", False) or result.get("success", False):
-                logger.info(f"✅ Menu de dizimista enviado com sucesso. ID: {result.get('message', {}).get('id', 'N/A')}")
-                return result
-            else:
-                logger.error(f"❌ Erro ao enviar menu de dizimista: {result}")
-                return {"error": f"Erro ao enviar: {result}"}
-        else:
-            logger.error(f"❌ Erro ao enviar menu de dizimista: {response.status_code} - {response.text}")
-            return {"error": f"Erro {response.status_code}: {response.text}"}
-            
-    except Exception as e:
-        logger.error(f"❌ Erro de conexão ao enviar menu de dizimista: {str(e)}", exc_info=True)
-        return {"error": f"Erro de conexão: {str(e)}"}
+    """Botões Sim/Não para o cadastro de dizimista (link com o telefone)"""
+    return enviar_payload('submenu:dizimista', phone)
 
 
 def send_whatsapp_menu_colaborador(phone):
-    """
-    Envia menu interativo com botões para cadastro de colaborador
-    Pergunta se o usuário quer ser redirecionado para o site de cadastro
-    """
-    try:
-        url = f"{API_BASE_URL}/messages/interactive"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
-        # Obter URL do site
-        site_url = get_site_url()
-        
-        # Limpar telefone para URL (remover código do país se existir)
-        telefone_limpo = limpar_telefone(phone)
-        if telefone_limpo and telefone_limpo.startswith('55'):
-            telefone_limpo = telefone_limpo[2:]
-        
-        colaborador_url = f"{site_url}/app_igreja/quero-ser-colaborador/?telefone={telefone_limpo}"
-        
-        logger.info(f"🌐 URL do colaborador: {colaborador_url}")
-        
-        # Payload oficial da Whapi para mensagens interativas (type: button)
-        message_data = {
-            "header": {"text": "Obrigado por interagir conosco."},
-            "body": {"text": "Posso redirecioná-lo para nosso Site de Cadastro de Colaborador ?"},
-            "footer": {"text": "Escolha sua Opção"},
-            "action": {
-                "buttons": [
-                    {
-                        "type": "url",
-                        "title": "Sim",
-                        "id": "colaborador_sim",
-                        "url": colaborador_url
-                    },
-                    {
-                        "type": "url",
-                        "title": "Não",
-                        "id": "colaborador_nao",
-                        "url": "#"  # URL temporária - será processado no webhook quando clicar em "Não"
-                    }
-                ]
-            },
-            "type": "button",
-            "to": phone
-        }
-        
-        logger.info(f"👥 Enviando menu de colaborador para {phone}")
-        logger.debug(f"Payload: {json.dumps(message_data, indent=2)}")
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
-        
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("sent", False) or result.get("success", False):
-                logger.info(f"✅ Menu de colaborador enviado com sucesso. ID: {result.get('message', {}).get('id', 'N/A')}")
-                return result
-            else:
-                logger.error(f"❌ Erro ao enviar menu de colaborador: {result}")
-                return {"error": f"Erro ao enviar: {result}"}
-        else:
-            logger.error(f"❌ Erro ao enviar menu de colaborador: {response.status_code} - {response.text}")
-            return {"error": f"Erro {response.status_code}: {response.text}"}
-            
-    except Exception as e:
-        logger.error(f"❌ Erro de conexão ao enviar menu de colaborador: {str(e)}", exc_info=True)
-        return {"error": f"Erro de conexão: {str(e)}"}
+    """Botões Sim/Não para o cadastro de colaborador (link com o telefone)"""
+    return enviar_payload('submenu:colaborador', phone)
 
 
 def send_whatsapp_menu_escalas(phone):
-    """
-    Envia menu interativo com botões para escalas de missas
-    Pergunta se o usuário quer ser redirecionado para o site
-    """
-    try:
-        url = f"{API_BASE_URL}/messages/interactive"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
-        site_url = get_site_url()
-        
-        # Formatar telefone para URL (remover código do país se necessário)
-        telefone_limpo = limpar_telefone(phone)
-        telefone_url = telefone_limpo.replace(' ', '').replace('(', '').replace(')', '').replace('-', '')
-        escalas_url = f"{site_url}/app_igreja/escala-missas/?telefone={telefone_url}"
-        
-        logger.info(f"🌐 URL das escalas: {escalas_url}")
-        
-        # Payload oficial da Whapi para mensagens interativas (type: button)
-        message_data = {
-            "header": {"text": "Obrigado por interagir conosco."},
-            "body": {"text": "Posso redirecioná-lo para nosso Site para ver as Escalas de Missas?"},
-            "footer": {"text": "Escolha sua Opção"},
-            "action": {
-                "buttons": [
-                    {
-                        "type": "url",
-                        "title": "Sim",
-                        "id": "escalas_sim",
-                        "url": escalas_url
-                    },
-                    {
-                        "type": "url",
-                        "title": "Não",
-                        "id": "escalas_nao",
-                        "url": "#"
-                    }
-                ]
-            },
-            "type": "button",
-            "to": phone
-        }
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
-        
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("sent", False) or result.get("success", False):
-                logger.info(f"✅ Menu de escalas enviado com sucesso. ID: {result.get('message', {}).get('id', 'N/A')}")
-                return result
-            else:
-                logger.error(f"❌ Erro ao enviar menu de escalas: {result}")
-                return {"error": f"Erro ao enviar: {result}"}
-        else:
-            logger.error(f"❌ Erro ao enviar menu de escalas: {response.status_code} - {response.text}")
-            return {"error": f"Erro {response.status_code}: {response.text}"}
-            
-    except Exception as e:
-        logger.error(f"❌ Erro de conexão ao enviar menu de escalas: {str(e)}", exc_info=True)
-        return {"error": f"Erro de conexão: {str(e)}"}
+    """Botões Sim/Não para as escalas de missas (link com o telefone)"""
+    return enviar_payload('submenu:escalas', phone)
 
 
 def send_whatsapp_menu_agendar_celebracao(phone):
-    """
-    Envia menu interativo com botões para agendar celebrações
-    Pergunta se o usuário quer ser redirecionado para o site
-    """
-    try:
-        url = f"{API_BASE_URL}/messages/interactive"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
-        site_url = get_site_url()
-        
-        # Limpar telefone para URL (remover código do país se existir)
-        telefone_limpo = limpar_telefone(phone)
-        if telefone_limpo and telefone_limpo.startswith('55'):
-            telefone_limpo = telefone_limpo[2:]
-        
-        agendar_url = f"{site_url}/app_igreja/celebracoes-agendadas-pub/agendar/?telefone={telefone_limpo}"
-        
-        logger.info(f"🌐 URL de agendamento: {agendar_url}")
-        
-        # Payload oficial da Whapi para mensagens interativas (type: button)
-        message_data = {
-            "header": {"text": "Obrigado por interagir conosco."},
-            "body": {"text": "Posso redirecioná-lo para nosso Site para Agendar uma Celebração?"},
-            "footer": {"text": "Escolha sua Opção"},
-            "action": {
-                "buttons": [
-                    {
-                        "type": "url",
-                        "title": "Sim",
-                        "id": "agendar_sim",
-                        "url": agendar_url
-                    },
-                    {
-                        "type": "url",
-                        "title": "Não",
-                        "id": "agendar_nao",
-                        "url": "#"
-                    }
-                ]
-            },
-            "type": "button",
-            "to": phone
-        }
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
-        
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("sent", False) or result.get("success", False):
-                logger.info(f"✅ Menu de agendar celebração enviado com sucesso. ID: {result.get('message', {}).get('id', 'N/A')}")
-                return result
-            else:
-                logger.error(f"❌ Erro ao enviar menu de agendar celebração: {result}")
-                return {"error": f"Erro ao enviar: {result}"}
-        else:
-            logger.error(f"❌ Erro ao enviar menu de agendar celebração: {response.status_code} - {response.text}")
-            return {"error": f"Erro {response.status_code}: {response.text}"}
-            
-    except Exception as e:
-        logger.error(f"❌ Erro de conexão ao enviar menu de agendar celebração: {str(e)}", exc_info=True)
-        return {"error": f"Erro de conexão: {str(e)}"}
+    """Botões Sim/Não para agendar celebrações (link com o telefone)"""
+    return enviar_payload('submenu:agendar', phone)
 
 
 def send_whatsapp_menu_oracoes(phone):
-    """
-    Envia menu interativo com botões para pedido de oração
-    Redireciona diretamente para a página de novo pedido
-    """
-    try:
-        url = f"{API_BASE_URL}/messages/interactive"
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {API_KEY}",
-            "channel-id": CHANNEL_ID
-        }
-        
-        # Obter URL do site
-        site_url = get_site_url()
-        
-        # Limpar telefone para URL (remover código do país se existir)
-        telefone_limpo = limpar_telefone(phone)
-        if telefone_limpo and telefone_limpo.startswith('55'):
-            telefone_limpo = telefone_limpo[2:]
-        
-        # URL direta para criar novo pedido de oração com telefone
-        oracoes_url = f"{site_url}/app_igreja/meus-pedidos-oracoes/novo/?telefone={telefone_limpo}"
-        
-        logger.info(f"🙏 URL do pedido de oração: {oracoes_url}")
-        
-        # Payload oficial da Whapi para mensagens interativas (type: button)
-        message_data = {
-            "header": {"text": "Obrigado por interagir conosco."},
-            "body": {"text": "Posso redirecioná-lo para nosso Site de Pedidos de Oração ?"},
-            "footer": {"text": "Escolha sua Opção"},
-            "action": {
-                "buttons": [
-                    {
-                        "type": "url",
-                        "title": "Sim",
-                        "id": "oracoes_sim",
-                        "url": oracoes_url
-                    },
-                    {
-                        "type": "url",
-                        "title": "Não",
-                        "id": "oracoes_nao",
-                        "url": "#"  # URL temporária - será processado no webhook quando clicar em "Não"
-                    }
-                ]
-            },
-            "type": "button",
-            "to": phone
-        }
-        
-        logger.info(f"🙏 Enviando menu de orações para {phone}")
-        logger.debug(f"Payload: {json.dumps(message_data, indent=2)}")
-        
-        response = requests.post(url, headers=headers, json=message_data, timeout=30)
-        
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response text: {response.text}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("sent", False) or result.get("success", False):
-                logger.info(f"✅ Menu de orações enviado com sucesso. ID: {result.get('message', {}).get('id', 'N/A')}")
-                return result
-            else:
-                logger.error(f"❌ Erro ao enviar menu de orações: {result}")
-                return {"error": f"Erro ao enviar: {result}"}
-        else:
-            logger.error(f"❌ Erro ao enviar menu de orações: {response.status_code} - {response.text}")
-            return {"error": f"Erro {response.status_code}: {response.text}"}
-            
-    except Exception as e:
-        logger.error(f"❌ Erro de conexão ao enviar menu de orações: {str(e)}", exc_info=True)
-        return {"error": f"Erro de conexão: {str(e)}"}
+    """Botões Sim/Não para o pedido de oração (link com o telefone)"""
+    return enviar_payload('submenu:oracoes', phone)
 
 
 def processar_botao_menu(button_id, sender_number):
     """
-    Processa cliques em botões do menu interativo
+    Processa cliques em botões do menu interativo (tabela utils_chatbot.ROTAS_BOTAO)
     """
-    logger.info(f"🔘 Processando botão: {button_id} de {sender_number}")
-    
-    if button_id == "liturgias_nao":
-        # Usuário escolheu "Não" no menu de liturgias (mesma lógica do dizimista: URL dinâmica com get_site_url)
-        site_url = get_site_url()
-        url_liturgias = f"{site_url}/app_igreja/liturgia-diaria/"
-        return send_whatsapp_message(
-            sender_number,
-            "📖 **LITURGIAS**\n\n"
-            "Entendido! Se precisar acessar as liturgias depois, é só digitar qualquer mensagem para ver o menu novamente.\n\n"
-            f"Ou acesse diretamente:\n{url_liturgias}"
-        )
-    
-    elif button_id == "dizimista_nao":
-        # Usuário escolheu "Não" no menu de dizimista
-        site_url = get_site_url()
-        url_cadastro = f"{site_url}/app_igreja/quero-ser-dizimista/"
-        return send_whatsapp_message(
-            sender_number,
-            "💰 **CADASTRO DE DIZIMISTA**\n\n"
-            "Entendido! Se precisar se cadastrar depois, é só digitar qualquer mensagem para ver o menu novamente.\n\n"
-            f"Ou acesse diretamente:\n{url_cadastro}"
-        )
-    
-    elif button_id == "colaborador_nao":
-        # Usuário escolheu "Não" no menu de colaborador
-        site_url = get_site_url()
-        url_cadastro = f"{site_url}/app_igreja/quero-ser-colaborador/"
-        return send_whatsapp_message(
-            sender_number,
-            "👥 **CADASTRO DE COLABORADOR**\n\n"
-            "Entendido! Se precisar se cadastrar depois, é só digitar qualquer mensagem para ver o menu novamente.\n\n"
-            f"Ou acesse diretamente:\n{url_cadastro}"
-        )
-    
-    elif button_id == "escalas_nao":
-        # Usuário escolheu "Não" no menu de escalas
-        site_url = get_site_url()
-        url_escalas = f"{site_url}/app_igreja/escala-missas/"
-        return send_whatsapp_message(
-            sender_number,
-            "⏰ **ESCALAS DE MISSAS**\n\n"
-            "Entendido! Se precisar acessar as escalas depois, é só digitar qualquer mensagem para ver o menu novamente.\n\n"
-            f"Ou acesse diretamente:\n{url_escalas}"
-        )
-    
-    elif button_id == "agendar_nao":
-        # Usuário escolheu "Não" no menu de agendar celebração
-        site_url = get_site_url()
-        url_agendar = f"{site_url}/app_igreja/celebracoes-agendadas-pub/agendar/"
-        return send_whatsapp_message(
-            sender_number,
-            "🕯️ **AGENDAR CELEBRAÇÕES**\n\n"
-            "Entendido! Se precisar agendar depois, é só digitar qualquer mensagem para ver o menu novamente.\n\n"
-            f"Ou acesse diretamente:\n{url_agendar}"
-        )
-    
-    elif button_id == "oracoes_nao":
-        # Usuário escolheu "Não" no menu de orações
-        site_url = get_site_url()
-        url_oracoes = f"{site_url}/app_igreja/meus-pedidos-oracoes/novo/"
-        return send_whatsapp_message(
-            sender_number,
-            "🙏 **PEDIDO DE ORAÇÃO**\n\n"
-            "Entendido! Se precisar fazer um pedido depois, é só digitar qualquer mensagem para ver o menu novamente.\n\n"
-            f"Ou acesse diretamente:\n{url_oracoes}"
-        )
-    
-    # Se não for um botão conhecido, retornar menu principal
-    logger.warning(f"⚠️  Botão desconhecido: {button_id}")
-    return send_whatsapp_menu(sender_number, send_image_first=False)
+    rota = rota_botao(button_id)
+    if rota is None:
+        # Se não for um botão conhecido, retornar menu principal
+        logger.warning("⚠️  Botão desconhecido: %s", button_id)
+        rota = 'menu'
+    registrar_estado(sender_number, ultimo_payload=rota)
+    return enviar_payload(rota, sender_number)
 
 
 def processar_item_menu(item_id, item_title, sender_number):
-    """Processa item selecionado do menu interativo"""
-    telefone_limpo = limpar_telefone(sender_number)
-    item_title_lower = (item_title or '').lower().strip()
-    
-    logger.info(f"🔍 Processando item do menu - ID: {item_id}, Título: {item_title}, De: {sender_number}")
-    
-    # Processar por título (mais confiável)
-    if item_title:
-        if "liturgias" in item_title_lower or "opcao 1" in item_title_lower:
-            logger.info(f"📖 Liturgias detectado por título - Enviando menu de botões...")
-            # Enviar menu interativo com botões (Sim/Não)
-            return send_whatsapp_menu_liturgias(sender_number)
-        
-        elif "membro" in item_title_lower or "colaborador" in item_title_lower or "opcao 2" in item_title_lower:
-            logger.info(f"👥 Colaborador detectado por título - Enviando menu de botões...")
-            # Enviar menu interativo com botões (Sim/Não)
-            return send_whatsapp_menu_colaborador(sender_number)
-        
-        elif "escalas" in item_title_lower or "opcao 3" in item_title_lower:
-            # Enviar menu interativo com botões (Sim/Não) para escalas
-            logger.info(f"⏰ Escalas detectado por título - Enviando menu de botões...")
-            return send_whatsapp_menu_escalas(sender_number)
-        
-        elif "dizimo" in item_title_lower or "dízimo" in item_title_lower or "opcao 4" in item_title_lower:
-            # Cadastro de dizimista - enviar menu interativo
-            logger.info(f"💰 Dizimista detectado por título - Enviando menu de botões...")
-            return send_whatsapp_menu_dizimista(sender_number)
-        
-        elif "agendar" in item_title_lower or "opcao 5" in item_title_lower:
-            # Enviar menu interativo com botões (Sim/Não) para agendar celebrações
-            logger.info(f"🕯️ Agendar Celebrações detectado por título - Enviando menu de botões...")
-            return send_whatsapp_menu_agendar_celebracao(sender_number)
-        
-        elif "oracao" in item_title_lower or "oração" in item_title_lower or "pedido" in item_title_lower or "opcao 6" in item_title_lower:
-            # Enviar menu interativo com botões (Sim/Não) para pedido de oração
-            logger.info(f"🙏 Pedido de Oração detectado por título - Enviando menu de botões...")
-            return send_whatsapp_menu_oracoes(sender_number)
-    
-    # Processar por ID (fallback)
-    if item_id == "liturgias":
-        logger.info(f"📖 Liturgias detectado por ID - Enviando menu de botões...")
-        # Enviar menu interativo com botões (Sim/Não)
-        return send_whatsapp_menu_liturgias(sender_number)
-    
-    elif item_id == "dizimo_ofertas":
-        # Cadastro de dizimista - enviar menu interativo
-        logger.info(f"💰 Dizimista detectado por ID - Enviando menu de botões...")
-        return send_whatsapp_menu_dizimista(sender_number)
-    
-    elif item_id == "Agendar_Celebracoes":
-        # Enviar menu interativo com botões (Sim/Não) para agendar celebrações
-        logger.info(f"🕯️ Agendar Celebrações detectado por ID - Enviando menu de botões...")
-        return send_whatsapp_menu_agendar_celebracao(sender_number)
-    
-    elif item_id == "pedido_oracao":
-        # Enviar menu interativo com botões (Sim/Não) para pedido de oração
-        logger.info(f"🙏 Pedido de Oração detectado por ID - Enviando menu de botões...")
-        return send_whatsapp_menu_oracoes(sender_number)
-    
-    # Opção não reconhecida
-    return send_whatsapp_message(
-        sender_number,
-        "Opção não reconhecida. Digite qualquer coisa para ver o menu novamente."
-    )
+    """Processa item selecionado do menu interativo (tabela utils_chatbot.ROTAS_LISTA)"""
+    rota = rota_item(item_id, item_title)
+    if rota is None:
+        logger.info("Item do menu não reconhecido - ID: %s, Título: %s", item_id, item_title)
+        return send_whatsapp_message(
+            sender_number,
+            "Opção não reconhecida. Digite qualquer coisa para ver o menu novamente."
+        )
+    registrar_estado(sender_number, ultimo_payload=rota)
+    return enviar_payload(rota, sender_number)
 
 
 @csrf_exempt
@@ -1132,8 +529,8 @@ def whatsapp_webhook(request):
     Compatível com o formato do app_chatbot.py (Flask)
     """
     try:
-        logger.info(f"Webhook recebido - Método: {request.method}")
-        logger.info(f"Headers: {dict(request.headers)}")
+        logger.debug("Webhook recebido - Método: %s", request.method)
+        logger.debug("Headers: %s", request.headers)
         
         if request.method == 'GET':
             # Verificação do webhook (algumas APIs requerem)
@@ -1153,7 +550,12 @@ def whatsapp_webhook(request):
         except:
             data = {}
         
-        logger.info(f"Dados recebidos: {json.dumps(data, indent=2, ensure_ascii=False)}")
+        # Tráfego para replay/teste de carga (só com WHATSAPP_GRAVAR_WEBHOOK configurado)
+        gravar_payload(data)
+        # Amostra sanitizada para depuração (TBWEBHOOKAMOSTRA), no lugar do dump de cada entrega
+        capturar_payload('webhook', data)
+        
+        logger.debug("Dados recebidos: %s", data)
         
         # Se não houver dados, retornar sucesso (pode ser verificação)
         if not data:
@@ -1164,6 +566,16 @@ def whatsapp_webhook(request):
                 "version": CURRENT_VERSION
             }, status=200)
         
+        # Status de entrega das mensagens enviadas (sent/delivered/read/failed): gravados em lote
+        if data.get("statuses"):
+            recebidos = receber_status(data.get("statuses", []))
+            evento('webhook_status', quantidade=recebidos)
+            return JsonResponse({
+                "status": "success",
+                "message": "Status recebidos",
+                "version": CURRENT_VERSION
+            }, status=200)
+
         # Processar formato "messages" (formato padrão Whapi Cloud)
         if data.get("messages") and data.get("event", {}).get("type") == "messages":
             for message in data.get("messages", []):
@@ -1172,10 +584,11 @@ def whatsapp_webhook(request):
                     logger.info("Mensagem enviada por nós, ignorando...")
                     continue
                 
-                # Verificar se já foi processada
+                # Verificar se já foi processada (marca na mesma operação, entre todos os workers)
                 message_id = message.get("id")
-                if message_id and message_id in processed_messages:
-                    logger.info(f"Mensagem {message_id} já foi processada, ignorando...")
+                if not mensagem_nova(message_id):
+                    logger.info("Mensagem %s já foi processada, ignorando...", message_id)
+                    evento('webhook_mensagem_repetida', id=message_id)
                     continue
                 
                 # Extrair telefone de várias formas possíveis (ANTES de verificar tipo)
@@ -1192,32 +605,31 @@ def whatsapp_webhook(request):
                 
                 # Rejeitar chamadas automaticamente (ptt é áudio, não chamada)
                 if message_type in ["call", "audio_call", "video_call"]:
-                    logger.info(f"Chamada detectada de {sender_number} - Tipo: {message_type} - Rejeitando automaticamente...")
+                    logger.info("Chamada detectada de %s - Tipo: %s - Rejeitando automaticamente...", sender_number, message_type)
                     call_id = message.get("id") or message.get("call_id")
                     if sender_number:
                         reject_whatsapp_call(sender_number, call_id)
-                    # Adicionar ao conjunto de processadas para não processar novamente
-                    if message_id:
-                        processed_messages.add(message_id)
                     continue
                 
                 if message_type == "unknown":
                     logger.info("Mensagem tipo unknown, ignorando...")
                     continue
                 
-                # Adicionar ao conjunto de processadas
-                if message_id:
-                    processed_messages.add(message_id)
-                
                 chat_name = message.get("chat_name", "") or message.get("from_name", "")
                 
-                logger.info(f"Processando mensagem - Tipo: {message_type}, De: {sender_number}, ID: {message_id}")
+                logger.info("Processando mensagem - Tipo: %s, De: %s, ID: %s", message_type, sender_number, message_id)
+                evento('webhook_mensagem', tipo=message_type, id=message_id)
                 
                 if not sender_number:
-                    logger.warning(f"Telefone não encontrado na mensagem: {json.dumps(message, indent=2)}")
+                    logger.warning("Telefone não encontrado na mensagem: %s", message)
                     # Tentar enviar menu mesmo sem telefone (pode estar em outro lugar)
                     continue
                 
+                # Rajada do mesmo número: acima do limite a mensagem é descartada sem resposta
+                if not dentro_do_limite(sender_number):
+                    logger.info("Limite de mensagens atingido para %s, ignorando %s", sender_number, message_id)
+                    continue
+                
                 try:
                     # Processar mensagens de texto
                     if message_type == "text":
@@ -1229,37 +641,17 @@ def whatsapp_webhook(request):
                             message_text = str(text_data) if text_data else ""
                         
                         message_text = message_text.lower().strip() if message_text else ""
-                        logger.info(f"Processando mensagem de texto: '{message_text[:50]}...' para {sender_number}")
-                        
-                        # Verificar se é o primeiro contato (enviar foto da capa)
-                        is_first_contact = sender_number not in numbers_with_menu
-                        if is_first_contact:
-                            logger.info(f"🎉 Primeiro contato detectado para {sender_number} - Enviando foto da capa")
-                            numbers_with_menu.add(sender_number)
-                            # Enviar menu com foto da capa no primeiro contato
-                            result = send_whatsapp_menu(sender_number, send_image_first=True, use_capa=True)
-                        else:
-                            # Contatos subsequentes: enviar menu sem imagem
-                            result = send_whatsapp_menu(sender_number, send_image_first=False)
+                        logger.info("Processando mensagem de texto: '%s...' para %s", message_text[:50], sender_number)
+                        result = responder_com_menu(sender_number)
                     
                     # Processar mídias (áudio, imagem, vídeo) - enviar menu automaticamente
                     elif message_type in ["audio", "voice", "ptt", "image", "video", "document", "sticker"]:
-                        logger.info(f"📎 Mídia recebida - Tipo: {message_type} de {sender_number} - Enviando menu automaticamente...")
-                        
-                        # Verificar se é o primeiro contato (enviar foto da capa)
-                        is_first_contact = sender_number not in numbers_with_menu
-                        if is_first_contact:
-                            logger.info(f"🎉 Primeiro contato detectado para {sender_number} - Enviando foto da capa")
-                            numbers_with_menu.add(sender_number)
-                            # Enviar menu com foto da capa no primeiro contato
-                            result = send_whatsapp_menu(sender_number, send_image_first=True, use_capa=True)
-                        else:
-                            # Contatos subsequentes: enviar menu sem imagem
-                            result = send_whatsapp_menu(sender_number, send_image_first=False)
+                        logger.info("📎 Mídia recebida - Tipo: %s de %s - Enviando menu automaticamente...", message_type, sender_number)
+                        result = responder_com_menu(sender_number)
                     
                     # Processar mensagens interativas (cliques no menu)
                     elif message_type in ["interactive", "list", "reply"]:
-                        logger.info(f"Processando interação do menu: {message_type} para {sender_number}")
+                        logger.info("Processando interação do menu: %s para %s", message_type, sender_number)
                         
                         # Verificar se é clique em botão (button_reply)
                         button_id = None
@@ -1272,7 +664,7 @@ def whatsapp_webhook(request):
                             if interactive.get("type") == "button_reply":
                                 button_reply = interactive.get("button_reply", {})
                                 button_id = button_reply.get("id")
-                                logger.info(f"🔘 Botão clicado: {button_id}")
+                                logger.info("🔘 Botão clicado: %s", button_id)
                                 # Processar botão
                                 result = processar_botao_menu(button_id, sender_number)
                                 continue
@@ -1292,7 +684,7 @@ def whatsapp_webhook(request):
                             reply_data = message.get("reply", {})
                             if reply_data.get("type") == "button_reply":
                                 button_id = reply_data.get("button_reply", {}).get("id")
-                                logger.info(f"🔘 Botão clicado (formato reply): {button_id}")
+                                logger.info("🔘 Botão clicado (formato reply): %s", button_id)
                                 result = processar_botao_menu(button_id, sender_number)
                                 continue
                             elif reply_data.get("type") == "list_reply":
@@ -1300,20 +692,16 @@ def whatsapp_webhook(request):
                                 item_id = list_reply.get("id")
                                 item_title = list_reply.get("title")
                         
-                        # Remover prefixo "ListV3:" se presente
-                        if item_id and item_id.startswith("ListV3:"):
-                            item_id = item_id.replace("ListV3:", "")
-                        
-                        logger.info(f"Item selecionado: {item_id}, Título: {item_title}")
+                        logger.info("Item selecionado: %s, Título: %s", item_id, item_title)
                         
                         # Processar item do menu (lista)
                         result = processar_item_menu(item_id, item_title, sender_number)
                     
                     if result and "error" in result:
-                        logger.error(f"Erro ao enviar resposta: {result['error']}")
+                        logger.error("Erro ao enviar resposta: %s", result['error'])
                     
                 except Exception as e:
-                    logger.error(f"Erro ao processar mensagem: {str(e)}", exc_info=True)
+                    logger.error("Erro ao processar mensagem: %s", str(e), exc_info=True)
         
         # Processar eventos de chamada diretamente (formato alternativo)
         if data.get("event", {}).get("type") == "call" or data.get("type") == "call":
@@ -1347,48 +735,34 @@ def whatsapp_webhook(request):
                     continue
                 
                 message_id = last_message.get("id")
-                if message_id in processed_messages:
+                if not mensagem_nova(message_id):
                     continue
                 
-                processed_messages.add(message_id)
-                
                 raw_id = last_message.get("from") or after_update.get("id")
                 sender_number = str(raw_id).split("@")[0].strip() if raw_id else None
                 message_type = (last_message.get("type") or "text").lower()
                 
                 # Rejeitar chamadas no formato chats_updates também (ptt é áudio, não chamada)
                 if message_type in ["call", "audio_call", "video_call"]:
-                    logger.info(f"Chamada detectada no formato chats_updates de {sender_number} - Rejeitando...")
+                    logger.info("Chamada detectada no formato chats_updates de %s - Rejeitando...", sender_number)
                     call_id = last_message.get("id") or last_message.get("call_id")
                     reject_whatsapp_call(sender_number, call_id)
                     continue
                 
+                if sender_number and not dentro_do_limite(sender_number):
+                    logger.info("Limite de mensagens atingido para %s, ignorando %s", sender_number, message_id)
+                    continue
+                
                 if sender_number:
                     try:
-                        # Verificar se é o primeiro contato (enviar foto da capa)
-                        is_first_contact = sender_number not in numbers_with_menu
-                        if is_first_contact:
-                            logger.info(f"🎉 Primeiro contato detectado para {sender_number} - Enviando foto da capa")
-                            numbers_with_menu.add(sender_number)
-                        
                         # Processar mensagens de texto
                         if message_type == "text":
-                            if is_first_contact:
-                                # Primeiro contato: enviar menu com foto da capa
-                                result = send_whatsapp_menu(sender_number, send_image_first=True, use_capa=True)
-                            else:
-                                # Contatos subsequentes: enviar menu sem imagem
-                                result = send_whatsapp_menu(sender_number, send_image_first=False)
+                            result = responder_com_menu(sender_number)
                         
                         # Processar mídias (áudio, imagem, vídeo) - enviar menu automaticamente
                         elif message_type in ["audio", "voice", "ptt", "image", "video", "document", "sticker"]:
-                            logger.info(f"📎 Mídia recebida (chats_updates) - Tipo: {message_type} de {sender_number} - Enviando menu automaticamente...")
-                            if is_first_contact:
-                                # Primeiro contato: enviar menu com foto da capa
-                                result = send_whatsapp_menu(sender_number, send_image_first=True, use_capa=True)
-                            else:
-                                # Contatos subsequentes: enviar menu sem imagem
-                                result = send_whatsapp_menu(sender_number, send_image_first=False)
+                            logger.info("📎 Mídia recebida (chats_updates) - Tipo: %s de %s - Enviando menu automaticamente...", message_type, sender_number)
+                            result = responder_com_menu(sender_number)
                         
                         # Processar mensagens interativas (cliques no menu)
                         elif message_type in ["interactive", "list", "reply"]:
@@ -1397,7 +771,7 @@ def whatsapp_webhook(request):
                             # Verificar se é botão (button_reply)
                             if reply_data.get("type") == "button_reply":
                                 button_id = reply_data.get("button_reply", {}).get("id")
-                                logger.info(f"🔘 Botão clicado (chats_updates): {button_id}")
+                                logger.info("🔘 Botão clicado (chats_updates): %s", button_id)
                                 result = processar_botao_menu(button_id, sender_number)
                             # Verificar se é lista (list_reply)
                             elif reply_data.get("type") == "list_reply":
@@ -1413,7 +787,7 @@ def whatsapp_webhook(request):
                                     item_title = list_data.get("title")
                                     result = processar_item_menu(item_id, item_title, sender_number)
                     except Exception as e:
-                        logger.error(f"Erro ao processar: {str(e)}", exc_info=True)
+                        logger.error("Erro ao processar: %s", str(e), exc_info=True)
         
         # Se chegou aqui sem processar nada, pode ser um webhook de verificação ou formato desconhecido
         # Retornar sucesso mesmo assim para não quebrar a API
@@ -1427,7 +801,7 @@ def whatsapp_webhook(request):
         }, status=200)
         
     except json.JSONDecodeError as e:
-        logger.error(f"Erro ao decodificar JSON do webhook: {e}")
+        logger.error("Erro ao decodificar JSON do webhook: %s", e)
         # Retornar 200 mesmo com erro para não quebrar a API
         return JsonResponse({
             "status": "success",
@@ -1435,7 +809,7 @@ def whatsapp_webhook(request):
             "version": CURRENT_VERSION
         }, status=200)
     except Exception as e:
-        logger.error(f"Erro no webhook WhatsApp: {e}", exc_info=True)
+        logger.error("Erro no webhook WhatsApp: %s", e, exc_info=True)
         # Retornar 200 mesmo com erro para não quebrar a API
         return JsonResponse({
             "status": "success",
@@ -1549,10 +923,10 @@ def whatsapp_imagem_principal(request):
                 # Retornar imagem otimizada
                 response = HttpResponse(output.read(), content_type='image/jpeg')
                 response['Cache-Control'] = 'public, max-age=3600'  # Cache de 1 hora
-                logger.info(f"✅ Imagem principal otimizada servida: {new_width}x{new_height} ({os_module.path.getsize(image_path)} bytes -> otimizado)")
+                logger.info("✅ Imagem principal otimizada servida: %sx%s (%s bytes -> otimizado)", new_width, new_height, os_module.path.getsize(image_path))
                 return response
             else:
-                logger.warning(f"⚠️  Arquivo de imagem não encontrado: {image_path}")
+                logger.warning("⚠️  Arquivo de imagem não encontrado: %s", image_path)
         else:
             logger.info("ℹ️  Nenhuma imagem principal configurada, usando padrão")
         
@@ -1591,7 +965,7 @@ def whatsapp_imagem_principal(request):
         return HttpResponse("Imagem não encontrada", status=404)
         
     except Exception as e:
-        logger.error(f"❌ Erro ao servir imagem otimizada: {str(e)}", exc_info=True)
+        logger.error("❌ Erro ao servir imagem otimizada: %s", str(e), exc_info=True)
         return HttpResponse(f"Erro ao processar imagem: {str(e)}", status=500)
 
 
@@ -1627,7 +1001,7 @@ def whatsapp_cadastro_dizimista(request):
             'message': 'JSON inválido'
         }, status=400)
     except Exception as e:
-        logger.error(f"Erro no cadastro de dizimista via API: {str(e)}", exc_info=True)
+        logger.error("Erro no cadastro de dizimista via API: %s", str(e), exc_info=True)
         return JsonResponse({
             'success': False,
             'message': str(e)
@@ -8,6 +8,8 @@ import os
 PROJECT_DIR = "/home/oncristo"
 bind = f"unix:{PROJECT_DIR}/gunicorn.sock"
 workers = multiprocessing.cpu_count() * 2 + 1
+# O Django confere se o cache é compartilhado entre os workers (utils_chatbot)
+raw_env = [f"WEB_CONCURRENCY={workers}"]
 worker_class = "sync"
 worker_connections = 1000
 timeout = 30
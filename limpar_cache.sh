@@ -88,20 +88,7 @@ if command -v apt-get &> /dev/null; then
     sudo apt-get clean 2>/dev/null || show_warning "Não foi possível limpar cache do apt"
 fi
 
-# 7. Adicionar timestamp aos arquivos JS para forçar refresh
-show_status "Adicionando timestamp aos arquivos JavaScript..."
-TIMESTAMP=$(date +%s)
-for js_file in static/js/*.js; do
-    if [ -f "$js_file" ]; then
-        # Criar backup
-        cp "$js_file" "${js_file}.backup"
-        # Adicionar comentário com timestamp
-        echo "// Cache bust: $TIMESTAMP" >> "$js_file"
-        show_success "Timestamp adicionado a $(basename "$js_file")"
-    fi
-done
-
-# 8. Criar script para limpeza rápida
+# 7. Criar script para limpeza rápida
 show_status "Criando script de limpeza rápida..."
 cat > limpar_cache_rapido.sh << 'EOF'
 #!/bin/bash
@@ -114,7 +101,7 @@ EOF
 chmod +x limpar_cache_rapido.sh
 show_success "Script de limpeza rápida criado"
 
-# 9. Mostrar informações do sistema
+# 8. Mostrar informações do sistema
 show_status "Informações do sistema:"
 echo "  - Diretório atual: $(pwd)"
 echo "  - Usuário: $(whoami)"
@@ -122,7 +109,7 @@ echo "  - Data/Hora: $(date)"
 echo "  - Espaço em disco:"
 df -h . | tail -1
 
-# 10. Instruções para o usuário
+# 9. Instruções para o usuário
 echo ""
 echo "🎯 INSTRUÇÕES PARA EVITAR CACHE:"
 echo "  1. Use Ctrl+Shift+R para hard refresh no navegador"
@@ -1,6 +1,8 @@
 import os
 import socket
 from pathlib import Path
+
+from boto3.s3.transfer import TransferConfig
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -35,6 +37,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primeiro da lista: o tempo medido inclui os demais middlewares
+    'app_igreja.middleware.MedicaoDesempenhoMiddleware',
+    'app_igreja.middleware.DetectorNMaisUmMiddleware',  # só em DEBUG
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,14 +95,24 @@ AWS_S3_USE_SSL = True
 AWS_QUERYSTRING_AUTH = True
 AWS_S3_SIGNATURE_VERSION = 's3v4'
 AWS_S3_URL_PROTOCOL = 'https:'
+# Arquivos acima de 8 MB sobem em partes (multipart), até 4 partes simultâneas
+AWS_S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024, max_concurrency=4,
+)
+# URLs de mídia (app_igreja/storage.py): pastas privadas sempre assinadas com validade curta;
+# as demais sem assinatura (bucket com leitura pública) ou assinadas com validade longa
+MIDIA_PREFIXOS_PRIVADOS = ['dizimistas/', 'colaboradores/']
+MIDIA_PUBLICA_SEM_ASSINATURA = os.getenv('MIDIA_PUBLICA_SEM_ASSINATURA', '').lower() in ('1', 'true', 'yes')
+MIDIA_PUBLICA_EXPIRACAO = 7 * 24 * 60 * 60  # máximo permitido pela assinatura S3v4
 STORAGES = {
     "default": {
-        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "BACKEND": "app_igreja.storage.ArmazenamentoMidia",
     } if USE_S3 else {
         "BACKEND": "django.core.files.storage.FileSystemStorage",
         "OPTIONS": {"location": BASE_DIR / "media", "base_url": "/media/"},
     },
-    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # collectstatic gera nomes com hash + versões .gz/.br (ver app_igreja/storage.py)
+    "staticfiles": {"BACKEND": "app_igreja.storage.ArmazenamentoEstatico"},
 }
 
 STATIC_URL = '/static/'
@@ -106,6 +121,87 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Rendições de imagens (utils_image): thumb/medio/grande geradas em segundo plano
+IMAGENS_WEBP = os.getenv('IMAGENS_WEBP', 'true').lower() in ('1', 'true', 'yes')
+IMAGENS_WORKERS = int(os.getenv('IMAGENS_WORKERS', '2'))
+IMAGENS_SINCRONO = os.getenv('IMAGENS_SINCRONO', '').lower() in ('1', 'true', 'yes')
+# Fotos de um mesmo formulário codificadas e enviadas ao storage ao mesmo tempo
+IMAGENS_UPLOADS_PARALELOS = int(os.getenv('IMAGENS_UPLOADS_PARALELOS', '5'))
+
+# Cache compartilhado entre os workers do gunicorn (home, estatísticas, URLs de mídia).
+# Sem CACHE_DIR, cada processo tem o seu cache em memória (desenvolvimento, testes); a
+# produção usa sempre FileBasedCache numa pasta fixa (production.py).
+CACHE_DIR = os.getenv('CACHE_DIR')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    } if CACHE_DIR else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+# Home pública (views_home): página inteira para anônimos e fragmentos do template
+HOME_CACHE_PAGINA = int(os.getenv('HOME_CACHE_PAGINA', '60'))
+HOME_CACHE_FRAGMENTOS = 30 * 60  # abaixo da validade das URLs assinadas de mídia
+
+# Medição de desempenho (app_igreja/middleware.py): fração das requisições medidas, de 0
+# (desligado) a 1 (todas). Resultado no log, em Área Admin > Desempenho e, para a equipe
+# (is_staff), no cabeçalho Server-Timing. Os testes rodam com 0 (setUpModule em tests.py).
+DESEMPENHO_AMOSTRAGEM = float(os.getenv('DESEMPENHO_AMOSTRAGEM', '0.1'))
+# Em DEBUG, consultas iguais repetidas este número de vezes numa requisição geram aviso de N+1
+N_MAIS_UM_LIMITE = int(os.getenv('N_MAIS_UM_LIMITE', '5'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+        # Fila com thread própria: o worker não espera a escrita do log (utils_log)
+        'whatsapp_fila': {'class': 'app_igreja.utils_log.FilaLogHandler'},
+    },
+    'loggers': {
+        'app_igreja.desempenho': {
+            'handlers': ['console'],
+            'level': os.getenv('DESEMPENHO_LOG_NIVEL', 'INFO'),
+            'propagate': False,
+        },
+        'app_igreja.whatsapp': {
+            'handlers': ['whatsapp_fila'],
+            'level': os.getenv('WHATSAPP_LOG_NIVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# Webhook do WhatsApp: arquivo JSONL onde gravar as entregas recebidas, sem dados pessoais
+# (utils_webhook), para o comando replay_webhook. Vazio = não grava.
+WHATSAPP_GRAVAR_WEBHOOK = os.getenv('WHATSAPP_GRAVAR_WEBHOOK', '')
+# Fração das entregas guardada (sanitizada) em TBWEBHOOKAMOSTRA e tamanho desse buffer circular
+WHATSAPP_AMOSTRAGEM_PAYLOAD = float(os.getenv('WHATSAPP_AMOSTRAGEM_PAYLOAD', '0.01'))
+WHATSAPP_AMOSTRAS_MAX = int(os.getenv('WHATSAPP_AMOSTRAS_MAX', '200'))
+# Rajadas por remetente (utils_chatbot): até N mensagens por janela deslizante (0 = sem limite)
+# e um menu só para as mensagens que chegam dentro da janela de agrupamento (segundos)
+WHATSAPP_LIMITE_MENSAGENS = int(os.getenv('WHATSAPP_LIMITE_MENSAGENS', '10'))
+WHATSAPP_JANELA_LIMITE = int(os.getenv('WHATSAPP_JANELA_LIMITE', '60'))
+WHATSAPP_JANELA_AGRUPAMENTO = int(os.getenv('WHATSAPP_JANELA_AGRUPAMENTO', '15'))
+# Fila de mensagens automáticas (utils_fila_whatsapp): envios por minuto
+WHATSAPP_FILA_POR_MINUTO = int(os.getenv('WHATSAPP_FILA_POR_MINUTO', '30'))
+# Mensagens em massa com até N destinatários saem na própria requisição; as maiores
+# ficam para o cron de enviar_fila_whatsapp (scripts/servidor_configurar_cron.sh)
+WHATSAPP_ENVIO_IMEDIATO = int(os.getenv('WHATSAPP_ENVIO_IMEDIATO', '5'))
+# Validade do media id de um arquivo enviado à Whapi (utils_midia_whatsapp); depois sobe de novo
+WHATSAPP_MIDIA_VALIDADE_DIAS = int(os.getenv('WHATSAPP_MIDIA_VALIDADE_DIAS', '25'))
+# Status de entrega vindos do webhook (utils_entregas_whatsapp): acumulados por worker e
+# gravados em lote a cada N eventos ou após N segundos
+WHATSAPP_STATUS_LOTE = int(os.getenv('WHATSAPP_STATUS_LOTE', '50'))
+WHATSAPP_STATUS_INTERVALO = float(os.getenv('WHATSAPP_STATUS_INTERVALO', '5'))
+# Status de um envio cuja entrega ainda não foi gravada voltam ao acumulador por até N segundos
+WHATSAPP_STATUS_ESPERA = float(os.getenv('WHATSAPP_STATUS_ESPERA', '120'))
+
+# Agendamentos públicos de celebração aceitos por horário de missa (utils_celebracoes)
+CELEBRACOES_CAPACIDADE_HORARIO = int(os.getenv('CELEBRACOES_CAPACIDADE_HORARIO', '5'))
+
 LANGUAGE_CODE = 'pt-br'
 TIME_ZONE = 'America/Sao_Paulo'
 USE_I18N = True
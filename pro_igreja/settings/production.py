@@ -44,6 +44,19 @@ DATABASES = {
     }
 }
 
+# Cache compartilhado entre os workers do gunicorn: versão de conteúdo da home (fragmentos
+# e página inteira), mensagens já processadas e limite por remetente do chatbot, ranking
+# de desempenho. Em memória (LocMemCache) cada worker teria o seu e os demais seguiriam
+# servindo conteúdo antigo. Pasta fixa dentro do projeto; CACHE_DIR só muda o local.
+CACHE_DIR = os.getenv('CACHE_DIR') or str(BASE_DIR / 'cache_django')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
 # Segurança para HTTPS
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
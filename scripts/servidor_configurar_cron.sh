@@ -0,0 +1,39 @@
+#!/bin/bash
+# ============================================================
+# RODAR NO SERVIDOR (como root)
+# Instala /etc/cron.d/oncristo com as tarefas agendadas do Django:
+# - enviar_fila_whatsapp: envia a fila do WhatsApp (mensagens em massa da área
+#   administrativa, lembretes, aniversários). Sem ele as mensagens ficam PENDENTE.
+# - lembretes_dizimo e aniversariantes_whatsapp: enfileiram as campanhas do dia.
+# Rodar de novo só reescreve o arquivo.
+# ============================================================
+
+set -e
+
+PROJECT_DIR="/home/oncristo"
+CRON_FILE="/etc/cron.d/oncristo"
+LOG_FILE="/var/log/oncristo_cron.log"
+PYTHON="${PROJECT_DIR}/venv/bin/python"
+
+if [ ! -x "$PYTHON" ]; then
+    echo "Python do venv não encontrado: $PYTHON"
+    exit 1
+fi
+
+cat > "$CRON_FILE" <<CRON
+# Gerado por scripts/servidor_configurar_cron.sh
+SHELL=/bin/bash
+DJANGO_ENV=production
+
+# Fila do WhatsApp a cada 2 minutos; flock impede duas execuções ao mesmo tempo
+*/2 * * * * root cd ${PROJECT_DIR} && flock -n /tmp/oncristo_fila_whatsapp.lock ${PYTHON} manage.py enviar_fila_whatsapp >> ${LOG_FILE} 2>&1
+# Campanhas do dia (o envio fica com a fila acima)
+0 8 * * * root cd ${PROJECT_DIR} && ${PYTHON} manage.py aniversariantes_whatsapp >> ${LOG_FILE} 2>&1
+30 8 * * * root cd ${PROJECT_DIR} && ${PYTHON} manage.py lembretes_dizimo >> ${LOG_FILE} 2>&1
+CRON
+
+chmod 644 "$CRON_FILE"
+echo "Instalado: $CRON_FILE"
+cat "$CRON_FILE"
+echo ""
+echo "Log das execuções: $LOG_FILE"
@@ -27,10 +27,16 @@ class OnCristoPWA {
           return;
         }
         
-        // Caminho do Service Worker baseado no ambiente
-        const swPath = '/static/js/sw.js';
+        // Remover o registro antigo (/static/js/sw.js, escopo /static/js/)
+        const registrations = await navigator.serviceWorker.getRegistrations();
+        registrations
+          .filter((reg) => new URL(reg.scope).pathname.startsWith('/static/'))
+          .forEach((reg) => reg.unregister());
+
+        // Service worker na raiz (escopo '/'), gerado pelo Django com a lista de estáticos versionados
+        const swPath = '/sw.js';
         
-        const registration = await navigator.serviceWorker.register(swPath);
+        const registration = await navigator.serviceWorker.register(swPath, { scope: '/' });
         console.log('Service Worker registrado:', registration);
         
         // Verificar atualizações
@@ -2,7 +2,7 @@
 // Biblioteca de funções reutilizáveis para formulários
 
 /**
- * Busca dados do CEP usando a API ViaCEP (JSONP)
+ * Busca dados do CEP usando a API local de CEP (cache do ViaCEP)
  * @param {string} cep - CEP a ser buscado (com ou sem formatação)
  * @param {Object} campos - Objeto com IDs dos campos para preenchimento
  * @param {string} campos.endereco - ID do campo endereço (pode ser 'id_PAR_endereco' ou 'PAR_endereco')
@@ -25,14 +25,13 @@ function buscarCep(cep, campos = {}, callback = null) {
         return;
     }
     
-    // Função global temporária para callback JSONP
+    // Função temporária que processa o retorno da consulta
     const callbackName = 'buscarCepCallback_' + Date.now();
     window[callbackName] = function(conteudo) {
-        console.log('📋 Dados recebidos do ViaCEP:', conteudo);
+        console.log('📋 Dados recebidos do CEP:', conteudo);
         
         // Remove a função temporária
         delete window[callbackName];
-        document.body.removeChild(script);
         
         if (!("erro" in conteudo)) {
             console.log('✅ Preenchendo campos...');
@@ -86,15 +85,22 @@ function buscarCep(cep, campos = {}, callback = null) {
         }
     };
     
-    // Cria script JSONP
-    const script = document.createElement('script');
-    script.src = 'https://viacep.com.br/ws/' + cepLimpo + '/json/?callback=' + callbackName;
-    script.onerror = function() {
-        console.error('💥 Erro ao carregar script ViaCEP');
-        delete window[callbackName];
-        if (callback) callback({ erro: 'Erro na requisição' });
-    };
-    document.body.appendChild(script);
+    // Consulta a API local (cache de CEPs; ViaCEP só quando o CEP ainda não é conhecido)
+    fetch('/app_igreja/api/cep/' + cepLimpo + '/')
+        .then(response => response.json())
+        .then(data => {
+            window[callbackName](data.error ? { erro: data.error } : {
+                logradouro: data.logradouro,
+                bairro: data.bairro,
+                localidade: data.cidade,
+                uf: data.estado
+            });
+        })
+        .catch(error => {
+            console.error('💥 Erro ao consultar CEP:', error);
+            delete window[callbackName];
+            if (callback) callback({ erro: 'Erro na requisição' });
+        });
 }
 
 /**
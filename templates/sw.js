@@ -1,18 +1,8 @@
-const CACHE_NAME = 'on-cristo-v1.0.1';
-const urlsToCache = [
-  '/',
-  '/static/css/style.css',
-  '/static/js/app.js',
-  '/static/img/catedral.jpg',
-  '/static/icons/icon-192x192.png',
-  '/static/icons/icon-512x512.png',
-  '/avisos-publico/',
-  '/horarios-missas/',
-  '/eventos-publico/',
-  '/paroquia-info/',
-  '/liturgia-diaria/',
-  '/aniversariantes/'
-];
+// Gerado por app_igreja/views/area_publica/views_pwa.py a partir do manifesto do collectstatic.
+// Não edite a lista de precache à mão: ela muda sozinha a cada deploy.
+const CACHE_NAME = '{{ cache_versao }}';
+const STATIC_URL = '{{ static_url }}';
+const urlsToCache = {{ precache_urls|safe }};
 
 // Instalação do Service Worker
 self.addEventListener('install', (event) => {
@@ -23,7 +13,7 @@ self.addEventListener('install', (event) => {
         console.log('Cache aberto');
         // Adicionar URLs ao cache uma por vez para melhor tratamento de erros
         return Promise.allSettled(
-          urlsToCache.map(url => 
+          ['/'].concat(urlsToCache).map(url => 
             cache.add(url).catch(error => {
               console.warn(`Falha ao cachear ${url}:`, error);
               return null;
@@ -63,49 +53,46 @@ self.addEventListener('activate', (event) => {
 
 // Interceptação de requisições
 self.addEventListener('fetch', (event) => {
-  // Ignorar requisições não-GET
-  if (event.request.method !== 'GET') {
+  // Ignorar requisições não-GET e de outras origens
+  if (event.request.method !== 'GET' || new URL(event.request.url).origin !== self.location.origin) {
     return;
   }
 
+  // Estáticos têm hash no nome: o conteúdo de uma URL nunca muda, então cache primeiro
+  if (new URL(event.request.url).pathname.startsWith(STATIC_URL)) {
+    event.respondWith(
+      caches.match(event.request).then((cached) => cached || fetch(event.request).then((response) => {
+        if (response && response.status === 200 && response.type === 'basic') {
+          const responseToCache = response.clone();
+          caches.open(CACHE_NAME).then((cache) => cache.put(event.request, responseToCache));
+        }
+        return response;
+      }))
+    );
+    return;
+  }
+
+  // Páginas: rede primeiro (conteúdo sempre atual), cache só quando offline
   event.respondWith(
-    caches.match(event.request)
+    fetch(event.request)
       .then((response) => {
-        // Retorna do cache se disponível
-        if (response) {
-          return response;
+        if (response && response.status === 200 && response.type === 'basic' && event.request.destination === 'document') {
+          const responseToCache = response.clone();
+          caches.open(CACHE_NAME).then((cache) => cache.put(event.request, responseToCache));
         }
-
-        // Se não estiver no cache, busca da rede
-        return fetch(event.request)
-          .then((response) => {
-            // Verifica se a resposta é válida
-            if (!response || response.status !== 200 || response.type !== 'basic') {
-              return response;
-            }
-
-            // Clona a resposta para armazenar no cache
-            const responseToCache = response.clone();
-
-            caches.open(CACHE_NAME)
-              .then((cache) => {
-                cache.put(event.request, responseToCache);
-              })
-              .catch(error => {
-                console.warn('Erro ao salvar no cache:', error);
-              });
-
-            return response;
-          })
-          .catch((error) => {
-            console.warn('Erro na requisição:', error);
-            // Se offline e não estiver no cache, retorna página offline
-            if (event.request.destination === 'document') {
-              return caches.match('/offline.html');
-            }
-            // Para outros recursos, retorna uma resposta vazia
-            return new Response('', { status: 404 });
-          });
+        return response;
+      })
+      .catch((error) => {
+        console.warn('Erro na requisição:', error);
+        return caches.match(event.request).then((cached) => {
+          if (cached) {
+            return cached;
+          }
+          if (event.request.destination === 'document') {
+            return caches.match('/');
+          }
+          return new Response('', { status: 404 });
+        });
       })
   );
 });